@@ -6,24 +6,48 @@ Usage:
     python scripts/daily_scan.py --mode daily
     python scripts/daily_scan.py --mode full --drives Y:,Z:,X:
     python scripts/daily_scan.py --mode daily --sync-sheets
+    python scripts/daily_scan.py --mode daily --verify-days 0   # deep verify (list everything)
+    python scripts/daily_scan.py --mode daily --hash   # content hashes: detect renamed files
 """
 import argparse
-import json
+import os
 import sys
+from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
 
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    case,
+    delete,
+    exists,
+    func,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.orm import aliased
+
 # Add project root to path
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.nams.api.database import NasFile, ScanHistory, get_db_context  # noqa: E402
+from src.nams.api.services.media_probe import run_media_probe  # noqa: E402
 from src.nams.api.services.scanner import (  # noqa: E402
+    DIR_VERIFY_DAYS,
+    PATH_LOOKUP_CHUNK,
     FolderType,
     ScanConfig,
     ScanMode,
     run_scan,
-    scan_directory,
 )
 
 
@@ -59,105 +83,287 @@ def update_scan_history(
     db.commit()
 
 
-def detect_path_changes(db, scanned_files: dict[str, dict]) -> dict:
+# Rows per executemany INSERT into the staging table
+STAGING_CHUNK = 5000
+
+
+def file_id_for(filename: str) -> str:
+    """NasFile.file_id of a file name (same as migrate_to_category.generate_file_id)."""
+    return filename.lower().strip()
+
+
+@contextmanager
+def scan_staging(db, seen_paths: set[str], new_paths: dict[str, str]):
+    """Load the scan's paths into a temp table for set-based change detection.
+
+    Yields the table (full_path, file_id, directory, is_new). It lives on the
+    session's connection, so everything using it runs in one transaction; the
+    table is dropped on exit and the caller commits.
+    """
+    staging = Table(
+        'scan_staging',
+        MetaData(),
+        Column('full_path', String, primary_key=True),
+        Column('file_id', String, index=True),
+        Column('directory', String),
+        Column('is_new', Boolean, nullable=False),
+        prefixes=['TEMPORARY'],
+    )
+    conn = db.connection()
+    staging.create(conn)
+    try:
+        # Plain DBAPI executemany: per-row parameter processing would dominate
+        rows = (
+            (
+                full_path,
+                file_id_for(os.path.basename(full_path)),
+                new_paths.get(full_path),
+                full_path in new_paths,
+            )
+            for full_path in sorted(seen_paths)  # primary key order: appends to the B-tree
+        )
+        while chunk := list(islice(rows, STAGING_CHUNK)):
+            conn.exec_driver_sql("INSERT INTO scan_staging VALUES (?, ?, ?, ?)", chunk)
+        yield staging
+    finally:
+        staging.drop(conn)
+
+
+def detect_path_changes(db, staging: Table) -> dict:
     """Detect path changes for existing files.
 
+    A stored file whose path was not seen has moved when a file the scan
+    inserted at a new path is the same file:
+
+    - same file_id (file name), unless both have content hashes and they
+      differ (a different file with the same name, e.g. on another drive)
+    - otherwise same content hash and size: renamed. The row takes the new
+      file name and is re-extracted (its metadata came from the old name)
+
+    The inserted row is dropped and the existing row (with its metadata and
+    group) moves to the new path, appending to path_history.
+
     Args:
         db: Database session
-        scanned_files: Dict of {file_id: file_info} from current scan
+        staging: Table from scan_staging
 
     Returns:
-        Stats dict with path_changes count
+        Stats dict with path_changes (renames included) and renames counts
+        and sample changes
     """
-    stats = {'path_changes': 0, 'changes': []}
-
-    # Get existing files by file_id
-    existing_files = db.query(NasFile).filter(
-        NasFile.file_id.in_(scanned_files.keys())
-    ).all()
-
-    for nas_file in existing_files:
-        current_scan = scanned_files.get(nas_file.file_id)
-        if not current_scan:
-            continue
-
-        new_path = current_scan.get('full_path')
-        if nas_file.full_path != new_path:
-            # Path changed - update history
-            old_history = []
-            if nas_file.path_history:
-                try:
-                    old_history = json.loads(nas_file.path_history)
-                except json.JSONDecodeError:
-                    old_history = []
-
-            change_record = {
-                'old_path': nas_file.full_path,
-                'new_path': new_path,
-                'changed_at': datetime.utcnow().isoformat(),
-            }
-            old_history.append(change_record)
-
-            nas_file.path_history = json.dumps(old_history)
-            nas_file.full_path = new_path
-            nas_file.directory = current_scan.get('directory', '')
-
-            stats['path_changes'] += 1
-            if len(stats['changes']) < 10:
-                stats['changes'].append({
-                    'file_id': nas_file.file_id,
-                    'old': change_record['old_path'],
-                    'new': new_path,
-                })
+    stats = {'path_changes': 0, 'renames': 0, 'changes': []}
+    now = datetime.utcnow()
+
+    seen = exists().where(staging.c.full_path == NasFile.full_path)
+    inserted = aliased(NasFile)
+    # First new path (and its directory) with the stored file's file_id
+    new_file = (
+        select(staging.c.full_path, staging.c.directory)
+        .join(inserted, inserted.full_path == staging.c.full_path)
+        .where(
+            staging.c.is_new,
+            staging.c.file_id == NasFile.file_id,
+            or_(
+                inserted.content_hash.is_(None),
+                NasFile.content_hash.is_(None),
+                inserted.content_hash == NasFile.content_hash,
+            ),
+        )
+        .order_by(staging.c.full_path)
+        .limit(1)
+    )
+    new_path = new_file.with_only_columns(staging.c.full_path).scalar_subquery()
+    new_dir = new_file.with_only_columns(staging.c.directory).scalar_subquery()
+    moves = Table(
+        'scan_moves',
+        MetaData(),
+        Column('id', Integer, primary_key=True),
+        Column('file_id', String),
+        Column('old_path', String),
+        Column('new_path', String, index=True),
+        Column('directory', String),
+        Column('filename', String),  # new file name (renames only)
+        prefixes=['TEMPORARY'],
+    )
+    conn = db.connection()
+    moves.create(conn)
+    try:
+        candidates = select(
+            NasFile.id, NasFile.file_id, NasFile.full_path, new_path, new_dir
+        ).where(
+            NasFile.file_id.isnot(None),
+            ~seen,
+            new_path.isnot(None),
+        )
+        conn.execute(moves.insert().from_select(
+            ['id', 'file_id', 'old_path', 'new_path', 'directory'], candidates
+        ))
+        stats['renames'] = insert_content_moves(conn, staging, moves)
+
+        stats['path_changes'] = conn.execute(select(func.count()).select_from(moves)).scalar()
+        for row in conn.execute(select(moves).order_by(moves.c.id).limit(10)):
+            stats['changes'].append({
+                'file_id': row.file_id,
+                'old': row.old_path,
+                'new': row.new_path,
+            })
+
+        # Rows the scan inserted at the new paths
+        conn.execute(delete(NasFile.__table__).where(
+            NasFile.full_path.in_(select(moves.c.new_path)),
+            NasFile.id.notin_(select(moves.c.id)),
+        ))
+
+        def moved(column):
+            return select(column).where(moves.c.id == NasFile.id).scalar_subquery()
+
+        moved_name = moved(moves.c.filename)
+        history = case(
+            (func.json_valid(NasFile.path_history), NasFile.path_history),
+            else_='[]',
+        )
+        conn.execute(update(NasFile.__table__).where(
+            NasFile.id.in_(select(moves.c.id))
+        ).values(
+            path_history=func.json_insert(history, '$[#]', func.json_object(
+                'old_path', NasFile.full_path,
+                'new_path', moved(moves.c.new_path),
+                'changed_at', now.isoformat(),
+            )),
+            full_path=moved(moves.c.new_path),
+            directory=func.coalesce(moved(moves.c.directory), ''),
+            filename=func.coalesce(moved_name, NasFile.filename),
+            extraction_version=case(
+                (moved_name.isnot(None), None),
+                else_=NasFile.extraction_version,
+            ),
+            updated_at=now,
+        ))
+    finally:
+        moves.drop(conn)
 
-    db.commit()
     return stats
 
 
-def detect_missing_files(db, current_scan_paths: set[str]) -> dict:
-    """Detect files that are no longer present on disk.
+def insert_content_moves(conn, staging: Table, moves: Table) -> int:
+    """Pair unseen stored files with inserted files of the same content.
+
+    Only the scan's inserted files not already claimed by a file_id move
+    are looked up; copies with the same content pair up in id / path order.
+    Returns the number of moves added to ``moves``.
+    """
+    targets = defaultdict(list)  # (content_hash, size) -> inserted rows
+    for row in conn.execute(
+        select(NasFile.full_path, NasFile.directory, NasFile.filename,
+               NasFile.content_hash, NasFile.size_bytes)
+        .join(staging, staging.c.full_path == NasFile.full_path)
+        .where(
+            staging.c.is_new,
+            NasFile.content_hash.isnot(None),
+            NasFile.full_path.notin_(select(moves.c.new_path)),
+        )
+        .order_by(NasFile.full_path)
+    ):
+        targets[(row.content_hash, row.size_bytes)].append(row)
+    if not targets:
+        return 0
+
+    seen = exists().where(staging.c.full_path == NasFile.full_path)
+    hashes = sorted({content_hash for content_hash, _ in targets})
+    pairs = []
+    for offset in range(0, len(hashes), PATH_LOOKUP_CHUNK):
+        for row in conn.execute(
+            select(NasFile.id, NasFile.file_id, NasFile.full_path, NasFile.filename,
+                   NasFile.content_hash, NasFile.size_bytes)
+            .where(
+                NasFile.content_hash.in_(hashes[offset:offset + PATH_LOOKUP_CHUNK]),
+                ~seen,
+                NasFile.id.notin_(select(moves.c.id)),
+            )
+            .order_by(NasFile.id)
+        ):
+            queue = targets.get((row.content_hash, row.size_bytes))
+            if not queue:
+                continue
+            target = queue.pop(0)
+            pairs.append({
+                'id': row.id,
+                'file_id': row.file_id,
+                'old_path': row.full_path,
+                'new_path': target.full_path,
+                'directory': target.directory,
+                'filename': target.filename if target.filename != row.filename else None,
+            })
+    if pairs:
+        conn.execute(moves.insert(), pairs)
+    return len(pairs)
+
+
+def detect_missing_files(db, staging: Table) -> dict:
+    """Flag files that are no longer present on disk, and clear found-again ones.
+
+    Missing files get last_seen_at (when first missed); files seen again
+    have it cleared.
 
     Args:
         db: Database session
-        current_scan_paths: Set of full_path values from current scan
+        staging: Table from scan_staging
 
     Returns:
-        Stats dict with missing_files count
+        Stats dict with missing_files / found_files counts and samples
     """
-    stats = {'missing_files': 0, 'missing': []}
-
-    # Get files not in current scan (and not already marked as missing/excluded)
-    all_db_files = db.query(NasFile).filter(
-        NasFile.is_excluded.is_(False)
-    ).all()
-
-    for nas_file in all_db_files:
-        if nas_file.full_path not in current_scan_paths:
-            # File is missing - update last_seen_at if not already set
-            if nas_file.last_seen_at is None:
-                nas_file.last_seen_at = datetime.utcnow()
-                stats['missing_files'] += 1
-                if len(stats['missing']) < 10:
-                    stats['missing'].append({
-                        'file_id': nas_file.file_id,
-                        'path': nas_file.full_path,
-                    })
+    stats = {'missing_files': 0, 'missing': [], 'found_files': 0, 'found': []}
+    now = datetime.utcnow()
+    conn = db.connection()
+    seen = exists().where(staging.c.full_path == NasFile.full_path)
+
+    found = (NasFile.last_seen_at.isnot(None), seen)
+    for row in conn.execute(select(NasFile.file_id, NasFile.full_path).where(*found).limit(10)):
+        stats['found'].append({'file_id': row.file_id, 'path': row.full_path})
+    stats['found_files'] = conn.execute(
+        update(NasFile.__table__).where(*found).values(last_seen_at=None, updated_at=now)
+    ).rowcount
+
+    # Not in current scan (and not already marked as missing/excluded)
+    stats['missing_files'] = conn.execute(update(NasFile.__table__).where(
+        NasFile.is_excluded.is_(False),
+        NasFile.last_seen_at.is_(None),
+        ~seen,
+    ).values(last_seen_at=now, updated_at=now)).rowcount
+    for row in conn.execute(
+        select(NasFile.file_id, NasFile.full_path)
+        .where(NasFile.last_seen_at == now)
+        .order_by(NasFile.id)
+        .limit(10)
+    ):
+        stats['missing'].append({'file_id': row.file_id, 'path': row.full_path})
 
-    db.commit()
     return stats
 
 
 def run_daily_scan(
     mode: str = 'daily',
     drives: str = 'Y:,Z:,X:',
-    sync_sheets: bool = False
+    sync_sheets: bool = False,
+    verify_days: int | None = DIR_VERIFY_DAYS,
+    probe: bool = False,
+    hash_content: bool = False,
 ) -> dict:
     """Run daily scan with change tracking.
 
+    Directories unchanged since the last scan are not listed again; each is
+    re-listed at least every ``verify_days`` days (0 = list everything).
+
     Args:
         mode: 'daily' (incremental) or 'full'
         drives: Comma-separated drive list
         sync_sheets: Whether to sync to Google Sheets after scan
+        verify_days: Deep verify interval for unchanged directories
+        probe: Read duration/resolution/codec of files changed since their
+            last probe (after move detection, so moved files are not re-probed)
+        hash_content: Hash new and changed files before move detection, so
+            renamed files are found and same-named different files are not
+            taken for moves
 
     Returns:
         Scan statistics
@@ -178,6 +384,10 @@ def run_daily_scan(
     config = ScanConfig(
         mode=scan_mode,
         folder_type=folder_type,
+        collect_seen=True,
+        prune_dirs=True,
+        verify_days=verify_days,
+        hash_content=hash_content,
     )
 
     combined_stats = {
@@ -186,7 +396,10 @@ def run_daily_scan(
         'new_files': 0,
         'updated_files': 0,
         'missing_files': 0,
+        'found_files': 0,
         'path_changes': 0,
+        'renames': 0,
+        'probed_files': 0,
         'total_scanned': 0,
         'total_size_bytes': 0,
         'errors': [],
@@ -202,6 +415,7 @@ def run_daily_scan(
             print("[Daily Scan] Step 1: Running file scan...")
             scan_stats = run_scan(config)
             combined_stats['new_files'] = scan_stats.get('new_files', 0)
+            combined_stats['updated_files'] = scan_stats.get('updated_files', 0)
             combined_stats['total_scanned'] = (
                 scan_stats.get('origin_files', 0) +
                 scan_stats.get('archive_files', 0) +
@@ -210,23 +424,31 @@ def run_daily_scan(
             combined_stats['total_size_bytes'] = scan_stats.get('total_size_bytes', 0)
             combined_stats['errors'].extend(scan_stats.get('errors', []))
 
-            # Step 2: Detect missing files (for incremental mode)
+            # Step 2: Path changes and missing files (for incremental mode), from
+            # the paths seen by the scan above - the drives are walked only once
             if mode == 'daily':
-                print("[Daily Scan] Step 2: Detecting missing files...")
-                # Get all current paths from scan
-                current_paths = set()
-                if config.folder_type in (FolderType.ORIGIN, FolderType.BOTH, FolderType.ALL):
-                    origin_files = scan_directory(Path(config.origin_path), "origin")
-                    current_paths.update(f.get('full_path') for f in origin_files)
-                if config.folder_type in (FolderType.ARCHIVE, FolderType.BOTH, FolderType.ALL):
-                    archive_files = scan_directory(Path(config.archive_path), "archive")
-                    current_paths.update(f.get('full_path') for f in archive_files)
-                if config.folder_type in (FolderType.POKERGO, FolderType.ALL):
-                    pokergo_files = scan_directory(Path(config.pokergo_path), "pokergo")
-                    current_paths.update(f.get('full_path') for f in pokergo_files)
-
-                missing_stats = detect_missing_files(db, current_paths)
-                combined_stats['missing_files'] = missing_stats.get('missing_files', 0)
+                seen_paths = scan_stats.get('seen_paths', set())
+                new_paths = scan_stats.get('new_paths', {})
+
+                with scan_staging(db, seen_paths, new_paths) as staging:
+                    print("[Daily Scan] Step 2: Detecting path changes...")
+                    path_stats = detect_path_changes(db, staging)
+                    combined_stats['path_changes'] = path_stats['path_changes']
+                    combined_stats['renames'] = path_stats['renames']
+                    # Moved files were counted as new by the scan
+                    combined_stats['new_files'] -= combined_stats['path_changes']
+
+                    print("[Daily Scan] Step 3: Detecting missing files...")
+                    missing_stats = detect_missing_files(db, staging)
+                    combined_stats['missing_files'] = missing_stats['missing_files']
+                    combined_stats['found_files'] = missing_stats['found_files']
+                db.commit()
+
+            if probe:
+                print("[Daily Scan] Step 4: Probing media headers...")
+                probe_stats = run_media_probe(db)
+                # Unreadable files are retried next run, not scan errors
+                combined_stats['probed_files'] = probe_stats['probed']
 
             # Update scan history with success
             update_scan_history(db, scan_history, combined_stats, status='completed')
@@ -239,9 +461,9 @@ def run_daily_scan(
             print(f"[Daily Scan] Failed: {error_msg}")
             raise
 
-    # Step 3: Sync to Google Sheets (optional)
+    # Step 5: Sync to Google Sheets (optional)
     if sync_sheets:
-        print("[Daily Scan] Step 3: Syncing to Google Sheets...")
+        print("[Daily Scan] Step 5: Syncing to Google Sheets...")
         try:
             from scripts.sync_sheets import sync_changes_to_sheets
             sync_result = sync_changes_to_sheets()
@@ -258,8 +480,13 @@ def run_daily_scan(
     print(f"  Mode: {combined_stats['mode']}")
     print(f"  Drives: {combined_stats['drives']}")
     print(f"  New files: {combined_stats['new_files']}")
+    print(f"  Updated files: {combined_stats['updated_files']}")
     print(f"  Missing files: {combined_stats['missing_files']}")
-    print(f"  Path changes: {combined_stats['path_changes']}")
+    print(f"  Found again: {combined_stats['found_files']}")
+    print(f"  Path changes: {combined_stats['path_changes']} "
+          f"({combined_stats['renames']} renamed)")
+    if probe:
+        print(f"  Probed files: {combined_stats['probed_files']}")
     print(f"  Total scanned: {combined_stats['total_scanned']}")
     print(f"  Total size: {combined_stats['total_size_bytes']:,} bytes")
     if combined_stats['errors']:
@@ -289,6 +516,23 @@ def main():
         action='store_true',
         help='Sync changes to Google Sheets after scan'
     )
+    parser.add_argument(
+        '--verify-days',
+        type=int,
+        default=DIR_VERIFY_DAYS,
+        help=f'Re-list unchanged directories after this many days '
+             f'(default: {DIR_VERIFY_DAYS}, 0 = deep verify now)'
+    )
+    parser.add_argument(
+        '--hash',
+        action='store_true',
+        help='Hash new and changed files (start/middle/end) to detect renamed files'
+    )
+    parser.add_argument(
+        '--probe',
+        action='store_true',
+        help='Read duration/resolution/codec from headers of new and changed files'
+    )
 
     args = parser.parse_args()
 
@@ -297,6 +541,9 @@ def main():
             mode=args.mode,
             drives=args.drives,
             sync_sheets=args.sync_sheets,
+            verify_days=args.verify_days,
+            probe=args.probe,
+            hash_content=args.hash,
         )
         sys.exit(0 if not stats.get('errors') else 1)
     except Exception as e:
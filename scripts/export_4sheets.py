@@ -7,6 +7,7 @@ from collections import defaultdict
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.nams.api.database import get_db, NasFile, AssetGroup, PokergoEpisode, Region, EventType
+from src.nams.api.services.exclusion_rules import ExclusionRuleSet, RuleSpec
 from src.nams.api.services.matching_v2 import is_actual_episode
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
@@ -20,6 +21,16 @@ EXT_PRIORITY = {'.mp4': 1, '.mov': 2, '.mxf': 3, '.avi': 4, '.mkv': 5, '.wmv': 6
 # Size threshold: 1GB in bytes
 SIZE_1GB = 1024 * 1024 * 1024
 
+# Sheet exclusion columns (fixed, independent of the DB rules); keywords are
+# checked against the filename only
+SHEET_EXCLUSIONS = ExclusionRuleSet([
+    RuleSpec('less_1gb', 'size', 'lt', str(SIZE_1GB)),
+    RuleSpec('less_30min', 'duration', 'lt', '1800'),  # 30분 = 1800초
+    RuleSpec('clip', 'keyword', 'contains', 'clip'),  # 'clip' 키워드만
+    RuleSpec('circuit', 'keyword', 'contains', 'circuit'),
+    RuleSpec('highlight', 'keyword', 'contains', 'highlight'),
+])
+
 
 def get_era(year: int) -> str:
     """Get WSOP era from year."""
@@ -121,17 +132,12 @@ def is_hand_clip(filename: str) -> bool:
 
 def check_exclude_conditions(filename: str, size_bytes: int, duration_sec: int = None) -> dict:
     """Check exclusion conditions for a file."""
-    fname_lower = filename.lower()
-    is_hand = is_hand_clip(filename)  # Hand clip 감지 (숫자+wsop, hs-, hand_)
-
-    return {
-        'less_1gb': size_bytes and size_bytes < SIZE_1GB,
-        'less_30min': duration_sec is not None and duration_sec < 1800,  # 30분 = 1800초
-        'clip': 'clip' in fname_lower,  # 'clip' 키워드만
-        'hand': is_hand,  # Hand clip 패턴 (별도 표시)
-        'circuit': 'circuit' in fname_lower,
-        'highlight': 'highlight' in fname_lower,
-    }
+    matched = set(SHEET_EXCLUSIONS.matches(filename, size_bytes or 0, None, duration_sec))
+    conditions = {rule.id: rule.id in matched for rule in SHEET_EXCLUSIONS.rules}
+    # Unknown size (0 / None) is not flagged as small
+    conditions['less_1gb'] = bool(size_bytes) and conditions['less_1gb']
+    conditions['hand'] = is_hand_clip(filename)  # Hand clip 패턴 (숫자+wsop, hs-, hand_)
+    return conditions
 
 
 def extract_base_name(filename: str) -> str:
@@ -13,7 +13,8 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.nams.api.database.session import get_db_context
-from src.nams.api.database.models import NasFile, Region, EventType
+from src.nams.api.database.lookups import get_code_lookup
+from src.nams.api.database.models import NasFile
 
 
 # 연도 추출 패턴
@@ -120,16 +121,12 @@ def extract_episode(filename: str, full_path: str) -> int:
 
 def get_region_id(code: str, session) -> int:
     """Region 코드로 ID 조회."""
-    region = session.query(Region).filter(Region.code == code).first()
-    return region.id if region else None
+    return get_code_lookup(session).region_id(code)
 
 
 def get_event_type_id(code: str, session) -> int:
     """EventType 코드로 ID 조회."""
-    if not code:
-        return None
-    etype = session.query(EventType).filter(EventType.code == code).first()
-    return etype.id if etype else None
+    return get_code_lookup(session).event_type_id(code)
 
 
 def extract_metadata():
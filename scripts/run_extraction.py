@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""NAMS 메타데이터 추출 실행 스크립트.
+
+Usage:
+    python scripts/run_extraction.py --incremental    # 변경된 패턴 영향 파일만 재추출
+    python scripts/run_extraction.py --full           # 전체 재추출
+    python scripts/run_extraction.py --full --workers 8
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# UTF-8 출력 설정
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# 프로젝트 루트 경로
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.nams.api.services.pattern_engine import (  # noqa: E402
+    run_full_reprocess,
+    run_incremental_extraction,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NAMS 메타데이터 추출')
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument('--incremental', action='store_true',
+                      help='패턴 세트 버전이 바뀐 파일 중 영향받는 파일만 재추출')
+    mode.add_argument('--full', action='store_true', help='전체 파일 재추출')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='전체 재추출 워커 프로세스 수 (default: 단일 프로세스)')
+    args = parser.parse_args()
+
+    start = time.time()
+    if args.incremental:
+        stats = run_incremental_extraction()
+    else:
+        stats = run_full_reprocess(workers=args.workers)
+    elapsed = time.time() - start
+
+    print(f"Processed: {stats['processed']}")
+    print(f"Matched:   {stats['matched']}")
+    print(f"Updated:   {stats['updated']}")
+    if 'skipped' in stats:
+        print(f"Skipped:   {stats['skipped']} (up to date)")
+    print(f"Elapsed:   {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -86,7 +86,7 @@ def phase2_matching() -> bool:
     try:
         from src.nams.api.database.session import get_db_context
         from src.nams.api.database.models import AssetGroup
-        from src.nams.api.services.matching import run_matching, update_match_categories, update_catalog_titles, enforce_one_to_one
+        from src.nams.api.services.matching import run_matching, update_match_categories, update_catalog_titles
 
         # 기존 매칭 초기화
         print_status("INFO", "기존 매칭 초기화...")
@@ -101,17 +101,11 @@ def phase2_matching() -> bool:
             db.commit()
             print_status("OK", f"{updated} 그룹 초기화 완료")
 
-        # 매칭 실행
+        # 매칭 실행 (1:1 할당 포함)
         print_status("INFO", "PokerGO 매칭 실행...")
         result = run_matching(min_score=0.5)
         print_status("OK", f"매칭 결과: {result}")
 
-        # 1:1 매칭 강제 (중복 제거)
-        print_status("INFO", "1:1 매칭 강제 (중복 제거)...")
-        with get_db_context() as db:
-            one_to_one_result = enforce_one_to_one(db)
-            print_status("OK", f"1:1 강제: {one_to_one_result}")
-
         # 카테고리 업데이트
         print_status("INFO", "매칭 카테고리 업데이트...")
         with get_db_context() as db:
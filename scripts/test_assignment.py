@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""Assignment test: optimal one-to-one PokerGO matching.
+
+Checks ``max_weight_assignment`` against a brute-force optimum on random
+sparse instances (never reusing a column, same total weight, same result on
+every run), then runs ``run_pokergo_matching`` on an in-memory database
+where two groups want the same episode: the loser gets its second choice
+instead of being left unmatched, and episodes already matched elsewhere are
+not offered. Finally ``enforce_one_to_one`` repairs injected duplicates.
+
+Usage:
+    python scripts/test_assignment.py
+"""
+
+import random
+import sys
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.nams.api.database import (  # noqa: E402
+    AssetGroup,
+    Base,
+    EventType,
+    PokergoEpisode,
+    Region,
+)
+from src.nams.api.services.assignment import max_weight_assignment  # noqa: E402
+from src.nams.api.services.matching import (  # noqa: E402
+    EpisodeIndex,
+    enforce_one_to_one,
+    match_group_to_pokergo,
+    run_pokergo_matching,
+)
+
+
+def brute_force(candidates) -> float:
+    """Best total weight by trying every assignment."""
+    best = 0.0
+
+    def search(row, used, total):
+        nonlocal best
+        if row == len(candidates):
+            best = max(best, total)
+            return
+        search(row + 1, used, total)
+        for column, weight in candidates[row]:
+            if column not in used:
+                search(row + 1, used | {column}, total + weight)
+
+    search(0, frozenset(), 0.0)
+    return best
+
+
+def test_solver() -> bool:
+    rng = random.Random(21)
+    wrong = reused = unstable = 0
+    for _ in range(2000):
+        columns = [f"ep{j}" for j in range(rng.randint(1, 6))]
+        candidates = [
+            [(column, rng.choice([0.5, 0.75, 1.0, round(rng.uniform(0.5, 1.3), 3)]))
+             for column in rng.sample(columns, rng.randint(0, len(columns)))]
+            for _ in range(rng.randint(1, 7))
+        ]
+        result = max_weight_assignment(candidates)
+        chosen = [column for column in result if column is not None]
+        reused += len(chosen) != len(set(chosen))
+        total = sum(dict(candidates[row])[column]
+                    for row, column in enumerate(result) if column is not None)
+        wrong += abs(total - brute_force(candidates)) > 1e-9
+        unstable += result != max_weight_assignment(candidates)
+
+    checks = [
+        ("no episode assigned twice", reused == 0),
+        ("total score is optimal", wrong == 0),
+        ("deterministic", unstable == 0),
+        ("tie keeps the earlier row",
+         max_weight_assignment([[("a", 1.0)], [("a", 1.0)]]) == ["a", None]),
+        ("loser takes its second choice",
+         max_weight_assignment([[("a", 0.9), ("b", 0.8)], [("a", 1.0)]]) == ["b", "a"]),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_matching() -> bool:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(Region(id=1, code="LV", name="Las Vegas"))
+        db.add(EventType(id=1, code="ME", name="Main Event"))
+        db.add_all([
+            PokergoEpisode(id="me", title="WSOP 2011 Main Event",
+                           collection_title="WSOP 2011"),
+            PokergoEpisode(id="me_ft", title="WSOP 2011 Main Event Final Table",
+                           collection_title="WSOP 2011"),
+            PokergoEpisode(id="me_12", title="WSOP 2012 Main Event",
+                           collection_title="WSOP 2012"),
+        ])
+        for pk, group_id, year in [(1, "2011_ME_A", 2011), (2, "2011_ME_B", 2011),
+                                   (3, "2012_ME_A", 2012), (4, "2012_ME_B", 2012)]:
+            db.add(AssetGroup(id=pk, group_id=group_id, year=year, region_id=1,
+                              event_type_id=1))
+        db.commit()
+        # 2012's only episode is already taken by a manually matched group
+        db.get(AssetGroup, 4).pokergo_episode_id = "me_12"
+        db.commit()
+
+        index = EpisodeIndex(db.query(PokergoEpisode).all())
+        greedy = {match_group_to_pokergo(db, db.get(AssetGroup, i), index)[0].id for i in (1, 2)}
+        stats = run_pokergo_matching(db, min_score=0.5)
+        matched = {g.id: g.pokergo_episode_id for g in db.query(AssetGroup)}
+
+        checks = [
+            ("greedy picks one episode for both groups", greedy == {"me"}),
+            ("both groups matched to different episodes",
+             {matched[1], matched[2]} == {"me", "me_ft"} and stats["second_choice"] == 1),
+            ("episode matched elsewhere not offered",
+             matched[3] is None and stats["matched"] == 2),
+        ]
+
+        # Duplicates left by manual edits are still repaired
+        db.get(AssetGroup, 3).pokergo_episode_id = "me_12"
+        db.get(AssetGroup, 3).pokergo_match_score = 0.9
+        db.commit()
+        repair = enforce_one_to_one(db)
+        checks.append(("enforce_one_to_one repairs duplicates",
+                       repair["conflicts_found"] == 1 and repair["groups_unmatched"] == 1
+                       and db.get(AssetGroup, 4).pokergo_episode_id is None))
+
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    print("=" * 60)
+    print("Assignment Test")
+    print("=" * 60)
+
+    success = test_solver()
+    success = test_matching() and success
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Bulk write-back test: process_unmatched_files extracts and writes unmatched files.
+
+Seeds the pattern set on an in-memory database with files that match a
+pattern, carry only a year, carry nothing, or are already matched, then runs
+``process_unmatched_files`` with a small chunk size. Unmatched files must be
+read, their extracted columns written back, and the already matched file
+left alone.
+
+Usage:
+    python scripts/test_bulk_writeback.py
+"""
+
+import sys
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.nams.api.database import (  # noqa: E402
+    Base,
+    EventType,
+    NasFile,
+    Region,
+    invalidate_code_lookup,
+)
+from src.nams.api.database.init_db import (  # noqa: E402
+    PATTERNS_CONFIG,
+    _create_pattern_if_not_exists,
+)
+from src.nams.api.services.pattern_engine import (  # noqa: E402
+    CompiledPatternSet,
+    process_unmatched_files,
+)
+
+ME_PATH = ("Z:/archive/WSOP/WSOP Bracelet Event/WSOP-LAS VEGAS/2025 WSOP-LAS VEGAS/"
+           "WSOP 2025 MAIN EVENT/WSOP 2025 Main Event _ Day 1A")
+
+
+def test_unmatched() -> bool:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(Region(id=1, code="LV", name="Las Vegas"))
+        db.add(EventType(id=1, code="ME", name="Main Event"))
+        for config in PATTERNS_CONFIG:
+            _create_pattern_if_not_exists(db, config)
+        db.commit()
+        pattern_set = CompiledPatternSet.load(db)
+
+        files = [
+            ("me.mp4", ME_PATH, None),
+            ("year.mp4", "Z:/archive/WSOP 2019 highlights", None),
+            ("clip.mov", "Z:/archive/misc/clips", None),
+            ("kept.mp4", ME_PATH, 1),
+        ]
+        for i, (filename, directory, pattern_id) in enumerate(files, 1):
+            db.add(NasFile(id=i, filename=filename, extension=filename[-4:], size_bytes=1,
+                           directory=directory, full_path=f"{directory}/{filename}",
+                           matched_pattern_id=pattern_id, year=1999 if pattern_id else None))
+        db.commit()
+
+        invalidate_code_lookup()  # codes come from this database
+        stats = process_unmatched_files(db, pattern_set, chunk_size=2)
+        db.expire_all()
+        me, year, clip, kept = (db.get(NasFile, i) for i in range(1, 5))
+
+        checks = [
+            ("every unmatched file processed", stats['processed'] == 3),
+            ("matched and updated counted", stats['matched'] == 2 and stats['updated'] == 2),
+            ("pattern match written back",
+             me.matched_pattern_id is not None and me.year == 2025
+             and me.region_id == 1 and me.event_type_id == 1 and me.stage == "D1A"),
+            ("year-only extraction written back",
+             year.matched_pattern_id is None and year.year == 2019),
+            ("file without data left unchanged", clip.year is None),
+            ("already matched file not reprocessed", kept.year == 1999),
+        ]
+    invalidate_code_lookup()
+
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    print("=" * 60)
+    print("Bulk Write-back Test")
+    print("=" * 60)
+
+    success = test_unmatched()
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+"""Category index test: bucketed find_best_match makes the linear scan's decisions.
+
+Builds PokerGO episodes from the WSOP catalog titles listed in
+docs/reference/POKERGO_WSOP_FULL_LIST.md (plus regional / bracelet / undated
+synthetic titles) and random CategoryEntries over every year, region, event
+type and sequence shape, then checks that ``find_best_match`` with a
+MatchKeyIndex returns exactly the MatchResult of the old linear scan (same
+type, score, episode and reason), whether given the index or a plain list.
+
+Usage:
+    python scripts/test_category_index.py
+"""
+
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.nams.api.database.models import Category, CategoryEntry, PokergoEpisode  # noqa: E402
+from src.nams.api.services.category_matching import (  # noqa: E402
+    CLASSIC_ERA_END,
+    MATCH_TYPE_EXACT,
+    MATCH_TYPE_NONE,
+    MatchKeyIndex,
+    MatchResult,
+    extract_entry_key,
+    extract_pokergo_key,
+    find_best_match,
+)
+
+CATALOG = project_root / "docs" / "reference" / "POKERGO_WSOP_FULL_LIST.md"
+REGIONS = ["LV", "EU", "APAC", "PARADISE", None]
+EVENT_TYPES = ["ME", "BR", "HU", "GM", "HR", None]
+
+
+def linear_match(entry, category, episodes, episode_keys) -> MatchResult:
+    """The original find_best_match: filter every episode, then scan for numbers."""
+    entry_key = extract_entry_key(entry, category)
+    candidates = []
+    for ep in episodes:
+        pg_key = episode_keys.get(ep.id)
+        if not pg_key or entry_key.year != pg_key.year:
+            continue
+        if (entry_key.region or 'LV') != (pg_key.region or 'LV'):
+            continue
+        if entry_key.event_type and pg_key.event_type:
+            if entry_key.event_type != pg_key.event_type:
+                continue
+        candidates.append((ep, pg_key))
+
+    if not candidates:
+        return MatchResult(match_type=MATCH_TYPE_NONE, score=0.0, reason="No candidates found")
+
+    prefix = f"Year={entry_key.year} | Type={entry_key.event_type} | "
+    for ep, pg_key in candidates:
+        if entry_key.event_num is not None and pg_key.event_num is not None:
+            if entry_key.event_num == pg_key.event_num:
+                return MatchResult(MATCH_TYPE_EXACT, 1.0, ep.id, ep.title,
+                                   prefix + f"Event#{entry_key.event_num}")
+        if entry_key.episode is not None and pg_key.episode is not None:
+            if entry_key.episode == pg_key.episode:
+                return MatchResult(MATCH_TYPE_EXACT, 1.0, ep.id, ep.title,
+                                   prefix + f"Episode={entry_key.episode}")
+
+    if len(candidates) == 1:
+        ep, pg_key = candidates[0]
+        if entry_key.year <= CLASSIC_ERA_END:
+            return MatchResult(MATCH_TYPE_EXACT, 0.9, ep.id, ep.title,
+                               f"Year={entry_key.year} | CLASSIC era single match")
+        if entry_key.episode is None and entry_key.event_num is None:
+            if pg_key.episode is None and pg_key.event_num is None:
+                return MatchResult(MATCH_TYPE_EXACT, 0.85, ep.id, ep.title,
+                                   prefix + "Single candidate")
+
+    return MatchResult(
+        match_type=MATCH_TYPE_NONE,
+        score=0.0,
+        reason=f"Ambiguous: {len(candidates)} candidates, no exact number match",
+    )
+
+
+def make_episodes(rng: random.Random) -> list[PokergoEpisode]:
+    rows = CATALOG.read_text(encoding='utf-8').splitlines()
+    titles = [row.split('|')[2].strip() for row in rows if re.match(r'^\| \d', row)]
+    for year in range(1973, 2026, 3):
+        titles += [
+            f"WSOP {year} Main Event",
+            f"WSOP Europe {year} Main Event Day {rng.randint(1, 4)}",
+            f"WSOP APAC {year} Heads Up Episode {rng.randint(1, 3)}",
+            f"WSOP {year} Bracelet Event #{rng.randint(1, 12)}",
+            f"WSOP {year} Event {rng.randint(1, 12)} Part {rng.randint(1, 3)}",
+            f"WSOP Paradise {year}",
+            "WSOP Classic Highlights",
+        ]
+    return [PokergoEpisode(id=f"ep{i}", title=title) for i, title in enumerate(titles)]
+
+
+def make_entries(rng: random.Random, count: int) -> list[tuple[CategoryEntry, Category]]:
+    entries = []
+    for i in range(count):
+        year = rng.randint(1973, 2025)
+        event_type = rng.choice(EVENT_TYPES)
+        code = f"WSOP_{year}_{event_type}_E{rng.randint(1, 12)}" if event_type == 'BR' \
+            else f"WSOP_{year}_{event_type}_{i}"
+        entry = CategoryEntry(entry_code=code, year=year, event_type=event_type,
+                              sequence=rng.choice([None, None, 1, 2, 3, 5, 12]))
+        entries.append((entry, Category(year=year, region=rng.choice(REGIONS))))
+    return entries
+
+
+def test_decisions() -> bool:
+    rng = random.Random(25)
+    episodes = make_episodes(rng)
+    episode_keys = {}
+    for ep in episodes:
+        key = extract_pokergo_key(ep)
+        if key:
+            episode_keys[ep.id] = key
+    entries = make_entries(rng, 3000)
+
+    start = time.perf_counter()
+    expected = [linear_match(entry, category, episodes, episode_keys)
+                for entry, category in entries]
+    old = time.perf_counter() - start
+    start = time.perf_counter()
+    index = MatchKeyIndex(episodes, episode_keys)
+    results = [find_best_match(entry, category, index) for entry, category in entries]
+    new = time.perf_counter() - start
+    from_list = [find_best_match(entry, category, episodes, episode_keys)
+                 for entry, category in entries[:200]]
+
+    kinds = {(r.match_type, r.score) for r in expected}
+    print(f"  {len(episodes)} episodes, {len(entries)} entries, {len(kinds)} decision kinds: "
+          f"linear {old * 1e3:.0f} ms, index {new * 1e3:.0f} ms")
+    checks = [
+        ("identical results with the index", results == expected),
+        ("identical results from an episode list", from_list == expected[:200]),
+        ("EXACT and NONE both exercised",
+         {MATCH_TYPE_EXACT, MATCH_TYPE_NONE} <= {r.match_type for r in expected}),
+        ("faster than the linear scan", new < old),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    print("=" * 60)
+    print("Category Index Test")
+    print("=" * 60)
+
+    success = test_decisions()
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+"""Content hash test: partial hash, fingerprint cache, moves and copy grouping.
+
+Checks that ``partial_hash`` matches copies under any name and tells apart
+files that differ in size or in a sampled region, that ``run_content_hash``
+hashes a file again only after its fingerprint changes, that
+``daily_scan.detect_path_changes`` finds renamed files by content and no
+longer takes a same-named file with different content for a move, and that
+``group_content_copies`` puts an ungrouped copy into its copy's group, and
+that ``run_auto_grouping`` still groups ungrouped files by year / event.
+
+Usage:
+    python scripts/test_content_hash.py
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from daily_scan import detect_path_changes, scan_staging  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.nams.api.database import (  # noqa: E402
+    AssetGroup,
+    Base,
+    EventType,
+    NasFile,
+    Region,
+    invalidate_code_lookup,
+)
+from src.nams.api.services.content_hash import (  # noqa: E402
+    HASH_SAMPLE_BYTES,
+    partial_hash,
+    run_content_hash,
+)
+from src.nams.api.services.grouping import (  # noqa: E402
+    group_content_copies,
+    run_auto_grouping,
+)
+
+MB = 1024 * 1024
+
+
+def write(path: Path, size: int, seed: int = 1) -> Path:
+    block = bytes((i * seed + i // 251) % 256 for i in range(MB))
+    with open(path, 'wb') as f:
+        for offset in range(0, size, MB):
+            f.write(block[:min(MB, size - offset)])
+    return path
+
+
+def flip(path: Path, offset: int) -> None:
+    with open(path, 'r+b') as f:
+        f.seek(offset)
+        byte = f.read(1)
+        f.seek(offset)
+        f.write(bytes([byte[0] ^ 0xFF]))
+
+
+def test_partial_hash(tmp: Path) -> bool:
+    large = 4 * HASH_SAMPLE_BYTES  # samples: [0, S), [1.5S, 2.5S), [3S, 4S)
+    original = write(tmp / "WSOP_2024_ME_D1.mp4", large)
+    base = partial_hash(str(original))
+
+    def variant(name, change):
+        path = tmp / name
+        shutil.copyfile(original, path)
+        change(path)
+        return partial_hash(str(path))
+
+    small = write(tmp / "small.mp4", HASH_SAMPLE_BYTES)
+    small_copy = tmp / "small_copy.mp4"
+    shutil.copyfile(small, small_copy)
+    flip(small_copy, HASH_SAMPLE_BYTES // 2)
+
+    checks = [
+        ("renamed copy matches", variant("renamed.mov", lambda p: None) == base),
+        ("start sample change differs", variant("a.mp4", lambda p: flip(p, 10)) != base),
+        ("middle sample change differs",
+         variant("b.mp4", lambda p: flip(p, 2 * HASH_SAMPLE_BYTES)) != base),
+        ("end sample change differs", variant("c.mp4", lambda p: flip(p, large - 1)) != base),
+        ("unsampled change not seen (by design)",
+         variant("d.mp4", lambda p: flip(p, HASH_SAMPLE_BYTES + 10)) == base),
+        ("size change differs",
+         variant("e.mp4", lambda p: p.open('ab').write(b'\0')) != base),
+        ("small file hashed whole", partial_hash(str(small)) != partial_hash(str(small_copy))),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_hash_cache(tmp: Path) -> bool:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    paths = sorted(tmp.glob("*.m*"))
+    with Session(engine) as db:
+        for i, path in enumerate(paths):
+            db.add(NasFile(id=i + 1, filename=path.name, extension=path.suffix,
+                           size_bytes=path.stat().st_size, full_path=str(path),
+                           fingerprint=f"1.0:{i}"))
+        db.commit()
+        first = run_content_hash(db, workers=4, chunk_size=3)
+        second = run_content_hash(db)
+        db.query(NasFile).filter(NasFile.id == 1).update({"fingerprint": "2.0:0"})
+        db.commit()
+        third = run_content_hash(db)
+        stored = db.get(NasFile, 1).content_hash
+
+    checks = [
+        ("every file hashed", first["hashed"] == len(paths)),
+        ("unchanged files not rehashed", second["hashed"] == 0
+         and second["cached"] == len(paths)),
+        ("changed fingerprint rehashed", third["hashed"] == 1),
+        ("stored hash is partial_hash", stored == partial_hash(str(paths[0]))),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_moves() -> bool:
+    """file_id moves unless contents differ; renames found by content."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    stored = [
+        # id, path, file_id, hash
+        (1, "Y:/old/WSOP_A.mp4", "wsop_a.mp4", "h1"),  # renamed
+        (2, "Y:/d1/same.mp4", "same.mp4", "h2"),  # same name, other content
+        (3, "Y:/d1/keep.mp4", "keep.mp4", "h4"),  # moved, new copy not hashed
+        (4, "Y:/o/e1.mp4", "e1.mp4", "h5"),  # two stored copies, one found
+        (5, "Z:/a/e2.mp4", "e2.mp4", "h5"),
+    ]
+    inserted = [
+        (10, "Y:/new/WSOP_A_final.mp4", "h1"),
+        (11, "Y:/d2/same.mp4", "h3"),
+        (12, "Y:/d2/keep.mp4", None),
+        (13, "Y:/n/e.mp4", "h5"),
+    ]
+    with Session(engine) as db:
+        for file_id, path, name_id, content_hash in stored:
+            db.add(NasFile(id=file_id, filename=path.rsplit("/", 1)[1], extension=".mp4",
+                           size_bytes=100, full_path=path, file_id=name_id,
+                           content_hash=content_hash, extraction_version="v1"))
+        for file_id, path, content_hash in inserted:
+            db.add(NasFile(id=file_id, filename=path.rsplit("/", 1)[1], extension=".mp4",
+                           size_bytes=100, full_path=path, content_hash=content_hash))
+        db.commit()
+
+        new_paths = {path: path.rsplit("/", 1)[0] for _, path, _ in inserted}
+        with scan_staging(db, set(new_paths), new_paths) as staging:
+            stats = detect_path_changes(db, staging)
+        db.commit()
+        rows = {f.id: f for f in db.query(NasFile)}
+
+    checks = [
+        ("three moves, two by content", stats["path_changes"] == 3 and stats["renames"] == 2),
+        ("renamed row takes new name and path",
+         (rows[1].full_path, rows[1].filename) == ("Y:/new/WSOP_A_final.mp4",
+                                                   "WSOP_A_final.mp4")),
+        ("renamed row re-extracted", rows[1].extraction_version is None),
+        ("same name, different content is not a move",
+         rows[2].full_path == "Y:/d1/same.mp4" and 11 in rows),
+        ("unhashed new copy moves by name",
+         rows[3].full_path == "Y:/d2/keep.mp4" and rows[3].extraction_version == "v1"),
+        ("one of two copies moves", rows[4].full_path == "Y:/n/e.mp4"
+         and rows[5].full_path == "Z:/a/e2.mp4"),
+        ("inserted duplicates dropped", not {10, 12, 13} & set(rows)),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_copy_grouping() -> bool:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        group = AssetGroup(id=1, group_id="2024_ME_01", year=2024)
+        db.add(group)
+        db.add(NasFile(id=1, filename="WSOP24_ME_01.mp4", extension=".mp4", size_bytes=100,
+                       full_path="Y:/WSOP24_ME_01.mp4", content_hash="h1",
+                       asset_group_id=1, role="primary", role_priority=1))
+        db.add(NasFile(id=2, filename="main_event_day1.mp4", extension=".mp4", size_bytes=100,
+                       full_path="X:/main_event_day1.mp4", content_hash="h1"))
+        db.add(NasFile(id=3, filename="other.mp4", extension=".mp4", size_bytes=100,
+                       full_path="Z:/other.mp4", content_hash="h2"))
+        db.commit()
+
+        grouped = group_content_copies(db)
+        db.commit()
+        copy = db.get(NasFile, 2)
+        checks = [
+            ("copy joins its group", grouped == 1 and copy.asset_group_id == 1),
+            ("copy is a backup", copy.role == "backup" and copy.role_priority == 2),
+            ("other content left alone", db.get(NasFile, 3).asset_group_id is None),
+            ("group stats updated", db.get(AssetGroup, 1).file_count == 2),
+        ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_auto_grouping() -> bool:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(Region(id=1, code="LV", name="Las Vegas"))
+        db.add(EventType(id=1, code="ME", name="Main Event"))
+        for pk, filename, year, duration in [(1, "WSOP24_ME_01_cut.mp4", 2024, 1800.0),
+                                             (2, "WSOP24_ME_01.mp4", 2024, 3600.0),
+                                             (3, "clip.mp4", None, None)]:
+            db.add(NasFile(id=pk, filename=filename, extension=".mp4", size_bytes=pk,
+                           full_path=f"X:/{filename}", year=year, region_id=1,
+                           event_type_id=1, episode=1 if year else None,
+                           duration_sec=duration))
+        db.commit()
+
+        invalidate_code_lookup()  # codes come from this database
+        stats = run_auto_grouping(db)
+        cut, full, clip = (db.get(NasFile, i) for i in (1, 2, 3))
+        group = db.get(AssetGroup, cut.asset_group_id) if cut.asset_group_id else None
+        checks = [
+            ("ungrouped files with a year grouped",
+             stats['processed'] == 2 and stats['grouped'] == 2
+             and group is not None and group.group_id == "2024_ME_01"
+             and full.asset_group_id == group.id and group.file_count == 2),
+            ("longer copy takes over a truncated primary",
+             full.role == "primary" and cut.role == "backup"),
+            ("file without a year left ungrouped", clip.asset_group_id is None),
+        ]
+    invalidate_code_lookup()
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    print("=" * 60)
+    print("Content Hash Test")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        success = test_partial_hash(Path(tmp))
+        success = test_hash_cache(Path(tmp)) and success
+    success = test_moves() and success
+    success = test_copy_grouping() and success
+    success = test_auto_grouping() and success
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""Daily scan test: missing and found-again files through the scan staging table.
+
+Stores files that are on disk, newly missing, missing since an earlier
+scan, found again and excluded, loads the scan's paths with
+``daily_scan.scan_staging`` and checks that ``detect_missing_files`` sets
+last_seen_at on newly missing files only, clears it on found-again ones,
+never flags excluded files, and reports at most 10 samples of each (the
+newly missing ones, not those missing since earlier). A second run on the
+same paths changes nothing.
+
+Usage:
+    python scripts/test_daily_scan.py
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from daily_scan import detect_missing_files, scan_staging  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.nams.api.database import Base, NasFile  # noqa: E402
+
+EARLIER = datetime(2026, 1, 5, 3, 0)
+
+# (kind, count): kinds are laid out in this id order
+FILES = [
+    ("still_missing", 1),  # missing since an earlier scan, lowest id
+    ("present", 15),
+    ("missing", 12),
+    ("found", 12),
+    ("excluded", 1),  # not on disk
+]
+
+
+def build_files() -> list[dict]:
+    files = []
+    for kind, count in FILES:
+        for n in range(count):
+            file_id = len(files) + 1
+            filename = f"{kind}_{n:02d}.mp4"
+            files.append({
+                "id": file_id,
+                "filename": filename,
+                "extension": ".mp4",
+                "size_bytes": 1,
+                "full_path": f"Y:/{kind}/{filename}",
+                "file_id": filename,
+                "is_excluded": kind == "excluded",
+                "last_seen_at": EARLIER if kind in ("still_missing", "found") else None,
+            })
+    return files
+
+
+def test_missing_files() -> bool:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    files = build_files()
+    by_kind = {kind: [f for f in files if f["filename"].startswith(f"{kind}_")]
+               for kind, _ in FILES}
+    on_disk = {f["full_path"] for f in by_kind["present"] + by_kind["found"]}
+
+    with Session(engine) as db:
+        db.add_all(NasFile(**f) for f in files)
+        db.commit()
+
+        with scan_staging(db, on_disk, {}) as staging:
+            stats = detect_missing_files(db, staging)
+        db.commit()
+        seen_at = dict(db.query(NasFile.id, NasFile.last_seen_at))
+        flagged = set(seen_at.values()) - {None, EARLIER}
+
+        with scan_staging(db, on_disk, {}) as staging:
+            again = detect_missing_files(db, staging)
+        db.commit()
+
+    def ids(kind):
+        return [f["id"] for f in by_kind[kind]]
+
+    def paths(kind):
+        return [f["full_path"] for f in by_kind[kind]]
+
+    checks = [
+        ("newly missing files counted", stats["missing_files"] == len(by_kind["missing"])),
+        ("newly missing files flagged with one scan time",
+         len(flagged) == 1 and all(seen_at[i] in flagged for i in ids("missing"))),
+        ("missing samples: first 10 newly missing, in id order",
+         [sample["path"] for sample in stats["missing"]] == paths("missing")[:10]),
+        ("file missing since an earlier scan keeps its time, not sampled",
+         all(seen_at[i] == EARLIER for i in ids("still_missing"))),
+        ("found-again files counted and cleared",
+         stats["found_files"] == len(by_kind["found"])
+         and all(seen_at[i] is None for i in ids("found"))),
+        ("found samples capped at 10",
+         len(stats["found"]) == 10
+         and {sample["path"] for sample in stats["found"]} <= set(paths("found"))),
+        ("excluded file never flagged",
+         all(seen_at[i] is None for i in ids("excluded"))),
+        ("files on disk untouched", all(seen_at[i] is None for i in ids("present"))),
+        ("second run changes nothing",
+         again == {'missing_files': 0, 'missing': [], 'found_files': 0, 'found': []}),
+    ]
+    print(f"  missing {stats['missing_files']} ({len(stats['missing'])} samples), "
+          f"found {stats['found_files']} ({len(stats['found'])} samples)")
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    print("=" * 60)
+    print("Daily Scan Test")
+    print("=" * 60)
+
+    success = test_missing_files()
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+"""Episode blocking test: blocked PokerGO scoring vs the brute-force scorer.
+
+Builds a seeded synthetic catalog of PokerGO episodes (Main Event, regional,
+numbered and titled bracelet events, grudge matches, CLASSIC era years,
+titles and seasons without a year) and asset groups with and without year,
+region, event type, episode and event number (some only on their first
+file). For every group, ``score_pokergo_candidates`` over an EpisodeIndex
+must return exactly the (episode, score) pairs of the pre-blocking scorer,
+which tests every episode against every hard constraint.
+
+Usage:
+    python scripts/test_episode_blocking.py
+    python scripts/test_episode_blocking.py --episodes 3000 --groups 1000 --seeds 5
+"""
+
+import argparse
+import random
+import re
+import sys
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.nams.api.database import (  # noqa: E402
+    AssetGroup,
+    Base,
+    EventType,
+    NasFile,
+    PokergoEpisode,
+    Region,
+    invalidate_code_lookup,
+)
+from src.nams.api.services.matching import (  # noqa: E402
+    CLASSIC_ERA_END_YEAR,
+    EpisodeIndex,
+    calculate_similarity,
+    extract_episode_from_title,
+    extract_year_from_season,
+    extract_year_from_title,
+    get_pokergo_titles,
+    load_match_context,
+    score_pokergo_candidates,
+)
+
+REGIONS = ["LV", "EU", "APAC", "PARADISE", "CYPRUS", "LA", "LONDON"]
+EVENT_TYPES = ["ME", "GM", "HU", "HR", "BR", "FT", "BEST"]
+YEARS = [1973, 1985, 1999, 2002, 2003, 2004, 2008, 2011, 2012, 2019, 2023]
+
+EPISODE_TITLES = [
+    "WSOP {year} Main Event Episode {n}",
+    "WSOP {year} Main Event Day {n}",
+    "WSOP {year} Main Event",
+    "Wsop {year} Me",
+    "Wsop {year}",
+    "WSOP Europe {year} Main Event Episode {n}",
+    "WSOPE {year} Event #{n} High Roller",
+    "WSOP Asia Pacific {year} Main Event Part {n}",
+    "WSOP APAC {year} Heads Up Championship",
+    "WSOP Paradise {year} Super Main Event Ep. {n}",
+    "WSOP Cyprus {year} Main Event #{n}",
+    "WSOP {year} Event #{n} $1,500 NLH Bracelet",
+    "WSOP {year} Ev{n} Bracelet Final Table",
+    "Wsop {year} {n:02d} 1500 Nlh",
+    "WSOP {year} Grudge Match Episode {n}",
+    "WSOP {year} Heads-Up Main Event {n}",
+    "WSOP {year} $1M Highroller Episode {n}",
+    "WSOP {year} Final Table Best Of",
+    "WSOP Main Event Episode {n}",
+    "Best of WSOP Bluffs {n}",
+    "High Stakes Poker Season {n}",
+]
+SEASONS = ["WSOP {year}", "WSOP Europe {year}", "Poker Classics", None]
+COLLECTIONS = ["WSOP {year}", "WSOP EU", "wsop apac collection", None]
+
+
+def build_catalog(db: Session, episodes: int, groups: int, seed: int) -> list[AssetGroup]:
+    """Store episodes and group files; the groups stay in memory (year may be None)."""
+    rng = random.Random(seed)
+    for i, code in enumerate(REGIONS, 1):
+        db.add(Region(id=i, code=code, name=code))
+    for i, code in enumerate(EVENT_TYPES, 1):
+        db.add(EventType(id=i, code=code, name=code))
+
+    for i in range(episodes):
+        year, n = rng.choice(YEARS), rng.randint(1, 12)
+        fields = {"year": year, "n": n}
+        db.add(PokergoEpisode(
+            id=f"ep{i:05d}",
+            title=rng.choice(EPISODE_TITLES).format(**fields) if i % 50 else None,
+            season_title=(rng.choice(SEASONS) or "").format(**fields) or None,
+            collection_title=(rng.choice(COLLECTIONS) or "").format(**fields) or None,
+        ))
+
+    file_id = 0
+    asset_groups = []
+    for i in range(1, groups + 1):
+        event_num = rng.choice([None, None, None, rng.randint(1, 12)])
+        asset_groups.append(AssetGroup(
+            id=i,
+            group_id=f"G{i:04d}",
+            year=rng.choice([None] + YEARS),
+            region_id=rng.choice([None, None] + list(range(1, len(REGIONS) + 1))),
+            event_type_id=rng.choice([None, None] + list(range(1, len(EVENT_TYPES) + 1))),
+            episode=rng.choice([None, None, rng.randint(1, 12)]),
+            event_num=event_num if i % 3 else None,
+        ))
+        # Some groups carry their event number on their first file only
+        for k in range(2):
+            file_id += 1
+            db.add(NasFile(
+                id=file_id, filename=f"g{i}_{k}.mp4", extension=".mp4", size_bytes=1,
+                asset_group_id=i, event_num=event_num if k == 0 and i % 3 == 0 else None,
+            ))
+    db.commit()
+    return asset_groups
+
+
+def brute_force_classic(group: AssetGroup, episodes: list[PokergoEpisode]):
+    """match_classic_era before blocking: first WSOP episode of the year."""
+    for episode in episodes:
+        if not episode.title:
+            continue
+        ep_year = extract_year_from_season(episode.season_title)
+        if not ep_year:
+            title_match = re.match(r'wsop\s+(19|20)\d{2}\b', episode.title.lower())
+            if title_match:
+                ep_year = int(title_match.group().split()[-1])
+        if ep_year != group.year:
+            continue
+        title_lower = episode.title.lower()
+        if 'wsop' not in title_lower:
+            continue
+        if 'main event' in title_lower:
+            return episode, 1.0
+        elif title_lower.strip() == f'wsop {group.year}' or ' me' in title_lower:
+            return episode, 0.98
+        return episode, 0.95
+    return None, 0.0
+
+
+def brute_force_scores(
+    group: AssetGroup,
+    episodes: list[PokergoEpisode],
+    region_code: str,
+    event_type_code: str,
+    group_event_num: int | None,
+) -> list[tuple[PokergoEpisode, float]]:
+    """match_group_to_pokergo before blocking, returning every scored episode."""
+    if group.year and group.year <= CLASSIC_ERA_END_YEAR:
+        classic_match, classic_score = brute_force_classic(group, episodes)
+        if classic_match:
+            return [(classic_match, classic_score)]
+
+    scored = []
+    for episode in episodes:
+        if not episode.title:
+            continue
+        score = 0.0
+        title_lower = episode.title.lower()
+
+        ep_year = extract_year_from_season(episode.season_title)
+        if not ep_year:
+            ep_year = extract_year_from_title(episode.title)
+        if ep_year and group.year:
+            if ep_year == group.year:
+                score += 0.3
+            else:
+                continue
+
+        ep_is_europe = 'europe' in title_lower or 'wsope' in title_lower
+        ep_is_apac = 'asia' in title_lower or 'apac' in title_lower
+        ep_is_paradise = 'paradise' in title_lower
+        ep_is_cyprus = 'cyprus' in title_lower
+        ep_is_regional = ep_is_europe or ep_is_apac or ep_is_paradise or ep_is_cyprus
+        if region_code:
+            if region_code in ('EU', 'APAC', 'PARADISE', 'CYPRUS', 'LA', 'LONDON'):
+                if region_code == 'EU' and not ep_is_europe:
+                    continue
+                elif region_code == 'APAC' and not ep_is_apac:
+                    continue
+                elif region_code == 'PARADISE' and not ep_is_paradise:
+                    continue
+                elif region_code == 'CYPRUS' and not ep_is_cyprus:
+                    continue
+                elif region_code in ('LA', 'LONDON') and not ep_is_regional:
+                    continue
+            elif region_code == 'LV' and ep_is_regional:
+                continue
+            if region_code == 'APAC' and ep_is_apac:
+                score += 0.2
+            elif region_code == 'EU' and ep_is_europe:
+                score += 0.2
+            elif region_code == 'PARADISE' and ep_is_paradise:
+                score += 0.2
+            elif region_code == 'CYPRUS' and ep_is_cyprus:
+                score += 0.2
+            elif region_code == 'LV' and not ep_is_regional:
+                score += 0.15
+
+        is_main_event_title = 'main event' in title_lower
+        if event_type_code:
+            if event_type_code == 'GM':
+                if 'grudge match' in title_lower:
+                    score += 0.3
+                elif is_main_event_title:
+                    continue
+            elif event_type_code == 'HU':
+                if 'heads up' in title_lower or 'heads-up' in title_lower:
+                    score += 0.3
+                elif is_main_event_title:
+                    continue
+            elif event_type_code == 'HR':
+                if 'high roller' in title_lower or 'highroller' in title_lower:
+                    score += 0.2
+                elif is_main_event_title:
+                    continue
+            elif event_type_code == 'BR':
+                if 'bracelet' in title_lower:
+                    score += 0.2
+                elif is_main_event_title:
+                    continue
+            elif event_type_code == 'ME':
+                if is_main_event_title:
+                    score += 0.2
+            elif event_type_code.lower() in title_lower:
+                score += 0.2
+        elif re.search(r'wsop\s+\d{4}\s+\d{2}\s+', title_lower) and not is_main_event_title:
+            continue
+
+        if group_event_num:
+            for pattern in (rf'event\s*#?\s*{group_event_num}\b', rf'#\s*{group_event_num}\b',
+                            rf'\bevt?\s*{group_event_num}\b'):
+                if re.search(pattern, title_lower, re.I):
+                    score += 0.35
+                    break
+            else:
+                continue
+
+        ep_episode = extract_episode_from_title(episode.title)
+        if ep_episode and group.episode:
+            if ep_episode == group.episode:
+                score += 0.3
+            else:
+                continue
+        elif not group.episode and ep_episode and group.year and group.year >= 2003:
+            continue
+
+        if episode.collection_title:
+            collection_lower = episode.collection_title.lower()
+            if group.year and str(group.year) in collection_lower:
+                score += 0.1
+            if region_code and region_code.lower() in collection_lower:
+                score += 0.1
+
+        group_title = f"WSOP {group.year} {region_code} {event_type_code} Episode {group.episode}"
+        score += calculate_similarity(group_title, episode.title) * 0.2
+        scored.append((episode, score))
+    return scored
+
+
+def test_seed(seed: int, episode_count: int, group_count: int) -> bool:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        groups = build_catalog(db, episode_count, group_count, seed)
+        invalidate_code_lookup()
+        episodes = db.query(PokergoEpisode).order_by(PokergoEpisode.id).all()
+        regions = {r.id: r.code for r in db.query(Region)}
+        event_types = {e.id: e.code for e in db.query(EventType)}
+        first_file_nums = {}
+        for file in db.query(NasFile).order_by(NasFile.id):
+            first_file_nums.setdefault(file.asset_group_id, file.event_num)
+
+        index = EpisodeIndex(episodes, get_pokergo_titles(db, episodes))
+        context = load_match_context(db)
+
+        mismatched, scored_groups, pairs = [], 0, 0
+        kinds = set()
+        for group in groups:
+            region_code = regions.get(group.region_id, "")
+            event_type_code = event_types.get(group.event_type_id, "")
+            event_num = group.event_num or first_file_nums.get(group.id)
+            expected = [(e.id, s) for e, s in brute_force_scores(
+                group, episodes, region_code, event_type_code, event_num)]
+            blocked = [(e.id, s) for e, s in score_pokergo_candidates(db, group, index, context)]
+            if blocked != expected:
+                mismatched.append(group.group_id)
+            if expected:
+                scored_groups += 1
+                pairs += len(expected)
+                kinds.add((group.year is None, not region_code, not event_type_code))
+        invalidate_code_lookup()
+
+    print(f"  seed {seed}: {len(groups)} groups, {scored_groups} with candidates, "
+          f"{pairs} (episode, score) pairs")
+    checks = [
+        (f"seed {seed}: identical (episode, score) pairs for every group "
+         f"({len(mismatched)} differ: {mismatched[:5]})", not mismatched),
+        (f"seed {seed}: groups missing year, region and event type all scored",
+         {(True, False, False), (False, True, False), (False, False, True)} <= kinds),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Episode blocking test")
+    parser.add_argument("--episodes", type=int, default=1500, help="PokerGO episodes")
+    parser.add_argument("--groups", type=int, default=400, help="Asset groups")
+    parser.add_argument("--seeds", type=int, default=3, help="Catalogs to check")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Episode Blocking Test")
+    print("=" * 60)
+
+    success = True
+    for seed in range(args.seeds):
+        success = test_seed(seed, args.episodes, args.groups) and success
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
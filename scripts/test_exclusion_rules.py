@@ -0,0 +1,377 @@
+#!/usr/bin/env python
+"""Golden-output test: compiled ExclusionRuleSet vs per-row rule loop.
+
+Checks that ``ExclusionRuleSet.check`` and the columnar ``evaluate`` /
+``check_batch`` give the same excluded flag, reason and rule as evaluating
+the rules one by one (the scanner's original ``check_exclusion_rules``), on
+a generated file corpus with the seed rules plus extra keyword, eq and
+malformed rules, and that ``reapply_exclusion_rules`` leaves every stored
+file in that state, also for names only str.lower() folds onto a keyword and
+keywords with LIKE wildcards. The set-based SQL reapply must store and
+report the same as evaluating every file in Python, also for sizes and
+durations SQLite renders differently. On 200k files a reapply that changes
+nothing must take well under a second, a rule edit changing 90% of them
+under 3 s. Also prints the per-file time of each.
+
+Usage:
+    python scripts/test_exclusion_rules.py
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.nams.api.database import Base, ExclusionRule, NasFile  # noqa: E402
+from src.nams.api.services.exclusion_rules import (  # noqa: E402
+    ExclusionCheckResult,
+    ExclusionRuleSet,
+    RuleSpec,
+    reapply_exclusion_rules,
+)
+
+RULES = [
+    RuleSpec(1, "size", "lt", "1073741824"),
+    RuleSpec(2, "duration", "lt", "3600"),
+    RuleSpec(3, "keyword", "contains", "clip"),
+    RuleSpec(4, "keyword", "contains", "highlight"),
+    RuleSpec(5, "keyword", "contains", "Circuit"),
+    RuleSpec(6, "size", "gt", "200000000000"),
+    RuleSpec(7, "keyword", "contains", "hs-"),
+    RuleSpec(8, "keyword", "contains", "ſ"),  # non-ASCII keyword
+    RuleSpec(9, "size", "lt", "not a number"),  # never matches
+    RuleSpec(10, "duration", "gt", "36000"),
+    RuleSpec(11, "keyword", "eq", "Final.MP4"),
+    RuleSpec(12, "size", "eq", "1234567890"),
+]
+
+
+def reference_check(rules, filename, size_bytes, full_path, duration_sec=None):
+    """Reference: evaluate rule objects one by one."""
+    filename_lower = filename.lower()
+    full_path_lower = full_path.lower()
+    for rule in rules:
+        if rule.rule_type in ("size", "duration"):
+            try:
+                threshold = int(rule.value)
+            except ValueError:
+                continue
+            number = size_bytes if rule.rule_type == "size" else duration_sec
+            if number is None:
+                continue
+            unit = " bytes" if rule.rule_type == "size" else "s"
+            label = "Size" if rule.rule_type == "size" else "Duration"
+            shown = f"{number:,}" if rule.rule_type == "size" else f"{number}"
+            limit = f"{threshold:,}" if rule.rule_type == "size" else f"{threshold}"
+            if rule.operator == "lt" and number < threshold:
+                return ExclusionCheckResult(True, f"{label} {shown}{unit} < {limit}{unit}", rule.id)
+            if rule.operator == "gt" and number > threshold:
+                return ExclusionCheckResult(True, f"{label} {shown}{unit} > {limit}{unit}", rule.id)
+            if rule.operator == "eq" and number == threshold:
+                return ExclusionCheckResult(True, f"{label} equals {limit}{unit}", rule.id)
+        elif rule.rule_type == "keyword":
+            keyword_lower = rule.value.lower()
+            if rule.operator == "contains":
+                if keyword_lower in filename_lower or keyword_lower in full_path_lower:
+                    return ExclusionCheckResult(
+                        True, f"Contains keyword '{rule.value}'", rule.id
+                    )
+            elif rule.operator == "eq" and filename_lower == keyword_lower:
+                return ExclusionCheckResult(True, f"Filename equals '{rule.value}'", rule.id)
+    return ExclusionCheckResult(False)
+
+
+def build_corpus(count: int = 20000, seed: int = 3) -> list[tuple]:
+    """(filename, size_bytes, full_path, duration_sec) tuples."""
+    rnd = random.Random(seed)
+    words = ["WSOP", "ME", "Day1", "clip", "CLIP", "Highlight", "circuit", "hs-12",
+             "ſeries", "final", "Episode", "FT", "NB", "hand_03"]
+    folders = ["Z:/archive/WSOP", "Y:/origin/Circuit 2019", "X:/GGP Footage/POKERGO",
+               "Z:/archive/Highlights", "Y:/origin/2024"]
+    sizes = [0, 500, 1073741823, 1073741824, 1234567890, 5_000_000_000, 300_000_000_000]
+    corpus = []
+    for _ in range(count):
+        name = "_".join(rnd.sample(words, rnd.randint(1, 3))) + rnd.choice([".mp4", ".MP4", ".mov"])
+        if rnd.random() < 0.01:
+            name = "Final.mp4"
+        size = rnd.choice(sizes) if rnd.random() < 0.3 else rnd.randint(0, 10**11)
+        duration = rnd.choice([None, None, 100, 3600, 40000])
+        corpus.append((name, size, f"{rnd.choice(folders)}/{name}", duration))
+    return corpus
+
+
+def test_same_results(rule_set: ExclusionRuleSet, corpus: list[tuple]) -> bool:
+    mismatches = 0
+    batch = rule_set.check_batch(corpus)
+    for (filename, size, path, duration), batched in zip(corpus, batch):
+        expected = reference_check(RULES, filename, size, path, duration)
+        actual = rule_set.check(filename, size, path, duration)
+        if actual != expected or batched != expected:
+            mismatches += 1
+            if mismatches <= 10:
+                print(f"[FAIL] {path} size={size} duration={duration}")
+                print(f"       expected={expected} check={actual} batch={batched}")
+
+    excluded = sum(1 for result in batch if result.excluded)
+    print(f"\nChecked {len(corpus)} files against {len(rule_set)} compiled rules "
+          f"({excluded} excluded)")
+    print(f"Mismatches: {mismatches}")
+    return mismatches == 0
+
+
+def test_reapply(corpus: list[tuple]) -> bool:
+    """Stored flags match the reference after reapply; a second reapply changes nothing."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        for rule in RULES:
+            db.add(ExclusionRule(id=rule.id, rule_type=rule.rule_type, operator=rule.operator,
+                                 value=rule.value, is_active=rule.id != 4))
+        # Stale state: 2 in 5 files excluded by rule 1 or the now inactive rule 4
+        stale = {0: 1, 1: 4}
+        db.execute(insert(NasFile), [
+            {"filename": filename, "extension": "mp4", "size_bytes": size,
+             "full_path": f"{path}.{i}", "is_excluded": i % 5 in stale,
+             "exclusion_rule_id": stale.get(i % 5),
+             "exclusion_reason": "old" if i % 5 in stale else None}
+            for i, (filename, size, path, _) in enumerate(corpus)
+        ])
+        db.commit()
+
+        active = [rule for rule in RULES if rule.id != 4]
+        stats = reapply_exclusion_rules(db)
+        db.commit()
+        again = reapply_exclusion_rules(db)
+
+        mismatches = 0
+        for file in db.query(NasFile):
+            expected = reference_check(active, file.filename, file.size_bytes, file.full_path)
+            actual = ExclusionCheckResult(
+                bool(file.is_excluded), file.exclusion_reason, file.exclusion_rule_id
+            )
+            if actual != expected:
+                mismatches += 1
+                if mismatches <= 10:
+                    print(f"[FAIL] {file.full_path}: expected={expected} stored={actual}")
+
+    by_rule = {delta["rule_id"]: delta for delta in stats["rules"]}
+    checks = [
+        ("stored flags match reference", mismatches == 0),
+        ("second reapply updates nothing", again["updated"] == 0),
+        ("deactivated rule reported without label",
+         by_rule[4]["rule"] is None and by_rule[4]["removed"] == len(corpus) // 5),
+        ("added/removed balance",
+         sum(d["added"] for d in stats["rules"]) - sum(d["removed"] for d in stats["rules"])
+         == stats["newly_excluded"] - stats["un_excluded"]),
+    ]
+    print(f"\nReapplied to {stats['total_files']} files: {stats['updated']} updated "
+          f"in {stats['elapsed_ms']} ms")
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_reapply_folding() -> bool:
+    """ASCII keywords only: Kelvin sign, '_' and eq rules are applied like Python does."""
+    rules = [
+        RuleSpec(1, "keyword", "contains", "kelvin"),
+        RuleSpec(2, "keyword", "contains", "hand_03"),
+        RuleSpec(3, "keyword", "eq", "Final.MP4"),
+    ]
+    files = ["\u212aELVIN cut.mp4", "x_HAND_03.mp4", "handx03.mp4", "FINAL.mp4", "\u212a.mp4"]
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        for rule in rules:
+            db.add(ExclusionRule(id=rule.id, rule_type=rule.rule_type, operator=rule.operator,
+                                 value=rule.value, is_active=True))
+        db.execute(insert(NasFile), [
+            {"filename": name, "extension": "mp4", "size_bytes": 1, "full_path": f"Z:/{name}"}
+            for name in files
+        ])
+        db.commit()
+        reapply_exclusion_rules(db)
+        db.commit()
+        again = reapply_exclusion_rules(db)
+        stored = {
+            file.filename: ExclusionCheckResult(
+                bool(file.is_excluded), file.exclusion_reason, file.exclusion_rule_id)
+            for file in db.query(NasFile)
+        }
+
+    checks = [
+        (f"{name!r} stored as reference",
+         stored[name] == reference_check(rules, name, 1, f"Z:/{name}"))
+        for name in files
+    ]
+    checks.append(("second reapply updates nothing", again["updated"] == 0))
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+# Sizes and durations whose text SQLite renders unlike Python (REAL size,
+# exponents, round-trip digits, negative zero); sizes pass rule 1
+EDGE_FILES = [
+    ("odd_size.mp4", 500.5, None),
+    ("tiny.mp4", 5_000_000_000, 1e-05),
+    ("digits.mp4", 5_000_000_000, 0.1 + 0.2),
+    ("negzero.mp4", 5_000_000_000, -0.0),
+    ("half.mp4", 5_000_000_000, 12.5),
+    ("whole.mp4", 5_000_000_000, 100.0),
+    ("e15.mp4", 5_000_000_000, 1e15),
+    ("e16.mp4", 5_000_000_000, 2e16),
+]
+
+
+def test_reapply_sql_vs_python(corpus: list[tuple]) -> bool:
+    """The set-based reapply stores and reports what evaluating every file in Python does.
+
+    A rule without an SQL form (threshold beyond SQLite's integers, never
+    matching) sends the twin database through the Python fallback.
+    """
+    files = [
+        {"filename": filename, "extension": "mp4", "size_bytes": size,
+         "full_path": f"{path}.{i}", "duration_sec": duration}
+        for i, (filename, size, path, duration) in enumerate(corpus)
+    ] + [
+        {"filename": name, "extension": "mp4", "size_bytes": size, "full_path": f"Z:/{name}",
+         "duration_sec": duration}
+        for name, size, duration in EDGE_FILES
+    ]
+    results = []
+    for rules in (RULES, RULES + [RuleSpec(13, "size", "gt", str(2**64))]):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            for rule in rules:
+                db.add(ExclusionRule(id=rule.id, rule_type=rule.rule_type,
+                                     operator=rule.operator, value=rule.value, is_active=True))
+            db.execute(insert(NasFile), files)
+            db.commit()
+            stats = reapply_exclusion_rules(db)
+            db.commit()
+            stored = [
+                (file.full_path, ExclusionCheckResult(
+                    bool(file.is_excluded), file.exclusion_reason, file.exclusion_rule_id))
+                for file in db.query(NasFile).order_by(NasFile.id)
+            ]
+            mismatches = [
+                path for (path, result), file in zip(stored, db.query(NasFile).order_by(NasFile.id))
+                if result != reference_check(RULES, file.filename, file.size_bytes,
+                                             file.full_path, file.duration_sec)
+            ]
+        del stats['elapsed_ms']
+        stats['rules'] = [delta for delta in stats['rules'] if delta['rule_id'] != 13]
+        results.append((stats, stored, mismatches))
+
+    (sql_stats, sql_stored, sql_mismatches), (py_stats, py_stored, py_mismatches) = results
+    for path in (sql_mismatches + py_mismatches)[:10]:
+        print(f"[FAIL] {path}: stored state differs from reference")
+    checks = [
+        ("set-based reapply matches reference", not sql_mismatches),
+        ("Python fallback matches reference", not py_mismatches),
+        ("set-based and Python reapply store the same", sql_stored == py_stored),
+        ("set-based and Python reapply report the same", sql_stats == py_stats),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_reapply_timing(count: int = 200_000) -> bool:
+    """A reapply that changes nothing reads only the files SQLite cannot settle.
+
+    One that changes most files is written set-based, without the files
+    passing through Python.
+    """
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        for rule in RULES:
+            db.add(ExclusionRule(id=rule.id, rule_type=rule.rule_type, operator=rule.operator,
+                                 value=rule.value, is_active=True))
+        db.execute(insert(NasFile), [
+            {"filename": filename, "extension": "mp4", "size_bytes": size,
+             "full_path": f"{path}.{i}", "duration_sec": duration}
+            for i, (filename, size, path, duration) in enumerate(build_corpus(count, seed=5))
+        ])
+        db.commit()
+        first = reapply_exclusion_rules(db)
+        db.commit()
+        again = reapply_exclusion_rules(db)
+        # Size threshold raised past almost every file: most files move to rule 1
+        db.get(ExclusionRule, 1).value = "100000000000"
+        db.commit()
+        edited = reapply_exclusion_rules(db)
+
+    print(f"\nReapplied to {count} files: {first['updated']} updated in "
+          f"{first['elapsed_ms']} ms, unchanged reapply in {again['elapsed_ms']} ms, "
+          f"rule edit {edited['updated']} updated in {edited['elapsed_ms']} ms")
+    checks = [
+        ("unchanged reapply updates nothing", again["updated"] == 0),
+        ("unchanged reapply keeps the totals",
+         again["excluded_files"] == first["excluded_files"]
+         and again["total_files"] == count),
+        (f"unchanged reapply of {count} files under 1 s", again["elapsed_ms"] < 1000),
+        (f"rule edit changes over 90% of {count} files", edited["updated"] > count * 0.9),
+        ("rule edit reapply under 3 s", edited["elapsed_ms"] < 3000),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def benchmark(rule_set: ExclusionRuleSet, corpus: list[tuple]) -> None:
+    """Print per-file time of the rule loop, check() and the columnar batch."""
+    start = time.perf_counter()
+    for filename, size, path, duration in corpus:
+        reference_check(RULES, filename, size, path, duration)
+    loop_us = (time.perf_counter() - start) / len(corpus) * 1e6
+
+    start = time.perf_counter()
+    for filename, size, path, duration in corpus:
+        rule_set.check(filename, size, path, duration)
+    check_us = (time.perf_counter() - start) / len(corpus) * 1e6
+
+    filenames = [f[0] for f in corpus]
+    sizes = [f[1] for f in corpus]
+    paths = [f[2] for f in corpus]
+    durations = [f[3] for f in corpus]
+    start = time.perf_counter()
+    rule_set.evaluate(filenames, sizes, paths, durations)
+    batch_us = (time.perf_counter() - start) / len(corpus) * 1e6
+
+    print(f"\nRule loop: {loop_us:6.2f} us/file")
+    print(f"check():   {check_us:6.2f} us/file")
+    print(f"evaluate:  {batch_us:6.2f} us/file")
+
+
+def main():
+    print("=" * 60)
+    print("Exclusion Rule Set Golden-Output Test")
+    print("=" * 60)
+
+    rule_set = ExclusionRuleSet(RULES)
+    corpus = build_corpus()
+    success = test_same_results(rule_set, corpus)
+    success = test_reapply(corpus) and success
+    success = test_reapply_folding() and success
+    success = test_reapply_sql_vs_python(corpus) and success
+    success = test_reapply_timing() and success
+    benchmark(rule_set, corpus)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
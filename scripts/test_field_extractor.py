@@ -0,0 +1,471 @@
+#!/usr/bin/env python
+"""Golden-output test: single-pass field extractor vs per-field reference functions.
+
+Every path in the corpus is run through ``field_extractor.extract_path_fields``
+and through the original ``extract_*_from_path`` functions in ``pattern_engine``;
+all fields must be identical. The corpus is the NAS paths below (checked with
+every pattern name) plus paths generated from fragments that trigger every
+reference rule, at its boundary values (years 1969/1970/2030/2031, two-digit
+years around 50, parts up to 10, file numbers around 50). A coverage pass
+checks that each reference regex matches somewhere in the corpus, and a guard
+fails when the reference functions change without an EXTRACTOR_VERSION bump.
+Also prints the per-path extraction time of both implementations.
+
+Usage:
+    python scripts/test_field_extractor.py
+    python scripts/test_field_extractor.py --generated 50000
+"""
+
+import argparse
+import ast
+import hashlib
+import inspect
+import random
+import re
+import sys
+import textwrap
+import time
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.nams.api.database.init_db import PATTERNS_CONFIG  # noqa: E402
+from src.nams.api.services import pattern_engine  # noqa: E402
+from src.nams.api.services.field_extractor import (  # noqa: E402
+    EXTRACTOR_VERSION,
+    extract_path_fields,
+)
+from src.nams.api.services.pattern_engine import (  # noqa: E402
+    detect_event_type_from_path,
+    extract_buyin_from_path,
+    extract_episode_from_path,
+    extract_event_num_from_path,
+    extract_gtd_from_path,
+    extract_part_from_path,
+    extract_season_from_path,
+    extract_stage_from_path,
+    extract_version_from_path,
+    extract_year_from_path,
+)
+
+ROOTS = [
+    "Z:/archive/",
+    "Y:/WSOP backup/",
+    "X:/GGP Footage/POKERGO/",
+    "Z:\\archive\\",
+    "",
+]
+
+# Relative paths seen on the NAS (docs/core, docs/archive/analysis)
+RELATIVE_PATHS = [
+    "WSOP/WSOP Bracelet Event/WSOP-LAS VEGAS/2025 WSOP-LAS VEGAS/WSOP 2025 MAIN EVENT/"
+    "WSOP 2025 Main Event _ Day 1A/WSOP 2025 Main Event _ Day 1A.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-LAS VEGAS/2025 WSOP-LAS VEGAS/WSOP 2025 MAIN EVENT/"
+    "WSOP 2025 Main Event _ Final Table/WSOP 2025 Main Event _ Final Table Day 1.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-LAS VEGAS/2025 WSOP-LAS VEGAS/WSOP 2025 MAIN EVENT/"
+    "WSOP 2025 Main Event _ Day 4 (part 1,2)/WSOP 2025 Main Event _ Day 4 (Part 2).mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-LAS VEGAS/2025 WSOP-LAS VEGAS/WSOP 2025 BRACELET SIDE EVENT/"
+    "WSOP 2025 Bracelet Events  Event #13 $1.5K No-Limit Hold'em 6-Max/"
+    "(PokerGO) WSOP 2025 Bracelet Events _ Event #13 $1.5K No-Limit Hold'em 6-Max.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-LAS VEGAS/2025 WSOP-LAS VEGAS/WSOP 2025 BRACELET SIDE EVENT/"
+    "WSOP 2025 Bracelet Events  Event #26 $25K No-Limit Hold'em High Roller  Day 2/"
+    "WSOP 2025 Bracelet Events _ Event #26 $25K No-Limit Hold'em High Roller _ Day 2_789647313.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-LAS VEGAS/2021 WSOP - LAS Vegas/"
+    "2021 WSOP Event #11 - $25,000 Heads Up No Limit Hold'em Championship Final Table.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-LAS VEGAS/2021 WSOP - LAS Vegas/"
+    "2021 WSOP Event #13 -$3,000 Freezeout No Limit Hold'em Final Table.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-LAS VEGAS/2022 WSOP/"
+    "2022 WSOP Event #70 -$10,000 No-Limit Hold'em Main Event Day 3.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-LAS VEGAS/2024 WSOP/"
+    "54-wsop-2024-me-day6-Foxen-gets-2-better-hands-to-fold-clean.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-LAS VEGAS/2024 WSOP/"
+    "1-wsop-2024-be-ev-01-5k-champions-reunion-ft-Conniff-hero-calls.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-EUROPE/2008 WSOP-Europe/WSOPE08_Episode_1_H264.mov",
+    "WSOP/WSOP Bracelet Event/WSOP-EUROPE/2011 WSOP-Europe/WSOPE11_Episode_01.mov",
+    "WSOP/WSOP Bracelet Event/WSOP-EUROPE/2013 WSOP-Europe/WSE13-ME01_EuroSprt_NB_TEXT.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-EUROPE/2021 WSOP-Europe/wsope-2021-10k-me-ft-004.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-EUROPE/2025 WSOP-Europe/2025 WSOP-EUROPE #14 MAIN EVENT/"
+    "NO COMMENTARY WITH GRAPHICS VER/Day 1 A/file.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-APAC/2013 WSOP-APAC/WSOP13_APAC_ME01_NB.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-APAC/2014 WSOP-APAC/WSOP14_APAC_HIGH_ROLLER-SHOW 1.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-APAC/2014 WSOP-APAC/WSOP14_APAC_MAIN_EVENT-SHOW 2.mp4",
+    "WSOP/WSOP Bracelet Event/WSOP-PARADISE/2024 WSOP-PARADISE SUPER MAIN EVENT/"
+    "2024 WSOP Paradise Super Main Event - Day 1B.mp4",
+    "WSOP/WSOP Circuit Event/WSOP Super Circuit/2023 WSOP International Super Circuit - London/"
+    "2023 WSOP International Super Circuit - London Main Event Day 3.mp4",
+    "WSOP/WSOP Circuit Event/WSOP Super Circuit/2025 Cyprus/"
+    "$5M GTD   WSOP Super Circuit Cyprus Main Event - Day 1A-006.mp4",
+    "WSOP/WSOP Circuit Event/WSOP-Circuit/2024 WSOP Circuit LA/WCLA24-01.mp4",
+    "WSOP/WSOP Circuit Event/WSOP-Circuit/2024 WSOP Circuit LA/WCLA24-17.mp4",
+    "WSOP/WSOP Circuit Event/WSOP-Circuit/2023 WSOP Circuit LA/WCLA23-PE-01.mkv",
+    "WSOP/WSOP Circuit Event/WSOP-Circuit/2023 WSOP Circuit LA/WP23-EP-02.mp4",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 1973/WSOP - 1973.avi",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 1973/wsop-1973-me-nobug.mp4",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 1983/WSOP_1983.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 1995/1995 World Series of Poker.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 1995/1995 World Series of Poker Main Event Show 1.mp4",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 1995/1995 WSOP VHS DUB.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2002/2002 World Series of Poker Part 1.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2002/WSOP_2002_2.mxf",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2002/WSOP - 2002 - 1.mxf",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2003/Main Event/WSOP_2003-01.mxf",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2003/2003 WSOP Best of ALL INS.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2003/WSOP_2003_Best_Of_Amazing_All-Ins.mxf",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2004/2004 WSOP Show 13 ME 01.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2004/2004 WSOP Show 1 2k NLTH_ESM000100722.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2004/2004 WSOP Tournament of Champs.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2005/Bracelet/WSOP_2005_01.mxf",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2005/WSOP 2005 Show 10_xxx.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2005/WSOP 2005 Lake Tahoe CC.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2006/WSOP 2006 Show 10_ES0600163242_GMPO 736.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2007/ESPN 2007 WSOP SEASON 5 SHOW 1.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2009/2009 WSOP ME01.mov",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2011/WS11_ME25_NB.mp4",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2011/WS11_GM02_NB.mp4",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2011/WS11_HU01_NB.mp4",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2011/WSOP_2011_31_ME25.mxf",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2012/WS12_Show_17_FINAL_NB.mp4",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2014/WSOP14_BR01_NB.mp4",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2016/"
+    "2016 World Series of Poker - Main Event Show 01 - GMPO 2074.mxf",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2017/WSOP 2017 Main Event _ Episode 10.mp4",
+    "WSOP backup/PRE-2003/1973/WSOP - 1973 (1).avi",
+    "WSOP backup/PRE-2003/1987/1987 World Series of Poker.mov",
+    "PAD/PAD S12/pad-s12-ep01-002.mp4",
+    "PAD/PAD S13/PAD_S13_EP01_GGPoker-001.mp4",
+    "GOG 최종/e01/E01_GOG_final_edit_231106.mp4",
+    "GOG/e01/E01_GOG_final_edit_231106.mp4",
+    "MPP/2025 MPP Cyprus/$1M GTD   $1K PokerOK Mystery Bounty/"
+    "$1M GTD   $1K PokerOK Mystery Bounty - Final Day.mp4",
+    "MPP/2025 MPP Cyprus/$5M GTD   $5K MPP Main Event/"
+    "$5M GTD   $5K MPP Main Event - Day 3 Session 2.mp4",
+    "GGMillions/250507_Super High Roller Poker FINAL TABLE with Joey ingram.mp4",
+    "GGMillions/Super High Roller Poker FINAL TABLE with Benjamin Rolle (1).mp4",
+    "WSOP/Grudge Match/2012 Grudge Match Episode 2.mp4",
+    "WSOP/Heads Up/WSOP_HU_2010_Final.mov",
+    "WSOP/misc/HyperDeck_0010-001.mp4",
+    "WSOP/misc/A9o vs Kqo ho.mp4",
+    "WSOP/misc/ME25.mxf",
+    "WSOP/misc/WSOP11_ME01_AUDIO.mp4",
+    "clips/Bounty) live from King's #wsop #poker.mp4",
+    "clips/WSOP 2024 Main Event _ Episode 1_clean.mp4",
+    "clips/WS12_Show_10_ME06_NB.mp4",
+    "WSOP/WSOP ARCHIVE (PRE-2016)/WSOP 2010/WSOP_2010-12.mxf",
+    "WSOP/2019/Session 4/Event 7 High Roller_01.mov",
+]
+
+PATTERN_NAMES = [None, "UNKNOWN"] + [cfg[0] for cfg in PATTERNS_CONFIG]
+
+
+def build_corpus() -> list[str]:
+    """Combine roots with relative paths plus case/separator variants."""
+    corpus = []
+    for root in ROOTS:
+        for rel in RELATIVE_PATHS:
+            path = root + (rel.replace('/', '\\') if root.endswith('\\') else rel)
+            corpus.append(path)
+            corpus.append(path.upper())
+            corpus.append(path.lower())
+    # Non-ASCII variants exercise the reference fallback
+    corpus.append("Z:/archive/WSOP/ſession 3/WSOP 2019 Main Event Day 2.mp4")
+    corpus.append("Z:/archive/WSOP/WSOP 2019/Kelvin \u212a Event #5.mp4")
+    return corpus
+
+
+# Fragments that trigger each reference rule; {placeholders} are filled from VALUES
+FRAGMENTS = [
+    # Year
+    "WSOP_{y4}", "WSOP-{y4}", "WSOP - {y4}", "wsop-{y4}-", "wsope-{y4}-", "WSOP {y4}",
+    "WSOPE {y4}", "WSOPE{y4}", "{y4} WSOP", "{y4}WSOP", "{y4} MPP", "{y4}MPP", "PRE-{y4}",
+    "pre-{y4}", "WSOPE{y2}_", "WSOP{y2}-", "WS{y2}_", "ws{y2}-", "_{y2}_", "-{y2}-", "{y4}",
+    "{y4} ", "Season {y4}",
+    # Stage
+    "Final Table", "FinalTable", "Final Table Day {n}", "final table day{n}", "Final Day",
+    "Day {n}{abcd}", "Day{n} {abcd}", "DAY {n}", "Session {n}", "Session{n}",
+    # Event number, buy-in, GTD
+    "Event #{n}", "Event{n}", "Event # {n}", "#{n} ", "#{n}", "${n}K", "${n},000", "${n}.5K",
+    "${n}M", "${n}", "${n}M GTD", "${n}K GTD", "${n}GTD", "${n}.5K GTD",
+    # Version
+    "NO COMMENTARY", "NoCommentary", "_NB_", "_NB.", "_nb", "CLEAN", "Clean",
+    # Part
+    "Part {n}", "Part_{n}", "part-{n}", "PART{n}",
+    # Episode
+    "WS{y2}_ME{n2}", "WS{y2}-GM{n2}", "WS{y2}_HU{n2}", "WS{y2}_BR{n2}", "WSOP{y2}_BR{n2}",
+    "WSOP{y2}-ME{n2}", "WSOP{y2}_APAC_HR{n2}", "WSOP{y2}_EU_ME{n2}", "{y4} WSOP ME{n}",
+    "WSOP {y4} Show {n}", "ESPN {y4} WSOP SEASON 5 SHOW {n}", "{y4} WSOP Show {n}",
+    "WCLA{y2}-PE-{n}", "WP{y2}-EP-{n}", "WCLA{y2}-ET-{n}", "pad-s{y2}-ep{n2}",
+    "PAD_S{y2}_EP{n2}", "E{n2}_GOG", "e{n2}-gog", "Show {n}", "Show{n}", "WCLA{y2}-{n}",
+    "Episode {n}", "Episode_{n}", "Episode{n}", "_ME{n2}_", "-ME{n2}.", "-me{n2}-",
+    "WSOPE{y2}_Episode_{n}", "wsope-{y4}-10k-me-ft-{n3}", "wsope-{y4}-{n}-hr-ft-{n}",
+    "WS{y2}_Show_{n}",
+    # Event type
+    "Main Event", "MainEvent", "MAIN_EVENT", "-me-", "_ME{d}", "-ME{d}", "me{d}",
+    "World Series of Poker", "{y4} World Series of Poker", "World  Series of Poker",
+    "High Roller", "HighRoller", "_HR{d}", "-hr{d}", "Heads Up", "HeadsUp", "-HU{d}",
+    "Grudge Match", "_GM{d}", "-ft-", "Bracelet", "_BR{d}", "Best Of", "BestOf", "best-of",
+    "WSOP_{y4}.", "WSOP {y4} ({n}).", "WSOP-{y4}-{n}.", "WSOP_{y4}_{n}.", "{y4}-{n}",
+    # Region (super circuit) and filler
+    "London", "Cyprus", "APAC", "PARADISE", "Europe", "Las Vegas", "GOG", "PAD", "MPP",
+    "GGMillions", "Hold'em", "(1)", "HyperDeck_0010", "ES0600163242", "x",
+]
+VALUES = {
+    "y4": ["1969", "1970", "1973", "1995", "1999", "2002", "2003", "2005", "2010", "2016",
+           "2025", "2030", "2031", "0042", "9999"],
+    "y2": ["00", "08", "11", "13", "49", "50", "73", "99"],
+    "n": ["0", "1", "2", "01", "09", "10", "11", "17", "49", "50", "99", "123", "004", "2024"],
+    "n2": ["00", "01", "07", "25", "49", "50", "99"],
+    "n3": ["001", "004", "123"],
+    "d": ["0", "1", "9"],
+    "abcd": ["", "A", "B", "c", "D", "E"],
+}
+JOINERS = [" ", " ", "_", "-", "", " - ", " _ ", "  ", "."]
+EXTENSIONS = ["mp4", "mov", "mxf", "mkv", "avi", "MP4", "MXF"]
+
+
+def generate_corpus(count: int, seed: int = 0) -> list[str]:
+    """Random paths built from FRAGMENTS, with random case, roots and separators."""
+    rng = random.Random(seed)
+
+    def component() -> str:
+        parts = [rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 3))]
+        text = ''.join(part + rng.choice(JOINERS) for part in parts).strip()
+        return re.sub(r'\{(\w+)\}', lambda m: rng.choice(VALUES[m.group(1)]), text)
+
+    corpus = []
+    for _ in range(count):
+        folders = [component() for _ in range(rng.randint(0, 4))]
+        name = component()
+        ending = rng.random()
+        if ending < 0.3:
+            name += rng.choice(["_", "-"]) + rng.choice(VALUES["n"])
+        if ending < 0.9:
+            name += "." + rng.choice(EXTENSIONS)
+        separator = rng.choice(["/", "\\"])
+        path = rng.choice(ROOTS) + separator.join(folders + [name])
+        case = rng.random()
+        if case < 0.2:
+            path = path.upper()
+        elif case < 0.4:
+            path = path.lower()
+        corpus.append(path)
+    return corpus
+
+
+# Reference functions whose rules extract_path_fields must reproduce, plus the
+# extract_metadata code around them. Their source digest per EXTRACTOR_VERSION:
+# changing them changes extracted values, so EXTRACTOR_VERSION must be bumped
+# (and the new digest recorded here) for incremental extraction to redo files.
+# Functions whose rules extract_path_fields replaces
+FIELD_FUNCTIONS = [
+    "extract_year_from_path", "extract_stage_from_path", "extract_event_num_from_path",
+    "extract_buyin_from_path", "extract_gtd_from_path", "extract_version_from_path",
+    "extract_episode_from_day_part", "extract_part_from_path", "extract_episode_from_path",
+    "extract_season_from_path", "detect_event_type_from_path",
+]
+REFERENCE_FUNCTIONS = FIELD_FUNCTIONS + [
+    "extract_region_from_super_circuit", "extract_metadata", "extract_basic",
+    "get_region_id", "get_event_type_id",
+]
+# Rules no path can reach: an earlier rule of the same function always wins
+UNREACHABLE_RULES = {
+    r"(\d{4})\s+World\s+Series\s+of\s+Poker",  # "World Series of Poker" already returned ME
+}
+REFERENCE_DIGESTS = {
+    1: "b565a3f4d396648d",
+}
+
+
+def reference_digest() -> str:
+    """Digest of the reference functions' code (comments, formatting and docstrings ignored)."""
+    digest = hashlib.sha256()
+    for name in REFERENCE_FUNCTIONS:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(getattr(pattern_engine, name))))
+        function = tree.body[0]
+        body = function.body
+        if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant):
+            function.body = body[1:]
+        digest.update(ast.unparse(tree).encode())
+    return digest.hexdigest()[:16]
+
+
+def reference_rules() -> set[str]:
+    """Regexes the reference field functions search with (literals in their source)."""
+    rules = set()
+    for name in FIELD_FUNCTIONS:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(getattr(pattern_engine, name))))
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                    and isinstance(node.func.value, ast.Name) and node.func.value.id == 're'
+                    and node.args and isinstance(node.args[0], ast.Constant)):
+                rules.add(node.args[0].value)
+            elif (isinstance(node, ast.Assign) and isinstance(node.value, ast.List)
+                    and node.targets[0].id.endswith('patterns')):
+                rules.update(element.value for element in node.value.elts)
+    return rules
+
+
+class _RecordingRe:
+    """Stands in for ``re`` in pattern_engine, recording which patterns matched."""
+
+    def __init__(self):
+        self.matched = set()
+
+    def __getattr__(self, name):
+        return getattr(re, name)
+
+    def search(self, pattern, string, flags=0):
+        m = re.search(pattern, string, flags)
+        if m:
+            self.matched.add(pattern)
+        return m
+
+    def match(self, pattern, string, flags=0):
+        m = re.match(pattern, string, flags)
+        if m:
+            self.matched.add(pattern)
+        return m
+
+    def sub(self, pattern, repl, string, count=0, flags=0):
+        if re.search(pattern, string, flags):
+            self.matched.add(pattern)
+        return re.sub(pattern, repl, string, count, flags)
+
+
+def test_rule_coverage(corpus: list[str]) -> bool:
+    """Every reference rule matches at least one path of the corpus."""
+    recorder = _RecordingRe()
+    pattern_engine.re = recorder
+    try:
+        for path in corpus:
+            for pattern_name in PATTERN_NAMES:
+                reference_fields(path, pattern_name)
+    finally:
+        pattern_engine.re = re
+    rules = reference_rules()
+    missing = sorted(rules - recorder.matched - UNREACHABLE_RULES)
+    for rule in missing:
+        print(f"  never matched: {rule}")
+    ok = len(rules) > 70 and not missing
+    print(f"[{'PASS' if ok else 'FAIL'}] all {len(rules)} reference rules match in the corpus")
+    return ok
+
+
+def test_reference_guard() -> bool:
+    """Reference functions unchanged since their EXTRACTOR_VERSION was recorded."""
+    digest = reference_digest()
+    ok = REFERENCE_DIGESTS.get(EXTRACTOR_VERSION) == digest
+    if not ok:
+        print(f"  reference digest {digest}, recorded for version {EXTRACTOR_VERSION}: "
+              f"{REFERENCE_DIGESTS.get(EXTRACTOR_VERSION)}")
+        print("  Reference extraction changed: bump EXTRACTOR_VERSION in field_extractor.py")
+        print("  and record the new digest in REFERENCE_DIGESTS")
+    print(f"[{'PASS' if ok else 'FAIL'}] reference functions match EXTRACTOR_VERSION "
+          f"{EXTRACTOR_VERSION}")
+    return ok
+
+
+def reference_fields(path: str, pattern_name: str | None) -> dict:
+    """Fields as produced by the original per-field functions."""
+    year = extract_year_from_path(path)
+    return {
+        'year': year,
+        'stage': extract_stage_from_path(path),
+        'event_num': extract_event_num_from_path(path),
+        'buyin': extract_buyin_from_path(path),
+        'gtd': extract_gtd_from_path(path),
+        'version': extract_version_from_path(path),
+        'part': extract_part_from_path(path, year),
+        'event_type_code': detect_event_type_from_path(path),
+        'episode': extract_episode_from_path(path, pattern_name),
+        'season': extract_season_from_path(path),
+    }
+
+
+def test_golden_output(generated: list[str]) -> bool:
+    """Compare every field: NAS paths with every pattern name, generated paths with a few."""
+    print("=" * 60)
+    print("Field Extractor Golden-Output Test")
+    print("=" * 60)
+
+    corpus = build_corpus()
+    rng = random.Random(1)
+    cases = [(path, PATTERN_NAMES) for path in corpus]
+    cases += [(path, [None] + rng.sample(PATTERN_NAMES[2:], 3)) for path in generated]
+    checked = 0
+    mismatches = []
+
+    for path, pattern_names in cases:
+        for pattern_name in pattern_names:
+            expected = reference_fields(path, pattern_name)
+            fields = extract_path_fields(path, pattern_name, episode=True, season=True)
+            actual = {key: getattr(fields, key) for key in expected}
+            checked += 1
+            if actual != expected:
+                mismatches.append((path, pattern_name, expected, actual))
+
+        # Part extraction without year (pattern with extract_year=False)
+        fields = extract_path_fields(path, year=False)
+        if fields.year is not None or fields.part != extract_part_from_path(path, None):
+            mismatches.append((path, 'year=False', None, fields))
+
+    for path, pattern_name, expected, actual in mismatches[:20]:
+        print(f"  MISMATCH [{pattern_name}] {path}")
+        print(f"    expected: {expected}")
+        print(f"    actual:   {actual}")
+
+    print(f"\nChecked {checked} (path, pattern) pairs over {len(cases)} paths "
+          f"({len(generated)} generated)")
+    print(f"Mismatches: {len(mismatches)}")
+    ok = not mismatches
+    print(f"[{'PASS' if ok else 'FAIL'}] single-pass extractor matches the reference functions")
+    return ok
+
+
+def benchmark(rounds: int = 5) -> None:
+    """Print per-path extraction time for both implementations.
+
+    Rounds alternate between the two and the best round of each is reported,
+    so a load change during the run does not skew the ratio.
+    """
+    corpus = build_corpus()
+    reference_s = engine_s = float('inf')
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for path in corpus:
+            reference_fields(path, "WSOP_BR_LV")
+        reference_s = min(reference_s, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for path in corpus:
+            extract_path_fields(path, "WSOP_BR_LV", episode=True, season=True)
+        engine_s = min(engine_s, time.perf_counter() - start)
+
+    reference_us = reference_s / len(corpus) * 1e6
+    engine_us = engine_s / len(corpus) * 1e6
+    print(f"\nReference functions: {reference_us:8.1f} us/path")
+    print(f"Field extractor:     {engine_us:8.1f} us/path")
+    print(f"Speedup:             {reference_us / engine_us:8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Field extractor golden-output test")
+    parser.add_argument("--generated", type=int, default=20000,
+                        help="Generated paths added to the NAS path corpus")
+    args = parser.parse_args()
+
+    generated = generate_corpus(args.generated)
+    success = test_golden_output(generated)
+    success = test_rule_coverage(build_corpus() + generated[:2000]) and success
+    success = test_reference_guard() and success
+    benchmark()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
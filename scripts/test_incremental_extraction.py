@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+"""Incremental extraction test: reprocess_incremental vs a full reprocess.
+
+Seeds an in-memory database with the seed regions, event types and pattern
+set (PATTERNS_CONFIG) plus files built from the field-extractor path corpus,
+runs a full reprocess, then applies pattern edits one at a time (regex edits,
+reprioritisation, deactivation, new patterns, changed and reverted event type).
+After each edit ``reprocess_incremental`` must leave every file exactly as a
+full reprocess would. Also times one-pattern edits on a 200k-file catalog.
+
+Usage:
+    python scripts/test_incremental_extraction.py
+    python scripts/test_incremental_extraction.py --files 50000
+"""
+
+import argparse
+import sys
+import time
+from itertools import product
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from test_field_extractor import build_corpus  # noqa: E402
+
+from src.nams.api.database import (  # noqa: E402
+    Base,
+    EventType,
+    NasFile,
+    Pattern,
+    Region,
+    invalidate_code_lookup,
+)
+from src.nams.api.database.init_db import (  # noqa: E402
+    PATTERNS_CONFIG,
+    _create_pattern_if_not_exists,
+)
+from src.nams.api.services.pattern_engine import (  # noqa: E402
+    EXTRACTION_COLUMNS,
+    CompiledPatternSet,
+    reprocess_all_files,
+    reprocess_incremental,
+)
+
+REGIONS = ["LV", "APAC", "EU", "PARADISE", "LA", "CYPRUS", "LONDON"]
+EVENT_TYPES = ["ME", "GM", "HU", "BR", "HR", "FT", "BEST", "BEST-ALLINS", "BEST-BLUFFS",
+               "BEST-MM", "UNK"]
+
+
+def build_files(count: int) -> list[dict]:
+    """NasFile rows cycling through the corpus, each under its own shelf folder."""
+    corpus = build_corpus()
+    # Letters only, so shelf names add no years, episodes or stage keywords
+    shelves = (''.join(letters) for letters in product('kqxz', repeat=9))
+    files = []
+    for i, shelf in zip(range(count), shelves):
+        path = corpus[i % len(corpus)]
+        directory, _, filename = path.rpartition('/')
+        directory = f"{directory}/{shelf}" if directory else shelf
+        files.append({
+            "filename": filename,
+            "extension": filename.rpartition('.')[2][:10],
+            "size_bytes": 1,
+            "directory": directory,
+            "full_path": f"{directory}/{filename}",
+            "is_manual_override": i % 97 == 0,
+        })
+    return files
+
+
+def seed(db: Session, count: int) -> None:
+    for i, code in enumerate(REGIONS, 1):
+        db.add(Region(id=i, code=code, name=code))
+    for i, code in enumerate(EVENT_TYPES, 1):
+        db.add(EventType(id=i, code=code, name=code))
+    for config in PATTERNS_CONFIG:
+        _create_pattern_if_not_exists(db, config)
+    db.execute(insert(NasFile), build_files(count))
+    db.commit()
+    invalidate_code_lookup()  # codes come from this database
+
+
+def unversioned(db: Session) -> int:
+    """Files without an extraction version (left with an earlier run's pattern)."""
+    return db.query(NasFile).filter(
+        NasFile.extraction_version.is_(None), NasFile.is_manual_override.is_not(True)
+    ).count()
+
+
+def snapshot(db: Session) -> list[tuple]:
+    """Extracted columns of every file, in id order."""
+    columns = [getattr(NasFile, column) for column, _ in EXTRACTION_COLUMNS]
+    return db.execute(
+        select(NasFile.id, NasFile.extraction_confidence, *columns).order_by(NasFile.id)
+    ).all()
+
+
+def pattern(db: Session, name: str) -> Pattern:
+    return db.query(Pattern).filter(Pattern.name == name).one()
+
+
+def edit_regex(db: Session) -> None:
+    """Same matches on the corpus: no file needs re-extracting."""
+    row = pattern(db, "WSOP_BR_LV")
+    row.regex = row.regex.replace("LAS.?VEGAS", r"LAS[\s_-]?VEGAS")
+
+
+def reprioritise(db: Session) -> None:
+    pattern(db, "WSOP_BR_LV").priority = 40
+
+
+def narrow_regex(db: Session) -> None:
+    pattern(db, "WSOP_BR_LV").regex = r"WSOP.*Bracelet.*LAS-VEGAS"
+
+
+def deactivate(db: Session) -> None:
+    pattern(db, "WSOP_BR_EU").is_active = False
+
+
+def add_pattern(db: Session) -> None:
+    db.add(Pattern(name="MAIN_EVENT_SHOW", priority=0, regex=r"Main\s*Event\s*Show",
+                   extract_year=True, extract_region="LV", extract_type="ME",
+                   extract_episode=True))
+
+
+def narrow_gog(db: Session) -> None:
+    """GOG files lose their pattern and have nothing else to extract."""
+    pattern(db, "GOG").regex = r"GOG.*E\d{2}[_\-]GOG[_\-]FINAL[_\-]CUT"
+
+
+def add_fallback(db: Session) -> None:
+    """A low-priority pattern for the files that GOG no longer wins."""
+    db.add(Pattern(name="GOG_FALLBACK", priority=50, regex=r"_GOG_", extract_year=False,
+                   extract_episode=True))
+
+
+def change_event_type(db: Session) -> None:
+    pattern(db, "WSOP_YEAR_ME").extract_type = "BR"
+
+
+def revert_event_type(db: Session) -> None:
+    """Back to an earlier pattern set, whose version some files still carry."""
+    pattern(db, "WSOP_YEAR_ME").extract_type = "ME"
+
+
+# (edit, whether it changes any file's metadata, whether any file is re-extracted),
+# applied in order
+EDITS = [
+    (edit_regex, False, False),
+    (reprioritise, True, True),
+    (narrow_regex, True, True),
+    (deactivate, True, True),
+    (add_pattern, True, True),
+    (narrow_gog, False, True),
+    (add_fallback, True, True),
+    (change_event_type, True, True),
+    (revert_event_type, True, True),
+]
+
+
+def test_matches_full_reprocess(count: int = 6000) -> bool:
+    """After each pattern edit the incremental result equals a full reprocess.
+
+    One database only ever runs incremental extraction (so files stay on
+    older versions across edits), its twin a full reprocess.
+    """
+    sessions = []
+    for _ in range(2):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        db = Session(engine)
+        seed(db, count)
+        reprocess_all_files(db, CompiledPatternSet.load(db))
+        sessions.append(db)
+    db, full = sessions
+
+    checks = []
+    for edit, changes_files, re_extracts in EDITS:
+        before = snapshot(db)
+        for session in sessions:
+            edit(session)
+            session.commit()
+        stats = reprocess_incremental(db, CompiledPatternSet.load(db))
+        again = reprocess_incremental(db, CompiledPatternSet.load(db))
+        reprocess_all_files(full, CompiledPatternSet.load(full))
+        incremental = snapshot(db)
+        name = edit.__name__
+        print(f"  {name}: re-extracted {stats['processed']}, "
+              f"skipped {stats['skipped']}, updated {stats['updated']}")
+        checks += [
+            (f"{name}: same files as a full reprocess", incremental == snapshot(full)),
+            (f"{name}: files changed" if changes_files else f"{name}: no file changed",
+             (incremental != before) == changes_files),
+            (f"{name}: most files not re-extracted" if re_extracts
+             else f"{name}: nothing re-extracted",
+             stats['processed'] < len(before) // 2 if re_extracts else stats['processed'] == 0),
+            (f"{name}: second run re-extracts only unversioned files",
+             again['processed'] == unversioned(db) and again['skipped'] == again['updated'] == 0),
+        ]
+    for session in sessions:
+        session.close()
+    invalidate_code_lookup()
+
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_timing(count: int) -> bool:
+    """One-pattern edits on a large catalog: only the files they touch cost time."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    timings = {}
+    with Session(engine) as db:
+        seed(db, count)
+        start = time.perf_counter()
+        reprocess_all_files(db, CompiledPatternSet.load(db))
+        full = time.perf_counter() - start
+
+        for edit in (edit_regex, narrow_regex):
+            edit(db)
+            db.commit()
+            start = time.perf_counter()
+            stats = reprocess_incremental(db, CompiledPatternSet.load(db))
+            timings[edit.__name__] = time.perf_counter() - start
+            print(f"  {edit.__name__}: {timings[edit.__name__]:.2f} s "
+                  f"({stats['processed']} re-extracted, {stats['skipped']} skipped)")
+    invalidate_code_lookup()
+
+    print(f"  {count} files: full reprocess {full:.2f} s")
+    checks = [
+        (f"regex edit keeping its matches on {count} files under 1 s",
+         timings['edit_regex'] < 1.0),
+        ("narrowing edit 5x faster than a full reprocess", timings['narrow_regex'] * 5 < full),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental extraction test")
+    parser.add_argument("--files", type=int, default=200_000,
+                        help="Catalog size for the timing check")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Incremental Extraction Test")
+    print("=" * 60)
+
+    success = test_matches_full_reprocess()
+    success = test_timing(args.files) and success
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
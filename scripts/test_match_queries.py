@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""Match query-count test: PokerGO matching issues no per-group queries.
+
+Counts the SQL statements ``run_pokergo_matching`` sends for 10 and for 40
+groups (with regions, event types and bracelet groups whose event number
+comes from their first file) and fails if the count grows with the number
+of groups. With a preloaded MatchContext and EpisodeIndex,
+``match_group_to_pokergo`` must run no query at all, and must still read
+the first file's event number.
+
+Usage:
+    python scripts/test_match_queries.py
+"""
+
+import sys
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.nams.api.database import (  # noqa: E402
+    AssetGroup,
+    Base,
+    CodeLookup,
+    EventType,
+    NasFile,
+    PokergoEpisode,
+    Region,
+    invalidate_code_lookup,
+)
+from src.nams.api.services.matching import (  # noqa: E402
+    EpisodeIndex,
+    load_match_context,
+    match_group_to_pokergo,
+    run_pokergo_matching,
+)
+
+
+class QueryCounter:
+    """Counts statements executed on an engine while active."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
+
+
+def make_db(groups: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([Region(id=1, code="LV", name="Las Vegas"),
+                    Region(id=2, code="EU", name="Europe")])
+        db.add_all([EventType(id=1, code="ME", name="Main Event"),
+                    EventType(id=2, code="BR", name="Bracelet")])
+        for year in (2011, 2012):
+            db.add(PokergoEpisode(id=f"me{year}", title=f"WSOP {year} Main Event",
+                                  season_title=f"WSOP {year}"))
+            for num in range(1, 6):
+                db.add(PokergoEpisode(id=f"br{year}_{num}",
+                                      title=f"WSOP {year} Bracelet Event {num} NLH",
+                                      season_title=f"WSOP {year}"))
+        for i in range(1, groups + 1):
+            bracelet = i % 2 == 0
+            db.add(AssetGroup(id=i, group_id=f"G{i:03d}", year=2011 + i % 2,
+                              region_id=1 + (i % 5 == 0), event_type_id=2 if bracelet else 1,
+                              episode=None if bracelet else i))
+            # Bracelet groups carry their event number on the first file only
+            db.add(NasFile(id=2 * i, filename=f"g{i}_a.mp4", extension=".mp4", size_bytes=1,
+                           asset_group_id=i, event_num=i % 5 + 1 if bracelet else None))
+            db.add(NasFile(id=2 * i + 1, filename=f"g{i}_b.mp4", extension=".mp4",
+                           size_bytes=1, asset_group_id=i))
+        db.commit()
+    return engine
+
+
+def matching_queries(groups: int) -> int:
+    engine = make_db(groups)
+    invalidate_code_lookup()  # each run loads its own codes
+    counter = QueryCounter(engine)
+    with Session(engine) as db:
+        run_pokergo_matching(db)
+    return counter.count
+
+
+def test_run_queries() -> bool:
+    small, large = matching_queries(10), matching_queries(40)
+    print(f"  run_pokergo_matching: {small} queries for 10 groups, {large} for 40")
+    ok = small == large
+    print(f"[{'PASS' if ok else 'FAIL'}] query count independent of group count")
+    return ok
+
+
+def test_group_queries() -> bool:
+    engine = make_db(4)
+    with Session(engine) as db:
+        index = EpisodeIndex(db.query(PokergoEpisode).all())
+        context = load_match_context(db, lookup=CodeLookup.load(db))
+        groups = db.query(AssetGroup).order_by(AssetGroup.id).all()
+        counter = QueryCounter(engine)
+        matches = [match_group_to_pokergo(db, group, index, context)[0] for group in groups]
+        queries = counter.count
+        unloaded = match_group_to_pokergo(db, groups[1], index)[0]
+
+    checks = [
+        ("no queries with a preloaded context", queries == 0),
+        ("first file's event number used",
+         matches[1] is not None and matches[1].id == "br2011_3"
+         and matches[3] is not None and matches[3].id == "br2011_5"),
+        ("same match without a context", unloaded is matches[1]),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    print("=" * 60)
+    print("Match Query Count Test")
+    print("=" * 60)
+
+    success = test_run_queries()
+    success = test_group_queries() and success
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+"""Media probe test: header readers and the fingerprint-cached probe stage.
+
+Builds small MP4 / MOV / MXF files whose headers carry a known duration,
+resolution and codec (moov after mdat, 64-bit atom sizes, v1 mvhd, an MXF
+run-in, MXF duration from the descriptor and from the material package
+tracks), checks ``probe_file`` reads them back, then runs
+``run_media_probe`` on an in-memory database: unchanged files are not
+probed again, changed ones are, unreadable ones are retried, and a duration
+exclusion rule fires on the probed durations.
+
+Usage:
+    python scripts/test_media_probe.py
+"""
+
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.nams.api.database import Base, ExclusionRule, NasFile  # noqa: E402
+from src.nams.api.services.grouping import is_truncated_copy  # noqa: E402
+from src.nams.api.services.media_probe import (  # noqa: E402
+    MediaInfo,
+    probe_file,
+    run_media_probe,
+)
+
+AVC_UL = bytes.fromhex('060e2b340401010a0401020201311001')
+MPEG2_UL = bytes.fromhex('060e2b34040101030401020201040300')
+
+
+# ============ MP4 / MOV ============
+
+def atom(kind: bytes, *children: bytes) -> bytes:
+    payload = b''.join(children)
+    return struct.pack('>I4s', 8 + len(payload), kind) + payload
+
+
+def full_atom(kind: bytes, version: int, payload: bytes) -> bytes:
+    return atom(kind, bytes([version, 0, 0, 0]), payload)
+
+
+def duration_header(kind: bytes, timescale: int, duration: int, version: int = 0) -> bytes:
+    if version == 1:
+        return full_atom(kind, 1, struct.pack('>QQIQ', 0, 0, timescale, duration) + bytes(80))
+    return full_atom(kind, 0, struct.pack('>IIII', 0, 0, timescale, duration) + bytes(80))
+
+
+def trak(handler: bytes, fourcc: bytes, width: int, height: int) -> bytes:
+    tkhd = full_atom(b'tkhd', 0, bytes(72) + struct.pack('>II', width << 16, height << 16))
+    hdlr = full_atom(b'hdlr', 0, bytes(4) + handler + bytes(13))
+    entry_body = bytes(24) + struct.pack('>HH', width, height) + bytes(50)
+    entry = struct.pack('>I4s', 8 + len(entry_body), fourcc) + entry_body
+    stsd = full_atom(b'stsd', 0, struct.pack('>I', 1) + entry)
+    minf = atom(b'minf', atom(b'stbl', stsd))
+    return atom(b'trak', tkhd, atom(b'mdia', duration_header(b'mdhd', 1000, 1), hdlr, minf))
+
+
+def mp4_file(seconds: float, width: int, height: int, fourcc: bytes, brand: bytes = b'isom',
+             mvhd_version: int = 0, large_mdat: bool = False) -> bytes:
+    ftyp = atom(b'ftyp', brand, bytes(4), brand)
+    if large_mdat:
+        payload = bytes(64)
+        mdat = struct.pack('>I4sQ', 1, b'mdat', 16 + len(payload)) + payload
+    else:
+        mdat = atom(b'mdat', bytes(64))
+    moov = atom(
+        b'moov',
+        duration_header(b'mvhd', 90000, int(seconds * 90000), mvhd_version),
+        trak(b'soun', b'mp4a', 0, 0),
+        trak(b'vide', fourcc, width, height),
+    )
+    return ftyp + mdat + moov  # moov last, as written by recorders
+
+
+# ============ MXF ============
+
+def klv(key: bytes, value: bytes) -> bytes:
+    return key + b'\x83' + len(value).to_bytes(3, 'big') + value
+
+
+def local_set(kind: int, **tags: bytes) -> bytes:
+    key = bytes.fromhex('060e2b34025301010d0101010101') + bytes([kind, 0])
+    items = b''.join(
+        struct.pack('>HH', int(tag[1:], 16), len(value)) + value for tag, value in tags.items()
+    )
+    return klv(key, items)
+
+
+def uid(n: int) -> bytes:
+    return bytes([n]) * 16
+
+
+def mxf_file(frames: int, rate: tuple[int, int], width: int, height: int, coding: bytes,
+             descriptor_duration: bool = True, run_in: bytes = b'') -> bytes:
+    rational = struct.pack('>ii', *rate)
+    descriptor = dict(t3C0A=uid(4), t3001=rational, t3203=struct.pack('>I', width),
+                      t3202=struct.pack('>I', height), t3201=coding)
+    if descriptor_duration:
+        descriptor['t3002'] = struct.pack('>q', frames)
+    metadata = b''.join([
+        klv(bytes.fromhex('060e2b34020501010d01020101050100'), struct.pack('>II', 0, 18)),
+        local_set(0x0F, t3C0A=uid(3), t0202=struct.pack('>q', frames)),
+        local_set(0x3B, t3C0A=uid(2), t4B01=rational, t4803=uid(3)),
+        local_set(0x36, t3C0A=uid(1), t4403=struct.pack('>II', 1, 16) + uid(2)),
+        local_set(0x28, **descriptor),
+    ])
+    pack = struct.pack('>HHIQQQQQIQI', 1, 3, 1, 0, 0, 0, len(metadata), 0, 0, 0, 1)
+    pack += bytes(16) + struct.pack('>II', 0, 16)
+    partition = klv(bytes.fromhex('060e2b34020501010d01020101020400'), pack)
+    return run_in + partition + metadata + bytes(256)
+
+
+CASES = [
+    ("wsop_me.mp4", mp4_file(3 * 3600 + 0.5, 1920, 1080, b'avc1'),
+     MediaInfo(3 * 3600 + 0.5, 1920, 1080, 'h264')),
+    ("clip_v1_large.mp4", mp4_file(600, 1280, 720, b'hvc1', mvhd_version=1, large_mdat=True),
+     MediaInfo(600, 1280, 720, 'hevc')),
+    ("master.mov", mp4_file(7200, 3840, 2160, b'apch', brand=b'qt  '),
+     MediaInfo(7200, 3840, 2160, 'prores')),
+    ("xdcam.mxf", mxf_file(90000, (25, 1), 1920, 1080, MPEG2_UL),
+     MediaInfo(3600, 1920, 1080, 'mpeg2')),
+    ("avc_runin.mxf", mxf_file(30000, (30000, 1001), 1920, 1080, AVC_UL,
+                               descriptor_duration=False, run_in=b'RUNIN' * 10),
+     MediaInfo(1001, 1920, 1080, 'h264')),
+    ("not_a_movie.mp4", b'\x00' * 200, MediaInfo()),
+]
+
+
+def same(actual: MediaInfo | None, expected: MediaInfo) -> bool:
+    actual = actual or MediaInfo()
+    duration_ok = (
+        actual.duration_sec == expected.duration_sec
+        if expected.duration_sec is None or actual.duration_sec is None
+        else abs(actual.duration_sec - expected.duration_sec) < 0.01
+    )
+    return duration_ok and (actual.width, actual.height, actual.codec) == (
+        expected.width, expected.height, expected.codec
+    )
+
+
+def test_readers(tmp: Path) -> bool:
+    ok = True
+    for name, data, expected in CASES:
+        path = tmp / name
+        path.write_bytes(data)
+        actual = probe_file(str(path))
+        passed = same(actual, expected)
+        ok = ok and passed
+        print(f"[{'PASS' if passed else 'FAIL'}] {name}: {actual}")
+    return ok
+
+
+def test_probe_stage(tmp: Path) -> bool:
+    """Probed once per fingerprint; duration rules use the probed durations."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(ExclusionRule(id=1, rule_type="duration", operator="lt", value="3600",
+                             is_active=True))
+        for i, (name, data, _) in enumerate(CASES):
+            db.add(NasFile(id=i + 1, filename=name, extension=Path(name).suffix,
+                           size_bytes=len(data), full_path=str(tmp / name),
+                           fingerprint=f"1.0:{len(data)}"))
+        db.add(NasFile(id=99, filename="gone.mp4", extension=".mp4", size_bytes=1,
+                       full_path=str(tmp / "gone.mp4"), fingerprint="1.0:1"))
+        db.commit()
+
+        first = run_media_probe(db, workers=4, chunk_size=2)
+        second = run_media_probe(db, workers=4)
+        db.query(NasFile).filter(NasFile.id == 1).update({"fingerprint": "2.0:1"})
+        db.commit()
+        third = run_media_probe(db, workers=4)
+
+        clip = db.get(NasFile, 2)
+        master = db.get(NasFile, 3)
+        checks = [
+            ("all readable files probed", first["probed"] == len(CASES)),
+            ("unreadable file reported", len(first["errors"]) == 1),
+            ("second run probes nothing new", second["probed"] == 0
+             and second["cached"] == len(CASES)),
+            ("unreadable file retried", second["candidates"] == 1),
+            ("changed fingerprint re-probed", third["probed"] == 1),
+            ("stored on NasFile", (master.video_width, master.video_height,
+                                   master.video_codec) == (3840, 2160, "prores")),
+            ("duration rule fires", clip.is_excluded and clip.exclusion_rule_id == 1),
+            ("long file not excluded", not master.is_excluded),
+        ]
+
+        longer = NasFile(duration_sec=master.duration_sec)
+        short_primary = NasFile(duration_sec=600, is_manual_override=False)
+        checks.append(("truncated primary detected",
+                       is_truncated_copy(short_primary, longer)
+                       and not is_truncated_copy(master, longer)))
+
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    print("=" * 60)
+    print("Media Probe Test")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        success = test_readers(Path(tmp))
+        success = test_probe_stage(Path(tmp)) and success
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""Parallel reprocess test: reprocess_all_files_parallel vs reprocess_all_files.
+
+Seeds two in-memory databases with the seed regions, event types, pattern set
+and a catalog built from the field-extractor path corpus, runs the serial
+reprocess on one and the parallel one on the other, and compares the
+processed/matched/updated stats and every extracted column. Also checks that
+a spawned worker process (the default start method on Windows) gets the
+patterns without importing the API app, whose startup initializes the live
+database.
+
+Usage:
+    python scripts/test_parallel_reprocess.py
+    python scripts/test_parallel_reprocess.py --files 20000 --workers 4
+"""
+
+import argparse
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import create_engine, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from test_incremental_extraction import seed, snapshot  # noqa: E402
+
+from src.nams.api.database import (  # noqa: E402
+    Base,
+    NasFile,
+    get_code_lookup,
+    invalidate_code_lookup,
+)
+from src.nams.api.services.pattern_engine import (  # noqa: E402
+    CompiledPatternSet,
+    _extract_chunk,
+    _init_reprocess_worker,
+    extract_metadata,
+    reprocess_all_files,
+    reprocess_all_files_parallel,
+)
+
+
+def app_modules() -> list[str]:
+    """Worker task: app modules this process has imported."""
+    return [name for name in ('src.nams.api.main', 'src.nams.api.routers') if name in sys.modules]
+
+
+def test_serial_vs_parallel(count: int, workers: int) -> bool:
+    """Same stats and same rows from the serial and the parallel reprocess."""
+    results = []
+    for parallel in (False, True):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            seed(db, count)
+            pattern_set = CompiledPatternSet.load(db)
+            if parallel:
+                stats = reprocess_all_files_parallel(db, workers, pattern_set, chunk_size=500)
+            else:
+                stats = reprocess_all_files(db, pattern_set)
+            results.append((stats, snapshot(db)))
+        invalidate_code_lookup()
+
+    (serial, serial_rows), (parallel, parallel_rows) = results
+    print(f"  serial:   {serial}")
+    print(f"  parallel: {parallel}")
+    checks = [
+        ("processed/matched/updated stats match", serial == parallel),
+        ("files were matched and updated", serial['matched'] > 0 and serial['updated'] > 0),
+        ("extracted columns match for every file", serial_rows == parallel_rows),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_spawned_worker() -> bool:
+    """A spawned worker extracts like this process without importing the app."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        seed(db, 500)
+        pattern_set = CompiledPatternSet.load(db)
+        lookup = get_code_lookup(db)
+        tasks = [tuple(row) for row in db.execute(
+            select(NasFile.id, NasFile.full_path, NasFile.filename).order_by(NasFile.id)
+        )]
+    expected = [
+        (file_id, extract_metadata(None, path, filename, pattern_set, lookup))
+        for file_id, path, filename in tasks
+    ]
+    invalidate_code_lookup()
+
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_reprocess_worker,
+        initargs=(pattern_set, lookup),
+    ) as pool:
+        extracted = pool.submit(_extract_chunk, tasks).result()
+        imported = pool.submit(app_modules).result()
+
+    checks = [
+        ("spawned worker extracts the same results", extracted == expected),
+        (f"spawned worker did not import the app ({imported or 'none'})", not imported),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel reprocess test")
+    parser.add_argument("--files", type=int, default=6000, help="Catalog size")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Parallel Reprocess Test")
+    print("=" * 60)
+
+    success = test_serial_vs_parallel(args.files, args.workers)
+    success = test_spawned_worker() and success
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
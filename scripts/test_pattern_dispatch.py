@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""Golden-output test: literal-dispatch CompiledPatternSet.match vs linear scan.
+
+Builds the seed pattern set (PATTERNS_CONFIG) without a database and checks
+that ``match()`` returns the same first pattern as trying every regex in
+priority order, for the field-extractor path corpus. Also prints the per-path
+time of both.
+
+Usage:
+    python scripts/test_pattern_dispatch.py
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from test_field_extractor import build_corpus  # noqa: E402
+
+from src.nams.api.database.init_db import PATTERNS_CONFIG  # noqa: E402
+from src.nams.api.services.pattern_engine import CompiledPattern, CompiledPatternSet  # noqa: E402
+
+# Paths that exercise literal edge cases (prefix-sharing, missing literals)
+EXTRA_PATHS = [
+    "Z:/archive/WSOPE-2011-10K-ME-FT-05.mp4",
+    "Z:/archive/wsope-2011-10k-me-ft-05.mp4",
+    "Z:/archive/WS11_ME01_NB.mp4",
+    "Z:/archive/PAD/PAD_S12_EP03.mp4",
+    "Z:/archive/WCLA23-PE-12.mp4",
+    "Z:/archive/MPP/2024 MPP Main Event Day 1.mp4",
+    "Z:/archive/random/clip_001.mov",
+    "Z:/archive/ſeries/WORLD ſERIES OF POKER 1999.mp4",
+]
+
+
+def build_pattern_set() -> CompiledPatternSet:
+    """Seed patterns compiled the same way CompiledPatternSet.load() does."""
+    patterns = []
+    for pattern_id, config in enumerate(PATTERNS_CONFIG, start=1):
+        name, priority, regex, extract_year, region, event_type, extract_episode, _ = config
+        patterns.append(CompiledPattern(
+            id=pattern_id,
+            name=name,
+            priority=priority,
+            regex=re.compile(regex, re.IGNORECASE),
+            extract_year=extract_year,
+            extract_region=region,
+            extract_type=event_type,
+            extract_episode=extract_episode,
+        ))
+    return CompiledPatternSet(patterns)
+
+
+def linear_match(pattern_set: CompiledPatternSet, path: str) -> CompiledPattern | None:
+    """Reference: try every regex in priority order."""
+    for pattern in pattern_set:
+        if pattern.regex.search(path):
+            return pattern
+    return None
+
+
+def test_same_winner(pattern_set: CompiledPatternSet, corpus: list[str]) -> bool:
+    mismatches = 0
+    for path in corpus:
+        expected = linear_match(pattern_set, path)
+        actual = pattern_set.match(path)
+        if actual is not expected:
+            mismatches += 1
+            print(f"[FAIL] {path}")
+            print(f"       expected={expected and expected.name} actual={actual and actual.name}")
+
+    print(f"\nChecked {len(corpus)} paths against {len(pattern_set)} patterns")
+    print(f"Mismatches: {mismatches}")
+    return mismatches == 0
+
+
+def benchmark(pattern_set: CompiledPatternSet, corpus: list[str], rounds: int = 5) -> None:
+    """Print per-path match time for both."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in corpus:
+            linear_match(pattern_set, path)
+    linear_us = (time.perf_counter() - start) / (rounds * len(corpus)) * 1e6
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for path in corpus:
+            pattern_set.match(path)
+    dispatch_us = (time.perf_counter() - start) / (rounds * len(corpus)) * 1e6
+
+    print(f"\nLinear scan:      {linear_us:8.1f} us/path")
+    print(f"Literal dispatch: {dispatch_us:8.1f} us/path")
+
+
+def main():
+    print("=" * 60)
+    print("Pattern Dispatch Golden-Output Test")
+    print("=" * 60)
+
+    pattern_set = build_pattern_set()
+    corpus = build_corpus() + EXTRA_PATHS
+    success = test_same_winner(pattern_set, corpus)
+    benchmark(pattern_set, corpus)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
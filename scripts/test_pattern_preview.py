@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+"""Pattern preview test: POST /api/patterns/preview vs re-matching every file.
+
+Seeds an in-memory database with the seed regions, event types, pattern set
+and a catalog built from the field-extractor path corpus, runs a full
+reprocess, then previews new patterns and edits through the endpoint. The
+captured/kept/released counts and per-pattern transitions must equal those
+from matching every file against the proposed pattern set.
+Also checks the 404 for an unknown pattern_id and the sample_size bounds,
+and that pattern changes made outside the API (init_db seeding, the
+migration script's delete-and-insert, ORM edits) reach get_pattern_set.
+
+Usage:
+    python scripts/test_pattern_preview.py
+    python scripts/test_pattern_preview.py --files 20000
+"""
+
+import argparse
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from test_incremental_extraction import seed  # noqa: E402
+
+from src.nams.api.database import (  # noqa: E402
+    Base,
+    NasFile,
+    Pattern,
+    get_db,
+    invalidate_code_lookup,
+)
+from src.nams.api.database.init_db import (  # noqa: E402
+    PATTERNS_CONFIG,
+    _create_pattern_if_not_exists,
+)
+from src.nams.api.routers import patterns  # noqa: E402
+from src.nams.api.services.pattern_engine import (  # noqa: E402
+    CompiledPattern,
+    CompiledPatternSet,
+    get_pattern_set,
+    invalidate_pattern_set,
+    reprocess_all_files,
+)
+from src.nams.api.services.pattern_preview import NEW_PATTERN_ID, UNMATCHED  # noqa: E402
+
+# (label, request body); pattern_id is filled in from "edit" (a pattern name)
+PREVIEWS = [
+    ("new pattern ahead of all", {"regex": r"WSOP.*Main\s*Event", "priority": 0}),
+    ("new pattern in the middle", {"regex": r"Bracelet.*Event", "priority": 20}),
+    ("literal-free pattern last", {"regex": r"\d{4}", "priority": 999}),
+    ("regex edit keeping its matches", {"edit": "WSOP_BR_LV",
+                                        "regex": r"WSOP.*Bracelet.*LAS[\s_-]?VEGAS"}),
+    ("regex edit releasing files", {"edit": "WSOP_BR_LV", "regex": r"WSOP.*Bracelet.*2019"}),
+    ("edit moved behind other patterns", {"edit": "WSOP_BR_LV", "priority": 60}),
+    ("edit moved ahead of all", {"edit": "GOG", "priority": 0}),
+]
+
+
+def expected_counts(db: Session, body: dict) -> dict:
+    """Counts from matching every file against the proposed set.
+
+    Files come from their stored matched_pattern_id, like in the preview
+    (manual overrides were never extracted, so theirs can be stale).
+    """
+    current = get_pattern_set(db)
+    candidate_id = body.get("pattern_id") or NEW_PATTERN_ID
+    candidate = CompiledPattern(
+        id=candidate_id, name=body["name"], priority=body["priority"],
+        regex=re.compile(body["regex"], re.IGNORECASE), extract_year=True,
+        extract_region=None, extract_type=None, extract_episode=True,
+    )
+    proposed = CompiledPatternSet([p for p in current if p.id != candidate_id] + [candidate])
+    names = {row.id: row.name for row in db.query(Pattern.id, Pattern.name)}
+    names[candidate_id] = body["name"]
+
+    counts = {"captured": 0, "kept": 0, "released": 0}
+    captured_from, released_to = Counter(), Counter()
+    for path, old_id in db.query(NasFile.full_path, NasFile.matched_pattern_id):
+        new = proposed.match(path)
+        new_id = new and new.id
+        if new_id == candidate_id:
+            if old_id == candidate_id:
+                counts["kept"] += 1
+            else:
+                counts["captured"] += 1
+                captured_from[names.get(old_id, UNMATCHED)] += 1
+        elif old_id == candidate_id:
+            counts["released"] += 1
+            released_to[names.get(new_id, UNMATCHED)] += 1
+    return {**counts, "captured_from": dict(captured_from), "released_to": dict(released_to)}
+
+
+def test_counts(client: TestClient, db: Session) -> bool:
+    """Each preview reports the same counts as re-matching every file."""
+    checks = []
+    totals = Counter()
+    for label, spec in PREVIEWS:
+        body = {key: value for key, value in spec.items() if key != "edit"}
+        if "edit" in spec:
+            pattern = db.query(Pattern).filter(Pattern.name == spec["edit"]).one()
+            body = {"pattern_id": pattern.id, "name": pattern.name,
+                    "regex": pattern.regex, "priority": pattern.priority, **body}
+        else:
+            body["name"] = "PREVIEW"
+        body["sample_size"] = 5
+
+        response = client.post("/api/patterns/preview", json=body)
+        if response.status_code != 200:
+            checks.append((f"{label}: status {response.status_code}", False))
+            continue
+        result = response.json()
+        expected = expected_counts(db, body)
+        got = {key: result[key] for key in expected}
+        totals.update({key: got[key] for key in ("captured", "kept", "released")})
+        print(f"  {label}: captured {got['captured']}, kept {got['kept']}, "
+              f"released {got['released']} ({result['elapsed_ms']} ms)")
+        checks += [
+            (f"{label}: counts match re-matching every file", got == expected),
+            (f"{label}: at most sample_size samples", len(result["samples"]) <= 5),
+        ]
+    checks.append(("previews captured, kept and released files",
+                   all(totals[key] for key in ("captured", "kept", "released"))))
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_errors(client: TestClient) -> bool:
+    """Unknown pattern_id, invalid regex and out-of-range sample_size are rejected."""
+    body = {"regex": "WSOP", "priority": 1}
+    checks = [
+        ("unknown pattern_id: 404",
+         client.post("/api/patterns/preview", json={**body, "pattern_id": 99999}).status_code
+         == 404),
+        ("invalid regex: 400",
+         client.post("/api/patterns/preview", json={**body, "regex": "WSOP("}).status_code
+         == 400),
+        ("sample_size over the limit: 422",
+         client.post("/api/patterns/preview", json={**body, "sample_size": 10**6}).status_code
+         == 422),
+        ("negative sample_size: 422",
+         client.post("/api/patterns/preview", json={**body, "sample_size": -1}).status_code
+         == 422),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_pattern_set_cache() -> bool:
+    """Pattern changes that do not call invalidate_pattern_set still reach get_pattern_set."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    invalidate_pattern_set()
+
+    def state(pattern_set):
+        return [(p.id, p.name, p.regex.pattern) for p in pattern_set]
+
+    checks = []
+    with Session(engine) as db:
+        for config in PATTERNS_CONFIG[:5]:
+            _create_pattern_if_not_exists(db, config)
+        db.commit()
+        first = get_pattern_set(db)
+        checks.append(("unchanged patterns: cached set reused", get_pattern_set(db) is first))
+
+        # init_db.seed_patterns: add the missing seed patterns
+        for config in PATTERNS_CONFIG:
+            _create_pattern_if_not_exists(db, config)
+        db.commit()
+        checks.append(("seeded patterns picked up",
+                       state(get_pattern_set(db)) == state(CompiledPatternSet.load(db))
+                       and len(get_pattern_set(db)) > len(first)))
+
+        # migrate_and_reprocess.replace_patterns: delete all, insert as many new ones
+        count = db.query(Pattern).count()
+        db.query(Pattern).delete()
+        db.commit()
+        for config in PATTERNS_CONFIG[:count]:
+            _create_pattern_if_not_exists(db, (f"NEW_{config[0]}", *config[1:]))
+        db.commit()
+        replaced = get_pattern_set(db)
+        checks.append(("replaced patterns picked up",
+                       state(replaced) == state(CompiledPatternSet.load(db))
+                       and all(p.name.startswith("NEW_") for p in replaced)))
+
+        edited = db.query(Pattern).order_by(Pattern.priority).first()
+        edited.regex = r"EDITED\d+"
+        db.commit()
+        checks.append(("edited regex picked up",
+                       get_pattern_set(db).patterns[0].regex.pattern == r"EDITED\d+"))
+
+        edited.is_active = False
+        db.commit()
+        checks.append(("deactivated pattern dropped",
+                       edited.id not in {p.id for p in get_pattern_set(db)}))
+    invalidate_pattern_set()
+
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pattern preview test")
+    parser.add_argument("--files", type=int, default=6000, help="Catalog size")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Pattern Preview Test")
+    print("=" * 60)
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    db = Session(engine)
+    seed(db, args.files)
+    reprocess_all_files(db, CompiledPatternSet.load(db))
+    invalidate_pattern_set()
+
+    app = FastAPI()
+    app.include_router(patterns.router, prefix="/api/patterns")
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+
+    success = test_counts(client, db)
+    success = test_errors(client) and success
+    success = test_pattern_set_cache() and success
+
+    db.close()
+    invalidate_code_lookup()
+    invalidate_pattern_set()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
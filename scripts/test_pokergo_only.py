@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""PokerGO-only test: the is_matched flag follows every pokergo_episode_id change.
+
+Changes group matches on an in-memory database the ways the code base does:
+ORM assignment, reassignment, unmatching, a bulk ``query.update`` reset,
+group deletion, two groups on one episode, and episodes imported after a
+group already points at them. After each step ``is_matched`` must equal
+"some group points at this episode", ``get_pokergo_only_episodes`` and the
+export's ``get_unmatched_pokergo_data`` must list exactly the others, and a
+rolled-back change must leave the flag untouched.
+
+Usage:
+    python scripts/test_pokergo_only.py
+"""
+
+import sys
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.nams.api.database import AssetGroup, Base, PokergoEpisode  # noqa: E402
+from src.nams.api.services.export import get_unmatched_pokergo_data  # noqa: E402
+from src.nams.api.services.matching import (  # noqa: E402
+    get_matching_summary,
+    get_pokergo_only_episodes,
+)
+
+
+def consistent(db: Session) -> bool:
+    """Flag, dashboard list and export list all agree with asset_groups."""
+    db.expire_all()
+    held = {g.pokergo_episode_id for g in db.query(AssetGroup)} - {None}
+    flags = {ep.id: ep.is_matched for ep in db.query(PokergoEpisode)}
+    expected = set(flags) - held
+    return (
+        flags == {episode_id: episode_id in held for episode_id in flags}
+        and {ep['id'] for ep in get_pokergo_only_episodes(db)} == expected
+        and {ep['pokergo_id'] for ep in get_unmatched_pokergo_data(db)} == expected
+        and get_matching_summary(db)['POKERGO_ONLY'] == len(expected)
+    )
+
+
+def test_flag() -> bool:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    checks = []
+    with Session(engine) as db:
+        db.add_all([PokergoEpisode(id=f"ep{i}", title=f"WSOP 2011 Main Event Episode {i}",
+                                   collection_title="WSOP 2011") for i in range(1, 6)])
+        db.add_all([AssetGroup(id=i, group_id=f"2011_ME_{i:02d}", year=2011)
+                    for i in range(1, 5)])
+        db.add(AssetGroup(id=9, group_id="2011_ME_09", year=2011, pokergo_episode_id="ep9"))
+        db.commit()
+        checks.append(("fresh episodes are PokerGO only", consistent(db)))
+
+        for i in range(1, 4):
+            db.get(AssetGroup, i).pokergo_episode_id = f"ep{i}"
+        db.commit()
+        checks.append(("ORM assignment marks matched", consistent(db)))
+
+        db.get(AssetGroup, 1).pokergo_episode_id = "ep4"
+        db.get(AssetGroup, 2).pokergo_episode_id = None
+        db.commit()
+        checks.append(("reassign and unmatch release episodes", consistent(db)))
+
+        db.get(AssetGroup, 4).pokergo_episode_id = "ep3"  # second group on ep3
+        db.commit()
+        db.get(AssetGroup, 3).pokergo_episode_id = None
+        db.commit()
+        ep3 = db.get(PokergoEpisode, "ep3").is_matched
+        checks.append(("episode held by another group stays matched", ep3 and consistent(db)))
+
+        db.delete(db.get(AssetGroup, 4))
+        db.commit()
+        checks.append(("group delete releases its episode", consistent(db)))
+
+        db.add(PokergoEpisode(id="ep9", title="WSOP 2011 Main Event Episode 9"))
+        db.commit()
+        checks.append(("episode imported after its group is matched",
+                       db.get(PokergoEpisode, "ep9").is_matched and consistent(db)))
+
+        db.get(AssetGroup, 2).pokergo_episode_id = "ep5"
+        db.flush()
+        db.rollback()
+        checks.append(("rolled-back match leaves the flag",
+                       not db.get(PokergoEpisode, "ep5").is_matched and consistent(db)))
+
+        db.query(AssetGroup).update({AssetGroup.pokergo_episode_id: None})
+        db.commit()
+        checks.append(("bulk reset releases everything", consistent(db)
+                       and len(get_pokergo_only_episodes(db)) == 6))
+
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    print("=" * 60)
+    print("PokerGO Only Test")
+    print("=" * 60)
+
+    success = test_flag()
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""PokerGO title cache test: pokergo_titles rows vs the title helpers.
+
+Builds the seeded synthetic episode catalog of the episode blocking test
+plus a few hand-picked titles (no title, lowercase "ep.", "Event#", part
+numbers, years outside 19xx/20xx) and checks that every row
+``get_pokergo_titles`` returns holds what normalize_title and the year,
+episode and Event # extractors give for its episode. Then edits titles and
+seasons and checks that exactly those rows are rebuilt, that a
+TITLE_CACHE_VERSION bump rebuilds every row and that a full refresh drops
+rows of deleted episodes.
+
+Usage:
+    python scripts/test_pokergo_titles.py
+    python scripts/test_pokergo_titles.py --episodes 5000 --seed 7
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from test_episode_blocking import build_catalog  # noqa: E402
+
+from src.nams.api.database import (  # noqa: E402
+    Base,
+    PokergoEpisode,
+    PokergoTitle,
+    invalidate_code_lookup,
+)
+from src.nams.api.services import matching  # noqa: E402
+from src.nams.api.services.category_matching import extract_event_num_from_text  # noqa: E402
+from src.nams.api.services.matching import (  # noqa: E402
+    extract_episode_from_title,
+    extract_year_from_season,
+    extract_year_from_title,
+    get_pokergo_titles,
+    normalize_title,
+    refresh_pokergo_titles,
+)
+
+# (id, title, season_title, collection_title)
+EXTRA_EPISODES = [
+    ("x-none", None, None, None),
+    ("x-ep", "wsop 2011 main event ep.7 final", "2011 WSOP", None),
+    ("x-event", "WSOP 2019 Event#42 Bracelet, Part 3", None, "WSOP 2019"),
+    ("x-years", "WSOP 1899 / 2105 / 2023 Main Event", "Season 3023", "1970s Classics"),
+    ("x-unicode", "WSOP 2023 Main Event – Épisode 5 (Día 2)", "WSOP Europe 2023", None),
+]
+
+CACHED_FIELDS = ["normalized_title", "title_tokens", "title_year", "season_year",
+                 "collection_year", "episode", "event_num"]
+
+
+def expected_row(episode: PokergoEpisode) -> dict:
+    """Cached fields of an episode, computed with the title helpers."""
+    title = episode.title or ""
+    normalized = normalize_title(title)
+    return {
+        "normalized_title": normalized,
+        "title_tokens": " ".join(sorted(set(normalized.split()))),
+        "title_year": extract_year_from_title(title),
+        "season_year": extract_year_from_season(episode.season_title),
+        "collection_year": extract_year_from_season(episode.collection_title),
+        "episode": extract_episode_from_title(title),
+        "event_num": extract_event_num_from_text(title),
+    }
+
+
+def differing(episodes: list[PokergoEpisode], titles: dict) -> list[str]:
+    """Ids of episodes whose cached row is missing or differs from the helpers."""
+    return [
+        episode.id for episode in episodes
+        if episode.id not in titles
+        or {field: getattr(titles[episode.id], field) for field in CACHED_FIELDS}
+        != expected_row(episode)
+    ]
+
+
+def test_rows(db: Session) -> bool:
+    """Every cached row holds what the title helpers give for its episode."""
+    episodes = db.query(PokergoEpisode).order_by(PokergoEpisode.id).all()
+    titles = get_pokergo_titles(db, episodes)
+    db.commit()
+    wrong = differing(episodes, titles)
+    print(f"  {len(episodes)} episodes, {len(titles)} cached rows")
+    checks = [
+        (f"every row matches the title helpers ({len(wrong)} differ: {wrong[:5]})", not wrong),
+        ("one row per episode", len(titles) == len(episodes)),
+        ("rows with year, episode and Event # cached",
+         all(any(getattr(row, field) is not None for row in titles.values())
+             for field in ("title_year", "season_year", "collection_year", "episode",
+                           "event_num"))),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_refresh(db: Session) -> bool:
+    """Changed titles and seasons refresh their rows only; a version bump refreshes all."""
+    episodes = db.query(PokergoEpisode).order_by(PokergoEpisode.id).all()
+    before = get_pokergo_titles(db, episodes)
+    edited = {
+        "x-ep": ("title", "WSOP 2012 Main Event Episode 9"),
+        "x-none": ("title", "WSOP 2003 Event #12 Final Table"),
+        "x-event": ("season_title", "WSOP 2018"),
+        episodes[0].id: ("collection_title", "WSOP 1985"),
+    }
+    for episode in episodes:
+        if episode.id in edited:
+            field, value = edited[episode.id]
+            setattr(episode, field, value)
+    db.commit()
+
+    titles = get_pokergo_titles(db, episodes)
+    db.commit()
+    changed = sorted(episode_id for episode_id, row in titles.items() if row != before[episode_id])
+    again = refresh_pokergo_titles(db, episodes)
+
+    matching.TITLE_CACHE_VERSION += 1
+    try:
+        bumped = refresh_pokergo_titles(db)
+        db.commit()
+    finally:
+        matching.TITLE_CACHE_VERSION -= 1
+    refresh_pokergo_titles(db)  # back to the current version
+
+    removed = episodes[1]
+    db.query(PokergoEpisode).filter(PokergoEpisode.id == removed.id).delete()
+    pruned = refresh_pokergo_titles(db)
+    db.commit()
+    remaining = db.query(PokergoEpisode).order_by(PokergoEpisode.id).all()
+
+    checks = [
+        (f"edited episodes refreshed ({changed})", changed == sorted(edited)),
+        ("refreshed rows match the title helpers",
+         not differing([e for e in episodes if e.id in edited], titles)),
+        ("second refresh rebuilds nothing",
+         again["added"] == again["updated"] == 0 and again["unchanged"] == len(episodes)),
+        ("version bump rebuilds every row", bumped["updated"] == len(episodes)),
+        ("full refresh drops the deleted episode's row",
+         pruned["removed"] == 1 and db.get(PokergoTitle, removed.id) is None),
+        ("rows still match after the rebuilds",
+         not differing(remaining, get_pokergo_titles(db, remaining))),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PokerGO title cache test")
+    parser.add_argument("--episodes", type=int, default=1500, help="PokerGO episodes")
+    parser.add_argument("--seed", type=int, default=0, help="Catalog seed")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("PokerGO Title Cache Test")
+    print("=" * 60)
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        build_catalog(db, args.episodes, 0, args.seed)
+        for episode_id, title, season_title, collection_title in EXTRA_EPISODES:
+            db.add(PokergoEpisode(id=episode_id, title=title, season_title=season_title,
+                                  collection_title=collection_title))
+        db.commit()
+        success = test_rows(db)
+        success = test_refresh(db) and success
+    invalidate_code_lookup()
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
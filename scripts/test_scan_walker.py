@@ -0,0 +1,348 @@
+#!/usr/bin/env python
+"""Golden-output test: parallel DirectoryWalker vs recursive single-threaded walk.
+
+Builds temporary directory trees and checks that ``scan_directory`` (and a
+multi-root ``DirectoryWalker.walk``) return exactly the records, in the same
+order, as the original recursive ``os.scandir`` walk, and that the streaming
+``iter_files`` yields the same records. A rescan with a DirectoryCache
+must list only directories whose mtime changed and still reach new files
+deep in the tree. An incremental ``run_scan`` after touching, resizing and
+deleting one file each (and adding one) must count them as changed,
+deleted and new, leave the rest unchanged and clear the extraction
+version of the changed rows only. Then prints scan time versus directory
+count for both.
+
+Local disks answer a listing in microseconds, while an SMB share needs a
+network round trip; ``--latency-ms`` adds that delay to every listing so the
+benchmark shows the latency-bound case.
+
+Usage:
+    python scripts/test_scan_walker.py
+    python scripts/test_scan_walker.py --latency-ms 5 --sizes 100,500,2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from operator import itemgetter
+from pathlib import Path
+from types import SimpleNamespace
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine, update  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from src.nams.api.database import Base, NasFile  # noqa: E402
+from src.nams.api.services import scanner  # noqa: E402
+from src.nams.api.services.scanner import (  # noqa: E402
+    VIDEO_EXTENSIONS,
+    DirectoryCache,
+    DirectoryWalker,
+    FileState,
+    FolderType,
+    ScanConfig,
+    ScanMode,
+    classify_file,
+    parse_filename,
+    run_scan,
+    scan_directory,
+)
+
+
+def reference_scan(root_path: Path, base_path: str = "") -> list[dict]:
+    """Reference: the original recursive single-threaded walk."""
+    files = []
+
+    if not root_path.exists():
+        return files
+
+    try:
+        for entry in os.scandir(root_path):
+            if entry.name.startswith('.') or entry.name in ('Thumbs.db', 'desktop.ini'):
+                continue
+
+            relative_path = os.path.join(base_path, entry.name) if base_path else entry.name
+
+            if entry.is_dir():
+                files.extend(reference_scan(Path(entry.path), relative_path))
+            elif entry.is_file():
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext in VIDEO_EXTENSIONS:
+                    filepath = Path(entry.path)
+                    file_info = parse_filename(filepath)
+                    file_info["relative_path"] = relative_path
+                    file_info["full_path"] = str(filepath)
+                    file_info["directory"] = base_path
+                    files.append(file_info)
+    except PermissionError:
+        pass
+
+    return files
+
+
+def build_tree(root: Path, directories: int, seed: int = 7) -> None:
+    """Random tree with ~``directories`` folders, videos, other files and skipped names."""
+    rnd = random.Random(seed)
+    folders = [root]
+    for n in range(directories - 1):
+        parent = rnd.choice(folders[-20:] + folders[:5])
+        folder = parent / rnd.choice([f"WSOP {2000 + n % 25}", f"Day {n}", f"Event #{n}", f"d{n}"])
+        folder.mkdir(exist_ok=True)
+        folders.append(folder)
+
+    names = ["WSOP14_APAC_ME_01", "WS11_ME25_NB", "clip", "2024 WSOPE Episode 3", "final"]
+    for folder in folders:
+        for k in range(rnd.randint(0, 4)):
+            ext = rnd.choice([".mp4", ".MOV", ".mxf", ".txt", ".jpg", ".mkv"])
+            (folder / f"{rnd.choice(names)}_{k}{ext}").write_bytes(b"x" * rnd.randint(0, 64))
+        if rnd.random() < 0.1:
+            (folder / "Thumbs.db").write_bytes(b"")
+            (folder / ".hidden.mp4").write_bytes(b"")
+
+
+def test_same_records(tmp: Path) -> bool:
+    """Single- and multi-root walks match the reference exactly."""
+    roots = []
+    for name, size in (("origin", 300), ("archive", 150), ("pokergo", 40)):
+        root = tmp / name
+        root.mkdir()
+        build_tree(root, size, seed=size)
+        roots.append((root, name))
+    roots.append((tmp / "missing", "missing"))
+
+    success = True
+    for root, base in roots:
+        expected = reference_scan(root, base)
+        for workers, share_workers in ((1, 1), (4, 2), (16, 8)):
+            actual = scan_directory(root, base, workers, share_workers)
+            if actual != expected:
+                success = False
+                print(f"[FAIL] {base} workers={workers}/{share_workers}: "
+                      f"{len(actual)} records, expected {len(expected)}")
+
+    walker = DirectoryWalker(workers=8, share_workers=3)
+    results = walker.walk(roots)
+    for (root, base), actual in zip(roots, results):
+        if actual != reference_scan(root, base):
+            success = False
+            print(f"[FAIL] multi-root walk differs for {base}")
+
+    # Streaming: same records per root, in discovery order
+    streamed = [[] for _ in roots]
+    for n, record in DirectoryWalker(workers=8, share_workers=3).iter_files(roots):
+        streamed[n].append(record)
+    for (root, base), actual, expected in zip(roots, streamed, results):
+        by_path = itemgetter("full_path")
+        if sorted(actual, key=by_path) != sorted(expected, key=by_path):
+            success = False
+            print(f"[FAIL] iter_files differs for {base}")
+
+    total = sum(len(files) for files in results)
+    print(f"Checked {len(roots)} roots, {walker.directories} directories, {total} records")
+    print("[PASS] same records in same order" if success else "[FAIL] records differ")
+    return success
+
+
+def cache_after(walker: DirectoryWalker, records: list[dict], old=None) -> DirectoryCache:
+    """Cache as run_scan would store it: listed directories plus still-valid old rows."""
+    rows = {path: row for path, row in (old.rows.items() if old else ())
+            if path in walker.pruned}
+    for path, (mtime, child_count) in walker.listed.items():
+        rows[path] = SimpleNamespace(path=path, mtime=mtime, child_count=child_count,
+                                     verified_at=None)
+    file_counts = Counter(os.path.dirname(f["full_path"]) for f in records)
+    return DirectoryCache(rows.values(), file_counts)
+
+
+def test_pruned_rescan(tmp: Path) -> bool:
+    """Unchanged directories are skipped; a new file deep in the tree is still found."""
+    root = tmp / "pruned"
+    root.mkdir()
+    build_tree(root, 200, seed=11)
+
+    first = DirectoryWalker(workers=8, cache=DirectoryCache([], Counter()))
+    records = first.walk([(root, "origin")])[0]
+    cache = cache_after(first, records)
+
+    second = DirectoryWalker(workers=8, cache=cache)
+    unchanged = second.walk([(root, "origin")])[0]
+
+    deep = max(second.pruned, key=len)
+    (Path(deep) / "WSOP24_NEW_01.mp4").write_bytes(b"x")
+    os.utime(deep, (time.time() + 10, time.time() + 10))  # coarse mtime resolution
+    third = DirectoryWalker(workers=8, cache=cache_after(second, records, cache))
+    added = third.walk([(root, "origin")])[0]
+
+    checks = [
+        ("second scan lists nothing", not unchanged and not second.listed),
+        ("every directory pruned", len(second.pruned) == first.directories),
+        ("only the changed directory listed", list(third.listed) == [deep]),
+        ("new file found", "WSOP24_NEW_01.mp4" in {f["filename"] for f in added}),
+        ("only the changed directory's files",
+         all(os.path.dirname(f["full_path"]) == deep for f in added)),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_classify_file() -> bool:
+    """New, unchanged and changed files, also rows stored before fingerprints."""
+    row = SimpleNamespace(fingerprint="100.0:10", size_bytes=10)
+    legacy = SimpleNamespace(fingerprint=None, size_bytes=10)
+    cases = [
+        ("not stored", classify_file(None, "100.0:10", 10), FileState.NEW),
+        ("same fingerprint", classify_file(row, "100.0:10", 10), FileState.UNCHANGED),
+        ("touched", classify_file(row, "200.0:10", 10), FileState.CHANGED),
+        ("resized", classify_file(row, "100.0:20", 20), FileState.CHANGED),
+        ("vanished before stat", classify_file(row, None, 0), FileState.UNCHANGED),
+        ("no stored fingerprint, same size", classify_file(legacy, "1.0:10", 10),
+         FileState.UNCHANGED),
+        ("no stored fingerprint, resized", classify_file(legacy, "1.0:20", 20),
+         FileState.CHANGED),
+    ]
+    checks = [(f"classify_file: {name} is {expected}", state == expected)
+              for name, state, expected in cases]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_incremental_rescan(tmp: Path) -> bool:
+    """run_scan counts touched, resized, deleted and new files; changed rows are re-extracted."""
+    root = tmp / "rescan"
+    root.mkdir()
+    build_tree(root, 60, seed=5)
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+
+    @contextmanager
+    def test_db_context():
+        with Session(engine) as db:
+            yield db
+            db.commit()
+
+    config = ScanConfig(origin_path=str(root), mode=ScanMode.INCREMENTAL,
+                        folder_type=FolderType.ORIGIN, workers=4, share_workers=2)
+    real_db_context = scanner.get_db_context
+    scanner.get_db_context = test_db_context
+    try:
+        first = run_scan(config)
+        with Session(engine) as db:
+            db.execute(update(NasFile).values(extraction_version="v1"))
+            db.commit()
+
+        videos = sorted(
+            (path for path in root.rglob("*") if path.suffix.lower() in VIDEO_EXTENSIONS
+             and not path.name.startswith(".")),
+            key=str,
+        )
+        touched, resized, deleted = videos[:3]
+        later = time.time() + 10  # coarse mtime resolution
+        os.utime(touched, (later, later))
+        resized.write_bytes(resized.read_bytes() + b"more")
+        deleted.unlink()
+        (touched.parent / "WSOP24_ADDED_01.mp4").write_bytes(b"x")
+
+        second = run_scan(config)
+    finally:
+        scanner.get_db_context = real_db_context
+
+    with Session(engine) as db:
+        rows = {row.full_path: row for row in db.query(
+            NasFile.full_path, NasFile.size_bytes, NasFile.extraction_version)}
+    changed = {str(touched), str(resized)}
+    counts = {key: second[f"{key}_files"] for key in ("new", "changed", "unchanged", "deleted")}
+    print(f"  {first['new_files']} files, rescan: {counts}")
+    checks = [
+        ("first scan stores every file as new",
+         first["new_files"] == len(videos) and first["changed_files"] == 0),
+        ("rescan counts: 1 new, 2 changed, 1 deleted, rest unchanged",
+         counts == {"new": 1, "changed": 2, "unchanged": len(videos) - 3, "deleted": 1}),
+        ("changed and deleted files reported",
+         {change["path"] for change in second["changed"]} == changed
+         and second["deleted"] == [str(deleted)]),
+        ("changed rows' extraction_version reset",
+         all(rows[path].extraction_version is None for path in changed)),
+        ("other rows keep their extraction_version",
+         all(row.extraction_version == "v1" for path, row in rows.items()
+             if path not in changed and path != str(touched.parent / "WSOP24_ADDED_01.mp4"))),
+        ("resized row has the new size", rows[str(resized)].size_bytes == resized.stat().st_size),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def benchmark(tmp: Path, sizes: list[int], latency_ms: float, workers: int) -> None:
+    """Print scan time versus directory count for both walks."""
+    real_scandir = os.scandir
+
+    def slow_scandir(path):
+        time.sleep(latency_ms / 1000)
+        return real_scandir(path)
+
+    print(f"\nLatency per listing: {latency_ms} ms, workers: {workers}")
+    print(f"{'dirs':>8} {'files':>8} {'recursive':>11} {'walker':>9} {'speedup':>8}")
+    for size in sizes:
+        root = tmp / f"bench_{size}"
+        root.mkdir()
+        build_tree(root, size, seed=size)
+
+        scanner.os.scandir = slow_scandir
+        try:
+            start = time.perf_counter()
+            files = reference_scan(root, "bench")
+            recursive_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            scan_directory(root, "bench", workers, workers)
+            walker_s = time.perf_counter() - start
+        finally:
+            scanner.os.scandir = real_scandir
+
+        print(f"{size:>8} {len(files):>8} {recursive_s:>10.2f}s {walker_s:>8.2f}s "
+              f"{recursive_s / walker_s:>7.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='DirectoryWalker golden test and benchmark')
+    parser.add_argument('--latency-ms', type=float, default=2.0,
+                        help='Simulated round trip per directory listing')
+    parser.add_argument('--sizes', default='100,400,1600',
+                        help='Comma-separated directory counts to benchmark')
+    parser.add_argument('--workers', type=int, default=scanner.SCAN_WORKERS)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Directory Walker Golden-Output Test")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        success = test_same_records(Path(tmp))
+        success = test_pruned_rescan(Path(tmp)) and success
+        success = test_classify_file() and success
+        success = test_incremental_rescan(Path(tmp)) and success
+        sizes = [int(size) for size in args.sizes.split(',')]
+        benchmark(Path(tmp), sizes, args.latency_ms, args.workers)
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""Similarity kernel test: calibration against SequenceMatcher and match decisions.
+
+Pairs synthetic group titles (every year / region / event type / episode
+shape the matcher builds) with the PokerGO WSOP catalog titles listed in
+docs/reference/POKERGO_WSOP_FULL_LIST.md, then checks that the calibrated
+kernel stays close to ``SequenceMatcher.ratio()``, that the batched API
+matches pairwise scoring, and that ``match_group_to_pokergo`` picks the same
+episode (when the old ratio had a clear winner) and makes the same
+``min_score`` decision as with the old ratio.
+
+Usage:
+    python scripts/test_similarity.py
+    python scripts/test_similarity.py --calibrate   # print a new CALIBRATION table
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+# Fix Windows console encoding
+sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from src.nams.api.database import AssetGroup, Base, EventType, PokergoEpisode, Region  # noqa: E402
+from src.nams.api.services.matching import (  # noqa: E402
+    EpisodeIndex,
+    match_group_to_pokergo,
+    normalize_title,
+    score_pokergo_candidates,
+)
+from src.nams.api.services.similarity import (  # noqa: E402
+    CALIBRATION,
+    TitleProfiles,
+    calibrate,
+    raw_similarity,
+    similarity,
+)
+
+CATALOG = project_root / "docs" / "reference" / "POKERGO_WSOP_FULL_LIST.md"
+REGIONS = ["LV", "EU", "APAC", ""]
+EVENT_TYPES = ["ME", "BR", "HU", "GM", "HR", ""]
+EPISODES = [None, 1, 5, 12, 25]
+QUANTILES = (0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 0.95, 0.99)
+MIN_SCORE = 0.5
+CLEAR_MARGIN = 0.02  # old best vs runner-up, in total score
+
+
+def catalog_titles() -> list[str]:
+    rows = CATALOG.read_text(encoding='utf-8').splitlines()
+    return [row.split('|')[2].strip() for row in rows if re.match(r'^\| \d', row)]
+
+
+def sample_pairs(titles: list[str], count: int = 300) -> list[tuple[str, str]]:
+    """(group title, episode title) pairs, both normalized, same year or undated."""
+    shapes = [
+        (year, normalize_title(f"WSOP {year} {region} {event_type} Episode {episode}"))
+        for year in range(2003, 2026) for region in REGIONS
+        for event_type in EVENT_TYPES for episode in EPISODES
+    ]
+    normalized = [normalize_title(title) for title in titles]
+    return [
+        (group_title, title)
+        for year, group_title in random.Random(22).sample(shapes, count)
+        for title in normalized
+        if str(year) in title or not re.search(r'\b(19|20)\d{2}\b', title)
+    ]
+
+
+def build_table(pairs) -> list[tuple[float, float]]:
+    """Equipercentile link: raw-overlap quantiles onto SequenceMatcher quantiles."""
+    profiles = TitleProfiles()
+    raw = sorted(raw_similarity(profiles.profile(a), profiles.profile(b)) for a, b in pairs)
+    ratio = sorted(SequenceMatcher(None, a, b).ratio() for a, b in pairs)
+    table = [(0.0, 0.0)]
+    for q in QUANTILES:
+        i = min(len(raw) - 1, int(q * len(raw)))
+        x, y = round(raw[i], 3), round(ratio[i], 3)
+        if x > table[-1][0] and y >= table[-1][1]:
+            table.append((x, y))
+    table.append((1.0, 1.0))
+    return table
+
+
+def test_kernel(pairs) -> bool:
+    a, b = "wsop 2011 main event episode 25", "wsop 2011 main event episode 2"
+    run = TitleProfiles()
+    candidates = [run.profile(title) for _, title in pairs[:500]]
+    batched = run.similarities(pairs[0][0], candidates)
+    pairwise = [similarity(pairs[0][0], title) for _, title in pairs[:500]]
+    knots_ok = all(x0 < x1 and y0 <= y1 for (x0, y0), (x1, y1) in zip(CALIBRATION,
+                                                                      CALIBRATION[1:]))
+
+    errors = [abs(similarity(a, b) - SequenceMatcher(None, a, b).ratio()) for a, b in pairs]
+    mean_error = sum(errors) / len(errors)
+
+    start = time.perf_counter()
+    for group_title, title in pairs:
+        SequenceMatcher(None, group_title, title).ratio()
+    old = time.perf_counter() - start
+    profiles = [run.profile(title) for _, title in pairs]
+    start = time.perf_counter()
+    run.similarities(pairs[0][0], profiles)
+    new = time.perf_counter() - start
+    print(f"  {len(pairs)} pairs: SequenceMatcher {old * 1e6 / len(pairs):.1f} us/pair, "
+          f"kernel {new * 1e6 / len(pairs):.2f} us/pair, mean |error| {mean_error:.3f}")
+
+    checks = [
+        ("identical titles score 1.0", similarity(a, a) == 1.0),
+        ("disjoint titles score 0.0", similarity("wsop 2011", "heads up") == 0.0),
+        ("nearer title scores higher", similarity(a, a + " final") > similarity(a, b)),
+        ("batched equals pairwise", batched == pairwise),
+        ("calibration increasing, ends at 0 and 1",
+         knots_ok and calibrate(0.0) == 0.0 and calibrate(1.0) == 1.0),
+        ("close to SequenceMatcher (mean |error| < 0.04)", mean_error < 0.04),
+        ("faster than SequenceMatcher", new < old),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def test_decisions(titles: list[str]) -> bool:
+    """Best episode and min_score decision per group, old ratio vs kernel."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        for i, code in enumerate(REGIONS[:-1], 1):
+            db.add(Region(id=i, code=code, name=code))
+        for i, code in enumerate(EVENT_TYPES[:-1], 1):
+            db.add(EventType(id=i, code=code, name=code))
+        db.commit()
+
+        episodes = [PokergoEpisode(id=f"ep{i}", title=title) for i, title in enumerate(titles)]
+        index = EpisodeIndex(episodes)
+        groups = [
+            AssetGroup(year=year, region_id=region, event_type_id=event_type, episode=episode)
+            for year in range(2003, 2026) for region in (1, 2, 3, None)
+            for event_type in (1, 2, 3, 4, 5, None) for episode in EPISODES
+        ]
+        same = accepted = clear = 0
+        for group in groups:
+            new_match, new_score = match_group_to_pokergo(db, group, index)
+            # Old score: swap the kernel's title bonus for SequenceMatcher's
+            region = {1: "LV", 2: "EU", 3: "APAC"}.get(group.region_id, "")
+            event_type = EVENT_TYPES[group.event_type_id - 1] if group.event_type_id else ""
+            group_title = normalize_title(
+                f"WSOP {group.year} {region} {event_type} Episode {group.episode}")
+            old_match, old_score, runner_up = None, 0.0, 0.0
+            for episode, score in score_pokergo_candidates(db, group, index):
+                normalized = normalize_title(episode.title)
+                kernel = index.profiles.similarities(
+                    group_title, [index.profiles.profile(normalized)])[0]
+                score += 0.2 * (SequenceMatcher(None, group_title, normalized).ratio() - kernel)
+                if score > old_score:
+                    old_match, old_score, runner_up = episode, score, old_score
+                else:
+                    runner_up = max(runner_up, score)
+            old_accept = old_match is not None and min(old_score, 1.0) >= MIN_SCORE
+            new_accept = new_match is not None and new_score >= MIN_SCORE
+            accepted += old_accept == new_accept
+            # Near-ties between interchangeable titles ("Day 1" / "Commentary") may flip
+            if old_accept and old_score - runner_up >= CLEAR_MARGIN:
+                clear += 1
+                same += new_match is old_match
+
+    print(f"  {len(groups)} groups: same decision {accepted}; "
+          f"clear winners {clear}, same episode {same}")
+    checks = [
+        ("title profiles kept per index",
+         0 < len(index.profiles) and EpisodeIndex(episodes[:1]).profiles is not index.profiles),
+        ("min_score decisions agree (>= 99%)", accepted >= 0.99 * len(groups)),
+        ("clear winners pick the same episode (>= 99%)", same >= 0.99 * clear),
+    ]
+    for name, ok in checks:
+        print(f"[{'PASS' if ok else 'FAIL'}] {name}")
+    return all(ok for _, ok in checks)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Similarity kernel test")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Print a CALIBRATION table built from the catalog titles")
+    args = parser.parse_args()
+
+    titles = catalog_titles()
+    pairs = sample_pairs(titles)
+    if args.calibrate:
+        print("CALIBRATION = (")
+        for raw, ratio in build_table(pairs):
+            print(f"    ({raw}, {ratio}),")
+        print(")")
+        return
+
+    print("=" * 60)
+    print("Similarity Kernel Test")
+    print("=" * 60)
+
+    success = test_kernel(pairs)
+    success = test_decisions(titles) and success
+
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
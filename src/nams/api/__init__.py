@@ -1,4 +1,15 @@
-"""NAMS API package."""
-from .main import app
+"""NAMS API package.
+
+``app`` is imported on first access, so importing the database or service
+modules (scripts, extraction worker processes) does not start the app or
+run its database init.
+"""
 
 __all__ = ["app"]
+
+
+def __getattr__(name: str):
+    if name == "app":
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,7 @@
 """Database package for NAMS."""
+from .bulk import BULK_CHUNK_SIZE, BulkInserter, BulkUpdater
 from .init_db import init_database
+from .lookups import CodeLookup, get_code_lookup, invalidate_code_lookup
 from .models import (
     AssetGroup,
     AuditLog,
@@ -9,8 +11,11 @@ from .models import (
     ExclusionRule,
     NasFile,
     Pattern,
+    PatternSetVersion,
     PokergoEpisode,
+    PokergoTitle,
     Region,
+    ScanDirectory,
     ScanHistory,
 )
 from .session import SessionLocal, engine, get_db, get_db_context
@@ -19,17 +24,26 @@ __all__ = [
     "Base",
     "CategoryEntry",
     "Pattern",
+    "PatternSetVersion",
     "Region",
     "EventType",
     "AssetGroup",
     "NasFile",
     "AuditLog",
     "PokergoEpisode",
+    "PokergoTitle",
     "ExclusionRule",
     "ScanHistory",
+    "ScanDirectory",
     "engine",
     "SessionLocal",
     "get_db",
     "get_db_context",
     "init_database",
+    "CodeLookup",
+    "get_code_lookup",
+    "invalidate_code_lookup",
+    "BULK_CHUNK_SIZE",
+    "BulkInserter",
+    "BulkUpdater",
 ]
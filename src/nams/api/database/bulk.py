@@ -0,0 +1,89 @@
+"""Chunked bulk writes for batch jobs (extraction, scanning)."""
+from sqlalchemy.orm import Session
+
+# Rows per executemany UPDATE / commit
+BULK_CHUNK_SIZE = 1000
+
+
+class BulkUpdater:
+    """Collect per-row column changes and write them back in fixed-size chunks.
+
+    Each change is a mapping of only the changed columns plus the primary key
+    (``{'id': 7, 'year': 2024}``). Every ``chunk_size`` rows the buffer is sent
+    as one ``bulk_update_mappings`` call and committed, so memory stays bounded
+    and the SQLite write lock is released between chunks.
+
+    Usage:
+        with BulkUpdater(db, NasFile) as writer:
+            writer.add({'id': file_id, 'year': 2024})
+    """
+
+    def __init__(self, db: Session, model, chunk_size: int = BULK_CHUNK_SIZE):
+        self.db = db
+        self.model = model
+        self.chunk_size = chunk_size
+        self.written = 0
+        self._buffer: list[dict] = []
+
+    def add(self, changes: dict) -> None:
+        """Queue one row's changed columns (must include the primary key)."""
+        self._buffer.append(changes)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write and commit everything queued so far."""
+        if self._buffer:
+            self.db.bulk_update_mappings(self.model, self._buffer)
+            self.written += len(self._buffer)
+            self._buffer = []
+        self.db.commit()
+
+    def __enter__(self) -> 'BulkUpdater':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+
+
+class BulkInserter:
+    """Collect new rows and insert them in fixed-size chunks.
+
+    Each row is a mapping of column values (``{'filename': ..., 'size_bytes': ...}``).
+    Every ``chunk_size`` rows the buffer is sent as one ``bulk_insert_mappings``
+    call and committed, so a long-running producer (a NAS scan) keeps memory
+    flat and its first rows are visible to other sessions early.
+
+    Usage:
+        with BulkInserter(db, NasFile) as writer:
+            writer.add({'filename': 'a.mp4', ...})
+    """
+
+    def __init__(self, db: Session, model, chunk_size: int = BULK_CHUNK_SIZE):
+        self.db = db
+        self.model = model
+        self.chunk_size = chunk_size
+        self.written = 0
+        self._buffer: list[dict] = []
+
+    def add(self, row: dict) -> None:
+        """Queue one row (all rows should have the same keys)."""
+        self._buffer.append(row)
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Insert and commit everything queued so far."""
+        if self._buffer:
+            self.db.bulk_insert_mappings(self.model, self._buffer)
+            self.written += len(self._buffer)
+            self._buffer = []
+        self.db.commit()
+
+    def __enter__(self) -> 'BulkInserter':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
@@ -1,5 +1,8 @@
 """Database initialization and seed data for NAMS."""
-from .models import Base, EventType, ExclusionRule, Pattern, Region
+from sqlalchemy import inspect, text
+
+from .lookups import invalidate_code_lookup
+from .models import POKERGO_MATCH_TRIGGERS, Base, EventType, ExclusionRule, Pattern, Region
 from .session import engine, get_db_context
 
 
@@ -9,6 +12,59 @@ def create_tables():
     print("[OK] Database tables created")
 
 
+# Columns added after their table was first created: (table, column, DDL type).
+# create_all() never alters existing tables, so add_missing_columns() does.
+NEW_COLUMNS = [
+    ('nas_files', 'extraction_version', 'VARCHAR(40)'),
+    ('nas_files', 'fingerprint', 'VARCHAR(40)'),
+    ('nas_files', 'duration_sec', 'FLOAT'),
+    ('nas_files', 'video_width', 'INTEGER'),
+    ('nas_files', 'video_height', 'INTEGER'),
+    ('nas_files', 'video_codec', 'VARCHAR(20)'),
+    ('nas_files', 'probe_fingerprint', 'VARCHAR(40)'),
+    ('nas_files', 'content_hash', 'VARCHAR(40)'),
+    ('nas_files', 'hash_fingerprint', 'VARCHAR(40)'),
+    ('pokergo_episodes', 'is_matched', 'BOOLEAN NOT NULL DEFAULT 0'),
+    ('pattern_set_versions', 'pattern_rules', 'TEXT'),
+    ('pattern_set_versions', 'equivalent_to', 'VARCHAR(40)'),
+]
+
+# Indexes added after their table was first created: (name, table, column)
+NEW_INDEXES = [
+    ('idx_nas_files_content_hash', 'nas_files', 'content_hash'),
+    ('idx_asset_groups_pokergo_episode', 'asset_groups', 'pokergo_episode_id'),
+    ('idx_pokergo_episodes_is_matched', 'pokergo_episodes', 'is_matched'),
+]
+
+
+def add_missing_columns():
+    """Add NEW_COLUMNS (and NEW_INDEXES) that an existing database does not have yet."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table, column, ddl in NEW_COLUMNS:
+            existing = {col['name'] for col in inspector.get_columns(table)}
+            if column not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                print(f"[OK] Added column {table}.{column}")
+        for name, table, column in NEW_INDEXES:
+            conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})"))
+
+
+def sync_pokergo_matches():
+    """Install the is_matched triggers and recompute the flag from asset_groups.
+
+    Catches up databases created before the triggers existed (or edited
+    without them); afterwards the triggers keep the flag current.
+    """
+    with engine.begin() as conn:
+        for trigger in POKERGO_MATCH_TRIGGERS:
+            conn.exec_driver_sql(trigger)
+        conn.exec_driver_sql(
+            "UPDATE pokergo_episodes SET is_matched = EXISTS ("
+            "SELECT 1 FROM asset_groups WHERE pokergo_episode_id = pokergo_episodes.id)"
+        )
+
+
 def seed_regions():
     """Seed initial region data."""
     regions = [
@@ -35,6 +91,7 @@ def seed_regions():
             if not existing:
                 db.add(Region(**r))
         db.commit()
+    invalidate_code_lookup()
     print(f"[OK] Seeded {len(regions)} regions")
 
 
@@ -72,6 +129,7 @@ def seed_event_types():
             if not existing:
                 db.add(EventType(**et))
         db.commit()
+    invalidate_code_lookup()
     print(f"[OK] Seeded {len(event_types)} event types")
 
 
@@ -483,10 +541,17 @@ def seed_exclusion_rules():
     print(f"[OK] Seeded {len(rules)} exclusion rules")
 
 
+_initialized = False
+
+
 def init_database():
     """Initialize database with tables and seed data."""
+    global _initialized
+    _initialized = True
     print("Initializing NAMS database...")
     create_tables()
+    add_missing_columns()
+    sync_pokergo_matches()
     seed_regions()
     seed_event_types()
     seed_patterns()
@@ -494,5 +559,15 @@ def init_database():
     print("[OK] Database initialization complete")
 
 
+def ensure_database():
+    """Run init_database() once per process, before its first script session.
+
+    Importing the package no longer does it, so extraction worker processes
+    never touch the database.
+    """
+    if not _initialized:
+        init_database()
+
+
 if __name__ == "__main__":
     init_database()
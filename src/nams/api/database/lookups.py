@@ -0,0 +1,55 @@
+"""Process-level code <-> id lookup tables for regions and event types."""
+from sqlalchemy.orm import Session
+
+from .models import EventType, Region
+
+
+class CodeLookup:
+    """In-memory code/id maps loaded once from the regions/event_types tables."""
+
+    def __init__(self, regions: dict[str, int], event_types: dict[str, int]):
+        self.region_ids = dict(regions)
+        self.event_type_ids = dict(event_types)
+        self.region_codes = {v: k for k, v in self.region_ids.items()}
+        self.event_type_codes = {v: k for k, v in self.event_type_ids.items()}
+
+    @classmethod
+    def load(cls, db: Session) -> 'CodeLookup':
+        """Load all regions and event types (active or not)."""
+        regions = {r.code: r.id for r in db.query(Region.code, Region.id)}
+        event_types = {e.code: e.id for e in db.query(EventType.code, EventType.id)}
+        return cls(regions, event_types)
+
+    def region_id(self, code: str | None) -> int | None:
+        """Get region ID by exact code."""
+        return self.region_ids.get(code) if code else None
+
+    def event_type_id(self, code: str | None) -> int | None:
+        """Get event type ID by exact code."""
+        return self.event_type_ids.get(code) if code else None
+
+    def region_code(self, region_id: int | None) -> str | None:
+        """Get region code by ID."""
+        return self.region_codes.get(region_id) if region_id else None
+
+    def event_type_code(self, event_type_id: int | None) -> str | None:
+        """Get event type code by ID."""
+        return self.event_type_codes.get(event_type_id) if event_type_id else None
+
+
+# Process-level cache, reset by invalidate_code_lookup() when regions/event types change
+_code_lookup: CodeLookup | None = None
+
+
+def get_code_lookup(db: Session) -> CodeLookup:
+    """Get the cached code lookup, loading it on first use."""
+    global _code_lookup
+    if _code_lookup is None:
+        _code_lookup = CodeLookup.load(db)
+    return _code_lookup
+
+
+def invalidate_code_lookup() -> None:
+    """Drop the cached lookup (call after seeding or editing regions/event types)."""
+    global _code_lookup
+    _code_lookup = None
@@ -2,6 +2,7 @@
 from datetime import datetime
 
 from sqlalchemy import (
+    DDL,
     BigInteger,
     Boolean,
     Column,
@@ -12,6 +13,7 @@ from sqlalchemy import (
     Integer,
     String,
     Text,
+    event,
 )
 from sqlalchemy.orm import declarative_base, relationship
 
@@ -186,6 +188,7 @@ class AssetGroup(Base):
 
     __table_args__ = (
         Index('idx_asset_groups_year', 'year'),
+        Index('idx_asset_groups_pokergo_episode', 'pokergo_episode_id'),
     )
 
 
@@ -203,6 +206,18 @@ class NasFile(Base):
     directory = Column(String(1000))
     full_path = Column(String(1500), unique=True)
     modified_at = Column(DateTime)
+    fingerprint = Column(String(40))  # "mtime:size" (마지막 스캔, 변경 감지용)
+
+    # 미디어 프로브 (컨테이너 헤더에서 읽음)
+    duration_sec = Column(Float)
+    video_width = Column(Integer)
+    video_height = Column(Integer)
+    video_codec = Column(String(20))  # h264, hevc, prores, mpeg2, ...
+    probe_fingerprint = Column(String(40))  # 프로브 시점의 fingerprint (같으면 재프로브 안 함)
+
+    # 부분 내용 해시 (처음/중간/끝 + 크기, 이름 변경·드라이브 간 사본 식별용)
+    content_hash = Column(String(40))
+    hash_fingerprint = Column(String(40))  # 해시 시점의 fingerprint (같으면 재계산 안 함)
 
     # 드라이브/폴더 정보
     drive = Column(String(10))  # X:, Y:, Z:
@@ -230,6 +245,7 @@ class NasFile(Base):
     # 매칭 패턴 정보
     matched_pattern_id = Column(Integer, ForeignKey('patterns.id'))
     extraction_confidence = Column(Float)  # 0.0 ~ 1.0
+    extraction_version = Column(String(40))  # 메타데이터를 만든 패턴 세트 + 추출기 버전
 
     # 수동 오버라이드
     is_manual_override = Column(Boolean, default=False)
@@ -263,9 +279,22 @@ class NasFile(Base):
         Index('idx_nas_files_group', 'asset_group_id'),
         Index('idx_nas_files_entry', 'entry_id'),
         Index('idx_nas_files_drive', 'drive'),
+        Index('idx_nas_files_content_hash', 'content_hash'),
     )
 
 
+class PatternSetVersion(Base):
+    """패턴 세트 버전 - 증분 추출 시 변경된 패턴 비교용."""
+    __tablename__ = 'pattern_set_versions'
+
+    version = Column(String(40), primary_key=True)  # NasFile.extraction_version
+    extractor_hash = Column(String(40), nullable=False)  # 추출기 버전 + 지역/이벤트 타입 코드
+    pattern_hashes = Column(Text, nullable=False)  # JSON: {"pattern_id": "hash"}
+    pattern_rules = Column(Text)  # JSON: {"pattern_id": [priority, "출력 필드 hash"]}
+    equivalent_to = Column(String(40))  # 이 버전에 남은 파일의 결과가 같은 이후 버전 (증분 추출)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
 class AuditLog(Base):
     """변경 이력."""
     __tablename__ = 'audit_logs'
@@ -298,6 +327,29 @@ class PokergoEpisode(Base):
     aired_at = Column(DateTime)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # 매칭된 그룹 존재 여부 - asset_groups 트리거가 같은 트랜잭션에서 유지 (POKERGO_ONLY = False)
+    is_matched = Column(Boolean, nullable=False, default=False, server_default='0')
+
+    __table_args__ = (
+        Index('idx_pokergo_episodes_is_matched', 'is_matched'),
+    )
+
+
+class PokergoTitle(Base):
+    """PokerGO 제목 정규화 캐시 - 에피소드 임포트 시 1회 계산, 매칭에서 재사용."""
+    __tablename__ = 'pokergo_titles'
+
+    episode_id = Column(String(100), ForeignKey('pokergo_episodes.id'), primary_key=True)
+    source_hash = Column(String(40), nullable=False)  # 제목/시즌/컬렉션 + 캐시 버전
+    normalized_title = Column(String(500))  # normalize_title(title)
+    title_tokens = Column(Text)  # 정규화 제목의 고유 토큰 (공백 구분, 정렬)
+    title_year = Column(Integer)  # 제목의 첫 연도
+    season_year = Column(Integer)  # season_title의 첫 연도
+    collection_year = Column(Integer)  # collection_title의 첫 연도
+    episode = Column(Integer)  # Episode N, Ep N, #N, Part N
+    event_num = Column(Integer)  # Event #N
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 
 class ExclusionRule(Base):
     """제외 규칙 - 스캔 시 파일 제외 조건."""
@@ -347,6 +399,17 @@ class ScanHistory(Base):
     )
 
 
+class ScanDirectory(Base):
+    """디렉토리 스캔 캐시 - 변경 없는 폴더는 재스캔 시 목록 조회 생략."""
+    __tablename__ = 'scan_directories'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    path = Column(String(1500), unique=True, nullable=False, index=True)  # 정규화된 전체 경로
+    mtime = Column(Float, nullable=False)  # 목록 조회 직전 디렉토리 mtime
+    child_count = Column(Integer, nullable=False)  # 영상 파일 + 하위 폴더 수
+    verified_at = Column(DateTime, default=datetime.utcnow)  # 마지막 실제 목록 조회
+
+
 class ValidationSession(Base):
     """검증 세션 - 사용자 작업 단위."""
     __tablename__ = 'validation_sessions'
@@ -364,3 +427,39 @@ class ValidationSession(Base):
     __table_args__ = (
         Index('idx_validation_sessions_user', 'user_name'),
     )
+
+
+# pokergo_episodes.is_matched 유지 트리거 (SQLite): asset_groups.pokergo_episode_id가 바뀌는
+# 모든 쓰기(ORM, 일괄 UPDATE, raw SQL)와 같은 트랜잭션에서 갱신
+_EPISODE_STILL_MATCHED = """
+    UPDATE pokergo_episodes SET is_matched = EXISTS (
+        SELECT 1 FROM asset_groups WHERE pokergo_episode_id = {episode_id}
+    ) WHERE id = {episode_id};"""
+
+POKERGO_MATCH_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS trg_asset_groups_match_insert
+AFTER INSERT ON asset_groups WHEN NEW.pokergo_episode_id IS NOT NULL
+BEGIN
+    UPDATE pokergo_episodes SET is_matched = 1 WHERE id = NEW.pokergo_episode_id;
+END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_asset_groups_match_update
+AFTER UPDATE OF pokergo_episode_id ON asset_groups
+WHEN OLD.pokergo_episode_id IS NOT NEW.pokergo_episode_id
+BEGIN
+    UPDATE pokergo_episodes SET is_matched = 1 WHERE id = NEW.pokergo_episode_id;
+    {_EPISODE_STILL_MATCHED.format(episode_id='OLD.pokergo_episode_id')}
+END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_asset_groups_match_delete
+AFTER DELETE ON asset_groups WHEN OLD.pokergo_episode_id IS NOT NULL
+BEGIN
+    {_EPISODE_STILL_MATCHED.format(episode_id='OLD.pokergo_episode_id')}
+END""",
+    f"""CREATE TRIGGER IF NOT EXISTS trg_pokergo_episodes_match_insert
+AFTER INSERT ON pokergo_episodes
+BEGIN
+    {_EPISODE_STILL_MATCHED.format(episode_id='NEW.id')}
+END""",
+]
+
+for _trigger in POKERGO_MATCH_TRIGGERS:
+    event.listen(Base.metadata, 'after_create', DDL(_trigger).execute_if(dialect='sqlite'))
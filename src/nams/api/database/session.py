@@ -35,7 +35,13 @@ def get_db() -> Session:
 
 @contextmanager
 def get_db_context():
-    """Context manager for database session (for scripts)."""
+    """Context manager for database session (for scripts).
+
+    The first session of a process initializes the database (tables, added
+    columns, seed data), see ensure_database().
+    """
+    from .init_db import ensure_database
+    ensure_database()
     db = SessionLocal()
     try:
         yield db
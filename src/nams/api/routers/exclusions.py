@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from ..database import ExclusionRule, get_db
 from ..schemas import (
+    ExclusionReapplyResult,
     ExclusionRuleCreate,
     ExclusionRuleListResponse,
     ExclusionRuleResponse,
@@ -12,6 +13,7 @@ from ..schemas import (
     ExclusionRuleUpdate,
     MessageResponse,
 )
+from ..services.exclusion_rules import ExclusionRuleSet, RuleSpec, reapply_exclusion_rules
 
 router = APIRouter()
 
@@ -107,62 +109,37 @@ async def toggle_exclusion_rule(rule_id: int, db: Session = Depends(get_db)):
     return rule
 
 
+@router.post("/reapply", response_model=ExclusionReapplyResult)
+async def reapply_exclusion_rules_to_files(db: Session = Depends(get_db)):
+    """Re-evaluate all files against the active rules and update their exclusion flags."""
+    result = reapply_exclusion_rules(db)
+    db.commit()
+    return result
+
+
 @router.post("/test", response_model=ExclusionRuleTestResult)
 async def test_exclusion_rule(data: ExclusionRuleTestRequest):
     """Test an exclusion rule against sample data."""
-    would_exclude = False
-    reason = ""
-
-    if data.rule_type == "size":
-        if data.sample_size_bytes is None:
-            return ExclusionRuleTestResult(
-                would_exclude=False,
-                reason="No sample size provided"
-            )
-        threshold = int(data.value)
-        if data.operator == "lt" and data.sample_size_bytes < threshold:
-            would_exclude = True
-            reason = f"Size {data.sample_size_bytes:,} bytes < {threshold:,} bytes"
-        elif data.operator == "gt" and data.sample_size_bytes > threshold:
-            would_exclude = True
-            reason = f"Size {data.sample_size_bytes:,} bytes > {threshold:,} bytes"
-        elif data.operator == "eq" and data.sample_size_bytes == threshold:
-            would_exclude = True
-            reason = f"Size equals {threshold:,} bytes"
-
-    elif data.rule_type == "duration":
-        if data.sample_duration_sec is None:
-            return ExclusionRuleTestResult(
-                would_exclude=False,
-                reason="No sample duration provided"
-            )
-        threshold = int(data.value)
-        if data.operator == "lt" and data.sample_duration_sec < threshold:
-            would_exclude = True
-            reason = f"Duration {data.sample_duration_sec}s < {threshold}s"
-        elif data.operator == "gt" and data.sample_duration_sec > threshold:
-            would_exclude = True
-            reason = f"Duration {data.sample_duration_sec}s > {threshold}s"
-        elif data.operator == "eq" and data.sample_duration_sec == threshold:
-            would_exclude = True
-            reason = f"Duration equals {threshold}s"
-
-    elif data.rule_type == "keyword":
-        if data.sample_filename is None:
-            return ExclusionRuleTestResult(
-                would_exclude=False,
-                reason="No sample filename provided"
-            )
-        filename_lower = data.sample_filename.lower()
-        keyword_lower = data.value.lower()
-        if data.operator == "contains" and keyword_lower in filename_lower:
-            would_exclude = True
-            reason = f"Filename contains '{data.value}'"
-        elif data.operator == "eq" and filename_lower == keyword_lower:
-            would_exclude = True
-            reason = f"Filename equals '{data.value}'"
-
-    if not would_exclude:
-        reason = "File would NOT be excluded by this rule"
-
-    return ExclusionRuleTestResult(would_exclude=would_exclude, reason=reason)
+    if data.rule_type == "size" and data.sample_size_bytes is None:
+        return ExclusionRuleTestResult(would_exclude=False, reason="No sample size provided")
+    if data.rule_type == "duration" and data.sample_duration_sec is None:
+        return ExclusionRuleTestResult(
+            would_exclude=False,
+            reason="No sample duration provided"
+        )
+    if data.rule_type == "keyword" and data.sample_filename is None:
+        return ExclusionRuleTestResult(would_exclude=False, reason="No sample filename provided")
+
+    # Evaluated exactly as the scanner does
+    rules = ExclusionRuleSet([RuleSpec(None, data.rule_type, data.operator, data.value)])
+    result = rules.check(
+        filename=data.sample_filename or "",
+        size_bytes=data.sample_size_bytes or 0,
+        duration_sec=data.sample_duration_sec,
+    )
+    if not result.excluded:
+        return ExclusionRuleTestResult(
+            would_exclude=False,
+            reason="File would NOT be excluded by this rule"
+        )
+    return ExclusionRuleTestResult(would_exclude=True, reason=result.reason)
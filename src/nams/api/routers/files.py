@@ -140,6 +140,10 @@ async def get_file(file_id: int, db: Session = Depends(get_db)):
         asset_group_id=file.asset_group_id,
         role=file.role,
         role_priority=file.role_priority,
+        duration_sec=file.duration_sec,
+        video_width=file.video_width,
+        video_height=file.video_height,
+        video_codec=file.video_codec,
         created_at=file.created_at,
         updated_at=file.updated_at,
         region_code=file.region.code if file.region else None,
@@ -10,12 +10,16 @@ from ..schemas import (
     MessageResponse,
     PatternAffectedFiles,
     PatternCreate,
+    PatternPreviewRequest,
+    PatternPreviewResponse,
     PatternReorder,
     PatternResponse,
     PatternTestRequest,
     PatternTestResult,
     PatternUpdate,
 )
+from ..services.pattern_engine import invalidate_pattern_set
+from ..services.pattern_preview import preview_pattern
 
 router = APIRouter()
 
@@ -32,6 +36,23 @@ async def list_patterns(
     return query.order_by(Pattern.priority).all()
 
 
+@router.post("/preview", response_model=PatternPreviewResponse)
+async def preview_pattern_impact(data: PatternPreviewRequest, db: Session = Depends(get_db)):
+    """Dry-run a new or edited pattern against all files without saving it.
+
+    Returns how many files it would capture (and from which patterns), how
+    many an edited pattern would release, and a sample of per-file diffs.
+    """
+    if data.pattern_id is not None:
+        pattern = db.query(Pattern).filter(Pattern.id == data.pattern_id).first()
+        if not pattern:
+            raise HTTPException(status_code=404, detail="Pattern not found")
+    try:
+        return preview_pattern(db, **data.model_dump())
+    except re.error as e:
+        raise HTTPException(status_code=400, detail=f"Invalid regex: {str(e)}")
+
+
 @router.get("/{pattern_id}", response_model=PatternResponse)
 async def get_pattern(pattern_id: int, db: Session = Depends(get_db)):
     """Get a specific pattern."""
@@ -59,6 +80,7 @@ async def create_pattern(data: PatternCreate, db: Session = Depends(get_db)):
     db.add(pattern)
     db.commit()
     db.refresh(pattern)
+    invalidate_pattern_set()
     return pattern
 
 
@@ -87,6 +109,7 @@ async def update_pattern(
 
     db.commit()
     db.refresh(pattern)
+    invalidate_pattern_set()
     return pattern
 
 
@@ -110,6 +133,7 @@ async def delete_pattern(pattern_id: int, db: Session = Depends(get_db)):
 
     db.delete(pattern)
     db.commit()
+    invalidate_pattern_set()
     return MessageResponse(message=f"Pattern '{pattern.name}' deleted")
 
 
@@ -122,6 +146,7 @@ async def reorder_patterns(data: PatternReorder, db: Session = Depends(get_db)):
             pattern.priority = idx + 1
 
     db.commit()
+    invalidate_pattern_set()
     return MessageResponse(message="Pattern priorities updated")
 
 
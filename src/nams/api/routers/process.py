@@ -1,5 +1,5 @@
 """Processing API router for NAMS (migration, scan, export, extract, group, match)."""
-from enum import Enum
+from enum import StrEnum
 
 from fastapi import APIRouter
 from fastapi.responses import PlainTextResponse
@@ -15,7 +15,7 @@ from ..services.export import (
 from ..services.grouping import run_grouping
 from ..services.matching import run_matching
 from ..services.migration import run_migration
-from ..services.pattern_engine import run_pattern_extraction
+from ..services.pattern_engine import run_incremental_extraction, run_pattern_extraction
 from ..services.scanner import FolderType, ScanConfig, ScanMode, run_scan
 
 router = APIRouter()
@@ -71,13 +71,13 @@ async def migrate_json_data(request: MigrationRequest):
 
 # ============ NAS Scan ============
 
-class ScanModeEnum(str, Enum):
+class ScanModeEnum(StrEnum):
     """Scan mode enum for API."""
     INCREMENTAL = "incremental"
     FULL = "full"
 
 
-class FolderTypeEnum(str, Enum):
+class FolderTypeEnum(StrEnum):
     """Folder type enum for API."""
     ORIGIN = "origin"
     ARCHIVE = "archive"
@@ -90,6 +90,7 @@ class ScanRequest(BaseModel):
     folder_type: FolderTypeEnum = FolderTypeEnum.BOTH
     origin_path: str = "Z:/WSOP"
     archive_path: str = "Z:/Archive"
+    probe_media: bool = False
 
 
 class ScanResponse(BaseModel):
@@ -108,6 +109,7 @@ async def scan_nas(request: ScanRequest):
         folder_type: 'origin', 'archive', or 'both'
         origin_path: Path to origin folder (default: Z:/WSOP)
         archive_path: Path to archive folder (default: Z:/Archive)
+        probe_media: Read duration/resolution/codec of new and changed files
     """
     try:
         config = ScanConfig(
@@ -115,6 +117,7 @@ async def scan_nas(request: ScanRequest):
             archive_path=request.archive_path,
             mode=ScanMode(request.mode.value),
             folder_type=FolderType(request.folder_type.value),
+            probe_media=request.probe_media,
         )
 
         stats = run_scan(config)
@@ -130,7 +133,7 @@ async def scan_nas(request: ScanRequest):
             success=True,
             message=(
                 f"Scanned {stats['origin_files']} origin + {stats['archive_files']} archive files. "
-                f"Added {stats['new_files']} new files."
+                f"Added {stats['new_files']} new files, updated {stats['updated_files']}."
             ),
             stats=stats,
         )
@@ -144,7 +147,7 @@ async def scan_nas(request: ScanRequest):
 
 # ============ Export ============
 
-class ExportFormat(str, Enum):
+class ExportFormat(StrEnum):
     """Export format."""
     CSV = "csv"
     JSON = "json"
@@ -264,8 +267,13 @@ class ProcessResponse(BaseModel):
     stats: dict
 
 
+class ExtractRequest(BaseModel):
+    """Extraction request parameters."""
+    incremental: bool = False
+
+
 @router.post("/extract", response_model=ProcessResponse)
-async def extract_metadata():
+async def extract_metadata(request: ExtractRequest | None = None):
     """Extract metadata from filenames using patterns.
 
     Processes files without pattern match and extracts:
@@ -273,9 +281,16 @@ async def extract_metadata():
     - region
     - event_type
     - episode
+
+    Args:
+        incremental: Re-extract only files whose stored pattern-set version is
+            stale or whose winning/candidate patterns changed
     """
     try:
-        stats = run_pattern_extraction()
+        if request and request.incremental:
+            stats = run_incremental_extraction()
+        else:
+            stats = run_pattern_extraction()
         return ProcessResponse(
             success=True,
             message=(
@@ -359,7 +374,9 @@ class PipelineRequest(BaseModel):
     folder_type: FolderTypeEnum = FolderTypeEnum.BOTH
     origin_path: str = "Y:/WSOP Backup"
     archive_path: str = "Z:/archive"
+    probe_media: bool = False
     extract: bool = True
+    extract_incremental: bool = False
     group: bool = True
     match: bool = True
     min_match_score: float = 0.5
@@ -385,12 +402,16 @@ async def run_full_pipeline(request: PipelineRequest):
                 archive_path=request.archive_path,
                 mode=ScanMode(request.scan_mode.value),
                 folder_type=FolderType(request.folder_type.value),
+                probe_media=request.probe_media,
             )
             all_stats['scan'] = run_scan(config)
 
         # 2. Extract
         if request.extract:
-            all_stats['extract'] = run_pattern_extraction()
+            if request.extract_incremental:
+                all_stats['extract'] = run_incremental_extraction()
+            else:
+                all_stats['extract'] = run_pattern_extraction()
 
         # 3. Group
         if request.group:
@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from ..database import AssetGroup, EventType, NasFile, Region, get_db
+from ..database import AssetGroup, EventType, NasFile, Region, get_db, invalidate_code_lookup
 from ..schemas import (
     EventTypeCreate,
     EventTypeResponse,
@@ -52,6 +52,7 @@ async def create_region(data: RegionCreate, db: Session = Depends(get_db)):
     db.add(region)
     db.commit()
     db.refresh(region)
+    invalidate_code_lookup()
     return region
 
 
@@ -78,6 +79,7 @@ async def update_region(
 
     db.commit()
     db.refresh(region)
+    invalidate_code_lookup()
     return region
 
 
@@ -105,6 +107,7 @@ async def delete_region(region_id: int, db: Session = Depends(get_db)):
 
     db.delete(region)
     db.commit()
+    invalidate_code_lookup()
     return MessageResponse(message=f"Region '{region.code}' deleted")
 
 
@@ -143,6 +146,7 @@ async def create_event_type(data: EventTypeCreate, db: Session = Depends(get_db)
     db.add(event_type)
     db.commit()
     db.refresh(event_type)
+    invalidate_code_lookup()
     return event_type
 
 
@@ -169,6 +173,7 @@ async def update_event_type(
 
     db.commit()
     db.refresh(event_type)
+    invalidate_code_lookup()
     return event_type
 
 
@@ -196,4 +201,5 @@ async def delete_event_type(type_id: int, db: Session = Depends(get_db)):
 
     db.delete(event_type)
     db.commit()
+    invalidate_code_lookup()
     return MessageResponse(message=f"Event type '{event_type.code}' deleted")
@@ -17,8 +17,10 @@ from .common import (
     YearStats,
 )
 from .exclusion import (
+    ExclusionReapplyResult,
     ExclusionRuleBase,
     ExclusionRuleCreate,
+    ExclusionRuleDelta,
     ExclusionRuleListResponse,
     ExclusionRuleResponse,
     ExclusionRuleTestRequest,
@@ -52,6 +54,9 @@ from .pattern import (
     PatternAffectedFiles,
     PatternBase,
     PatternCreate,
+    PatternPreviewChange,
+    PatternPreviewRequest,
+    PatternPreviewResponse,
     PatternReorder,
     PatternResponse,
     PatternTestRequest,
@@ -85,6 +90,9 @@ __all__ = [
     "PatternTestRequest",
     "PatternTestResult",
     "PatternAffectedFiles",
+    "PatternPreviewRequest",
+    "PatternPreviewChange",
+    "PatternPreviewResponse",
     # File
     "NasFileBase",
     "NasFileCreate",
@@ -114,4 +122,6 @@ __all__ = [
     "ExclusionRuleListResponse",
     "ExclusionRuleTestRequest",
     "ExclusionRuleTestResult",
+    "ExclusionRuleDelta",
+    "ExclusionReapplyResult",
 ]
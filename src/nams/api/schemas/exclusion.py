@@ -73,3 +73,24 @@ class ExclusionRuleTestResult(BaseModel):
     """Result of exclusion rule test."""
     would_exclude: bool
     reason: str
+
+
+class ExclusionRuleDelta(BaseModel):
+    """Per-rule change after re-applying exclusion rules."""
+    rule_id: int
+    rule: str | None = None  # None: rule was removed or deactivated
+    excluded: int
+    added: int
+    removed: int
+
+
+class ExclusionReapplyResult(BaseModel):
+    """Result of re-applying exclusion rules to all files."""
+    total_files: int
+    excluded_files: int
+    newly_excluded: int
+    un_excluded: int
+    reassigned: int
+    updated: int
+    rules: list[ExclusionRuleDelta]
+    elapsed_ms: float
@@ -74,6 +74,10 @@ class NasFileResponse(NasFileBase):
     asset_group_id: int | None = None
     role: str = "backup"
     role_priority: int | None = None
+    duration_sec: float | None = None
+    video_width: int | None = None
+    video_height: int | None = None
+    video_codec: str | None = None
     created_at: datetime
     updated_at: datetime
 
@@ -1,7 +1,7 @@
 """Pattern Pydantic schemas for NAMS API."""
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class PatternBase(BaseModel):
@@ -72,3 +72,39 @@ class PatternAffectedFiles(BaseModel):
     pattern_name: str
     affected_count: int
     sample_files: list[str]
+
+
+class PatternPreviewRequest(BaseModel):
+    """Pattern dry-run request (a new pattern, or an edit of pattern_id)."""
+    regex: str
+    priority: int
+    name: str = "PREVIEW"
+    pattern_id: int | None = None
+    extract_year: bool = True
+    extract_region: str | None = None
+    extract_type: str | None = None
+    extract_episode: bool = True
+    sample_size: int = Field(20, ge=0, le=100)
+
+
+class PatternPreviewChange(BaseModel):
+    """One file whose winning pattern would change."""
+    file_id: int
+    full_path: str
+    old_pattern: str
+    new_pattern: str
+    changed_fields: dict[str, list]  # field -> [old, new]
+
+
+class PatternPreviewResponse(BaseModel):
+    """Impact of a candidate pattern on the catalog."""
+    total_files: int
+    candidate_files: int  # Paths containing the regex's required literals
+    matched_files: int  # Paths the regex matches
+    captured: int  # Files the candidate would newly win
+    kept: int  # Files the edited pattern wins now and would keep
+    released: int  # Files the edited pattern would no longer win
+    captured_from: dict[str, int]  # Previous pattern -> file count
+    released_to: dict[str, int]  # New pattern -> file count
+    samples: list[PatternPreviewChange]
+    elapsed_ms: float
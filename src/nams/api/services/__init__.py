@@ -18,13 +18,13 @@ from .matching import (
     update_match_categories,
 )
 from .migration import run_migration
-from .pattern_engine import run_pattern_extraction
+from .pattern_engine import run_full_reprocess, run_incremental_extraction, run_pattern_extraction
 from .scanner import FolderType, ScanConfig, ScanMode, run_scan
 
 __all__ = [
     "run_migration",
     "run_scan", "ScanConfig", "ScanMode", "FolderType",
-    "run_pattern_extraction",
+    "run_pattern_extraction", "run_incremental_extraction", "run_full_reprocess",
     "run_grouping",
     "run_matching", "update_match_categories", "get_pokergo_only_episodes", "get_matching_summary",
     "MATCH_CATEGORY_MATCHED", "MATCH_CATEGORY_NAS_ONLY_HISTORIC",
@@ -0,0 +1,140 @@
+"""Maximum-weight bipartite assignment over sparse candidate lists.
+
+``max_weight_assignment(candidates)`` gives each row (a NAS group) at most one
+column (a PokerGO episode) and each column at most one row, maximizing the
+summed weight of the chosen pairs. Only listed (row, column) pairs may be
+chosen, so a row whose candidates are all taken stays unassigned.
+
+Rows are split into blocks that share no column and each block is solved on
+its own with shortest augmenting paths (the Jonker-Volgenant / Crouse
+method behind scipy's linear_sum_assignment), run as Dijkstra over the sparse
+edges. Every row also gets a private zero-weight "unassigned" column, so a
+block of n rows and E candidate pairs costs O(n * E log E) at worst and
+usually far less. Results are deterministic: rows are added in the given
+order and, between equally good assignments, a row added earlier keeps its
+column.
+"""
+import heapq
+from collections.abc import Hashable, Sequence
+from itertools import count
+
+INF = float('inf')
+
+Candidates = Sequence[Sequence[tuple[Hashable, float]]]
+
+
+def assignment_blocks(candidates: Candidates) -> list[list[int]]:
+    """Row indices grouped into blocks that share no column, in row order."""
+    parent = list(range(len(candidates)))
+
+    def find(row: int) -> int:
+        while parent[row] != row:
+            parent[row] = parent[parent[row]]
+            row = parent[row]
+        return row
+
+    owner: dict[Hashable, int] = {}
+    for row, edges in enumerate(candidates):
+        for column, _ in edges:
+            other = owner.setdefault(column, row)
+            if other != row:
+                a, b = find(other), find(row)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+    blocks: dict[int, list[int]] = {}
+    for row in range(len(candidates)):
+        blocks.setdefault(find(row), []).append(row)
+    return list(blocks.values())
+
+
+def _solve_block(candidates: Candidates, rows: list[int]) -> tuple[list[int], list[Hashable]]:
+    """Column position (or -1) per row of one block, in ``rows`` order, and the columns.
+
+    Minimizes cost = -weight; column m + k is row k's "unassigned" column.
+    """
+    positions: dict[Hashable, int] = {}
+    edges: list[list[tuple[int, float]]] = []
+    for row in rows:
+        edges.append([
+            (positions.setdefault(column, len(positions)), -weight)
+            for column, weight in candidates[row]
+        ])
+    m = len(positions)
+    for k, row_edges in enumerate(edges):
+        row_edges.append((m + k, 0.0))
+
+    u = [0.0] * len(rows)
+    v = [0.0] * (m + len(rows))
+    row4col = [-1] * len(v)
+    col4row = [-1] * len(rows)
+
+    for current in range(len(rows)):
+        path_cost: dict[int, float] = {}
+        path: dict[int, int] = {}  # column -> row it was reached from
+        done: set[int] = set()  # columns whose path cost is final
+        visited: list[int] = []  # assigned rows the search passed through
+        heap: list[tuple[float, int, int]] = []
+        tie = count()
+        i, min_val, sink = current, 0.0, -1
+
+        while sink < 0:
+            for j, cost in edges[i]:
+                if j in done:
+                    continue
+                reduced = min_val + cost - u[i] - v[j]
+                if reduced < path_cost.get(j, INF):
+                    path_cost[j] = reduced
+                    path[j] = i
+                    heapq.heappush(heap, (reduced, next(tie), j))
+            while True:
+                min_val, _, j = heapq.heappop(heap)
+                if j not in done and min_val == path_cost[j]:
+                    break
+            done.add(j)
+            if row4col[j] < 0:
+                sink = j
+            else:
+                i = row4col[j]
+                visited.append(i)
+
+        # Keep reduced costs non-negative, then flip the path
+        u[current] += min_val
+        for i in visited:
+            u[i] += min_val - path_cost[col4row[i]]
+        for j in done:
+            v[j] -= min_val - path_cost[j]
+        j = sink
+        while True:
+            i = path[j]
+            row4col[j] = i
+            col4row[i], j = j, col4row[i]
+            if i == current:
+                break
+
+    return [j if j < m else -1 for j in col4row], list(positions)
+
+
+def max_weight_assignment(candidates: Candidates) -> list[Hashable | None]:
+    """Column assigned to each row (None if unassigned), maximizing total weight.
+
+    Args:
+        candidates: Per row, its allowed (column, weight) pairs; weights > 0
+            (apply any minimum-score cutoff before calling)
+
+    Returns:
+        One column or None per row; no column is used twice
+    """
+    result: list[Hashable | None] = [None] * len(candidates)
+    for rows in assignment_blocks(candidates):
+        if len(rows) == 1:
+            # Single row: its best candidate (first one on ties)
+            edges = candidates[rows[0]]
+            if edges:
+                result[rows[0]] = max(edges, key=lambda edge: edge[1])[0]
+            continue
+        chosen, columns = _solve_block(candidates, rows)
+        for row, j in zip(rows, chosen):
+            if j >= 0:
+                result[row] = columns[j]
+    return result
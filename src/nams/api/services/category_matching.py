@@ -7,12 +7,15 @@ Phase 2: 하이브리드 매칭 엔진
 """
 import re
 from dataclasses import dataclass
+from itertools import chain
+from typing import NamedTuple
 
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from ..database import get_db_context
 from ..database.models import Category, CategoryEntry, PokergoEpisode
+from .matching import get_pokergo_titles
 
 # =============================================================================
 # Match Type Constants
@@ -91,15 +94,34 @@ def extract_event_num_from_text(text: str) -> int | None:
     return int(match.group(1)) if match else None
 
 
-def extract_pokergo_key(episode: PokergoEpisode) -> MatchKey | None:
-    """PokerGO 에피소드에서 매칭 키 추출."""
+def _cached_year(cached: int | None, text: str) -> int | None:
+    """pokergo_titles 연도(19xx/20xx 첫 매치)를 extract_year_from_text 결과로 변환.
+
+    첫 매치가 1970-2029 범위면 그대로 같은 결과, 범위 밖일 때만 다시 검색.
+    """
+    if cached is None:
+        return None
+    if 1970 <= cached <= 2029:
+        return cached
+    return extract_year_from_text(text)
+
+
+def extract_pokergo_key(episode: PokergoEpisode, cached=None) -> MatchKey | None:
+    """PokerGO 에피소드에서 매칭 키 추출.
+
+    Args:
+        cached: pokergo_titles 행 (matching.get_pokergo_titles), 있으면 연도/Event# 재사용
+    """
     title = episode.title or ""
     season = episode.season_title or ""
     collection = episode.collection_title or ""
     all_text = f"{title} {season} {collection}".lower()
 
     # Year extraction (season_title이 가장 신뢰도 높음)
-    year = extract_year_from_text(season) or extract_year_from_text(title)
+    if cached is not None:
+        year = _cached_year(cached.season_year, season) or _cached_year(cached.title_year, title)
+    else:
+        year = extract_year_from_text(season) or extract_year_from_text(title)
     if not year:
         return None
 
@@ -134,7 +156,9 @@ def extract_pokergo_key(episode: PokergoEpisode) -> MatchKey | None:
     # Episode/Event number
     episode_num = extract_episode_from_text(title)
     # Bracelet Events인 경우 Event # 추출
-    event_num = extract_event_num_from_text(title) if event_type == 'BR' else None
+    event_num = None
+    if event_type == 'BR':
+        event_num = cached.event_num if cached is not None else extract_event_num_from_text(title)
 
     return MatchKey(
         year=year,
@@ -253,41 +277,78 @@ def calculate_match_score(entry_key: MatchKey, pg_key: MatchKey) -> tuple[float,
     return min(score, 1.0), " | ".join(reasons)
 
 
+class CandidateBlock(NamedTuple):
+    """find_best_match 1단계 후보와 번호 -> 첫 후보 위치 맵."""
+    candidates: list[tuple[PokergoEpisode, MatchKey]]
+    by_event_num: dict[int, int]
+    by_episode: dict[int, int]
+
+
+class MatchKeyIndex:
+    """PokerGO MatchKey 버킷 인덱스: (year, region) -> event_type -> 에피소드.
+
+    실행당 1회 생성. ``candidates()``는 Year+Region+EventType 선형 필터와 같은
+    후보를 같은 에피소드 순서로 돌려주며, (year, region, event_type)별로
+    메모이즈된다. Episode/Event# 정확 매칭은 dict 조회로 끝난다.
+    """
+
+    def __init__(self, episodes: list[PokergoEpisode], episode_keys: dict):
+        # (year, region) -> event_type -> [(position, episode, key)]
+        self._buckets: dict[tuple, dict[str | None, list]] = {}
+        self._blocks: dict[tuple, CandidateBlock] = {}
+        for position, ep in enumerate(episodes):
+            pg_key = episode_keys.get(ep.id)
+            if not pg_key:
+                continue
+            by_type = self._buckets.setdefault((pg_key.year, pg_key.region or 'LV'), {})
+            by_type.setdefault(pg_key.event_type or None, []).append((position, ep, pg_key))
+
+    def candidates(self, entry_key: MatchKey) -> CandidateBlock:
+        """Year/Region(None=LV) 일치, EventType은 양쪽 모두 있을 때만 일치 요구."""
+        event_type = entry_key.event_type or None
+        block_key = (entry_key.year, entry_key.region or 'LV', event_type)
+        block = self._blocks.get(block_key)
+        if block is None:
+            by_type = self._buckets.get(block_key[:2], {})
+            if event_type:
+                # 같은 타입 + 타입 없는 에피소드
+                rows = chain(by_type.get(event_type, ()), by_type.get(None, ()))
+            else:
+                rows = chain.from_iterable(by_type.values())
+            candidates = [(ep, pg_key) for _, ep, pg_key in sorted(rows, key=lambda r: r[0])]
+
+            by_event_num: dict[int, int] = {}
+            by_episode: dict[int, int] = {}
+            for i, (_, pg_key) in enumerate(candidates):
+                if pg_key.event_num is not None:
+                    by_event_num.setdefault(pg_key.event_num, i)
+                if pg_key.episode is not None:
+                    by_episode.setdefault(pg_key.episode, i)
+            block = CandidateBlock(candidates, by_event_num, by_episode)
+            self._blocks[block_key] = block
+        return block
+
+
 def find_best_match(
     entry: CategoryEntry,
     category: Category,
-    episodes: list[PokergoEpisode],
-    episode_keys: dict,
+    episodes: 'list[PokergoEpisode] | MatchKeyIndex',
+    episode_keys: dict | None = None,
 ) -> MatchResult:
     """CategoryEntry에 가장 적합한 PokerGO 에피소드 찾기.
 
     보수적 매칭: 확실한 1:1 매칭만 EXACT, 나머지는 NONE
+
+    Args:
+        episodes: 에피소드 목록(+ episode_keys) 또는 실행당 1회 만든 MatchKeyIndex
     """
+    if not isinstance(episodes, MatchKeyIndex):
+        episodes = MatchKeyIndex(episodes, episode_keys or {})
     entry_key = extract_entry_key(entry, category)
 
-    # 1단계: Year+Region+EventType 일치하는 후보 찾기
-    candidates = []
-    for ep in episodes:
-        pg_key = episode_keys.get(ep.id)
-        if not pg_key:
-            continue
-
-        # Year 일치 필수
-        if entry_key.year != pg_key.year:
-            continue
-
-        # Region 일치 (None은 LV로 취급)
-        entry_region = entry_key.region or 'LV'
-        pg_region = pg_key.region or 'LV'
-        if entry_region != pg_region:
-            continue
-
-        # EventType 일치
-        if entry_key.event_type and pg_key.event_type:
-            if entry_key.event_type != pg_key.event_type:
-                continue
-
-        candidates.append((ep, pg_key))
+    # 1단계: Year+Region+EventType 일치하는 후보 찾기 (버킷 조회)
+    block = episodes.candidates(entry_key)
+    candidates = block.candidates
 
     # 후보가 없으면 NONE
     if not candidates:
@@ -297,30 +358,32 @@ def find_best_match(
             reason="No candidates found",
         )
 
-    # 2단계: Episode/Event# 번호로 정확히 매칭되는 후보 찾기
+    # 2단계: Episode/Event# 번호로 정확히 매칭되는 후보 찾기 (첫 후보 우선)
     exact_match = None
     exact_reason = ""
 
-    for ep, pg_key in candidates:
+    event_hit = (
+        block.by_event_num.get(entry_key.event_num)
+        if entry_key.event_num is not None else None
+    )
+    episode_hit = (
+        block.by_episode.get(entry_key.episode)
+        if entry_key.episode is not None else None
+    )
+    if event_hit is not None and (episode_hit is None or event_hit <= episode_hit):
         # Bracelet Event: Event# 번호로 매칭
-        if entry_key.event_num is not None and pg_key.event_num is not None:
-            if entry_key.event_num == pg_key.event_num:
-                exact_match = ep
-                exact_reason = (
-                    f"Year={entry_key.year} | Type={entry_key.event_type} | "
-                    f"Event#{entry_key.event_num}"
-                )
-                break
-
+        exact_match = candidates[event_hit][0]
+        exact_reason = (
+            f"Year={entry_key.year} | Type={entry_key.event_type} | "
+            f"Event#{entry_key.event_num}"
+        )
+    elif episode_hit is not None:
         # Episode 번호로 매칭
-        if entry_key.episode is not None and pg_key.episode is not None:
-            if entry_key.episode == pg_key.episode:
-                exact_match = ep
-                exact_reason = (
-                    f"Year={entry_key.year} | Type={entry_key.event_type} | "
-                    f"Episode={entry_key.episode}"
-                )
-                break
+        exact_match = candidates[episode_hit][0]
+        exact_reason = (
+            f"Year={entry_key.year} | Type={entry_key.event_type} | "
+            f"Episode={entry_key.episode}"
+        )
 
     # 번호로 정확히 매칭되면 EXACT
     if exact_match:
@@ -410,12 +473,14 @@ def run_category_matching(
     if not episodes:
         return stats
 
-    # Pre-compute episode keys
+    # Pre-compute episode keys (years/Event# from the pokergo_titles cache), bucketed once
+    titles = get_pokergo_titles(db, episodes)
     episode_keys = {}
     for ep in episodes:
-        key = extract_pokergo_key(ep)
+        key = extract_pokergo_key(ep, titles.get(ep.id))
         if key:
             episode_keys[ep.id] = key
+    index = MatchKeyIndex(episodes, episode_keys)
 
     # Load categories for lookup
     categories = {c.id: c for c in db.query(Category).all()}
@@ -436,7 +501,7 @@ def run_category_matching(
             continue
 
         category = categories.get(entry.category_id)
-        result = find_best_match(entry, category, episodes, episode_keys)
+        result = find_best_match(entry, category, index)
 
         # Apply result
         if result.score >= min_score:
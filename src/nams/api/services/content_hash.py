@@ -0,0 +1,124 @@
+"""Partial-content hash: rename-proof identity of large media files.
+
+Hashing whole multi-GB recordings over SMB is too slow, so a file's content
+hash covers its size plus three samples of HASH_SAMPLE_BYTES (start, middle,
+end), each read with one large unbuffered read; files smaller than three
+samples are hashed whole. Two files with the same hash are copies of each
+other in practice (recordings differ in every sample), whatever their names
+or drives.
+
+Hashes are stored on NasFile with the fingerprint the file had when it was
+hashed (``hash_fingerprint``), so a file is hashed again only after the
+scanner sees its mtime or size change. Changing HASH_SAMPLE_BYTES makes
+stored hashes incomparable with new ones (clear content_hash to rehash).
+"""
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from ..database import BULK_CHUNK_SIZE, BulkUpdater, NasFile
+
+# Bytes read at the start, middle and end of a file
+HASH_SAMPLE_BYTES = 2 * 1024 * 1024
+
+# Concurrent hashes (bandwidth bound: fewer than the media probe)
+HASH_WORKERS = 4
+
+
+def _read_into(f, view: memoryview) -> int:
+    """Fill view from f (raw reads may return short); bytes read."""
+    total = 0
+    while total < len(view):
+        count = f.readinto(view[total:])
+        if not count:
+            break
+        total += count
+    return total
+
+
+def partial_hash(path: str) -> str:
+    """Hex blake2b-128 of the file size and its start / middle / end samples.
+
+    Raises:
+        OSError: The file could not be read
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    buffer = bytearray(HASH_SAMPLE_BYTES)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        digest.update(size.to_bytes(8, 'little'))
+        if size <= 3 * HASH_SAMPLE_BYTES:
+            while count := _read_into(f, view):
+                digest.update(view[:count])
+        else:
+            for offset in (0, (size - HASH_SAMPLE_BYTES) // 2, size - HASH_SAMPLE_BYTES):
+                f.seek(offset)
+                digest.update(view[:_read_into(f, view)])
+    return digest.hexdigest()
+
+
+def _hash(path: str) -> tuple[str | None, str | None]:
+    try:
+        return partial_hash(path), None
+    except OSError as e:
+        return None, str(e)
+
+
+def run_content_hash(db: Session, workers: int = HASH_WORKERS,
+                     chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+    """Hash files whose fingerprint changed since they were last hashed.
+
+    Files are hashed concurrently by ``workers`` threads; every chunk of
+    results is written and committed. Unreadable files are left unhashed
+    and retried next time.
+
+    Returns:
+        Hash statistics
+    """
+    stats = {
+        'candidates': 0,
+        'cached': 0,
+        'hashed': 0,
+        'errors': [],
+    }
+
+    present = NasFile.last_seen_at.is_(None)  # not flagged missing
+    stale = or_(
+        NasFile.hash_fingerprint.is_(None),
+        NasFile.fingerprint.is_(None),
+        NasFile.hash_fingerprint != NasFile.fingerprint,
+    )
+    rows = db.execute(
+        select(NasFile.id, NasFile.full_path, NasFile.fingerprint)
+        .where(present, stale)
+        .order_by(NasFile.full_path)
+    ).all()
+    stats['candidates'] = len(rows)
+    stats['cached'] = db.query(NasFile).filter(present, ~stale).count()
+    print(f"[Hash] {len(rows)} files to hash, {stats['cached']} cached")
+
+    with (
+        ThreadPoolExecutor(max_workers=workers) as pool,
+        BulkUpdater(db, NasFile, chunk_size) as updater,
+    ):
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            results = pool.map(_hash, [row.full_path for row in chunk])
+            for row, (content_hash, error) in zip(chunk, results):
+                if error is not None:
+                    if len(stats['errors']) < 10:
+                        stats['errors'].append(error)
+                    continue
+                stats['hashed'] += 1
+                updater.add({
+                    'id': row.id,
+                    'content_hash': content_hash,
+                    'hash_fingerprint': row.fingerprint,
+                })
+
+    print(f"[Hash] Hashed {stats['hashed']} files ({len(stats['errors'])} errors)")
+    return stats
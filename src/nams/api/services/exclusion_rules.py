@@ -0,0 +1,553 @@
+"""Compiled exclusion rules shared by the scanner, rule previews and exports."""
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    update,
+)
+from sqlalchemy.orm import Session
+
+from ..database import ExclusionRule, NasFile
+
+# Joins filename and path into one search text (cannot occur in either)
+_SEPARATOR = "\0"
+
+# Rows per executemany INSERT into the reapply staging table
+STAGING_CHUNK = 5000
+
+# Characters str.lower() turns into ASCII (U+0130 -> "i\u0307", KELVIN SIGN -> "k");
+# SQLite's LIKE folds ASCII letters only
+_LOWER_TO_ASCII = ("\u0130", "\u212a")
+_SQLITE_INT = range(-2**63, 2**63)
+
+
+@dataclass
+class ExclusionCheckResult:
+    """Result of exclusion check."""
+    excluded: bool
+    reason: str | None = None
+    rule_id: int | None = None
+
+
+class RuleSpec(NamedTuple):
+    """An exclusion rule that is not stored (exports, previews); ExclusionRule rows also fit."""
+    id: object
+    rule_type: str
+    operator: str
+    value: str
+
+
+class CompiledRule(NamedTuple):
+    """One rule with its threshold parsed / keyword lowercased once."""
+    id: object
+    rule_type: str
+    operator: str
+    value: str
+    threshold: int | None
+    keyword: str | None
+
+
+def _compile_rule(rule) -> CompiledRule | None:
+    """Compile one rule; None for rules that can never match (bad value, unknown type)."""
+    if rule.rule_type in ("size", "duration"):
+        if rule.operator not in ("lt", "gt", "eq"):
+            return None
+        try:
+            threshold = int(rule.value)
+        except (TypeError, ValueError):
+            return None
+        return CompiledRule(rule.id, rule.rule_type, rule.operator, rule.value, threshold, None)
+    if rule.rule_type == "keyword" and rule.operator in ("contains", "eq"):
+        keyword = (rule.value or "").lower()
+        return CompiledRule(rule.id, rule.rule_type, rule.operator, rule.value, None, keyword)
+    return None
+
+
+def _compare(operator: str, number: int, threshold: int) -> bool:
+    if operator == "lt":
+        return number < threshold
+    if operator == "gt":
+        return number > threshold
+    return number == threshold
+
+
+class ExclusionRuleSet:
+    """Exclusion rules compiled for evaluating many files.
+
+    Rules are tried in order and the first one that matches is the reason a
+    file is excluded (same as evaluating the ExclusionRule rows one by one).
+
+    - size / duration: ``lt``, ``gt``, ``eq`` against an int threshold parsed
+      once; duration rules are skipped when the duration is unknown
+    - keyword ``contains``: case-insensitive substring of the filename or the
+      full path. All keywords form one regex alternation that is searched
+      once per file, so files without any keyword (most of them) skip every
+      keyword rule
+    - keyword ``eq``: case-insensitive equality with the filename
+
+    Rules with a non-numeric threshold or an unknown type/operator never match.
+    """
+
+    def __init__(self, rules):
+        self.rules: list[CompiledRule] = [
+            compiled for compiled in map(_compile_rule, rules) if compiled is not None
+        ]
+        keywords = sorted({
+            rule.keyword for rule in self.rules
+            if rule.rule_type == "keyword" and rule.operator == "contains"
+        })
+        self._keywords = (
+            re.compile("|".join(map(re.escape, keywords))) if keywords else None
+        )
+
+    @classmethod
+    def load(cls, db: Session) -> 'ExclusionRuleSet':
+        """Compile the active rules from the database (id order)."""
+        rules = db.query(ExclusionRule).filter(ExclusionRule.is_active).order_by(ExclusionRule.id)
+        return cls(rules.all())
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @staticmethod
+    def reason(rule: CompiledRule, filename: str, size_bytes: int,
+               duration_sec: int | None = None) -> str:
+        """Human-readable reason a rule matched."""
+        if rule.rule_type == "size":
+            if rule.operator == "eq":
+                return f"Size equals {rule.threshold:,} bytes"
+            sign = "<" if rule.operator == "lt" else ">"
+            return f"Size {size_bytes:,} bytes {sign} {rule.threshold:,} bytes"
+        if rule.rule_type == "duration":
+            if rule.operator == "eq":
+                return f"Duration equals {rule.threshold}s"
+            sign = "<" if rule.operator == "lt" else ">"
+            return f"Duration {duration_sec}s {sign} {rule.threshold}s"
+        if rule.operator == "eq":
+            return f"Filename equals '{rule.value}'"
+        return f"Contains keyword '{rule.value}'"
+
+    def _matches(self, rule: CompiledRule, filename_lower: str, text: str | None,
+                 size_bytes: int, duration_sec: int | None) -> bool:
+        if rule.rule_type == "size":
+            return _compare(rule.operator, size_bytes, rule.threshold)
+        if rule.rule_type == "duration":
+            return duration_sec is not None and _compare(rule.operator, duration_sec,
+                                                         rule.threshold)
+        if rule.operator == "eq":
+            return filename_lower == rule.keyword
+        return text is not None and rule.keyword in text
+
+    def _search_text(self, filename_lower: str, full_path: str | None) -> str | None:
+        """Lowercased filename + path, or None when no keyword occurs in them."""
+        if self._keywords is None:
+            return None
+        text = filename_lower
+        if full_path:
+            text = f"{filename_lower}{_SEPARATOR}{full_path.lower()}"
+        return text if self._keywords.search(text) else None
+
+    def first_match(self, filename: str, size_bytes: int, full_path: str | None = None,
+                    duration_sec: int | None = None) -> CompiledRule | None:
+        """First rule matching a file, or None."""
+        filename_lower = filename.lower()
+        text = self._search_text(filename_lower, full_path)
+        for rule in self.rules:
+            if self._matches(rule, filename_lower, text, size_bytes, duration_sec):
+                return rule
+        return None
+
+    def matches(self, filename: str, size_bytes: int, full_path: str | None = None,
+                duration_sec: int | None = None) -> list:
+        """Ids of every rule matching a file, in rule order."""
+        filename_lower = filename.lower()
+        text = self._search_text(filename_lower, full_path)
+        return [
+            rule.id for rule in self.rules
+            if self._matches(rule, filename_lower, text, size_bytes, duration_sec)
+        ]
+
+    def check(self, filename: str, size_bytes: int, full_path: str | None = None,
+              duration_sec: int | None = None) -> ExclusionCheckResult:
+        """Check one file: excluded by the first matching rule, with its reason."""
+        rule = self.first_match(filename, size_bytes, full_path, duration_sec)
+        if rule is None:
+            return ExclusionCheckResult(excluded=False)
+        return ExclusionCheckResult(
+            excluded=True,
+            reason=self.reason(rule, filename, size_bytes, duration_sec),
+            rule_id=rule.id,
+        )
+
+    def evaluate(self, filenames: list[str], sizes: list[int],
+                 full_paths: list[str | None] | None = None,
+                 durations: list[int | None] | None = None) -> list[int | None]:
+        """Columnar batch: index into ``rules`` of each file's first matching rule.
+
+        Rules are applied one at a time to the files no earlier rule matched,
+        so a size threshold is a single comparison sweep over the size column
+        and keyword rules only look at files the keyword regex found.
+
+        Returns:
+            One rule index (or None) per file
+        """
+        n = len(sizes)
+        result: list[int | None] = [None] * n
+        undecided = list(range(n))
+        # Built on first use for the files still undecided then (a subset
+        # of those is all later keyword rules look at)
+        lowered: dict[int, str] | None = None
+        texts: dict[int, str] | None = None
+
+        for index, rule in enumerate(self.rules):
+            if not undecided:
+                break
+            op, threshold = rule.operator, rule.threshold
+            if rule.rule_type == "size":
+                if op == "lt":
+                    hit = [i for i in undecided if sizes[i] < threshold]
+                elif op == "gt":
+                    hit = [i for i in undecided if sizes[i] > threshold]
+                else:
+                    hit = [i for i in undecided if sizes[i] == threshold]
+            elif rule.rule_type == "duration":
+                if durations is None:
+                    continue
+                hit = [
+                    i for i in undecided
+                    if durations[i] is not None and _compare(op, durations[i], threshold)
+                ]
+            else:
+                if lowered is None:
+                    lowered = {i: filenames[i].lower() for i in undecided}
+                if op == "eq":
+                    hit = [i for i in undecided if lowered[i] == rule.keyword]
+                else:
+                    if texts is None:
+                        # Only files containing some keyword get a search text
+                        texts = {}
+                        for i in undecided:
+                            path = full_paths[i] if full_paths is not None else None
+                            text = self._search_text(lowered[i], path)
+                            if text is not None:
+                                texts[i] = text
+                    keyword = rule.keyword
+                    hit = [i for i in undecided if i in texts and keyword in texts[i]]
+
+            if hit:
+                for i in hit:
+                    result[i] = index
+                decided = set(hit)
+                undecided = [i for i in undecided if i not in decided]
+        return result
+
+    def check_batch(self, files) -> list[ExclusionCheckResult]:
+        """Check (filename, size_bytes, full_path, duration_sec) tuples in one batch."""
+        files = list(files)
+        filenames = [f[0] for f in files]
+        sizes = [f[1] for f in files]
+        full_paths = [f[2] for f in files]
+        durations = [f[3] for f in files]
+        indexes = self.evaluate(filenames, sizes, full_paths, durations)
+
+        results = []
+        for (filename, size_bytes, _, duration_sec), index in zip(files, indexes):
+            if index is None:
+                results.append(ExclusionCheckResult(excluded=False))
+            else:
+                rule = self.rules[index]
+                results.append(ExclusionCheckResult(
+                    excluded=True,
+                    reason=self.reason(rule, filename, size_bytes, duration_sec),
+                    rule_id=rule.id,
+                ))
+        return results
+
+
+def _like(column: str, keyword: str, params: list, anywhere: bool = False) -> str:
+    """``column LIKE ?`` matching ``keyword`` literally (or anywhere in the column)."""
+    escaped = keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    wildcard = "%" if anywhere else ""
+    params.append(f"{wildcard}{escaped}{wildcard}")
+    if escaped == keyword:
+        return f"{column} LIKE ?"
+    return f"{column} LIKE ? ESCAPE '\\'"
+
+
+def _reason_sql(rule: CompiledRule) -> tuple[str, list, str]:
+    """SQL for ExclusionRuleSet.reason of a rule: (expression, parameters, guard).
+
+    The guard holds where the expression renders exactly what Python would:
+    a size is an integer, and a duration reads back as the same number from
+    its SQLite text, in a range where neither side uses an exponent (SQLite
+    switches to one at 1e15, repr at 1e16).
+    """
+    if rule.rule_type in ("size", "duration") and rule.operator == "eq":
+        return "?", [ExclusionRuleSet.reason(rule, "", 0)], "1"
+    sign = "<" if rule.operator == "lt" else ">"
+    if rule.rule_type == "size":
+        return ("('Size ' || printf('%,d', size_bytes) || ?)",
+                [f" bytes {sign} {rule.threshold:,} bytes"], "typeof(size_bytes) = 'integer'")
+    if rule.rule_type == "duration":
+        return ("('Duration ' || duration_sec || ?)", [f"s {sign} {rule.threshold}s"],
+                "abs(duration_sec) >= 0.0001 AND abs(duration_sec) < 1e15 "
+                "AND CAST(CAST(duration_sec AS TEXT) AS REAL) = duration_sec")
+    return "?", [ExclusionRuleSet.reason(rule, "", 0)], "1"
+
+
+def _changed_rule_sql(rules: ExclusionRuleSet) -> tuple[str, list] | None:
+    """SQL expression for how the exclusion state of a nas_files row changes.
+
+    A CASE finds the row's first matching rule like ``evaluate`` and compares
+    its id and reason with the stored ones: the rule's index into
+    ``rules.rules`` when the state changes to it, NULL when it changes to no
+    rule, -2 when it stays. Rows SQL cannot settle exactly are -1 and get
+    evaluated in Python: those whose lowercasing LIKE could get wrong, and
+    those whose reason ``_reason_sql`` would not render like Python. None
+    when a rule has no exact SQL form (huge threshold, NUL in a keyword,
+    non-int id).
+    """
+    keywords = [rule.keyword for rule in rules.rules if rule.rule_type == "keyword"]
+    if any(_SEPARATOR in keyword for keyword in keywords):
+        return None
+    if all(keyword.isascii() for keyword in keywords):
+        unsure = " OR ".join(["instr(filename, ?) OR instr(full_path, ?)"] * 2)
+        unsure_params = [char for char in _LOWER_TO_ASCII for _ in range(2)]
+    else:
+        unsure = ("length(CAST(filename AS BLOB)) != length(filename) "
+                  "OR length(CAST(full_path AS BLOB)) != length(full_path)")
+        unsure_params = []
+
+    branches = []
+    params = []
+    for index, rule in enumerate(rules.rules):
+        if not isinstance(rule.id, int) or rule.id not in _SQLITE_INT:
+            return None
+        if rule.rule_type == "keyword":
+            if unsure:  # before the first keyword rule
+                branches.append(f"WHEN {unsure} THEN -1")
+                params += unsure_params
+                unsure = None
+            condition_params = []
+            if rule.operator == "eq":
+                condition = _like("filename", rule.keyword, condition_params)
+            else:
+                condition = (f"({_like('filename', rule.keyword, condition_params, True)} "
+                             f"OR {_like('full_path', rule.keyword, condition_params, True)})")
+        else:
+            if rule.threshold not in _SQLITE_INT:
+                return None
+            column = "size_bytes" if rule.rule_type == "size" else "duration_sec"
+            sign = {"lt": "<", "gt": ">", "eq": "="}[rule.operator]
+            condition = f"{column} {sign} ?"
+            condition_params = [rule.threshold]
+        reason, reason_params, guard = _reason_sql(rule)
+        settled = "" if guard == "1" else f"WHEN NOT ({guard}) THEN -1 "
+        branches.append(
+            f"WHEN {condition} THEN CASE {settled}WHEN coalesce(is_excluded "
+            f"AND exclusion_rule_id IS {rule.id} AND exclusion_reason IS {reason}, 0) "
+            f"THEN -2 ELSE {index} END"
+        )
+        params += condition_params + reason_params
+    unchanged = ("WHEN coalesce(is_excluded AND (exclusion_rule_id IS NOT NULL "
+                 "OR exclusion_reason IS NOT NULL), 0) THEN NULL ELSE -2")
+    return f"CASE {' '.join(branches)} {unchanged} END", params
+
+
+def _rule_state_sql(rules: ExclusionRuleSet, index: str) -> tuple[str, str, list]:
+    """SQL for the rule id and the reason of rule number ``index``: (id, reason, parameters).
+
+    Both are NULL when ``index`` is NULL or -1. Rule ids are inlined (ints,
+    checked by ``_changed_rule_sql``); the parameters belong to the reason.
+    """
+    if not rules.rules:
+        return "NULL", "NULL", []
+    rule_ids = []
+    reasons = []
+    params = []
+    for i, rule in enumerate(rules.rules):
+        reason, reason_params, _ = _reason_sql(rule)
+        rule_ids.append(f"WHEN {i} THEN {rule.id}")
+        reasons.append(f"WHEN {i} THEN {reason}")
+        params += reason_params
+    return (f"CASE {index} {' '.join(rule_ids)} END",
+            f"CASE {index} {' '.join(reasons)} END", params)
+
+
+def reapply_exclusion_rules(db: Session, rules: ExclusionRuleSet | None = None) -> dict:
+    """Re-evaluate every NasFile against the current rules and update its flags.
+
+    Set-based in SQLite: one INSERT ... SELECT finds each file's first rule
+    (``_changed_rule_sql``) and stages the files whose flag, rule or reason
+    changes, with their new state, and one UPDATE ... FROM writes them, so
+    no row travels through Python. Only the files SQL cannot settle exactly
+    (non-ASCII lowercasing, odd durations) are evaluated in Python, in one
+    columnar batch (ExclusionRuleSet.evaluate); all of them when a rule has
+    no SQL form. The caller commits.
+
+    Args:
+        db: Database session
+        rules: Rules to apply (default: active rules from the database)
+
+    Returns:
+        Totals and, per rule (old or new), files now excluded by it and how
+        many it gained ('added') or lost ('removed')
+    """
+    start = time.perf_counter()
+    if rules is None:
+        rules = ExclusionRuleSet.load(db)
+
+    conn = db.connection()
+    counts = conn.exec_driver_sql(
+        "SELECT exclusion_rule_id, count(*) FROM nas_files "
+        "WHERE is_excluded AND exclusion_rule_id IS NOT NULL GROUP BY 1"
+    ).all()
+    total = conn.exec_driver_sql("SELECT count(*) FROM nas_files").scalar()
+
+    changed_rule = _changed_rule_sql(rules)
+    staging = _exclusion_staging()
+    staging.create(conn)
+    try:
+        if changed_rule is None:
+            # Everything is evaluated in Python (excluded NULL: not yet evaluated)
+            conn.exec_driver_sql(
+                "INSERT INTO exclusion_staging (id, old_rule_id) "
+                "SELECT id, CASE WHEN is_excluded THEN exclusion_rule_id END FROM nas_files"
+            )
+        else:
+            case, params = changed_rule
+            rule_id, reason, reason_params = _rule_state_sql(rules, "rule")
+            conn.exec_driver_sql(
+                f"WITH evaluated AS MATERIALIZED (SELECT id, {case} AS rule FROM nas_files) "
+                "INSERT INTO exclusion_staging (id, rule_id, reason, excluded, old_rule_id) "
+                f"SELECT id, {rule_id}, {reason}, "
+                "CASE rule WHEN -1 THEN NULL ELSE rule IS NOT NULL END, "
+                "CASE WHEN is_excluded THEN exclusion_rule_id END "
+                "FROM evaluated JOIN nas_files USING (id) WHERE rule IS NOT -2",
+                tuple(params + reason_params),
+            )
+        _evaluate_unsettled(conn, rules)
+
+        # Stored counts per rule, moved along with every file that changes rule
+        excluded_by = Counter(dict(counts))
+        stats = {
+            'total_files': total,
+            'excluded_files': 0,
+            'newly_excluded': 0,
+            'un_excluded': 0,
+            'reassigned': 0,
+            'updated': 0,
+        }
+        added = Counter()
+        removed = Counter()
+        moves = conn.exec_driver_sql(
+            "SELECT old_rule_id, rule_id, count(*) FROM exclusion_staging GROUP BY 1, 2"
+        )
+        for old_rule_id, rule_id, files in moves:
+            stats['updated'] += files
+            if old_rule_id == rule_id:
+                continue  # same rule, reason text changed
+            if old_rule_id is None:
+                stats['newly_excluded'] += files
+            elif rule_id is None:
+                stats['un_excluded'] += files
+            else:
+                stats['reassigned'] += files
+            if old_rule_id is not None:
+                removed[old_rule_id] += files
+                excluded_by[old_rule_id] -= files
+            if rule_id is not None:
+                added[rule_id] += files
+                excluded_by[rule_id] += files
+        stats['excluded_files'] = sum(excluded_by.values())
+
+        if stats['updated']:
+            conn.execute(update(NasFile.__table__).where(
+                NasFile.id == staging.c.id
+            ).values(
+                is_excluded=staging.c.excluded,
+                exclusion_rule_id=staging.c.rule_id,
+                exclusion_reason=staging.c.reason,
+                updated_at=datetime.utcnow(),
+            ))
+    finally:
+        staging.drop(conn)
+
+    labels = {rule.id: f"{rule.rule_type} {rule.operator} {rule.value}" for rule in rules.rules}
+    stats['rules'] = [
+        {
+            'rule_id': rule_id,
+            'rule': labels.get(rule_id),  # None: rule removed or inactive
+            'excluded': excluded_by[rule_id],
+            'added': added[rule_id],
+            'removed': removed[rule_id],
+        }
+        for rule_id in sorted(
+            set(labels) | set(removed) - {None},
+            key=lambda rule_id: (rule_id not in labels, rule_id),
+        )
+    ]
+    stats['elapsed_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return stats
+
+
+def _exclusion_staging() -> Table:
+    """Temporary table of the files a reapply changes: their new and old state."""
+    return Table(
+        'exclusion_staging',
+        MetaData(),
+        Column('id', Integer, primary_key=True),
+        Column('rule_id', Integer),
+        Column('reason', String),
+        Column('excluded', Boolean),  # NULL: left for Python to evaluate
+        Column('old_rule_id', Integer),
+        prefixes=['TEMPORARY'],
+    )
+
+
+def _evaluate_unsettled(conn, rules: ExclusionRuleSet) -> None:
+    """Evaluate the staged files SQL left to Python; keep only those that change."""
+    # Plain DB-API tuples: Row objects cost more than evaluating the rules.
+    # A file's current state is (rule id, reason), both NULL when not excluded.
+    cursor = conn.connection.cursor()
+    try:
+        rows = cursor.execute(
+            "SELECT id, filename, size_bytes, full_path, duration_sec, "
+            "CASE WHEN is_excluded THEN exclusion_rule_id END, "
+            "CASE WHEN is_excluded THEN exclusion_reason END "
+            "FROM nas_files WHERE id IN (SELECT id FROM exclusion_staging WHERE excluded IS NULL)"
+        ).fetchall()
+        cursor.execute("DELETE FROM exclusion_staging WHERE excluded IS NULL")
+    finally:
+        cursor.close()
+    if not rows:
+        return
+    ids, filenames, sizes, full_paths, durations, old_rule_ids, old_reasons = zip(*rows)
+    indexes = rules.evaluate(filenames, sizes, full_paths, durations)
+
+    compiled = rules.rules
+    changes = []
+    for i, index in enumerate(indexes):
+        if index is None:
+            rule_id = reason = None
+        else:
+            rule = compiled[index]
+            rule_id = rule.id
+            reason = rules.reason(rule, filenames[i], sizes[i], durations[i])
+        if rule_id != old_rule_ids[i] or reason != old_reasons[i]:
+            changes.append((ids[i], rule_id, reason, rule_id is not None, old_rule_ids[i]))
+    for offset in range(0, len(changes), STAGING_CHUNK):
+        conn.exec_driver_sql(
+            "INSERT INTO exclusion_staging VALUES (?, ?, ?, ?, ?)",
+            changes[offset:offset + STAGING_CHUNK],
+        )
@@ -105,37 +105,19 @@ def get_groups_data(db: Session) -> list[dict]:
     return result
 
 
+def _unmatched_episodes(db: Session) -> list[PokergoEpisode]:
+    """PokerGO only episodes (is_matched index), by collection and title."""
+    return db.query(PokergoEpisode).filter(
+        PokergoEpisode.is_matched.is_(False)
+    ).order_by(PokergoEpisode.collection_title, PokergoEpisode.title).all()
+
+
 def get_unmatched_pokergo_data(db: Session) -> list[dict]:
     """Get PokerGO episodes that are not matched to any NAS group."""
-    # Get all matched episode IDs
-    matched_ids = set(
-        g.pokergo_episode_id
-        for g in db.query(AssetGroup).filter(
-            AssetGroup.pokergo_episode_id.isnot(None)
-        ).all()
-    )
-
-    # Get unmatched episodes
-    if matched_ids:
-        unmatched = db.query(PokergoEpisode).filter(
-            ~PokergoEpisode.id.in_(matched_ids)
-        ).order_by(PokergoEpisode.collection_title, PokergoEpisode.title).all()
-    else:
-        unmatched = db.query(PokergoEpisode).order_by(
-            PokergoEpisode.collection_title, PokergoEpisode.title
-        ).all()
-
     result = []
-    for ep in unmatched:
+    for ep in _unmatched_episodes(db):
         # Extract year from title or collection
-        year = None
-        import re
-        for text in [ep.title, ep.collection_title]:
-            if text:
-                match = re.search(r'\b(19|20)\d{2}\b', text)
-                if match:
-                    year = int(match.group())
-                    break
+        year = _extract_year_from_text(ep.title, ep.collection_title)
 
         # Generate match reason for PokerGO Only
         if year and year < 2019:
@@ -520,24 +502,8 @@ def get_full_matching_data(db: Session) -> tuple[list[dict], list[dict]]:
         })
 
     # Get unmatched PokerGO episodes
-    matched_ids = set(
-        g.pokergo_episode_id
-        for g in db.query(AssetGroup).filter(
-            AssetGroup.pokergo_episode_id.isnot(None)
-        ).all()
-    )
-
-    if matched_ids:
-        unmatched_episodes = db.query(PokergoEpisode).filter(
-            ~PokergoEpisode.id.in_(matched_ids)
-        ).order_by(PokergoEpisode.collection_title, PokergoEpisode.title).all()
-    else:
-        unmatched_episodes = db.query(PokergoEpisode).order_by(
-            PokergoEpisode.collection_title, PokergoEpisode.title
-        ).all()
-
     unmatched_pokergo = []
-    for ep in unmatched_episodes:
+    for ep in _unmatched_episodes(db):
         # Extract year from title or collection
         year = _extract_year_from_text(ep.title, ep.collection_title)
 
@@ -0,0 +1,573 @@
+"""Single-pass field extractor for extended path metadata.
+
+Compiled equivalent of the per-field ``extract_*_from_path`` functions in
+``pattern_engine``, which stay the reference (and handle non-ASCII paths).
+The path is lowercased once and ``extract_path_fields`` fills every field in
+one pass: each rule is a precompiled, literal-led regex run only when a
+substring check says its literal occurs, and matches that several fields read
+(final table, day) are searched once. Rules a reference function tries in
+priority order are combined into one alternation per field (``_Rules``), so a
+field is usually settled by a single search. Digit-led rules are searched on a
+copy of the path with every digit replaced by 0 (``0000\\s*wsop`` instead of
+``(\\d{4})\\s*wsop``). Output is identical to the reference functions (see
+``scripts/test_field_extractor.py``).
+"""
+import os
+import re
+from dataclasses import dataclass
+
+# Part of every NasFile.extraction_version: bump whenever a change here (or in
+# pattern_engine's region/event type handling) can change extracted values, so
+# incremental extraction treats all files as stale.
+EXTRACTOR_VERSION = 1
+
+
+@dataclass(slots=True)
+class PathFields:
+    """Fields extracted from one full path."""
+    year: int | None = None
+    stage: str | None = None
+    event_num: int | None = None
+    buyin: str | None = None
+    gtd: str | None = None
+    version: str | None = None
+    part: int | None = None
+    event_type_code: str | None = None
+    episode: int | None = None
+    season: int | None = None
+
+
+def _rx(pattern: str) -> re.Pattern:
+    return re.compile(pattern)
+
+
+class _Rules:
+    """Regexes tried in priority order, found with one combined alternation.
+
+    The alternation (common literal prefix factored out, so the engine keeps
+    its fast literal search) reports, at each position where any rule matches,
+    the highest-priority rule matching there. The best rule over all those
+    positions, at its first such position, is the rule and match that trying
+    the rules one by one would find. Usually that takes a single search.
+    """
+
+    def __init__(self, patterns: list[str]):
+        self.rules = [_rx(pattern) for pattern in patterns]
+        n = 0
+        prefix = os.path.commonprefix(patterns)
+        while n < len(prefix) and prefix[n].isalnum():
+            n += 1
+        while n and any(p[n:n + 1] in ('?', '*', '+', '{') for p in patterns):
+            n -= 1  # don't split a quantified letter (wsope?)
+        self.keyword = prefix[:n]
+        self.any = _rx(prefix[:n] + '(?:' + '|'.join(f'({p[n:]})' for p in patterns) + ')')
+        # Combined-regex group of each rule -> (rule index, group of its value)
+        self._groups = {}
+        group = 1
+        for i, rule in enumerate(self.rules):
+            self._groups[group] = (i, group + 1 if rule.groups else None)
+            group += rule.groups + 1
+
+    def first(self, target: str, accept=None) -> tuple[int, str | None] | None:
+        """(rule index, group 1) of the first rule whose first match is accepted."""
+        best = best_value = None
+        m = self.any.search(target)
+        while m is not None:
+            rule, value_group = self._groups[m.lastindex]
+            if best is None or rule < best:
+                best, best_value = rule, m.group(value_group) if value_group else None
+                if rule == 0:
+                    break
+            # Matches start with the keyword; jump to its next occurrence
+            start = target.find(self.keyword, m.start() + 1)
+            m = self.any.search(target, start) if start >= 0 else None
+        if best is None or accept is None or accept(best_value):
+            return None if best is None else (best, best_value)
+
+        # Rejected: rules ahead of it match nowhere, try the ones after it
+        for i in range(best + 1, len(self.rules)):
+            found = self.rules[i].search(target)
+            if found:
+                value = found.group(1) if found.re.groups else None
+                if accept(value):
+                    return i, value
+        return None
+
+
+class _Preceded:
+    """``[chars]<regex>`` searched from the regex's leading literal.
+
+    Candidates of the literal-led regex never overlap a valid match, so the
+    first candidate preceded by one of ``chars`` is the leftmost match.
+    """
+
+    def __init__(self, chars: str, pattern: str):
+        self.chars = chars
+        self.regex = _rx(pattern)
+
+    def search(self, target: str) -> re.Match | None:
+        for m in self.regex.finditer(target):
+            start = m.start()
+            if start and target[start - 1] in self.chars:
+                return m
+        return None
+
+
+_ZERO_DIGITS = bytes.maketrans(b'123456789', b'000000000')
+
+
+def _zeroed(low: str) -> str:
+    """``low`` (ASCII) with every digit replaced by 0, same length.
+
+    A rule run on it matches at the same span as its ``\\d`` form on ``low``.
+    """
+    return low.encode('ascii').translate(_ZERO_DIGITS).decode('ascii')
+
+
+def _four_digits(low: str, m: re.Match) -> str:
+    return low[m.start():m.start() + 4]
+
+
+def _is_year(value: str) -> bool:
+    return 1970 <= int(value) <= 2030
+
+
+# Rules written in lowercase run case-sensitively against path.lower(), which
+# is equivalent to re.IGNORECASE on ASCII paths but keeps the regex engine's
+# literal-prefix fast search. Rules that were case-sensitive run on the path.
+
+# ---------------------------------------------------------------------------
+# Year
+# ---------------------------------------------------------------------------
+
+_YEAR_FILENAME_START = _rx(r'^(\d{4})\s+')
+_YEAR_FILENAME_WSOP = _Rules([
+    r'wsop[_\-](\d{4})',
+    r'wsop\s*-\s*(\d{4})',
+    r'wsope?-(\d{4})-',
+    r'wsope?\s*(\d{4})',
+])
+_PRE_YEAR = _rx(r'PRE-\d{4}')
+# Full-path rules in priority order: (\d{4})\s*wsop, these, (\d{4})\s*mpp, dashes
+_YEAR_BEFORE_WSOP = _rx(r'0000\s*wsop')  # on the zeroed path
+_YEAR_AFTER_WSOP = _Rules([
+    r'wsope?\s*(\d{4})',
+    r'wsop[_\-](\d{4})',
+    r'wsop\s*-\s*(\d{4})',
+])
+_YEAR_BEFORE_MPP = _rx(r'0000\s*mpp')
+_YEAR_WSOP_DASHES = _rx(r'wsope?-(\d{4})-')
+_YEAR_2DIGIT_WS = _Rules([
+    r'wsope?(\d{2})[_\-]',
+    r'ws(\d{2})[_\-]',
+])
+_YEAR_2DIGIT = _rx(r'[_\-](\d{2})[_\-]')
+_YEAR_FOLDER = _rx(r'[/\\](\d{4})[/\\]')
+_YEAR_FILENAME_GENERIC = _rx(r'\b(19[7-9]\d|20[0-2]\d)\b')
+
+
+def _year(path: str, low: str, zeroed: str, filename: str) -> int | None:
+    if filename[:1].isdigit():
+        m = _YEAR_FILENAME_START.match(filename)
+        if m and _is_year(m.group(1)):
+            return int(m.group(1))
+
+    filename_lower = filename.lower()
+    if 'wsop' in filename_lower:
+        hit = _YEAR_FILENAME_WSOP.first(filename_lower, _is_year)
+        if hit:
+            return int(hit[1])
+
+    # Remove PRE-XXXX (case-sensitive) before searching the full path
+    if 'PRE-' in path:
+        low = _PRE_YEAR.sub('', path).lower()
+        zeroed = _zeroed(low)
+
+    if 'wsop' in low:
+        m = _YEAR_BEFORE_WSOP.search(zeroed)
+        if m and _is_year(_four_digits(low, m)):
+            return int(_four_digits(low, m))
+        hit = _YEAR_AFTER_WSOP.first(low, _is_year)
+        if hit:
+            return int(hit[1])
+    if 'mpp' in low:
+        m = _YEAR_BEFORE_MPP.search(zeroed)
+        if m and _is_year(_four_digits(low, m)):
+            return int(_four_digits(low, m))
+    if 'wsop' in low:
+        m = _YEAR_WSOP_DASHES.search(low)
+        if m and _is_year(m.group(1)):
+            return int(m.group(1))
+
+    hit = m = None
+    if 'ws00' in zeroed or 'wsop00' in zeroed or 'wsope00' in zeroed:
+        hit = _YEAR_2DIGIT_WS.first(low)
+    if not hit and ('00_' in zeroed or '00-' in zeroed):
+        m = _YEAR_2DIGIT.search(low)
+    if hit or m:
+        y = int(hit[1] if hit else m.group(1))
+        return 2000 + y if y < 50 else 1900 + y
+
+    if '0000/' in zeroed or '0000\\' in zeroed:
+        m = _YEAR_FOLDER.search(low)
+        if m and _is_year(m.group(1)):
+            return int(m.group(1))
+
+    m = _YEAR_FILENAME_GENERIC.search(filename)
+    if m:
+        return int(m.group(1))
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Stage / event number / buy-in / GTD / version / part
+# ---------------------------------------------------------------------------
+
+_FINAL_TABLE = _rx(r'final\s*table')
+_FINAL_TABLE_DAY = _rx(r'final\s*table\s*day\s*(\d+)')
+# Stage reads the suffix; episode (day\s*(\d+)\s*[abcd]?) the same first match
+_DAY = _rx(r'day\s*(\d+)\s*([abcd])?')
+_SESSION = _rx(r'session\s*(\d+)')
+_EVENT_NUM = _rx(r'event\s*#?(\d+)')
+_HASH_NUM = _rx(r'#(\d+)\s')
+_BUYIN = _rx(r'\$(\d+(?:[.,]\d+)?[km]?)')
+_GTD = _rx(r'\$(\d+[mk]?)\s*gtd')
+_NO_COMMENTARY = _rx(r'no\s*commentary')
+_NB = _rx(r'_nb[_\.]')
+_PART = _rx(r'part[_\s\-]*(\d+)')
+_PART_WSOP = _rx(r'wsop[_\-]\d{4}[_\-](\d+)\.(?:mxf|mov|mp4)')
+_PART_WSOP_SPACE = _rx(r'wsop\s*-\s*\d{4}\s*-\s*(\d+)\.(?:mxf|mov|mp4)')
+_PART_TRAILING = _rx(r'[_\-](\d+)\.(?:mxf|mov|mp4)$')
+
+
+def _classic_part(filename_lower: str) -> int | None:
+    """Part from a CLASSIC era (up to 2002) file number: WSOP_2002_1.mxf."""
+    if 'wsop' in filename_lower:
+        m = _PART_WSOP.search(filename_lower)
+        if m and int(m.group(1)) <= 10:
+            return int(m.group(1))
+        m = _PART_WSOP_SPACE.search(filename_lower)
+        if m and int(m.group(1)) <= 10:
+            return int(m.group(1))
+    m = _PART_TRAILING.search(filename_lower)
+    if m and 1 <= int(m.group(1)) <= 10:
+        return int(m.group(1))
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Event type
+# ---------------------------------------------------------------------------
+
+# Types in priority order (ME, HR, HU, GM, FT, BR, BEST); the first type with
+# any hit wins. Folder variants ([/\\]Main\s*Event[/\\] etc.) are implied by
+# the plain keyword rules. Upper-case codes (_ME1) are case-sensitive.
+_MAIN_EVENT = _rx(r'main\s*event')
+_ME_MXF = _rx(r'wsop_(?:200[3-9]|2010)-\d+\.mxf')
+_WORLD_SERIES = _rx(r'world\s+series\s+of\s+poker')
+_ME_CODE = _Preceded('_-', r'ME\d')
+_HIGH_ROLLER = _rx(r'high\s*roller')
+_HR_CODE = _Preceded('_-', r'HR\d')
+_HEADS_UP = _rx(r'heads\s*up')
+_HU_CODE = _Preceded('_-', r'HU\d')
+_GRUDGE_MATCH = _rx(r'grudge\s*match')
+_GM_CODE = _Preceded('_-', r'GM\d')
+_BR_CODE = _Preceded('_-', r'BR\d')
+_BEST_OF = _rx(r'best\s*of')
+# The reference's (\d{4})\s+World\s+Series\s+of\s+Poker rule is left out: any
+# path it matches already returned ME from the World Series rule above.
+_CLASSIC_EVENT_TYPE = _Rules([
+    r'wsop[_\-\s]+(\d{4})\.',
+    r'wsop[_\-\s]+(\d{4})[_\-]\d+\.',
+    r'wsop[_\-\s]+(\d{4})\s*\(\d+\)\.',
+])
+# \b(19[7-9]\d|200[0-2])\b, the leading \b checked by hand
+_CLASSIC_YEAR = _rx(r'(?:19[7-9]\d|200[0-2])\b')
+
+
+def _is_classic(value: str) -> bool:
+    return int(value) <= 2002
+
+
+def _event_type(path: str, low: str, zeroed: str, final_table) -> str | None:
+    if (('main' in low and _MAIN_EVENT.search(low))
+            or '-me-' in low
+            or ('wsop_' in low and _ME_MXF.search(low))
+            or ('world' in low and _WORLD_SERIES.search(low))
+            or ('ME' in path and _ME_CODE.search(path))):
+        return "ME"
+    if ('high' in low and _HIGH_ROLLER.search(low)) or ('HR' in path and _HR_CODE.search(path)):
+        return "HR"
+    if ('heads' in low and _HEADS_UP.search(low)) or ('HU' in path and _HU_CODE.search(path)):
+        return "HU"
+    if (('grudge' in low and _GRUDGE_MATCH.search(low))
+            or ('GM' in path and _GM_CODE.search(path))):
+        return "GM"
+    if final_table or '-ft-' in low:
+        return "FT"
+    if 'bracelet' in low or ('BR' in path and _BR_CODE.search(path)):
+        return "BR"
+    if 'best' in low and _BEST_OF.search(low):
+        return "BEST"
+
+    # CLASSIC era (up to 2002) without a type keyword
+    if ('wsop' in low
+            and ('0000.' in zeroed or '0000_0' in zeroed or '0000-0' in zeroed or '(' in low)
+            and _CLASSIC_EVENT_TYPE.first(low, _is_classic)):
+        return "ME"
+    if ('wsop' in low or 'pre-' in low) and ('19' in path or '200' in path):
+        for m in _CLASSIC_YEAR.finditer(path):
+            start = m.start()
+            if not start or not (path[start - 1].isalnum() or path[start - 1] == '_'):
+                return "ME"
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Episode
+# ---------------------------------------------------------------------------
+
+# (required text, rule, search the lowercased path?, exclusive upper bound);
+# a rule is a regex, a _Preceded, or _Rules tried in their own order. Text for
+# lowercase rules is looked up in the zeroed path (ws00: ws, two digits); a
+# pair of texts needs either one.
+_WS_FORMAT = r'ws\d{2}[_\-](?:me|gm|hu|br)(\d{2})'
+_WSOP_YY = r'wsop\d{2}[_\-](?:me|br|hr)(\d{2})'
+_WSOP_YY_REGION = r'wsop\d{2}_\w+_(?:me|br|hr)(\d{2})'
+_EPISODE_WORD = _rx(r'episode[_\s]?(\d+)')
+
+# pattern_name -> rules tried in order before the generic rules
+_EPISODE_BY_PATTERN = {
+    "WSOP_WS_FORMAT": [('ws00', _rx(_WS_FORMAT), True, None)],
+    "WSOP_YEAR_ME": [('wsop00', _Rules([_WSOP_YY, _WSOP_YY_REGION]), True, None)],
+    "WSOP_YEAR_DASH_EP": [
+        ('wsop_0000', _rx(r'wsop_\d{4}[_\-](\d+)\.(?:mxf|mov|mp4)'), True, None),
+    ],
+    "BOOM_YEAR_WSOP_ME": [('wsop', _rx(r'\d{4}\s+wsop\s+me(\d+)'), True, None)],
+    "BOOM_WSOP_YEAR_SHOW": [('show', _rx(r'wsop\s+\d{4}\s+show\s+(\d+)'), True, None)],
+    "ESPN_WSOP_SHOW": [('espn', _rx(r'espn\s+\d{4}\s+wsop.*show\s+(\d+)'), True, None)],
+    "BOOM_YEAR_WSOP_SHOW": [('show', _rx(r'\d{4}\s+wsop\s+show\s+(\d+)'), True, None)],
+    "WCLA_PE_ET": [('w', _rx(r'w(?:cla|p)\d{2}-(?:pe|et|ep)-(\d+)'), True, None)],
+    "PAD": [('', _rx(r'ep?(\d{2})'), True, None)],  # [Ee][Pp]?(\d{2}) on the path
+    "GOG": [('E', _rx(r'E(\d{2})[_\-]'), False, None)],
+    "WSOP_ARCHIVE_PRE2016": [
+        ('show', _rx(r'show\s*(\d+)'), True, None),
+        ('', _rx(r'[_\-](\d{1,2})\.(?:mxf|mov|mp4)'), True, 50),
+    ],
+    "WSOP_CIRCUIT_LA": [('WCLA', _rx(r'WCLA\d{2}-(\d+)'), False, None)],
+    "WSOP_BR_EU": [
+        ('episode', _EPISODE_WORD, True, None),
+        ('me00', _Preceded('_-', r'me(\d{2})[_\-]'), True, None),
+    ],
+    "WSOPE_EPISODE": [('wsope', _rx(r'wsope\d{2}_episode_(\d+)'), True, None)],
+    "WSOPE_LOWERCASE": [
+        ('wsope', _rx(r'wsope-\d{4}-\d+k?-[a-z]+-ft-(\d+)'), True, None),
+    ],
+    "WSOP_BR_LV": [
+        (('ws00', 'wsop00'),
+         _Rules([_WS_FORMAT, _WSOP_YY, _WSOP_YY_REGION, r'ws\d{2}_show_(\d+)']), True, None),
+    ],
+}
+_EPISODE_BY_PATTERN["WSOP_YEAR_UNDERSCORE_EP"] = _EPISODE_BY_PATTERN["WSOP_YEAR_DASH_EP"]
+_EPISODE_BY_PATTERN["WSOP_BR_EU_2025"] = _EPISODE_BY_PATTERN["WSOP_BR_EU"]
+_EPISODE_BY_PATTERN["WSOP_BR_LV_2025_ME"] = _EPISODE_BY_PATTERN["WSOP_BR_LV"]
+_EPISODE_BY_PATTERN["WSOP_BR_LV_2025_SIDE"] = _EPISODE_BY_PATTERN["WSOP_BR_LV"]
+
+# Generic rules, after the pattern's own
+_ME_EPISODE = _Preceded('_-', r'me(\d{2})[_\-\.]')
+# -(\d{3})\.ext$ then [_\-](\d{1,2})\.ext$ (below 50): both read the digits of
+# the one [_\-]<digits>.ext ending. End-anchored, so only the tail is searched.
+_NUM_ENDINGS = ('0.mp0', '0.mov', '0.mxf')  # zeroed, .mp4 included
+_NUM_END = _rx(r'[_\-](\d+)\.(?:mp4|mov|mxf)$')
+_END_TAIL = 12
+_FINAL_DAY = _rx(r'final\s*day')
+_PART_EPISODE = _rx(r'part\s*(\d+)')
+
+
+def _pattern_episode(rules, path: str, low: str, zeroed: str) -> int | None:
+    for needed, rule, on_lower, limit in rules:
+        if on_lower:
+            target, text = low, zeroed
+        else:
+            target = text = path
+        if (needed in text if isinstance(needed, str)
+                else needed[0] in text or needed[1] in text):
+            if isinstance(rule, _Rules):
+                hit = rule.first(target)
+                if hit:
+                    return int(hit[1])
+                continue
+            m = rule.search(target)
+            if m:
+                ep = int(m.group(1))
+                if limit is None or ep < limit:
+                    return ep
+    return None
+
+
+def _generic_episode(low: str, zeroed: str, final_table, day) -> int | None:
+    if 'episode' in low:
+        m = _EPISODE_WORD.search(low)
+        if m:
+            return int(m.group(1))
+    if 'me00' in zeroed:
+        m = _ME_EPISODE.search(low)
+        if m:
+            return int(m.group(1))
+    if zeroed.endswith(_NUM_ENDINGS):
+        m = _NUM_END.search(low, len(low) - _END_TAIL if len(low) > _END_TAIL else 0)
+        if m:
+            digits = m.group(1)
+            if len(digits) == 3 and m.group(0)[0] == '-':
+                return int(digits)
+            if len(digits) <= 2 and int(digits) < 50:
+                return int(digits)
+
+    # Day/Part: Final Day/Table -> 99, Day N -> N, Part N -> N (0 = none)
+    if final_table or ('final' in low and _FINAL_DAY.search(low)):
+        return 99
+    if day:
+        return int(day.group(1)) or None
+    if 'part' in low:
+        m = _PART_EPISODE.search(low)
+        if m:
+            return int(m.group(1)) or None
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def extract_path_fields(
+    path: str,
+    pattern_name: str | None = None,
+    *,
+    year: bool = True,
+    event_type: bool = True,
+    episode: bool = False,
+    season: bool = False,
+) -> PathFields:
+    """Extract all extended fields from a full path in one call.
+
+    Args:
+        path: Full path (directory + filename)
+        pattern_name: Matched pattern name (selects episode rules)
+        year: Extract year (part extraction uses it for the CLASSIC era)
+        event_type: Detect event type from path keywords
+        episode: Extract episode number
+        season: Extract season number (PAD)
+
+    Returns:
+        PathFields with the same values the per-field
+        ``pattern_engine.extract_*_from_path`` functions would return.
+    """
+    if not path.isascii():
+        # re.IGNORECASE also folds a few non-ASCII letters (e.g. U+017F) onto
+        # ASCII ones, so keyword prefilters are only exact for ASCII paths.
+        return _extract_reference(path, pattern_name, year, event_type, episode, season)
+
+    low = path.lower()
+    zeroed = _zeroed(low)
+    filename = path.rpartition('\\')[2].rpartition('/')[2]
+    year_value = _year(path, low, zeroed, filename) if year else None
+
+    # Read by stage, event type and episode
+    final_table = 'final' in low and _FINAL_TABLE.search(low)
+    day = not final_table and 'day' in low and _DAY.search(low)
+
+    stage = None
+    if final_table:
+        m = _FINAL_TABLE_DAY.search(low, final_table.start())
+        stage = f"FT-D{m.group(1)}" if m else "FT"
+    elif day:
+        stage = f"D{day.group(1)}{(day.group(2) or '').upper()}"
+    elif 'session' in low:
+        m = _SESSION.search(low)
+        if m:
+            stage = f"S{m.group(1)}"
+
+    event_num = None
+    if 'event' in low:
+        m = _EVENT_NUM.search(low)
+        if m:
+            event_num = int(m.group(1))
+    if event_num is None and '#' in path:
+        m = _HASH_NUM.search(path)
+        if m:
+            event_num = int(m.group(1))
+
+    # Amounts keep the original-case text (K/M suffix) of the matched span
+    buyin = gtd = None
+    if '$' in path:
+        m = _BUYIN.search(low)
+        if m:
+            buyin = path[m.start(1):m.end(1)].replace(',', '')
+        if 'gtd' in low:
+            m = _GTD.search(low)
+            if m:
+                gtd = path[m.start(1):m.end(1)]
+
+    version = None
+    if 'commentary' in low and _NO_COMMENTARY.search(low):
+        version = "NC"
+    elif '_nb' in low and _NB.search(low):
+        version = "NB"
+    elif 'clean' in low:
+        version = "CLEAN"
+
+    part = None
+    if 'part' in low:
+        m = _PART.search(low)
+        if m:
+            part = int(m.group(1))
+    if part is None and year_value and year_value <= 2002:
+        part = _classic_part(low[len(low) - len(filename):])
+
+    episode_value = None
+    if episode:
+        rules = _EPISODE_BY_PATTERN.get(pattern_name)
+        if rules:
+            episode_value = _pattern_episode(rules, path, low, zeroed)
+        if episode_value is None:
+            episode_value = _generic_episode(low, zeroed, final_table, day)
+
+    season_value = None
+    if season:
+        i = zeroed.find('s00')  # s(\d{2})
+        if i >= 0:
+            season_value = int(low[i + 1:i + 3])
+
+    event_type_code = _event_type(path, low, zeroed, final_table) if event_type else None
+    # Positional: keyword arguments double the cost of building the result
+    return PathFields(year_value, stage, event_num, buyin, gtd, version, part,
+                      event_type_code, episode_value, season_value)
+
+
+def _extract_reference(
+    path: str,
+    pattern_name: str | None,
+    year: bool,
+    event_type: bool,
+    episode: bool,
+    season: bool,
+) -> PathFields:
+    """Fallback to the per-field reference functions."""
+    from . import pattern_engine as pe
+
+    fields = PathFields()
+    if year:
+        fields.year = pe.extract_year_from_path(path)
+    fields.stage = pe.extract_stage_from_path(path)
+    fields.event_num = pe.extract_event_num_from_path(path)
+    fields.buyin = pe.extract_buyin_from_path(path)
+    fields.gtd = pe.extract_gtd_from_path(path)
+    fields.version = pe.extract_version_from_path(path)
+    fields.part = pe.extract_part_from_path(path, fields.year)
+    if event_type:
+        fields.event_type_code = pe.detect_event_type_from_path(path)
+    if episode:
+        fields.episode = pe.extract_episode_from_path(path, pattern_name)
+    if season:
+        fields.season = pe.extract_season_from_path(path)
+    return fields
@@ -1,10 +1,13 @@
 """Auto-grouping service for NAMS."""
 from collections import defaultdict
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
 
-from ..database import AssetGroup, EventType, NasFile, Region, get_db_context
+from ..database import AssetGroup, NasFile, get_code_lookup, get_db_context
+
+# A primary shorter than this fraction of another copy's duration is truncated
+TRUNCATED_RATIO = 0.9
 
 
 def generate_group_id(
@@ -72,12 +75,10 @@ def get_or_create_group(
     """
     # Get codes if not provided
     if region_id and not region_code:
-        region = db.query(Region).get(region_id)
-        region_code = region.code if region else None
+        region_code = get_code_lookup(db).region_code(region_id)
 
     if event_type_id and not event_type_code:
-        event_type = db.query(EventType).get(event_type_id)
-        event_type_code = event_type.code if event_type else None
+        event_type_code = get_code_lookup(db).event_type_code(event_type_id)
 
     # Generate group ID (include event_num for Bracelet Events, part for CLASSIC era)
     group_id = generate_group_id(year, region_code, event_type_code, episode, event_num, part)
@@ -103,9 +104,19 @@ def get_or_create_group(
     return group
 
 
+def is_truncated_copy(primary: NasFile, file: NasFile) -> bool:
+    """Whether a primary is clearly shorter than another copy (both probed)."""
+    if primary.is_manual_override or not primary.duration_sec or not file.duration_sec:
+        return False
+    return primary.duration_sec < file.duration_sec * TRUNCATED_RATIO
+
+
 def assign_file_to_group(db: Session, file: NasFile, group: AssetGroup) -> bool:
     """Assign file to group and set role.
 
+    A file whose probed duration is clearly longer than the current primary's
+    takes over as primary (the old primary becomes the last backup).
+
     Returns:
         True if file was updated
     """
@@ -128,12 +139,19 @@ def assign_file_to_group(db: Session, file: NasFile, group: AssetGroup) -> bool:
         file.role = 'primary'
         file.role_priority = 1
     else:
-        # Subsequent files are backups
         max_priority = db.query(func.max(NasFile.role_priority)).filter(
             NasFile.asset_group_id == group.id
         ).scalar() or 0
-        file.role = 'backup'
-        file.role_priority = max_priority + 1
+        if is_truncated_copy(existing_primary, file):
+            # Longer copy replaces a truncated primary
+            existing_primary.role = 'backup'
+            existing_primary.role_priority = max_priority + 1
+            file.role = 'primary'
+            file.role_priority = 1
+        else:
+            # Subsequent files are backups
+            file.role = 'backup'
+            file.role_priority = max_priority + 1
 
     return True
 
@@ -147,11 +165,48 @@ def update_group_stats(db: Session, group: AssetGroup):
     group.has_backup = any(f.role == 'backup' for f in files)
 
 
+def group_content_copies(db: Session) -> int:
+    """Put ungrouped files into the group of a copy with the same content.
+
+    Copies of a recording on Origin / Archive / PokerGO drives share a
+    content hash and size even when their names (and so their extracted
+    metadata) differ. A file with grouped copies in several groups joins
+    the lowest group id.
+
+    Returns:
+        Number of files grouped
+    """
+    copy = aliased(NasFile)
+    copy_group = select(func.min(copy.asset_group_id)).where(
+        copy.content_hash == NasFile.content_hash,
+        copy.size_bytes == NasFile.size_bytes,
+        copy.asset_group_id.isnot(None),
+    ).scalar_subquery()
+    rows = db.query(NasFile, copy_group).filter(
+        NasFile.asset_group_id.is_(None),
+        NasFile.content_hash.isnot(None),
+        copy_group.isnot(None),
+    ).all()
+
+    groups = {}
+    grouped = 0
+    for file, group_id in rows:
+        if group_id not in groups:
+            groups[group_id] = db.get(AssetGroup, group_id)
+        if assign_file_to_group(db, file, groups[group_id]):
+            db.flush()  # role of the next copy sees this one
+            grouped += 1
+    for group in groups.values():
+        update_group_stats(db, group)
+    return grouped
+
+
 def run_auto_grouping(db: Session) -> dict:
     """Run auto-grouping on ungrouped files.
 
     For CLASSIC era (1973-2002), includes part in grouping key to separate
-    different content (Part 1, Part 2 are different content).
+    different content (Part 1, Part 2 are different content). Files with a
+    grouped copy elsewhere (same content hash) join that copy's group first.
 
     Returns:
         Statistics about grouping
@@ -159,14 +214,18 @@ def run_auto_grouping(db: Session) -> dict:
     stats = {
         'processed': 0,
         'grouped': 0,
+        'copies_grouped': 0,
         'new_groups': 0,
         'skipped': 0,
     }
 
+    # Copies of already grouped files (same content hash) join their group
+    stats['copies_grouped'] = group_content_copies(db)
+
     # Get files without group that have year
     files = db.query(NasFile).filter(
-        NasFile.asset_group_id is None,
-        NasFile.year is not None
+        NasFile.asset_group_id.is_(None),
+        NasFile.year.isnot(None)
     ).all()
 
     stats['processed'] = len(files)
@@ -189,8 +248,9 @@ def run_auto_grouping(db: Session) -> dict:
         file_groups[key].append(file)
 
     # Get region/event_type codes for group ID generation
-    regions = {r.id: r.code for r in db.query(Region).all()}
-    event_types = {e.id: e.code for e in db.query(EventType).all()}
+    lookup = get_code_lookup(db)
+    regions = lookup.region_codes
+    event_types = lookup.event_type_codes
 
     # Process each group
     groups_created = set()
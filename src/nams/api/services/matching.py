@@ -1,10 +1,26 @@
 """PokerGO matching service for NAMS."""
+import hashlib
+import json
 import re
-from difflib import SequenceMatcher
+from types import SimpleNamespace
+from typing import NamedTuple
 
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from ..database import AssetGroup, EventType, NasFile, PokergoEpisode, Region, get_db_context
+from ..database import (
+    AssetGroup,
+    CodeLookup,
+    EventType,
+    NasFile,
+    PokergoEpisode,
+    PokergoTitle,
+    Region,
+    get_code_lookup,
+    get_db_context,
+)
+from .assignment import max_weight_assignment
+from .similarity import TitleProfile, TitleProfiles, similarity
 
 
 def normalize_title(title: str) -> str:
@@ -210,7 +226,12 @@ def extract_episode_from_title(title: str) -> int | None:
 
 def calculate_similarity(s1: str, s2: str) -> float:
     """Calculate similarity between two strings."""
-    return SequenceMatcher(None, normalize_title(s1), normalize_title(s2)).ratio()
+    return normalized_similarity(normalize_title(s1), normalize_title(s2))
+
+
+def normalized_similarity(n1: str, n2: str) -> float:
+    """Similarity between two already normalized titles (SequenceMatcher scale)."""
+    return similarity(n1, n2)
 
 
 def extract_year_from_season(season_title: str) -> int | None:
@@ -223,10 +244,311 @@ def extract_year_from_season(season_title: str) -> int | None:
     return None
 
 
+# Bump when normalize_title or the extract_* helpers change (invalidates pokergo_titles)
+TITLE_CACHE_VERSION = 1
+
+
+def _title_source_hash(episode: PokergoEpisode) -> str:
+    """Hash of the episode fields the title cache is derived from."""
+    payload = [TITLE_CACHE_VERSION, episode.title, episode.season_title, episode.collection_title]
+    return hashlib.sha1(json.dumps(payload).encode('utf-8')).hexdigest()
+
+
+def build_pokergo_title(episode: PokergoEpisode) -> dict:
+    """Compute the pokergo_titles row of an episode."""
+    title = episode.title or ""
+    normalized = normalize_title(title)
+    event_num = re.search(r'event\s*#?\s*(\d+)', title, re.I)
+    return {
+        'episode_id': episode.id,
+        'source_hash': _title_source_hash(episode),
+        'normalized_title': normalized,
+        'title_tokens': ' '.join(sorted(set(normalized.split()))),
+        'title_year': extract_year_from_title(title),
+        'season_year': extract_year_from_season(episode.season_title),
+        'collection_year': extract_year_from_season(episode.collection_title),
+        'episode': extract_episode_from_title(title),
+        'event_num': int(event_num.group(1)) if event_num else None,
+    }
+
+
+def refresh_pokergo_titles(db: Session, episodes: list[PokergoEpisode] | None = None) -> dict:
+    """Bring the pokergo_titles cache up to date (the caller commits).
+
+    Rows are rebuilt only for episodes whose title/season/collection changed
+    since they were cached. Without ``episodes`` every episode is checked and
+    rows of deleted episodes are removed.
+
+    Returns:
+        Statistics: added, updated, unchanged, removed
+    """
+    stats = {'added': 0, 'updated': 0, 'unchanged': 0, 'removed': 0}
+    full = episodes is None
+    if full:
+        episodes = db.query(PokergoEpisode).all()
+
+    cached = dict(db.query(PokergoTitle.episode_id, PokergoTitle.source_hash))
+    added, updated = [], []
+    for episode in episodes:
+        source_hash = cached.get(episode.id)
+        if source_hash == _title_source_hash(episode):
+            stats['unchanged'] += 1
+        elif source_hash is None:
+            added.append(build_pokergo_title(episode))
+        else:
+            updated.append(build_pokergo_title(episode))
+
+    if added:
+        db.bulk_insert_mappings(PokergoTitle, added)
+    if updated:
+        db.bulk_update_mappings(PokergoTitle, updated)
+    stats['added'] = len(added)
+    stats['updated'] = len(updated)
+
+    if full:
+        stale = set(cached) - {episode.id for episode in episodes}
+        if stale:
+            db.query(PokergoTitle).filter(
+                PokergoTitle.episode_id.in_(stale)
+            ).delete(synchronize_session=False)
+        stats['removed'] = len(stale)
+
+    return stats
+
+
+def get_pokergo_titles(db: Session, episodes: list[PokergoEpisode]) -> dict:
+    """Load cached title rows (episode_id -> row) for episodes, refreshing stale ones.
+
+    Episodes imported outside migrate_pokergo_episodes are filled in here, in
+    the caller's transaction.
+    """
+    refresh_pokergo_titles(db, episodes)
+    columns = [column for column in PokergoTitle.__table__.columns if column.name != 'updated_at']
+    return {row.episode_id: row for row in db.query(*columns)}
+
+
+class EpisodeKey(NamedTuple):
+    """Blocking key of a PokerGO episode, derived once from its titles."""
+    title_lower: str
+    normalized_title: str
+    season_year: int | None
+    year: int | None  # season_title year, else title year
+    episode: int | None
+    is_europe: bool
+    is_apac: bool
+    is_paradise: bool
+    is_cyprus: bool
+    is_main_event: bool
+    is_grudge_match: bool
+    is_heads_up: bool
+    is_high_roller: bool
+    is_bracelet: bool
+    is_numbered_bracelet: bool  # "Wsop 2004 05 1500 Nlh"
+    profile: TitleProfile  # tokens / trigrams of normalized_title
+
+    @property
+    def is_regional(self) -> bool:
+        return self.is_europe or self.is_apac or self.is_paradise or self.is_cyprus
+
+
+def make_episode_key(episode: PokergoEpisode, profiles: TitleProfiles,
+                     title=None) -> EpisodeKey:
+    """Compute the blocking key of a titled episode.
+
+    Args:
+        profiles: Title profiles of the matching run
+        title: Its pokergo_titles row (normalized title, years, episode), if loaded
+    """
+    if title is None:
+        title = SimpleNamespace(**build_pokergo_title(episode))
+    title_lower = episode.title.lower()
+    return EpisodeKey(
+        title_lower=title_lower,
+        normalized_title=title.normalized_title,
+        season_year=title.season_year,
+        year=title.season_year or title.title_year,
+        episode=title.episode,
+        is_europe='europe' in title_lower or 'wsope' in title_lower,
+        is_apac='asia' in title_lower or 'apac' in title_lower,
+        is_paradise='paradise' in title_lower,
+        is_cyprus='cyprus' in title_lower,
+        is_main_event='main event' in title_lower,
+        is_grudge_match='grudge match' in title_lower,
+        is_heads_up='heads up' in title_lower or 'heads-up' in title_lower,
+        is_high_roller='high roller' in title_lower or 'highroller' in title_lower,
+        is_bracelet='bracelet' in title_lower,
+        is_numbered_bracelet=bool(re.search(r'wsop\s+\d{4}\s+\d{2}\s+', title_lower)),
+        profile=profiles.profile(title.normalized_title),
+    )
+
+
+def _in_region_block(key: EpisodeKey, region_code: str) -> bool:
+    """Region hard constraint of match_group_to_pokergo.
+
+    Region markers are explicit, never substrings of the code ('eu' is in "reunion").
+    Non-LV groups only match their own regional episodes, LV never matches them.
+    """
+    if region_code == 'EU':
+        return key.is_europe
+    if region_code == 'APAC':
+        return key.is_apac
+    if region_code == 'PARADISE':
+        return key.is_paradise
+    if region_code == 'CYPRUS':
+        return key.is_cyprus
+    if region_code in ('LA', 'LONDON'):
+        # LA/LONDON have no PokerGO data anyway
+        return key.is_regional
+    if region_code == 'LV':
+        return not key.is_regional
+    return True
+
+
+def _in_event_type_block(key: EpisodeKey, event_type_code: str) -> bool:
+    """Event type hard constraint of match_group_to_pokergo.
+
+    GM/HU/HR/BR groups never match Main Event titles unless the title also
+    has their type.
+    """
+    if event_type_code == 'GM':
+        return key.is_grudge_match or not key.is_main_event
+    if event_type_code == 'HU':
+        return key.is_heads_up or not key.is_main_event
+    if event_type_code == 'HR':
+        return key.is_high_roller or not key.is_main_event
+    if event_type_code == 'BR':
+        return key.is_bracelet or not key.is_main_event
+    if not event_type_code:
+        # Without event_type only Main Event coverage is safe: numbered bracelet
+        # events ("Wsop 2004 05 1500 Nlh") are skipped (BOOM era issue)
+        return key.is_main_event or not key.is_numbered_bracelet
+    return True
+
+
+class EpisodeIndex:
+    """PokerGO episodes blocked by (year, region, event type).
+
+    Each titled episode's key is computed once. ``block()`` returns the episodes
+    that pass match_group_to_pokergo's hard year/region/event-type constraints,
+    in original order (so score ties resolve the same way), memoized per key.
+    Episodes without a year belong to every year block; groups without a year,
+    region or event type fall back to the wider tier for that field.
+
+    Normalized titles, years and episode numbers come from the pokergo_titles
+    cache when ``titles`` (get_pokergo_titles()) is given. Title profiles of
+    the episodes and group titles are kept in ``profiles`` for the run.
+    """
+
+    def __init__(self, episodes: list[PokergoEpisode], titles: dict | None = None):
+        self.episodes = list(episodes)
+        titles = titles or {}
+        self.profiles = TitleProfiles()
+        # Titled episodes with their keys, in original order
+        self._entries: list[tuple[PokergoEpisode, EpisodeKey]] = []
+        self._by_year: dict[int | None, list[int]] = {}
+        self._classic: dict[int, tuple[PokergoEpisode, float]] = {}
+        self._blocks: dict[tuple, list[tuple[PokergoEpisode, EpisodeKey]]] = {}
+
+        for episode in self.episodes:
+            if not episode.title:
+                continue
+            key = make_episode_key(episode, self.profiles, titles.get(episode.id))
+            self._by_year.setdefault(key.year, []).append(len(self._entries))
+            self._entries.append((episode, key))
+            self._add_classic(episode, key)
+
+    def __len__(self) -> int:
+        return len(self.episodes)
+
+    def _add_classic(self, episode: PokergoEpisode, key: EpisodeKey) -> None:
+        """Record the first WSOP episode per year for match_classic_era."""
+        # Season year (not buy-ins like "$2000 NLHE"), else a title starting "Wsop YYYY"
+        year = key.season_year
+        if not year:
+            title_match = re.match(r'wsop\s+(19|20)\d{2}\b', key.title_lower)
+            if title_match:
+                year = int(title_match.group().split()[-1])
+        if not year or year in self._classic or 'wsop' not in key.title_lower:
+            return
+
+        if key.is_main_event:
+            score = 1.0
+        elif key.title_lower.strip() == f'wsop {year}' or ' me' in key.title_lower:
+            score = 0.98  # Year-only or ME abbreviation
+        else:
+            score = 0.95
+        self._classic[year] = (episode, score)
+
+    def classic(self, year: int) -> tuple[PokergoEpisode | None, float]:
+        """First WSOP episode of a CLASSIC era year, with its score."""
+        return self._classic.get(year, (None, 0.0))
+
+    def block(
+        self,
+        year: int | None,
+        region_code: str,
+        event_type_code: str,
+    ) -> list[tuple[PokergoEpisode, EpisodeKey]]:
+        """Candidate (episode, key) pairs for a group, in original order."""
+        block_key = (year or None, region_code, event_type_code)
+        candidates = self._blocks.get(block_key)
+        if candidates is None:
+            if year:
+                # This year's episodes plus undated ones
+                positions = sorted(self._by_year.get(year, []) + self._by_year.get(None, []))
+            else:
+                positions = range(len(self._entries))
+            candidates = [
+                self._entries[i] for i in positions
+                if _in_region_block(self._entries[i][1], region_code)
+                and _in_event_type_block(self._entries[i][1], event_type_code)
+            ]
+            self._blocks[block_key] = candidates
+        return candidates
+
+
+def _as_index(episodes: 'list[PokergoEpisode] | EpisodeIndex') -> EpisodeIndex:
+    return episodes if isinstance(episodes, EpisodeIndex) else EpisodeIndex(episodes)
+
+
+class MatchContext(NamedTuple):
+    """Per-run lookups for match_group_to_pokergo, so scoring runs no queries."""
+    lookup: CodeLookup
+    file_event_nums: dict[int, int]  # asset group id -> event_num of its first file
+
+
+def load_match_context(
+    db: Session,
+    group_ids: list[int] | None = None,
+    lookup: CodeLookup | None = None,
+) -> MatchContext:
+    """Load region/event type codes and each group's first-file event number.
+
+    The event numbers come from one grouped query (the lowest-id file of each
+    group); groups whose first file has no event number are left out.
+
+    Args:
+        group_ids: Only these groups (default: all)
+        lookup: Region/event type code lookup (default: cached lookup)
+    """
+    first_files = (
+        select(func.min(NasFile.id))
+        .where(NasFile.asset_group_id.isnot(None))
+        .group_by(NasFile.asset_group_id)
+    )
+    if group_ids is not None:
+        first_files = first_files.where(NasFile.asset_group_id.in_(group_ids))
+    rows = db.execute(
+        select(NasFile.asset_group_id, NasFile.event_num)
+        .where(NasFile.id.in_(first_files), NasFile.event_num.isnot(None))
+    )
+    return MatchContext(lookup or get_code_lookup(db), dict(rows.all()))
+
+
 def match_classic_era(
     db: Session,
     group: AssetGroup,
-    episodes: list[PokergoEpisode]
+    episodes: 'list[PokergoEpisode] | EpisodeIndex'
 ) -> tuple[PokergoEpisode | None, float]:
     """Match CLASSIC Era (1973-2002) files by year only.
 
@@ -236,78 +558,54 @@ def match_classic_era(
     CRITICAL FIX: Use season_title for year extraction to avoid
     matching buy-in amounts (e.g., "$2000 NLHE") as years.
 
+    Args:
+        episodes: Episode list or a prebuilt EpisodeIndex
+
     Returns:
         Tuple of (best_match, score)
     """
     if not group.year or group.year > CLASSIC_ERA_END_YEAR:
         return None, 0.0
 
-    year_str = str(group.year)
-
-    # Search for match by year (CLASSIC Era has 1 video per year)
-    for episode in episodes:
-        if not episode.title:
-            continue
-
-        # CRITICAL: Use season_title for year extraction (most reliable)
-        # Season format: "WSOP 2000", "WSOP 1973", etc.
-        ep_year = extract_year_from_season(episode.season_title)
-
-        # Fallback: If no season, check title starts with "Wsop YYYY"
-        if not ep_year:
-            title_match = re.match(r'wsop\s+(19|20)\d{2}\b', episode.title.lower())
-            if title_match:
-                ep_year = int(title_match.group().split()[-1])
-
-        # Year must match exactly
-        if ep_year != group.year:
-            continue
-
-        title_lower = episode.title.lower()
-
-        # Verify it's WSOP related
-        if 'wsop' not in title_lower:
-            continue
-
-        # Score based on match quality
-        if 'main event' in title_lower:
-            return episode, 1.0
-        elif title_lower.strip() == f'wsop {year_str}' or ' me' in title_lower:
-            return episode, 0.98  # Year-only or ME abbreviation
-        else:
-            return episode, 0.95
-
-    return None, 0.0
+    # CLASSIC Era has 1 video per year: the first WSOP episode of that year
+    return _as_index(episodes).classic(group.year)
 
 
-def match_group_to_pokergo(
+def score_pokergo_candidates(
     db: Session,
     group: AssetGroup,
-    episodes: list[PokergoEpisode]
-) -> tuple[PokergoEpisode | None, float]:
-    """Find best matching PokerGO episode for a group.
+    episodes: 'list[PokergoEpisode] | EpisodeIndex',
+    context: MatchContext | None = None,
+) -> list[tuple[PokergoEpisode, float]]:
+    """Score every PokerGO episode a group may match.
+
+    Args:
+        episodes: Episode list or a prebuilt EpisodeIndex (build one per run)
+        context: Preloaded MatchContext (build one per run); with it and an
+            EpisodeIndex no queries are issued
 
     Returns:
-        Tuple of (best_match, score)
+        (episode, raw score) pairs in block order; scores are not capped at 1.0
     """
     if not episodes:
-        return None, 0.0
+        return []
+    index = _as_index(episodes)
 
     # CLASSIC Era (1973-2002): Year-only matching (M01 fix)
     if group.year and group.year <= CLASSIC_ERA_END_YEAR:
-        classic_match, classic_score = match_classic_era(db, group, episodes)
+        classic_match, classic_score = match_classic_era(db, group, index)
         if classic_match:
-            return classic_match, classic_score
+            return [(classic_match, classic_score)]
 
     # Build search terms from group
     search_terms = []
 
-    # Get region and event type names
-    region = db.query(Region).get(group.region_id) if group.region_id else None
-    event_type = db.query(EventType).get(group.event_type_id) if group.event_type_id else None
+    if context is None:
+        context = load_match_context(db, [group.id] if group.id else [])
 
-    region_code = region.code if region else ""
-    event_type_code = event_type.code if event_type else ""
+    # Get region and event type codes
+    region_code = context.lookup.region_code(group.region_id) or ""
+    event_type_code = context.lookup.event_type_code(group.event_type_id) or ""
 
     # Build expected title patterns
     if group.year:
@@ -325,126 +623,62 @@ def match_group_to_pokergo(
     if group.episode:
         search_terms.append(f'episode {group.episode}')
 
-    best_match = None
-    best_score = 0.0
+    # Get event_num from group itself or its first file
+    group_event_num = group.event_num or context.file_event_nums.get(group.id)
 
-    for episode in episodes:
-        if not episode.title:
-            continue
+    # Title similarity compares against the cached normalized episode titles
+    group_title = normalize_title(
+        f"WSOP {group.year} {region_code} {event_type_code} Episode {group.episode}"
+    )
+
+    scored = []
 
+    # Only episodes passing the year/region/event type constraints are scored;
+    # title similarity is computed for the whole block at once
+    block = index.block(group.year, region_code, event_type_code)
+    title_scores = index.profiles.similarities(group_title, [key.profile for _, key in block])
+    for (episode, key), similarity_score in zip(block, title_scores):
         score = 0.0
-        title_lower = episode.title.lower()
-        normalize_title(episode.title)
+        title_lower = key.title_lower
 
-        # Year match (important) - Use season_title first (most reliable)
-        ep_year = extract_year_from_season(episode.season_title)
-        if not ep_year:
-            ep_year = extract_year_from_title(episode.title)
-
-        if ep_year and group.year:
-            if ep_year == group.year:
-                score += 0.3
-            else:
-                continue  # Year mismatch - skip
+        # Year match (important) - season_title year first (most reliable)
+        if key.year and group.year:
+            score += 0.3
 
         # Region match (M01 fix: more patterns)
-        # Determine episode region from title
-        ep_is_europe = 'europe' in title_lower or 'wsope' in title_lower
-        ep_is_apac = 'asia' in title_lower or 'apac' in title_lower
-        ep_is_paradise = 'paradise' in title_lower
-        ep_is_cyprus = 'cyprus' in title_lower
-        ep_is_regional = ep_is_europe or ep_is_apac or ep_is_paradise or ep_is_cyprus
-
         if region_code:
-            # CRITICAL: Region matching must be explicit, not substring-based
-            # 'eu' in "reunion" would cause false positives
-
-            # First: Check region MISMATCH (must skip before scoring)
-            if region_code in ('EU', 'APAC', 'PARADISE', 'CYPRUS', 'LA', 'LONDON'):
-                # Non-LV groups can ONLY match regional episodes
-                if region_code == 'EU' and not ep_is_europe:
-                    continue  # EU group must match Europe episode
-                elif region_code == 'APAC' and not ep_is_apac:
-                    continue  # APAC group must match APAC episode
-                elif region_code == 'PARADISE' and not ep_is_paradise:
-                    continue  # PARADISE group must match Paradise episode
-                elif region_code == 'CYPRUS' and not ep_is_cyprus:
-                    continue  # CYPRUS group must match Cyprus episode
-                elif region_code in ('LA', 'LONDON') and not ep_is_regional:
-                    # LA/LONDON have no PokerGO data anyway
-                    continue
-            elif region_code == 'LV' and ep_is_regional:
-                # LV group should NOT match regional episodes
-                continue
-
-            # Then: Add score for matching region
-            if region_code == 'APAC' and ep_is_apac:
+            if region_code == 'APAC' and key.is_apac:
                 score += 0.2
-            elif region_code == 'EU' and ep_is_europe:
+            elif region_code == 'EU' and key.is_europe:
                 score += 0.2
-            elif region_code == 'PARADISE' and ep_is_paradise:
+            elif region_code == 'PARADISE' and key.is_paradise:
                 score += 0.2
-            elif region_code == 'CYPRUS' and ep_is_cyprus:
+            elif region_code == 'CYPRUS' and key.is_cyprus:
                 score += 0.2
-            elif region_code == 'LV' and not ep_is_regional:
+            elif region_code == 'LV' and not key.is_regional:
                 score += 0.15  # Default LV matches non-regional episodes
 
         # Event type match (M01 fix: more patterns + strict constraints)
-        is_main_event_title = 'main event' in title_lower
-        is_grudge_match_title = 'grudge match' in title_lower
-        is_heads_up_title = 'heads up' in title_lower or 'heads-up' in title_lower
-        is_high_roller_title = 'high roller' in title_lower or 'highroller' in title_lower
-        is_bracelet_title = 'bracelet' in title_lower
-
-        if event_type_code:
-            # CRITICAL: Prevent wrong event type matches
-            # GM/HU/HR/BR groups should NEVER match Main Event titles
-            # (unless title also has their type)
-            if event_type_code == 'GM':
-                if is_grudge_match_title:
-                    score += 0.3
-                elif is_main_event_title and not is_grudge_match_title:
-                    continue  # Skip - GM should not match Main Event
-            elif event_type_code == 'HU':
-                if is_heads_up_title:
-                    score += 0.3
-                elif is_main_event_title and not is_heads_up_title:
-                    continue  # Skip - HU should not match Main Event
-            elif event_type_code == 'HR':
-                if is_high_roller_title:
-                    score += 0.2
-                elif is_main_event_title:
-                    continue  # Skip - HR should not match Main Event
-            elif event_type_code == 'BR':
-                if is_bracelet_title:
-                    score += 0.2
-                elif is_main_event_title:
-                    continue  # Skip - BR should not match Main Event
-            elif event_type_code == 'ME':
-                if is_main_event_title:
-                    score += 0.2
-                # ME can match Bracelet titles (some MEs are bracelet events)
-            elif event_type_code.lower() in title_lower:
+        if event_type_code == 'GM':
+            if key.is_grudge_match:
+                score += 0.3
+        elif event_type_code == 'HU':
+            if key.is_heads_up:
+                score += 0.3
+        elif event_type_code == 'HR':
+            if key.is_high_roller:
                 score += 0.2
-        else:
-            # No event_type - be very strict about what this can match
-            # Groups without event_type should only match Main Event coverage
-            # to prevent random bracelet event matches (BOOM era issue)
-            # Pattern: "Wsop 2004 05 1500 Nlh"
-            is_bracelet_event = re.search(r'wsop\s+\d{4}\s+\d{2}\s+', title_lower, re.I)
-            if is_bracelet_event and not is_main_event_title:
-                # This looks like a bracelet event by number, but group has no event_type
-                # Skip to prevent wrong matches
-                continue
+        elif event_type_code == 'BR':
+            if key.is_bracelet:
+                score += 0.2
+        elif event_type_code == 'ME':
+            if key.is_main_event:
+                score += 0.2
+            # ME can match Bracelet titles (some MEs are bracelet events)
+        elif event_type_code and event_type_code.lower() in title_lower:
+            score += 0.2
 
         # Event number match (for Bracelet Events: Event #37 etc.)
-        # Get event_num from group's files or group itself
-        group_event_num = group.event_num
-        if not group_event_num:
-            first_file = db.query(NasFile).filter(NasFile.asset_group_id == group.id).first()
-            if first_file:
-                group_event_num = first_file.event_num
-
         if group_event_num:
             event_num_matched = False
             event_num_patterns = [
@@ -464,7 +698,7 @@ def match_group_to_pokergo(
                 continue
 
         # Episode match (M01 fix: strict episode matching)
-        ep_episode = extract_episode_from_title(episode.title)
+        ep_episode = key.episode
         if ep_episode and group.episode:
             if ep_episode == group.episode:
                 score += 0.3
@@ -491,10 +725,31 @@ def match_group_to_pokergo(
                 score += 0.1
 
         # Title similarity bonus (M01 fix: better normalization)
-        group_title = f"WSOP {group.year} {region_code} {event_type_code} Episode {group.episode}"
-        similarity = calculate_similarity(group_title, episode.title)
-        score += similarity * 0.2
+        score += similarity_score * 0.2
+
+        scored.append((episode, score))
 
+    return scored
+
+
+def match_group_to_pokergo(
+    db: Session,
+    group: AssetGroup,
+    episodes: 'list[PokergoEpisode] | EpisodeIndex',
+    context: MatchContext | None = None,
+) -> tuple[PokergoEpisode | None, float]:
+    """Find best matching PokerGO episode for a group.
+
+    Args:
+        episodes: Episode list or a prebuilt EpisodeIndex (build one per run)
+        context: Preloaded MatchContext (build one per run)
+
+    Returns:
+        Tuple of (best_match, score)
+    """
+    best_match = None
+    best_score = 0.0
+    for episode, score in score_pokergo_candidates(db, group, episodes, context):
         if score > best_score:
             best_score = score
             best_match = episode
@@ -506,57 +761,86 @@ def match_group_to_pokergo(
 
 
 def run_pokergo_matching(db: Session, min_score: float = 0.5) -> dict:
-    """Match unmatched groups to PokerGO episodes.
+    """Match unmatched groups to PokerGO episodes, one group per episode.
+
+    Every group's candidates scoring at least ``min_score`` form a sparse
+    group x episode score matrix; the maximum-weight assignment over it is
+    solved per block of groups sharing candidates, so a group that loses its
+    best episode to a better match gets its next best instead of nothing.
+    Episodes already matched to another group are not offered.
 
     Args:
         db: Database session
         min_score: Minimum score to accept match
 
     Returns:
-        Statistics about matching
+        Statistics about matching (``second_choice``: matched, but not to the
+        group's top scorer; ``unassigned``: every candidate went to other groups)
     """
     stats = {
         'processed': 0,
         'matched': 0,
         'skipped': 0,
+        'second_choice': 0,
+        'unassigned': 0,
     }
 
     # Get groups without PokerGO match
     groups = db.query(AssetGroup).filter(
-        AssetGroup.pokergo_episode_id is None
-    ).all()
+        AssetGroup.pokergo_episode_id.is_(None)
+    ).order_by(AssetGroup.group_id).all()
 
     stats['processed'] = len(groups)
 
-    # Get all PokerGO episodes
+    # Get all PokerGO episodes, blocked once for the whole run (titles from the cache)
     episodes = db.query(PokergoEpisode).all()
 
     if not episodes:
         return stats
+    index = EpisodeIndex(episodes, get_pokergo_titles(db, episodes))
+    context = load_match_context(db)
+    taken = {
+        episode_id for (episode_id,) in db.query(AssetGroup.pokergo_episode_id).filter(
+            AssetGroup.pokergo_episode_id.isnot(None)
+        ).distinct()
+    }
 
+    nas_only_categories = (
+        MATCH_CATEGORY_NAS_ONLY_HISTORIC,
+        MATCH_CATEGORY_NAS_ONLY_MODERN,
+    )
+
+    # Sparse score matrix: per group, its candidates above the cutoff
+    rows: list[AssetGroup] = []
+    candidates: list[list[tuple[int, float]]] = []
+    by_id: dict[int, PokergoEpisode] = {}
     for group in groups:
-        # Skip groups without year
-        if not group.year:
+        # Skip groups without year, or already categorized as NAS_ONLY (no PokerGO data)
+        if not group.year or group.match_category in nas_only_categories:
             stats['skipped'] += 1
             continue
 
-        # Skip groups already categorized as NAS_ONLY (no PokerGO data exists)
-        nas_only_categories = (
-            MATCH_CATEGORY_NAS_ONLY_HISTORIC,
-            MATCH_CATEGORY_NAS_ONLY_MODERN,
-        )
-        if group.match_category in nas_only_categories:
-            stats['skipped'] += 1
+        edges = []
+        for episode, score in score_pokergo_candidates(db, group, index, context):
+            if min(score, 1.0) >= min_score and episode.id not in taken:
+                edges.append((episode.id, score))
+                by_id[episode.id] = episode
+        if edges:
+            rows.append(group)
+            candidates.append(edges)
+
+    for group, edges, episode_id in zip(rows, candidates, max_weight_assignment(candidates)):
+        if episode_id is None:
+            stats['unassigned'] += 1
             continue
-
-        # Find best match
-        best_match, score = match_group_to_pokergo(db, group, episodes)
-
-        if best_match and score >= min_score:
-            group.pokergo_episode_id = best_match.id
-            group.pokergo_title = best_match.title
-            group.pokergo_match_score = score
-            stats['matched'] += 1
+        score = dict(edges)[episode_id]
+        if score < max(weight for _, weight in edges):
+            stats['second_choice'] += 1
+        episode = by_id[episode_id]
+        group.pokergo_episode_id = episode.id
+        group.pokergo_title = episode.title
+        group.pokergo_match_score = min(score, 1.0)
+        stats['matched'] += 1
 
     db.commit()
     return stats
@@ -573,7 +857,9 @@ def enforce_one_to_one(db: Session) -> dict:
 
     ABSOLUTE PRINCIPLE: One PokerGO Title = One NAS Group (NO EXCEPTIONS)
 
-    When multiple groups are matched to the same PokerGO episode:
+    run_pokergo_matching already assigns each episode at most once; this
+    repairs duplicates from manual edits or older runs. When multiple groups
+    are matched to the same PokerGO episode:
     - Only the group with the highest score is kept
     - Other groups are unmatched (become NAS_ONLY)
     - Part separation is handled via Catalog Title, not by allowing N:1 matching
@@ -589,23 +875,23 @@ def enforce_one_to_one(db: Session) -> dict:
         'groups_unmatched': 0,
     }
 
-    # Find all PokerGO episodes with multiple group matches
+    matched = AssetGroup.pokergo_episode_id.isnot(None)
+    stats['checked_episodes'] = db.query(
+        func.count(func.distinct(AssetGroup.pokergo_episode_id))
+    ).filter(matched).scalar()
+
+    # Only episodes with multiple group matches are loaded
+    duplicated = (
+        db.query(AssetGroup.pokergo_episode_id)
+        .filter(matched)
+        .group_by(AssetGroup.pokergo_episode_id)
+        .having(func.count(AssetGroup.id) > 1)
+    )
     episode_to_groups = defaultdict(list)
-
-    groups_with_match = db.query(AssetGroup).filter(
-        AssetGroup.pokergo_episode_id is not None
-    ).all()
-
-    for group in groups_with_match:
+    for group in db.query(AssetGroup).filter(AssetGroup.pokergo_episode_id.in_(duplicated)):
         episode_to_groups[group.pokergo_episode_id].append(group)
 
-    stats['checked_episodes'] = len(episode_to_groups)
-
-    # Process episodes with multiple matches
     for episode_id, groups in episode_to_groups.items():
-        if len(groups) <= 1:
-            continue
-
         stats['conflicts_found'] += 1
 
         # ABSOLUTE PRINCIPLE: Keep only the best match (highest score)
@@ -690,38 +976,28 @@ def get_pokergo_only_episodes(db: Session) -> list[dict]:
     Returns:
         List of episode info dicts
     """
-    # Get all matched episode IDs
-    matched_ids = set()
-    groups_with_match = db.query(AssetGroup).filter(
-        AssetGroup.pokergo_episode_id is not None
-    ).all()
-    for g in groups_with_match:
-        matched_ids.add(g.pokergo_episode_id)
-
-    # Get unmatched episodes
-    all_episodes = db.query(PokergoEpisode).all()
     unmatched = []
 
-    for ep in all_episodes:
-        if ep.id not in matched_ids:
-            # Extract year from title or collection
-            year = None
-            for text in [ep.title, ep.collection_title]:
-                if text:
-                    match = re.search(r'\b(19|20)\d{2}\b', text)
-                    if match:
-                        year = int(match.group())
-                        break
-
-            unmatched.append({
-                'id': ep.id,
-                'title': ep.title,
-                'collection_title': ep.collection_title,
-                'season_title': ep.season_title,
-                'year': year,
-                'duration_sec': ep.duration_sec,
-                'match_category': MATCH_CATEGORY_POKERGO_ONLY,
-            })
+    # Unmatched episodes straight from the is_matched index (kept by triggers)
+    for ep in db.query(PokergoEpisode).filter(PokergoEpisode.is_matched.is_(False)):
+        # Extract year from title or collection
+        year = None
+        for text in [ep.title, ep.collection_title]:
+            if text:
+                match = re.search(r'\b(19|20)\d{2}\b', text)
+                if match:
+                    year = int(match.group())
+                    break
+
+        unmatched.append({
+            'id': ep.id,
+            'title': ep.title,
+            'collection_title': ep.collection_title,
+            'season_title': ep.season_title,
+            'year': year,
+            'duration_sec': ep.duration_sec,
+            'match_category': MATCH_CATEGORY_POKERGO_ONLY,
+        })
 
     return unmatched
 
@@ -732,8 +1008,6 @@ def get_matching_summary(db: Session) -> dict:
     Returns:
         Dictionary with counts for each category
     """
-    from sqlalchemy import func
-
     # NAS group categories
     category_counts = db.query(
         AssetGroup.match_category,
@@ -755,8 +1029,9 @@ def get_matching_summary(db: Session) -> dict:
         summary['total_nas_groups'] += count
 
     # Count PokerGO only
-    pokergo_only = get_pokergo_only_episodes(db)
-    summary[MATCH_CATEGORY_POKERGO_ONLY] = len(pokergo_only)
+    summary[MATCH_CATEGORY_POKERGO_ONLY] = db.query(func.count(PokergoEpisode.id)).filter(
+        PokergoEpisode.is_matched.is_(False)
+    ).scalar()
     summary['total_pokergo_episodes'] = db.query(PokergoEpisode).count()
 
     return summary
@@ -13,6 +13,7 @@ from typing import NamedTuple
 from sqlalchemy.orm import Session
 
 from ..database import AssetGroup, EventType, PokergoEpisode, Region, get_db_context
+from .matching import get_pokergo_titles
 
 
 def is_actual_episode(title: str) -> bool:
@@ -74,7 +75,7 @@ class PokergoMatchKey(NamedTuple):
     region: str | None  # EU, APAC, PARADISE
 
 
-def extract_pokergo_match_key(episode: PokergoEpisode) -> PokergoMatchKey | None:
+def extract_pokergo_match_key(episode: PokergoEpisode, cached=None) -> PokergoMatchKey | None:
     """PokerGO 에피소드에서 매칭 키 추출.
 
     Title 패턴:
@@ -87,19 +88,24 @@ def extract_pokergo_match_key(episode: PokergoEpisode) -> PokergoMatchKey | None
     중요: WSOP와 WSOPE는 별도 대회
     - WSOP = Las Vegas (기본)
     - WSOPE = WSOP Europe → Region=EU
+
+    cached: pokergo_titles 행 (matching.get_pokergo_titles), 있으면 연도 재사용
     """
     title = episode.title or ""
     season = episode.season_title or ""
     collection = episode.collection_title or ""
 
-    # Extract year
+    # Extract year (title → season → collection)
     year = None
-    for text in [title, season, collection]:
-        if text:
-            match = re.search(r'\b(19|20)\d{2}\b', text)
-            if match:
-                year = int(match.group())
-                break
+    if cached is not None:
+        year = cached.title_year or cached.season_year or cached.collection_year
+    else:
+        for text in [title, season, collection]:
+            if text:
+                match = re.search(r'\b(19|20)\d{2}\b', text)
+                if match:
+                    year = int(match.group())
+                    break
 
     if not year:
         return None
@@ -344,10 +350,11 @@ def run_matching_v2(db: Session, min_score: float = 0.5, clear_existing: bool =
     stats['total_episodes'] = len(episodes)
     stats['filtered_headers'] = len(all_episodes) - len(episodes)
 
-    # Build episode index by key
+    # Build episode index by key (years from the pokergo_titles cache)
+    titles = get_pokergo_titles(db, episodes)
     episode_index = {}
     for ep in episodes:
-        key = extract_pokergo_match_key(ep)
+        key = extract_pokergo_match_key(ep, titles.get(ep.id))
         if key:
             # Index by (year, type, episode) if episode exists
             if key.episode:
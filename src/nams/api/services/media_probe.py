@@ -0,0 +1,436 @@
+"""Media probe: duration, resolution and codec from container headers.
+
+Pure Python readers for the two container families on the NAS:
+
+- MP4 / MOV (ISO BMFF / QuickTime atoms): ``moov`` is found by walking the
+  top-level atoms with seeks (``mdat`` is skipped, not read), then read once.
+  Duration comes from ``mvhd`` (or the video track's ``mdhd``), resolution
+  and codec from the video track's ``stsd`` sample entry.
+- MXF: only the header partition is read. Duration comes from the picture
+  descriptor (ContainerDuration / SampleRate) or the material package
+  tracks (Sequence Duration / EditRate), resolution and codec from the
+  picture descriptor (StoredWidth / StoredHeight / PictureEssenceCoding).
+
+Results are stored on NasFile together with the fingerprint the file had
+when it was probed (``probe_fingerprint``), so a file is probed again only
+after the scanner sees its mtime or size change.
+"""
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from ..database import BULK_CHUNK_SIZE, BulkUpdater, NasFile
+from .exclusion_rules import reapply_exclusion_rules
+
+# Containers with a header reader
+PROBE_EXTENSIONS = ('.mp4', '.mov', '.m4v', '.mxf')
+
+# Concurrent probes (each is a few small reads, latency bound on SMB shares)
+PROBE_WORKERS = 8
+
+# Largest moov atom / MXF header metadata read into memory
+MAX_HEADER_BYTES = 64 * 1024 * 1024
+
+# MXF allows a run-in of up to 64 KB before the header partition pack
+MXF_RUN_IN = 65536
+
+# Sample entry fourcc -> codec name (MOV / MP4)
+FOURCC_CODECS = {
+    'avc1': 'h264', 'avc3': 'h264',
+    'hvc1': 'hevc', 'hev1': 'hevc',
+    'apch': 'prores', 'apcn': 'prores', 'apcs': 'prores', 'apco': 'prores',
+    'ap4h': 'prores', 'ap4x': 'prores',
+    'mp4v': 'mpeg4',
+    'mx5p': 'mpeg2', 'mx5n': 'mpeg2', 'm2v1': 'mpeg2', 'xd5a': 'mpeg2', 'xd5b': 'mpeg2',
+    'xd5c': 'mpeg2', 'xd5d': 'mpeg2', 'xd5e': 'mpeg2', 'xd5f': 'mpeg2', 'xdhd': 'mpeg2',
+    'xdvc': 'mpeg2',
+    'dvc ': 'dv', 'dvcp': 'dv', 'dv5n': 'dv', 'dv5p': 'dv', 'dvh5': 'dv', 'dvh6': 'dv',
+    'dvhp': 'dv', 'dvhq': 'dv',
+    'AVdn': 'vc3', 'AVdh': 'vc3',
+    'mjp2': 'jpeg2000',
+}
+
+# MXF PictureEssenceCoding UL bytes 10..13 prefix -> codec name (first match wins)
+MXF_CODECS = [
+    (bytes([0x02, 0x02, 0x03, 0x01]), 'jpeg2000'),
+    (bytes([0x02, 0x02, 0x03, 0x06]), 'prores'),
+    (bytes([0x02, 0x02, 0x71]), 'vc3'),
+    (bytes([0x02, 0x02, 0x02]), 'dv'),
+    (bytes([0x02, 0x02, 0x01]), 'mpeg2'),  # 01.3x (AVC) and 01.20 (MPEG-4) checked below
+    (bytes([0x02, 0x01]), 'uncompressed'),
+]
+
+_MXF_PREFIX = bytes.fromhex('060e2b34')
+# Header partition pack key (bytes 13, 14 = kind, status)
+_MXF_HEADER_PARTITION = bytes.fromhex('060e2b34020501010d01020101') + b'\x02'
+# Header metadata sets: 06.0e.2b.34.02.53.01.01.0d.01.01.01.01.01.<type>.00
+_MXF_SET_PREFIX = bytes.fromhex('060e2b34025301010d0101010101')
+_MXF_MATERIAL_PACKAGE = 0x36
+
+
+@dataclass
+class MediaInfo:
+    """Probe result (None = not found in the header)."""
+    duration_sec: float | None = None
+    width: int | None = None
+    height: int | None = None
+    codec: str | None = None
+
+
+# ============ MP4 / MOV ============
+
+def _atoms(buf: bytes, start: int, end: int):
+    """Yield (type, payload start, atom end) of the atoms in buf[start:end]."""
+    pos = start
+    while pos + 8 <= end:
+        size, kind = struct.unpack_from('>I4s', buf, pos)
+        header = 8
+        if size == 1:
+            if pos + 16 > end:
+                return
+            size = struct.unpack_from('>Q', buf, pos + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header or pos + size > end:
+            return
+        yield kind, pos + header, pos + size
+        pos += size
+
+
+def _child(buf: bytes, start: int, end: int, kind: bytes) -> tuple[int, int] | None:
+    for atom, payload, atom_end in _atoms(buf, start, end):
+        if atom == kind:
+            return payload, atom_end
+    return None
+
+
+def _find_moov(f) -> bytes | None:
+    """Seek through the top-level atoms and read the moov payload."""
+    file_size = os.fstat(f.fileno()).st_size
+    pos = 0
+    while pos + 8 <= file_size:
+        f.seek(pos)
+        header = f.read(16)
+        if len(header) < 8:
+            return None
+        size, kind = struct.unpack_from('>I4s', header)
+        offset = 8
+        if size == 1:
+            if len(header) < 16:
+                return None
+            size = struct.unpack_from('>Q', header, 8)[0]
+            offset = 16
+        elif size == 0:
+            size = file_size - pos
+        if size < offset:
+            return None
+        if kind == b'moov':
+            if size - offset > MAX_HEADER_BYTES:
+                return None
+            f.seek(pos + offset)
+            return f.read(size - offset)
+        pos += size
+    return None
+
+
+def _header_duration(buf: bytes, start: int) -> float | None:
+    """Duration in seconds of an mvhd / mdhd payload."""
+    version = buf[start]
+    if version == 1:
+        timescale, duration = struct.unpack_from('>IQ', buf, start + 20)
+        unknown = 0xFFFFFFFFFFFFFFFF
+    else:
+        timescale, duration = struct.unpack_from('>II', buf, start + 12)
+        unknown = 0xFFFFFFFF
+    if not timescale or not duration or duration == unknown:
+        return None
+    return duration / timescale
+
+
+def parse_moov(buf: bytes) -> MediaInfo:
+    """Duration, video resolution and codec from a moov payload."""
+    info = MediaInfo()
+    end = len(buf)
+    mvhd = _child(buf, 0, end, b'mvhd')
+    if mvhd:
+        info.duration_sec = _header_duration(buf, mvhd[0])
+
+    for kind, trak_start, trak_end in _atoms(buf, 0, end):
+        if kind != b'trak':
+            continue
+        mdia = _child(buf, trak_start, trak_end, b'mdia')
+        if not mdia:
+            continue
+        hdlr = _child(buf, *mdia, b'hdlr')
+        if not hdlr or buf[hdlr[0] + 8:hdlr[0] + 12] != b'vide':
+            continue
+
+        if info.duration_sec is None:
+            mdhd = _child(buf, *mdia, b'mdhd')
+            if mdhd:
+                info.duration_sec = _header_duration(buf, mdhd[0])
+
+        minf = _child(buf, *mdia, b'minf')
+        stbl = minf and _child(buf, *minf, b'stbl')
+        stsd = stbl and _child(buf, *stbl, b'stsd')
+        # stsd: version/flags, entry count, then the first sample entry
+        if stsd and stsd[0] + 8 + 36 <= stsd[1]:
+            entry = stsd[0] + 8
+            fourcc = buf[entry + 4:entry + 8].decode('latin-1')
+            info.codec = FOURCC_CODECS.get(fourcc, fourcc.strip() or None)
+            info.width, info.height = struct.unpack_from('>HH', buf, entry + 32)
+        if not info.width:
+            # tkhd ends with width, height as 16.16 fixed point
+            tkhd = _child(buf, trak_start, trak_end, b'tkhd')
+            if tkhd and tkhd[1] - tkhd[0] >= 84:
+                width, height = struct.unpack_from('>II', buf, tkhd[1] - 8)
+                info.width, info.height = width >> 16, height >> 16
+        break
+    return info
+
+
+def probe_mp4(f) -> MediaInfo | None:
+    """Probe an open MP4 / MOV file; None if it has no moov atom."""
+    moov = _find_moov(f)
+    if moov is None:
+        return None
+    return parse_moov(moov)
+
+
+# ============ MXF ============
+
+def _ber_length(buf: bytes, pos: int) -> tuple[int, int]:
+    """(length, position after it) of the BER length at buf[pos]."""
+    first = buf[pos]
+    if first < 0x80:
+        return first, pos + 1
+    count = first & 0x7F
+    return int.from_bytes(buf[pos + 1:pos + 1 + count], 'big'), pos + 1 + count
+
+
+def _klvs(buf: bytes, pos: int = 0):
+    """Yield (key, value start, value end) of the KLV triplets in buf."""
+    end = len(buf)
+    while pos + 17 <= end:
+        key = buf[pos:pos + 16]
+        if key[:4] != _MXF_PREFIX:
+            return
+        length, value = _ber_length(buf, pos + 16)
+        if value + length > end:
+            return
+        yield key, value, value + length
+        pos = value + length
+
+
+def _local_tags(buf: bytes, start: int, end: int) -> dict[int, bytes]:
+    """Local set items {tag: value} (2-byte tag, 2-byte length)."""
+    items = {}
+    pos = start
+    while pos + 4 <= end:
+        tag, length = struct.unpack_from('>HH', buf, pos)
+        items[tag] = buf[pos + 4:pos + 4 + length]
+        pos += 4 + length
+    return items
+
+
+def _rational(value: bytes | None) -> float | None:
+    if not value or len(value) < 8:
+        return None
+    numerator, denominator = struct.unpack('>ii', value[:8])
+    return numerator / denominator if numerator > 0 and denominator > 0 else None
+
+
+def _length(value: bytes | None) -> int | None:
+    if not value or len(value) < 8:
+        return None
+    length = struct.unpack('>q', value[:8])[0]
+    return length if length > 0 else None
+
+
+def _refs(value: bytes | None) -> list[bytes]:
+    """UUIDs of a strong reference batch (count, item size, items)."""
+    if not value or len(value) < 8:
+        return []
+    count, size = struct.unpack('>II', value[:8])
+    return [value[8 + i * size:8 + (i + 1) * size] for i in range(count)]
+
+
+def mxf_codec(ul: bytes | None) -> str | None:
+    """Codec name of a PictureEssenceCoding UL."""
+    if not ul or len(ul) < 16:
+        return None
+    family = ul[10:14]
+    if family[:3] == bytes([0x02, 0x02, 0x01]) and family[3] >= 0x20:
+        return 'h264' if family[3] >= 0x30 else 'mpeg4'
+    for prefix, codec in MXF_CODECS:
+        if family.startswith(prefix):
+            return codec
+    return ul[8:16].hex()
+
+
+def parse_mxf_header(buf: bytes) -> MediaInfo:
+    """Duration, picture size and codec from MXF header metadata sets."""
+    info = MediaInfo()
+    sets = {}  # InstanceUID -> tags
+    tracks = []
+    descriptor_duration = None
+    for key, start, end in _klvs(buf):
+        if not key.startswith(_MXF_SET_PREFIX):
+            continue
+        tags = _local_tags(buf, start, end)
+        if 0x3C0A in tags:
+            sets[tags[0x3C0A]] = tags
+        kind = key[14]
+        if kind == _MXF_MATERIAL_PACKAGE:
+            tracks = _refs(tags.get(0x4403))
+        if 0x3203 in tags and info.width is None:
+            # Picture descriptor: StoredWidth / StoredHeight / PictureEssenceCoding
+            info.width = struct.unpack('>I', tags[0x3203][:4])[0]
+            info.height = struct.unpack('>I', tags[0x3202][:4])[0] if 0x3202 in tags else None
+            info.codec = mxf_codec(tags.get(0x3201))
+            rate = _rational(tags.get(0x3001))
+            frames = _length(tags.get(0x3002))
+            if rate and frames:
+                descriptor_duration = frames / rate
+
+    info.duration_sec = descriptor_duration
+    if info.duration_sec is None:
+        durations = []
+        for uid in tracks:
+            track = sets.get(uid)
+            if not track:
+                continue
+            rate = _rational(track.get(0x4B01))
+            sequence = sets.get(track.get(0x4803))
+            frames = _length(sequence.get(0x0202)) if sequence else None
+            if rate and frames:
+                durations.append(frames / rate)
+        info.duration_sec = max(durations, default=None)
+    return info
+
+
+def probe_mxf(f) -> MediaInfo | None:
+    """Probe an open MXF file from its header partition; None if it has none."""
+    head = f.read(MXF_RUN_IN + 16)
+    pos = head.find(_MXF_HEADER_PARTITION)
+    if pos < 0:
+        return None
+    f.seek(pos)
+    pack = f.read(16 + 9 + 88)
+    length, value = _ber_length(pack, 16)
+    # Partition pack: versions (2+2), KAGSize (4), this / previous / footer
+    # partition (8 each), HeaderByteCount (8)
+    header_bytes = struct.unpack_from('>Q', pack, value + 32)[0]
+    f.seek(pos + value + length)
+    # The header metadata may be preceded by a KLV fill item
+    buf = f.read(min(header_bytes + MXF_RUN_IN, MAX_HEADER_BYTES))
+    return parse_mxf_header(buf)
+
+
+def probe_file(path: str) -> MediaInfo | None:
+    """Probe one file by extension; None if the container is not recognized.
+
+    Raises:
+        OSError: The file could not be read
+    """
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, 'rb') as f:
+        try:
+            if extension == '.mxf':
+                return probe_mxf(f)
+            if extension in PROBE_EXTENSIONS:
+                return probe_mp4(f)
+        except (struct.error, IndexError, ValueError):
+            return None  # truncated or malformed header
+    return None
+
+
+def _probe(path: str) -> tuple[MediaInfo | None, str | None]:
+    try:
+        return probe_file(path), None
+    except OSError as e:
+        return None, str(e)
+
+
+# ============ Probe stage ============
+
+def run_media_probe(db: Session, workers: int = PROBE_WORKERS,
+                    chunk_size: int = BULK_CHUNK_SIZE) -> dict:
+    """Probe files whose fingerprint changed since their last probe.
+
+    Files are probed concurrently by ``workers`` threads; every chunk of
+    results is written and committed. Unreadable files (OSError) are left
+    unprobed and retried next time; unrecognized headers are stored as
+    probed with no values. Afterwards exclusion rules are re-applied, so
+    duration rules see the new durations.
+
+    Returns:
+        Probe statistics
+    """
+    stats = {
+        'candidates': 0,
+        'cached': 0,
+        'probed': 0,
+        'with_duration': 0,
+        'unrecognized': 0,
+        'errors': [],
+        'exclusion_updates': 0,
+    }
+
+    probeable = [
+        NasFile.extension.in_(PROBE_EXTENSIONS),
+        NasFile.last_seen_at.is_(None),  # not flagged missing
+    ]
+    stale = or_(
+        NasFile.probe_fingerprint.is_(None),
+        NasFile.fingerprint.is_(None),
+        NasFile.probe_fingerprint != NasFile.fingerprint,
+    )
+    rows = db.execute(
+        select(NasFile.id, NasFile.full_path, NasFile.fingerprint)
+        .where(*probeable, stale)
+        .order_by(NasFile.full_path)
+    ).all()
+    stats['candidates'] = len(rows)
+    stats['cached'] = db.query(NasFile).filter(*probeable, ~stale).count()
+    print(f"[Probe] {len(rows)} files to probe, {stats['cached']} cached")
+
+    with (
+        ThreadPoolExecutor(max_workers=workers) as pool,
+        BulkUpdater(db, NasFile, chunk_size) as updater,
+    ):
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            results = pool.map(_probe, [row.full_path for row in chunk])
+            for row, (info, error) in zip(chunk, results):
+                if error is not None:
+                    if len(stats['errors']) < 10:
+                        stats['errors'].append(error)
+                    continue
+                stats['probed'] += 1
+                info = info or MediaInfo()
+                if info.duration_sec is not None:
+                    stats['with_duration'] += 1
+                elif info.codec is None:
+                    stats['unrecognized'] += 1
+                updater.add({
+                    'id': row.id,
+                    'duration_sec': info.duration_sec,
+                    'video_width': info.width,
+                    'video_height': info.height,
+                    'video_codec': info.codec,
+                    'probe_fingerprint': row.fingerprint,
+                })
+
+    if stats['probed']:
+        stats['exclusion_updates'] = reapply_exclusion_rules(db)['updated']
+        db.commit()
+
+    print(f"[Probe] Probed {stats['probed']} files ({stats['with_duration']} with duration, "
+          f"{stats['unrecognized']} unrecognized, {len(stats['errors'])} errors)")
+    return stats
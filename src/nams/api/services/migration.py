@@ -5,7 +5,8 @@ from pathlib import Path
 
 from sqlalchemy.orm import Session
 
-from ..database import AssetGroup, EventType, NasFile, PokergoEpisode, Region, get_db_context
+from ..database import AssetGroup, NasFile, PokergoEpisode, get_code_lookup, get_db_context
+from .matching import refresh_pokergo_titles
 
 # Data paths
 DATA_DIR = Path("D:/AI/claude01/pokergo_crawling/data")
@@ -21,19 +22,13 @@ def load_json(path: Path) -> dict:
 
 
 def get_region_id(db: Session, code: str) -> int | None:
-    """Get region ID by code."""
-    if not code:
-        return None
-    region = db.query(Region).filter(Region.code == code).first()
-    return region.id if region else None
+    """Get region ID by code (resolved through the cached code lookup)."""
+    return get_code_lookup(db).region_id(code)
 
 
 def get_event_type_id(db: Session, code: str) -> int | None:
-    """Get event type ID by code."""
-    if not code:
-        return None
-    event_type = db.query(EventType).filter(EventType.code == code).first()
-    return event_type.id if event_type else None
+    """Get event type ID by code (resolved through the cached code lookup)."""
+    return get_code_lookup(db).event_type_id(code)
 
 
 def migrate_pokergo_episodes(db: Session) -> int:
@@ -75,6 +70,9 @@ def migrate_pokergo_episodes(db: Session) -> int:
         db.add(episode)
         count += 1
 
+    db.flush()
+    # Normalized titles/years for the matchers, computed once here
+    refresh_pokergo_titles(db)
     db.commit()
     return count
 
@@ -0,0 +1,91 @@
+"""In-memory index of all NasFile paths for fast what-if regex evaluation."""
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from ..database import NasFile
+
+
+class PathIndex:
+    """Every NasFile path with its lowercased copy and current winning pattern.
+
+    ``candidates(literals)`` narrows the catalog to paths containing at least
+    one required literal; the substring scan per literal is done once and
+    memoized, so repeated previews of similar regexes only pay for the regex.
+    ``won_by`` lists the positions each pattern currently wins.
+    """
+
+    def __init__(self, rows, signature: tuple = ()):
+        self.signature = signature
+        self._postings: dict[str, list[int]] = {}
+
+        ids, full_paths, directories, filenames, winners = zip(*rows) if rows else ((),) * 5
+        self.ids: list[int] = list(ids)
+        self.paths: list[str] = [
+            full_path or directory or filename
+            for full_path, directory, filename in zip(full_paths, directories, filenames)
+        ]
+        self.filenames: list[str] = list(filenames)
+        self.lowered: list[str] = [path.lower() for path in self.paths]
+        self.winners: list[int | None] = list(winners)
+        self.won_by: dict[int | None, list[int]] = {}
+        for i, winner in enumerate(self.winners):
+            self.won_by.setdefault(winner, []).append(i)
+        self._non_ascii = [i for i, path in enumerate(self.paths) if not path.isascii()]
+
+    @classmethod
+    def load(cls, db: Session) -> 'PathIndex':
+        """Load all NasFile paths (id order)."""
+        rows = db.execute(select(
+            NasFile.id,
+            NasFile.full_path,
+            NasFile.directory,
+            NasFile.filename,
+            NasFile.matched_pattern_id,
+        ).order_by(NasFile.id)).all()
+        return cls(rows, _signature(db))
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def _posting(self, literal: str) -> list[int]:
+        posting = self._postings.get(literal)
+        if posting is None:
+            posting = [i for i, low in enumerate(self.lowered) if literal in low]
+            self._postings[literal] = posting
+        return posting
+
+    def candidates(self, requirements: tuple[frozenset[str], ...]) -> list[int]:
+        """Positions of paths that may match a regex with these literal requirements.
+
+        Intersects, per requirement, the union of the memoized postings of its
+        literals. Non-ASCII paths are always included (see regex_literals).
+        """
+        if not requirements:
+            return list(range(len(self.paths)))
+        positions = None
+        for literals in requirements:
+            union = set().union(*(self._posting(literal) for literal in literals))
+            positions = union if positions is None else positions & union
+        positions.update(self._non_ascii)
+        return sorted(positions)
+
+
+def _signature(db: Session) -> tuple:
+    """Cheap fingerprint of nas_files (row count, last id, last update)."""
+    return tuple(db.query(
+        func.count(NasFile.id),
+        func.max(NasFile.id),
+        func.max(NasFile.updated_at),
+    ).one())
+
+
+# Process-level cache, rebuilt when nas_files changes
+_path_index: PathIndex | None = None
+
+
+def get_path_index(db: Session) -> PathIndex:
+    """Get the cached path index, reloading it if nas_files changed."""
+    global _path_index
+    if _path_index is None or _path_index.signature != _signature(db):
+        _path_index = PathIndex.load(db)
+    return _path_index
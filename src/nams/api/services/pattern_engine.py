@@ -1,10 +1,26 @@
 """Pattern matching engine for extracting metadata from full paths."""
+import hashlib
+import json
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 
+from sqlalchemy import LargeBinary, and_, cast, false, func, or_, true
 from sqlalchemy.orm import Session
 
-from ..database import EventType, NasFile, Pattern, Region, get_db_context
+from ..database import (
+    BULK_CHUNK_SIZE,
+    BulkUpdater,
+    CodeLookup,
+    NasFile,
+    Pattern,
+    PatternSetVersion,
+    get_code_lookup,
+    get_db_context,
+)
+from .field_extractor import EXTRACTOR_VERSION, extract_path_fields
+from .regex_literals import may_match, required_literals
 
 
 @dataclass
@@ -31,22 +47,227 @@ class ExtractionResult:
     part: int | None = None         # Part number (for CLASSIC era: Part 1, Part 2)
 
 
-def get_region_id(db: Session, code: str) -> int | None:
-    """Get region ID by code."""
+@dataclass(frozen=True)
+class CompiledPattern:
+    """Active pattern with its regex precompiled (IGNORECASE)."""
+    id: int
+    name: str
+    priority: int
+    regex: re.Pattern
+    extract_year: bool
+    extract_region: str | None
+    extract_type: str | None
+    extract_episode: bool
+
+
+class CompiledPatternSet:
+    """Active patterns loaded once, ordered by priority and precompiled.
+
+    Build one with ``CompiledPatternSet.load(db)`` (or ``get_pattern_set(db)``
+    for the process-level cached instance) and reuse it for a whole run instead
+    of querying and recompiling patterns for every file.
+
+    ``match()`` dispatches on required literals: each pattern needs a path to
+    contain one literal of each of its literal sets (see regex_literals), one
+    substring pass over the distinct literals yields a bitmask of the sets a
+    path satisfies, and only the regexes of patterns whose sets are all
+    satisfied run, still in priority order.
+    """
+
+    def __init__(self, patterns: list[CompiledPattern]):
+        self.patterns = sorted(patterns, key=lambda p: p.priority)
+        # Literal requirements per pattern, aligned with self.patterns
+        self.requirements = [
+            required_literals(p.regex.pattern, re.IGNORECASE) for p in self.patterns
+        ]
+
+        # Bit n = n-th distinct literal set; per pattern, the bits it needs
+        set_bits: dict[frozenset[str], int] = {}
+        needs = []
+        for requirements in self.requirements:
+            need = 0
+            for literals in requirements:
+                need |= 1 << set_bits.setdefault(literals, len(set_bits))
+            needs.append(need)
+        dispatch: dict[str, int] = {}
+        for literals, bit in set_bits.items():
+            for literal in literals:
+                dispatch[literal] = dispatch.get(literal, 0) | (1 << bit)
+        self._dispatch = sorted(dispatch.items())
+        self._needs = list(zip(self.patterns, needs))
+
+    @classmethod
+    def load(cls, db: Session) -> 'CompiledPatternSet':
+        """Load and compile all active patterns ordered by priority.
+
+        Patterns with an invalid regex are skipped, same as the per-file
+        ``re.error`` handling they used to get.
+        """
+        rows = db.query(Pattern).filter(
+            Pattern.is_active
+        ).order_by(Pattern.priority).all()
+
+        patterns = []
+        for row in rows:
+            try:
+                regex = re.compile(row.regex, re.IGNORECASE)
+            except re.error:
+                continue
+            patterns.append(CompiledPattern(
+                id=row.id,
+                name=row.name,
+                priority=row.priority,
+                regex=regex,
+                extract_year=bool(row.extract_year),
+                extract_region=row.extract_region,
+                extract_type=row.extract_type,
+                extract_episode=bool(row.extract_episode),
+            ))
+        return cls(patterns)
+
+    def __iter__(self):
+        return iter(self.patterns)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def match(self, target: str) -> CompiledPattern | None:
+        """Return the first pattern (by priority) whose regex matches target."""
+        lowered = target.lower()
+        if not lowered.isascii():
+            # Literal prefilters are only exact for ASCII (see regex_literals)
+            for pattern in self.patterns:
+                if pattern.regex.search(target):
+                    return pattern
+            return None
+
+        satisfied = 0
+        for literal, bits in self._dispatch:
+            if literal in lowered:
+                satisfied |= bits
+
+        for pattern, need in self._needs:
+            if not need & ~satisfied and pattern.regex.search(target):
+                return pattern
+        return None
+
+
+def _pattern_signature(db: Session) -> tuple:
+    """Cheap fingerprint of the patterns table (row count, last id, last update)."""
+    return tuple(db.query(
+        func.count(Pattern.id),
+        func.max(Pattern.id),
+        func.max(Pattern.updated_at),
+    ).one())
+
+
+# Process-level cache: (signature, pattern set), reloaded when the patterns table changes
+_pattern_set: tuple[tuple, CompiledPatternSet] | None = None
+
+
+def get_pattern_set(db: Session) -> CompiledPatternSet:
+    """Get the cached compiled pattern set, reloading it if the patterns changed.
+
+    Keyed on the patterns table signature, so edits that bypass the API
+    (init_db seeding, migration scripts, another process) are picked up too.
+    """
+    global _pattern_set
+    signature = _pattern_signature(db)
+    if _pattern_set is None or _pattern_set[0] != signature:
+        _pattern_set = (signature, CompiledPatternSet.load(db))
+    return _pattern_set[1]
+
+
+def invalidate_pattern_set() -> None:
+    """Drop the cached pattern set (forces a reload, e.g. for another database)."""
+    global _pattern_set
+    _pattern_set = None
+
+
+def _digest(payload) -> str:
+    return hashlib.sha1(json.dumps(payload).encode('utf-8')).hexdigest()
+
+
+def pattern_hash(pattern: CompiledPattern) -> str:
+    """Hash of everything in a pattern that can change what it extracts."""
+    return _digest([
+        pattern.name,
+        pattern.priority,
+        pattern.regex.pattern,
+        pattern.extract_year,
+        pattern.extract_region,
+        pattern.extract_type,
+        pattern.extract_episode,
+    ])
+
+
+def pattern_output_hash(pattern: CompiledPattern) -> str:
+    """Hash of what a pattern contributes to the files it wins (not its regex or priority)."""
+    return _digest([
+        pattern.name,
+        pattern.extract_year,
+        pattern.extract_region,
+        pattern.extract_type,
+        pattern.extract_episode,
+    ])
+
+
+def extractor_hash(lookup: CodeLookup) -> str:
+    """Hash of the extractor code version and the region/event type code maps."""
+    return _digest([
+        EXTRACTOR_VERSION,
+        sorted(lookup.region_ids.items()),
+        sorted(lookup.event_type_ids.items()),
+    ])
+
+
+def register_pattern_set_version(
+    db: Session,
+    pattern_set: CompiledPatternSet,
+    lookup: CodeLookup,
+) -> str:
+    """Get the version string for a pattern set, recording its pattern hashes.
+
+    The version is what NasFile.extraction_version stores; the recorded
+    per-pattern hashes, priorities and output hashes let incremental
+    extraction work out which patterns changed since a file was last
+    extracted, and how. Files are about to be stamped with the version, so
+    it no longer stands for a later one (equivalent_to is cleared).
+    """
+    base = extractor_hash(lookup)
+    hashes = {str(p.id): pattern_hash(p) for p in pattern_set}
+    version = _digest([base, sorted(hashes.items())])
+    existing = db.get(PatternSetVersion, version)
+    if existing is None:
+        db.add(PatternSetVersion(
+            version=version,
+            extractor_hash=base,
+            pattern_hashes=json.dumps(hashes),
+            pattern_rules=json.dumps({
+                str(p.id): [p.priority, pattern_output_hash(p)] for p in pattern_set
+            }),
+        ))
+        db.commit()
+    elif existing.equivalent_to is not None:
+        existing.equivalent_to = None
+        db.commit()
+    return version
+
+
+def get_region_id(db: Session, code: str, lookup: CodeLookup | None = None) -> int | None:
+    """Get region ID by code (resolved through the cached code lookup)."""
     if not code:
         return None
-    region = db.query(Region).filter(Region.code == code.upper()).first()
-    return region.id if region else None
+    return (lookup or get_code_lookup(db)).region_id(code.upper())
 
 
-def get_event_type_id(db: Session, code: str) -> int | None:
-    """Get event type ID by code."""
+def get_event_type_id(db: Session, code: str, lookup: CodeLookup | None = None) -> int | None:
+    """Get event type ID by code (resolved through the cached code lookup)."""
     if not code:
         return None
     # Normalize code
     code = code.upper().replace('_', '-')
-    event_type = db.query(EventType).filter(EventType.code == code).first()
-    return event_type.id if event_type else None
+    return (lookup or get_code_lookup(db)).event_type_id(code)
 
 
 def extract_year_from_path(path: str) -> int | None:
@@ -553,13 +774,24 @@ def detect_event_type_from_path(path: str) -> str | None:
     return None
 
 
-def extract_metadata(db: Session, full_path: str, filename: str = None) -> ExtractionResult:
+def extract_metadata(
+    db: Session,
+    full_path: str,
+    filename: str = None,
+    pattern_set: CompiledPatternSet | None = None,
+    lookup: CodeLookup | None = None,
+) -> ExtractionResult:
     """Extract metadata from full path using patterns.
 
+    With both ``pattern_set`` and ``lookup`` given, no database access is
+    needed (``db`` may be None), which is what the reprocess workers rely on.
+
     Args:
         db: Database session
         full_path: Full path to parse (directory + filename)
         filename: Optional filename (for backward compatibility)
+        pattern_set: Compiled patterns to use (default: cached active set)
+        lookup: Region/event type code lookup (default: cached lookup)
 
     Returns:
         ExtractionResult with extracted metadata
@@ -567,93 +799,84 @@ def extract_metadata(db: Session, full_path: str, filename: str = None) -> Extra
     # Use full_path for matching (primary)
     match_target = full_path if full_path else filename
 
-    # Get active patterns ordered by priority
-    patterns = db.query(Pattern).filter(
-        Pattern.is_active
-    ).order_by(Pattern.priority).all()
-
-    for pattern in patterns:
-        try:
-            # Match against full path (not just filename)
-            match = re.search(pattern.regex, match_target, re.IGNORECASE)
-            if match:
-                result = ExtractionResult(
-                    matched=True,
-                    pattern_id=pattern.id,
-                    pattern_name=pattern.name,
-                )
-
-                # Extract year
-                if pattern.extract_year:
-                    result.year = extract_year_from_path(match_target)
-
-                # Extract region (fixed from pattern or dynamic)
-                result.region_code = pattern.extract_region
-                if not result.region_code and pattern.name == "WSOP_CIRCUIT_SUPER":
-                    result.region_code = extract_region_from_super_circuit(match_target)
-
-                # CRITICAL: Override region based on filename keywords (APAC, PARADISE, EUROPE)
-                # This handles cases like WSOP13_APAC_ME01 in WSOP-LAS VEGAS folder
-                filename_upper = (filename or match_target.split('\\')[-1].split('/')[-1]).upper()
-                if '_APAC_' in filename_upper or 'APAC' in filename_upper:
-                    result.region_code = 'APAC'
-                elif '_PARADISE_' in filename_upper or 'PARADISE' in filename_upper:
-                    result.region_code = 'PARADISE'
-                elif 'WSOPE' in filename_upper or '_EU_' in filename_upper:
-                    result.region_code = 'EU'
-
-                if result.region_code:
-                    result.region_id = get_region_id(db, result.region_code)
-
-                # Extract event type (fixed from pattern or dynamic)
-                result.event_type_code = pattern.extract_type
-                if not result.event_type_code:
-                    result.event_type_code = detect_event_type_from_path(match_target)
-                if result.event_type_code:
-                    result.event_type_id = get_event_type_id(db, result.event_type_code)
-
-                # Extract episode
-                if pattern.extract_episode:
-                    result.episode = extract_episode_from_path(match_target, pattern.name)
-
-                # Extract extended metadata
-                result.stage = extract_stage_from_path(match_target)
-                result.event_num = extract_event_num_from_path(match_target)
-                result.buyin = extract_buyin_from_path(match_target)
-                result.gtd = extract_gtd_from_path(match_target)
-                result.version = extract_version_from_path(match_target)
-
-                # CLASSIC Era Part extraction (1973-2002)
-                result.part = extract_part_from_path(match_target, result.year)
-
-                # PAD specific: season
-                if pattern.name == "PAD":
-                    result.season = extract_season_from_path(match_target)
-
-                # Calculate confidence
-                filled_fields = sum([
-                    result.year is not None,
-                    result.region_id is not None,
-                    result.event_type_id is not None,
-                    result.episode is not None,
-                    result.stage is not None,
-                ])
-                result.confidence = min(1.0, 0.5 + (filled_fields * 0.1))
-
-                return result
-        except re.error:
-            continue
+    if pattern_set is None:
+        pattern_set = get_pattern_set(db)
+
+    # Match against full path (not just filename), first pattern by priority wins
+    pattern = pattern_set.match(match_target)
+    if pattern:
+        result = ExtractionResult(
+            matched=True,
+            pattern_id=pattern.id,
+            pattern_name=pattern.name,
+        )
+
+        # Extract all path-derived fields in one pass
+        fields = extract_path_fields(
+            match_target,
+            pattern.name,
+            year=pattern.extract_year,
+            event_type=not pattern.extract_type,
+            episode=pattern.extract_episode,
+            season=pattern.name == "PAD",
+        )
+        result.year = fields.year
+
+        # Extract region (fixed from pattern or dynamic)
+        result.region_code = pattern.extract_region
+        if not result.region_code and pattern.name == "WSOP_CIRCUIT_SUPER":
+            result.region_code = extract_region_from_super_circuit(match_target)
+
+        # CRITICAL: Override region based on filename keywords (APAC, PARADISE, EUROPE)
+        # This handles cases like WSOP13_APAC_ME01 in WSOP-LAS VEGAS folder
+        filename_upper = (filename or match_target.split('\\')[-1].split('/')[-1]).upper()
+        if '_APAC_' in filename_upper or 'APAC' in filename_upper:
+            result.region_code = 'APAC'
+        elif '_PARADISE_' in filename_upper or 'PARADISE' in filename_upper:
+            result.region_code = 'PARADISE'
+        elif 'WSOPE' in filename_upper or '_EU_' in filename_upper:
+            result.region_code = 'EU'
+
+        if result.region_code:
+            result.region_id = get_region_id(db, result.region_code, lookup)
+
+        # Extract event type (fixed from pattern or dynamic)
+        result.event_type_code = pattern.extract_type or fields.event_type_code
+        if result.event_type_code:
+            result.event_type_id = get_event_type_id(db, result.event_type_code, lookup)
+
+        # Episode, extended metadata, CLASSIC era part, PAD season
+        result.episode = fields.episode
+        result.stage = fields.stage
+        result.event_num = fields.event_num
+        result.buyin = fields.buyin
+        result.gtd = fields.gtd
+        result.version = fields.version
+        result.part = fields.part
+        result.season = fields.season
+
+        # Calculate confidence
+        filled_fields = sum([
+            result.year is not None,
+            result.region_id is not None,
+            result.event_type_id is not None,
+            result.episode is not None,
+            result.stage is not None,
+        ])
+        result.confidence = min(1.0, 0.5 + (filled_fields * 0.1))
+
+        return result
 
     # No pattern matched - try basic extraction
-    return extract_basic(db, match_target)
+    return extract_basic(db, match_target, lookup)
 
 
-def extract_basic(db: Session, path: str) -> ExtractionResult:
+def extract_basic(db: Session, path: str, lookup: CodeLookup | None = None) -> ExtractionResult:
     """Basic extraction without patterns."""
     result = ExtractionResult(matched=False, confidence=0.3)
 
-    # Try to find year
-    result.year = extract_year_from_path(path)
+    fields = extract_path_fields(path)
+    result.year = fields.year
 
     # Try to find region
     if 'APAC' in path.upper():
@@ -666,29 +889,151 @@ def extract_basic(db: Session, path: str) -> ExtractionResult:
         result.region_code = 'LV'
 
     if result.region_code:
-        result.region_id = get_region_id(db, result.region_code)
+        result.region_id = get_region_id(db, result.region_code, lookup)
 
     # Try to find event type
-    result.event_type_code = detect_event_type_from_path(path)
+    result.event_type_code = fields.event_type_code
     if result.event_type_code:
-        result.event_type_id = get_event_type_id(db, result.event_type_code)
+        result.event_type_id = get_event_type_id(db, result.event_type_code, lookup)
 
     # Extract extended fields
-    result.stage = extract_stage_from_path(path)
-    result.event_num = extract_event_num_from_path(path)
-    result.buyin = extract_buyin_from_path(path)
-    result.gtd = extract_gtd_from_path(path)
-    result.version = extract_version_from_path(path)
+    result.stage = fields.stage
+    result.event_num = fields.event_num
+    result.buyin = fields.buyin
+    result.gtd = fields.gtd
+    result.version = fields.version
 
     # CLASSIC Era Part extraction (1973-2002)
-    result.part = extract_part_from_path(path, result.year)
+    result.part = fields.part
 
     return result
 
 
-def process_unmatched_files(db: Session) -> dict:
+# (NasFile column, ExtractionResult attribute) written back by extraction
+EXTRACTION_COLUMNS = (
+    ('matched_pattern_id', 'pattern_id'),
+    ('year', 'year'),
+    ('region_id', 'region_id'),
+    ('event_type_id', 'event_type_id'),
+    ('episode', 'episode'),
+    ('stage', 'stage'),
+    ('event_num', 'event_num'),
+    ('season', 'season'),
+    ('buyin', 'buyin'),
+    ('gtd', 'gtd'),
+    ('version', 'version'),
+)
+
+
+def _iter_rows(db: Session, columns: list, chunk_size: int, *criteria):
+    """Yield chunks of NasFile column tuples (id first) matching criteria, in id order."""
+    last_id = 0
+    while True:
+        rows = db.query(NasFile.id, *columns).filter(
+            NasFile.id > last_id, *criteria
+        ).order_by(NasFile.id).limit(chunk_size).all()
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1].id
+
+
+def _iter_extraction_rows(db: Session, chunk_size: int, *criteria):
+    """Yield NasFile rows (id, paths, override flag, extraction columns) in id order.
+
+    Only plain column tuples are loaded, never full ORM objects.
+    """
+    columns = [getattr(NasFile, column) for column, _ in EXTRACTION_COLUMNS]
+    return _iter_rows(db, [
+        NasFile.full_path,
+        NasFile.directory,
+        NasFile.filename,
+        NasFile.is_manual_override,
+        NasFile.extraction_confidence,
+        NasFile.extraction_version,
+        *columns,
+    ], chunk_size, *criteria)
+
+
+def _unmatched_changes(row, result: ExtractionResult, stats: dict) -> dict | None:
+    """Changed columns for process_unmatched_files (only non-empty values overwrite)."""
+    if not (result.matched or result.year):
+        return None
+    stats['matched'] += 1
+
+    changes = {}
+    for column, attr in EXTRACTION_COLUMNS:
+        value = getattr(result, attr)
+        if value and value != getattr(row, column):
+            changes[column] = value
+    updated = bool(changes)
+
+    if result.confidence:
+        if result.confidence != row.extraction_confidence:
+            changes['extraction_confidence'] = result.confidence
+        updated = True
+
+    if updated:
+        stats['updated'] += 1
+    if not changes:
+        return None
+    changes['id'] = row.id
+    return changes
+
+
+def _reprocess_changes(
+    row,
+    result: ExtractionResult,
+    stats: dict,
+    version: str | None = None,
+) -> dict | None:
+    """Changed columns for a full reprocess (every extracted value overwrites).
+
+    ``version`` is stamped into extraction_version whether or not anything
+    else changed, so incremental runs know the row is current. A row left
+    with the matched_pattern_id of an earlier run (nothing useful extracted
+    now) gets no version instead: incremental runs trust the stored winner.
+    """
+    changes = {}
+
+    # Update if pattern matched OR basic extraction found useful data
+    has_useful_data = result.matched or result.year or result.event_type_id
+    if has_useful_data:
+        if result.matched:
+            stats['matched'] += 1
+
+        for column, attr in EXTRACTION_COLUMNS:
+            value = getattr(result, attr)
+            if value != getattr(row, column):
+                changes[column] = value
+        if changes:
+            stats['updated'] += 1
+
+        if result.confidence != row.extraction_confidence:
+            changes['extraction_confidence'] = result.confidence
+
+    if version:
+        stamp = version if has_useful_data or row.matched_pattern_id is None else None
+        if row.extraction_version != stamp:
+            changes['extraction_version'] = stamp
+    if not changes:
+        return None
+    changes['id'] = row.id
+    return changes
+
+
+def process_unmatched_files(
+    db: Session,
+    pattern_set: CompiledPatternSet | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> dict:
     """Process files without pattern match.
 
+    Args:
+        db: Database session
+        pattern_set: Compiled patterns reused for the whole run (default: cached set)
+        chunk_size: Rows read, written back and committed per chunk
+
     Returns:
         Statistics about processing
     """
@@ -698,71 +1043,111 @@ def process_unmatched_files(db: Session) -> dict:
         'updated': 0,
     }
 
-    # Get files without pattern match
-    files = db.query(NasFile).filter(
-        NasFile.matched_pattern_id is None
-    ).all()
+    if pattern_set is None:
+        pattern_set = get_pattern_set(db)
+    lookup = get_code_lookup(db)
+
+    with BulkUpdater(db, NasFile, chunk_size) as writer:
+        # Get files without pattern match
+        for rows in _iter_extraction_rows(db, chunk_size, NasFile.matched_pattern_id.is_(None)):
+            stats['processed'] += len(rows)
+            for row in rows:
+                # Use full_path for better matching
+                result = extract_metadata(
+                    db, row.full_path or row.directory, row.filename, pattern_set, lookup
+                )
+                changes = _unmatched_changes(row, result, stats)
+                if changes:
+                    writer.add(changes)
 
-    stats['processed'] = len(files)
+    return stats
 
-    for file in files:
-        # Use full_path for better matching
-        result = extract_metadata(db, file.full_path or file.directory, file.filename)
 
-        if result.matched or result.year:
-            stats['matched'] += 1
+def reprocess_all_files(
+    db: Session,
+    pattern_set: CompiledPatternSet | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> dict:
+    """Reprocess all files with new patterns (full path matching).
 
-            # Update file
-            updated = False
-            if result.pattern_id and file.matched_pattern_id != result.pattern_id:
-                file.matched_pattern_id = result.pattern_id
-                updated = True
-            if result.year and file.year != result.year:
-                file.year = result.year
-                updated = True
-            if result.region_id and file.region_id != result.region_id:
-                file.region_id = result.region_id
-                updated = True
-            if result.event_type_id and file.event_type_id != result.event_type_id:
-                file.event_type_id = result.event_type_id
-                updated = True
-            if result.episode and file.episode != result.episode:
-                file.episode = result.episode
-                updated = True
-
-            # Update extended fields
-            if result.stage and file.stage != result.stage:
-                file.stage = result.stage
-                updated = True
-            if result.event_num and file.event_num != result.event_num:
-                file.event_num = result.event_num
-                updated = True
-            if result.season and file.season != result.season:
-                file.season = result.season
-                updated = True
-            if result.buyin and file.buyin != result.buyin:
-                file.buyin = result.buyin
-                updated = True
-            if result.gtd and file.gtd != result.gtd:
-                file.gtd = result.gtd
-                updated = True
-            if result.version and file.version != result.version:
-                file.version = result.version
-                updated = True
-
-            if result.confidence:
-                file.extraction_confidence = result.confidence
-                updated = True
-
-            if updated:
-                stats['updated'] += 1
+    Args:
+        db: Database session
+        pattern_set: Compiled patterns reused for the whole run (default: cached set)
+        chunk_size: Rows read, written back and committed per chunk
+
+    Returns:
+        Statistics about processing
+    """
+    stats = {
+        'processed': 0,
+        'matched': 0,
+        'updated': 0,
+    }
+
+    if pattern_set is None:
+        pattern_set = get_pattern_set(db)
+    lookup = get_code_lookup(db)
+    version = register_pattern_set_version(db, pattern_set, lookup)
+
+    with BulkUpdater(db, NasFile, chunk_size) as writer:
+        for rows in _iter_extraction_rows(db, chunk_size):
+            stats['processed'] += len(rows)
+            for row in rows:
+                # Skip manually overridden files
+                if row.is_manual_override:
+                    continue
+
+                # Use full_path for matching
+                result = extract_metadata(
+                    db, row.full_path or row.directory, row.filename, pattern_set, lookup
+                )
+                changes = _reprocess_changes(row, result, stats, version)
+                if changes:
+                    writer.add(changes)
 
-    db.commit()
     return stats
 
 
-def reprocess_all_files(db: Session) -> dict:
-    """Reprocess all files with new patterns (full path matching).
+REPROCESS_CHUNK_SIZE = 2000
+
+# Per-worker state for reprocess_all_files_parallel(), set by _init_reprocess_worker()
+_worker_pattern_set: CompiledPatternSet | None = None
+_worker_lookup: CodeLookup | None = None
+
+
+def _init_reprocess_worker(pattern_set: CompiledPatternSet, lookup: CodeLookup) -> None:
+    """Receive the compiled patterns and code lookup once per worker process."""
+    global _worker_pattern_set, _worker_lookup
+    _worker_pattern_set = pattern_set
+    _worker_lookup = lookup
+
+
+def _extract_chunk(rows: list[tuple[int, str, str]]) -> list[tuple[int, ExtractionResult]]:
+    """Worker: run extraction for (id, full_path, filename) tuples without a DB session."""
+    return [
+        (file_id, extract_metadata(None, path, filename, _worker_pattern_set, _worker_lookup))
+        for file_id, path, filename in rows
+    ]
+
+
+def reprocess_all_files_parallel(
+    db: Session,
+    workers: int,
+    pattern_set: CompiledPatternSet | None = None,
+    chunk_size: int = REPROCESS_CHUNK_SIZE,
+) -> dict:
+    """Reprocess all files with extraction spread over a process pool.
+
+    Rows are read in id-ordered chunks; workers only get (id, full_path,
+    filename) tuples and return ExtractionResults, and this process writes
+    the changed columns back as bulk UPDATEs. Manual overrides are skipped
+    and the stats match reprocess_all_files().
+
+    Args:
+        db: Database session
+        workers: Number of worker processes
+        pattern_set: Compiled patterns reused for the whole run (default: cached set)
+        chunk_size: Files per read chunk / worker task
 
     Returns:
         Statistics about processing
@@ -773,66 +1158,276 @@ def reprocess_all_files(db: Session) -> dict:
         'updated': 0,
     }
 
-    # Get all files
-    files = db.query(NasFile).all()
-    stats['processed'] = len(files)
-
-    for file in files:
-        # Skip manually overridden files
-        if file.is_manual_override:
-            continue
-
-        # Use full_path for matching
-        result = extract_metadata(db, file.full_path or file.directory, file.filename)
-
-        # Update if pattern matched OR basic extraction found useful data
-        has_useful_data = result.matched or result.year or result.event_type_id
-        if has_useful_data:
-            if result.matched:
-                stats['matched'] += 1
-
-            updated = False
-            # Update all fields from extraction
-            if result.pattern_id != file.matched_pattern_id:
-                file.matched_pattern_id = result.pattern_id
-                updated = True
-            if result.year != file.year:
-                file.year = result.year
-                updated = True
-            if result.region_id != file.region_id:
-                file.region_id = result.region_id
-                updated = True
-            if result.event_type_id != file.event_type_id:
-                file.event_type_id = result.event_type_id
-                updated = True
-            if result.episode != file.episode:
-                file.episode = result.episode
-                updated = True
-            if result.stage != file.stage:
-                file.stage = result.stage
-                updated = True
-            if result.event_num != file.event_num:
-                file.event_num = result.event_num
-                updated = True
-            if result.season != file.season:
-                file.season = result.season
-                updated = True
-            if result.buyin != file.buyin:
-                file.buyin = result.buyin
-                updated = True
-            if result.gtd != file.gtd:
-                file.gtd = result.gtd
-                updated = True
-            if result.version != file.version:
-                file.version = result.version
-                updated = True
-
-            file.extraction_confidence = result.confidence
-
-            if updated:
-                stats['updated'] += 1
+    if pattern_set is None:
+        pattern_set = get_pattern_set(db)
+    lookup = get_code_lookup(db)
+    version = register_pattern_set_version(db, pattern_set, lookup)
+
+    def apply(rows, future, writer):
+        results = dict(future.result())
+        for row in rows:
+            result = results.get(row.id)
+            if result is None:
+                continue
+            changes = _reprocess_changes(row, result, stats, version)
+            if changes:
+                writer.add(changes)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_reprocess_worker,
+        initargs=(pattern_set, lookup),
+    ) as pool, BulkUpdater(db, NasFile) as writer:
+        # Keep a bounded number of chunks in flight so memory stays flat
+        pending = deque()
+        for rows in _iter_extraction_rows(db, chunk_size):
+            stats['processed'] += len(rows)
+            tasks = [
+                (row.id, row.full_path or row.directory, row.filename)
+                for row in rows
+                # Skip manually overridden files
+                if not row.is_manual_override
+            ]
+            pending.append((rows, pool.submit(_extract_chunk, tasks)))
+            if len(pending) >= workers * 2:
+                apply(*pending.popleft(), writer)
+        while pending:
+            apply(*pending.popleft(), writer)
+
+    return stats
+
+
+def _changed_pattern_ids(old_hashes: dict[str, str], new_hashes: dict[str, str]) -> set[int]:
+    """Pattern ids added, removed or edited between two recorded pattern sets."""
+    return {
+        int(pattern_id)
+        for pattern_id in old_hashes.keys() | new_hashes.keys()
+        if old_hashes.get(pattern_id) != new_hashes.get(pattern_id)
+    }
+
 
+def _resolve_equivalent(versions: dict, name: str, current: str) -> str | None:
+    """Follow equivalent_to from a version to the one its files' results equal.
+
+    None when the chain leaves ``versions`` (another extractor, no pattern rules).
+    """
+    seen = set()
+    while name != current and versions[name].equivalent_to is not None:
+        seen.add(name)
+        name = versions[name].equivalent_to
+        if name not in versions or name in seen:
+            return None
+    return name
+
+
+def _recheck_plans(
+    old: PatternSetVersion,
+    new_hashes: dict[str, str],
+    pattern_set: CompiledPatternSet,
+) -> dict:
+    """How to tell, per winning pattern id, whether a file extracted under ``old`` may change.
+
+    A file's metadata depends only on its path and winning pattern, so it can
+    change only if its winner was edited or removed, or a changed pattern of
+    at least the winner's priority now matches. Plans are keyed by pattern id
+    (None = files no pattern matched); each is True (always re-extract) or
+    ``(keep, rivals, winner)``: the winner's (requirements, regex) that must
+    still match when only its regex changed, the (requirements, regex) of
+    changed patterns that could now win first, and the reprioritised winner
+    a full match must still return.
+    """
+    changed_ids = _changed_pattern_ids(json.loads(old.pattern_hashes), new_hashes)
+    patterns = {p.id: (p, (requirements, p.regex))
+                for p, requirements in zip(pattern_set.patterns, pattern_set.requirements)}
+    changed = [(p, check) for p, check in patterns.values() if p.id in changed_ids]
+
+    def rivals(priority: int, winner_id: int | None = None) -> tuple:
+        # Ties count: patterns of equal priority have no fixed order
+        return tuple(check for p, check in changed if p.priority <= priority and p.id != winner_id)
+
+    plans = {None: (None, tuple(check for _, check in changed), None)}
+    for key, (priority, output) in json.loads(old.pattern_rules).items():
+        pattern_id = int(key)
+        pattern, check = patterns.get(pattern_id, (None, None))
+        if pattern_id not in changed_ids:
+            plans[pattern_id] = (None, rivals(pattern.priority), None)
+        elif pattern is None or output != pattern_output_hash(pattern):
+            plans[pattern_id] = True
+        elif priority == pattern.priority:
+            plans[pattern_id] = (check, rivals(priority, pattern_id), None)
+        else:
+            plans[pattern_id] = (None, (), pattern)
+    return plans
+
+
+def _affected(plan, pattern_set: CompiledPatternSet, target: str) -> bool:
+    """Whether a file's recheck plan (see _recheck_plans) says to re-extract it."""
+    if plan is True:
+        return True
+    keep, rivals, winner = plan
+    if winner is not None:
+        return pattern_set.match(target) is not winner
+    lowered = target.lower()
+    if keep is not None:
+        requirements, regex = keep
+        if not (may_match(requirements, lowered) and regex.search(target)):
+            return True
+    return any(
+        may_match(requirements, lowered) and regex.search(target)
+        for requirements, regex in rivals
+    )
+
+
+def _may_change_filter(plans: dict):
+    """SQL condition for files of one old version that _affected() might flag.
+
+    Files whose winner has only rivals to beat are read only when a rival's
+    literal prefilter (LIKE, ASCII case-insensitive like may_match) passes
+    on their path; non-ASCII paths always pass, same as may_match.
+    """
+    winner = NasFile.matched_pattern_id
+    target = func.coalesce(
+        func.nullif(NasFile.full_path, ''), func.nullif(NasFile.directory, ''), NasFile.filename
+    )
+    non_ascii = func.length(cast(target, LargeBinary)) != func.length(target)
+
+    def winner_in(ids: list) -> object:
+        known = [pattern_id for pattern_id in ids if pattern_id is not None]
+        return or_(winner.in_(known), winner.is_(None) if None in ids else false())
+
+    def prefilter(requirements: tuple) -> object:
+        return and_(true(), *(
+            or_(*(target.contains(literal, autoescape=True) for literal in literals))
+            for literals in requirements
+        ))
+
+    # Stored winners the old version did not have
+    conditions = [winner.not_in([pattern_id for pattern_id in plans if pattern_id is not None])]
+    read_all = []
+    by_rivals: dict[tuple, list] = {}
+    for pattern_id, plan in plans.items():
+        if plan is True or plan[0] is not None or plan[2] is not None:
+            read_all.append(pattern_id)
+        elif plan[1]:
+            by_rivals.setdefault(plan[1], []).append(pattern_id)
+    if read_all:
+        conditions.append(winner_in(read_all))
+    for rivals, ids in by_rivals.items():
+        conditions.append(and_(winner_in(ids), or_(
+            non_ascii, *(prefilter(requirements) for requirements, _ in rivals)
+        )))
+    return or_(*conditions)
+
+
+def reprocess_incremental(
+    db: Session,
+    pattern_set: CompiledPatternSet | None = None,
+    chunk_size: int = BULK_CHUNK_SIZE,
+) -> dict:
+    """Re-extract only files whose metadata may differ under the current patterns.
+
+    A file is re-extracted when its extraction_version is missing, unknown or
+    was made by another extractor/code-lookup version, or when its stored
+    winning pattern may no longer win with the same output (see
+    _recheck_plans). Files whose winner no changed pattern can displace are
+    not even read. Every other file would get the same result as before and
+    is not written either: its old version is recorded as equivalent_to the
+    current one, and later runs treat it as such. Manual overrides are
+    skipped, same as a full reprocess, and re-extracted files are written
+    back with the same rules.
+
+    Args:
+        db: Database session
+        pattern_set: Compiled patterns to use (default: cached set)
+        chunk_size: Rows read, written back and committed per chunk
+
+    Returns:
+        Statistics about processing ('skipped' = files already up to date)
+    """
+    stats = {
+        'processed': 0,
+        'matched': 0,
+        'updated': 0,
+        'skipped': 0,
+    }
+
+    if pattern_set is None:
+        pattern_set = get_pattern_set(db)
+    lookup = get_code_lookup(db)
+    version = register_pattern_set_version(db, pattern_set, lookup)
+
+    current = db.get(PatternSetVersion, version)
+    new_hashes = json.loads(current.pattern_hashes)
+
+    # Versions whose files can be checked, grouped by the version their files'
+    # results equal (following equivalent_to). Versions missing here (None,
+    # unknown, other extractor, recorded before pattern_rules) mean "re-extract".
+    known = {
+        old.version: old for old in db.query(PatternSetVersion).filter(
+            PatternSetVersion.extractor_hash == current.extractor_hash,
+            PatternSetVersion.pattern_rules.is_not(None),
+        )
+    }
+    groups: dict[str, list[str]] = {version: [version]}
+    for name in known:
+        target = _resolve_equivalent(known, name, version)
+        if target is not None and name != version:
+            groups.setdefault(target, []).append(name)
+    plans_by_version = {
+        name: _recheck_plans(known[name], new_hashes, pattern_set)
+        for name in groups if name != version
+    }
+
+    # Skip manually overridden files
+    not_override = NasFile.is_manual_override.is_not(True)
+
+    affected_ids = []
+    for old_version, plans in plans_by_version.items():
+        for rows in _iter_rows(
+            db,
+            [NasFile.full_path, NasFile.directory, NasFile.filename, NasFile.matched_pattern_id],
+            chunk_size,
+            NasFile.extraction_version.in_(groups[old_version]),
+            not_override,
+            _may_change_filter(plans),
+        ):
+            for row in rows:
+                target = row.full_path or row.directory or row.filename
+                if _affected(plans.get(row.matched_pattern_id, True), pattern_set, target):
+                    affected_ids.append(row.id)
+
+    def extract(rows, writer):
+        stats['processed'] += len(rows)
+        for row in rows:
+            result = extract_metadata(
+                db, row.full_path or row.directory, row.filename, pattern_set, lookup
+            )
+            changes = _reprocess_changes(row, result, stats, version)
+            if changes:
+                writer.add(changes)
+
+    unknown = or_(
+        NasFile.extraction_version.is_(None),
+        NasFile.extraction_version.not_in([name for names in groups.values() for name in names]),
+    )
+    with BulkUpdater(db, NasFile, chunk_size) as writer:
+        for rows in _iter_extraction_rows(db, chunk_size, unknown, not_override):
+            extract(rows, writer)
+        for start in range(0, len(affected_ids), chunk_size):
+            ids = affected_ids[start:start + chunk_size]
+            for rows in _iter_extraction_rows(db, chunk_size, NasFile.id.in_(ids)):
+                extract(rows, writer)
+
+    # Re-extracted files now carry the current version (or none), so what is
+    # left on the old versions is exactly the unaffected files
+    for old_version in plans_by_version:
+        stats['skipped'] += db.query(func.count(NasFile.id)).filter(
+            NasFile.extraction_version.in_(groups[old_version]),
+            not_override,
+        ).scalar()
+        known[old_version].equivalent_to = version
     db.commit()
+
     return stats
 
 
@@ -842,7 +1437,19 @@ def run_pattern_extraction() -> dict:
         return process_unmatched_files(db)
 
 
-def run_full_reprocess() -> dict:
-    """Run full reprocess on all files."""
+def run_incremental_extraction() -> dict:
+    """Run incremental extraction (only files stale for the current patterns)."""
+    with get_db_context() as db:
+        return reprocess_incremental(db)
+
+
+def run_full_reprocess(workers: int | None = None) -> dict:
+    """Run full reprocess on all files.
+
+    Args:
+        workers: Worker processes for extraction (None or 1 = serial in this process)
+    """
     with get_db_context() as db:
+        if workers and workers > 1:
+            return reprocess_all_files_parallel(db, workers)
         return reprocess_all_files(db)
@@ -0,0 +1,174 @@
+"""Dry-run a candidate pattern against the whole catalog before saving it."""
+import re
+import time
+from collections import Counter
+
+from sqlalchemy.orm import Session
+
+from ..database import Pattern, get_code_lookup
+from .path_index import get_path_index
+from .pattern_engine import (
+    EXTRACTION_COLUMNS,
+    CompiledPattern,
+    CompiledPatternSet,
+    extract_metadata,
+    get_pattern_set,
+)
+from .regex_literals import required_literals
+
+# CompiledPattern.id for a candidate that is not saved yet (DB ids start at 1)
+NEW_PATTERN_ID = 0
+UNMATCHED = "(unmatched)"
+
+
+def _changed_fields(old, new) -> dict[str, list]:
+    """Extraction fields that differ between two ExtractionResults."""
+    changes = {}
+    for column, attr in EXTRACTION_COLUMNS:
+        # The pattern change itself is reported as old_pattern/new_pattern
+        if column == 'matched_pattern_id':
+            continue
+        if getattr(old, attr) != getattr(new, attr):
+            changes[column] = [getattr(old, attr), getattr(new, attr)]
+    return changes
+
+
+def preview_pattern(
+    db: Session,
+    regex: str,
+    priority: int,
+    name: str = "PREVIEW",
+    pattern_id: int | None = None,
+    extract_year: bool = True,
+    extract_region: str | None = None,
+    extract_type: str | None = None,
+    extract_episode: bool = True,
+    sample_size: int = 20,
+) -> dict:
+    """Work out which files a new or edited pattern would capture or release.
+
+    The candidate is placed into the active pattern set by priority (replacing
+    ``pattern_id`` when editing). Only paths containing its required literals
+    are tested, and a path is captured when no pattern ahead of it matches.
+    "From" patterns are the files' stored matched_pattern_id, which is taken
+    to be up to date with the active pattern set (as after a reprocess), so
+    patterns ahead of a file's winner are not re-run on it.
+
+    Args:
+        db: Database session
+        regex: Candidate regex (compiled with IGNORECASE, like saved patterns)
+        priority: Candidate priority
+        name: Candidate name (episode rules are chosen by name)
+        pattern_id: Existing pattern being edited, None for a new pattern
+        extract_year / extract_region / extract_type / extract_episode: As on Pattern
+        sample_size: Number of per-file diffs to return
+
+    Returns:
+        Counts, per-pattern transitions and a sample of per-file diffs
+
+    Raises:
+        re.error: If the regex is invalid
+    """
+    start = time.perf_counter()
+    compiled = re.compile(regex, re.IGNORECASE)
+
+    current = get_pattern_set(db)
+    lookup = get_code_lookup(db)
+    candidate_id = pattern_id if pattern_id is not None else NEW_PATTERN_ID
+    candidate = CompiledPattern(
+        id=candidate_id,
+        name=name,
+        priority=priority,
+        regex=compiled,
+        extract_year=extract_year,
+        extract_region=extract_region,
+        extract_type=extract_type,
+        extract_episode=extract_episode,
+    )
+
+    patterns = [p for p in current if p.id != candidate_id]
+    proposed = CompiledPatternSet(patterns + [candidate])
+    position = proposed.patterns.index(candidate)
+
+    names = {row.id: row.name for row in db.query(Pattern.id, Pattern.name)}
+    names[candidate_id] = name
+
+    index = get_path_index(db)
+    candidates = index.candidates(required_literals(regex, re.IGNORECASE))
+
+    ahead = proposed.patterns[:position]
+    ahead_ids = {p.id for p in ahead}
+    current_ids = [p.id for p in current]
+    # Patterns ahead of the edited pattern in the current set did not match
+    # the files it wins now
+    was_ahead = set()
+    if pattern_id in current_ids:
+        was_ahead = set(current_ids[:current_ids.index(pattern_id)])
+    # A file's winner is the first current pattern it matches, so patterns
+    # ahead of the candidate and behind the winner need no re-run. Files
+    # without a current winner are checked against all of them.
+    newly_ahead = CompiledPatternSet([p for p in ahead if p.id not in was_ahead])
+    all_ahead = CompiledPatternSet(ahead)
+    current_ids = set(current_ids)
+
+    matched = 0
+    captured: list[int] = []
+    kept = 0
+    won = set()
+    for i in candidates:
+        path = index.paths[i]
+        if not compiled.search(path):
+            continue
+        matched += 1
+        winner = index.winners[i]
+        if winner in ahead_ids:
+            continue
+        if winner == candidate_id:
+            if newly_ahead.match(path):
+                continue
+            kept += 1
+        elif winner in current_ids or not all_ahead.match(path):
+            captured.append(i)
+        else:
+            continue
+        won.add(i)
+
+    # Files the edited pattern currently wins but would no longer win
+    released: list[tuple[int, int | None]] = []
+    if pattern_id is not None:
+        fallback = CompiledPatternSet([p for p in proposed if p.id not in was_ahead])
+        for i in index.won_by.get(pattern_id, ()):
+            if i not in won:
+                new = fallback.match(index.paths[i])
+                released.append((i, new.id if new else None))
+
+    captured_from = Counter(names.get(index.winners[i], UNMATCHED) for i in captured)
+    released_to = Counter(names.get(new_id, UNMATCHED) for _, new_id in released)
+
+    samples = []
+    for i, new_id in [(i, candidate_id) for i in captured] + released:
+        if len(samples) >= sample_size:
+            break
+        path, filename = index.paths[i], index.filenames[i]
+        old = extract_metadata(db, path, filename, current, lookup)
+        new = extract_metadata(db, path, filename, proposed, lookup)
+        samples.append({
+            'file_id': index.ids[i],
+            'full_path': path,
+            'old_pattern': names.get(index.winners[i], UNMATCHED),
+            'new_pattern': names.get(new_id, UNMATCHED),
+            'changed_fields': _changed_fields(old, new),
+        })
+
+    return {
+        'total_files': len(index),
+        'candidate_files': len(candidates),
+        'matched_files': matched,
+        'captured': len(captured),
+        'kept': kept,
+        'released': len(released),
+        'captured_from': dict(captured_from),
+        'released_to': dict(released_to),
+        'samples': samples,
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 1),
+    }
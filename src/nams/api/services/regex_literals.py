@@ -0,0 +1,93 @@
+"""Required-literal extraction from regexes, for cheap substring prefilters.
+
+``required_literals(r'WSOP.*(?:Main|High)\\s*Event')`` returns
+``({'event'}, {'wsop'}, {'main', 'high'})``: any path the regex matches
+(case-insensitively) contains, once lowercased, "event" and "wsop" and one of
+"main"/"high". Paths failing that never need the regex.
+
+Literals are lowercase ASCII only. Under re.IGNORECASE a few non-ASCII
+characters fold onto ASCII letters (U+017F matches "s"), so callers must treat
+non-ASCII paths as always possible matches.
+"""
+import re
+from re import _constants as sre
+from re import _parser as sre_parse
+
+# Shorter literals filter almost nothing
+MIN_LITERAL_LENGTH = 2
+
+_REPEATS = (sre.MAX_REPEAT, sre.MIN_REPEAT, sre.POSSESSIVE_REPEAT)
+
+
+def _score(literals: frozenset[str]) -> tuple[int, int]:
+    """Selectivity of an any-of set: longest shortest literal, then fewest literals."""
+    return (min(map(len, literals)), -len(literals))
+
+
+def _requirements(items) -> list[frozenset[str]]:
+    """Any-of literal sets that every match of a parsed sequence must satisfy (all of them)."""
+    found: list[frozenset[str]] = []
+    run: list[str] = []
+
+    def close_run():
+        if len(run) >= MIN_LITERAL_LENGTH:
+            found.append(frozenset([''.join(run)]))
+        run.clear()
+
+    for op, av in items:
+        if op is sre.LITERAL and av < 128:
+            run.append(chr(av).lower())
+            continue
+        close_run()
+
+        if op is sre.SUBPATTERN:
+            found.extend(_requirements(av[3]))
+        elif op is sre.ATOMIC_GROUP:
+            found.extend(_requirements(av))
+        elif op in _REPEATS:
+            # Only a mandatory repetition guarantees its body
+            if av[0] >= 1:
+                found.extend(_requirements(av[2]))
+        elif op is sre.BRANCH:
+            # Each branch contributes its most selective set; all branches must have one
+            best = [max(_requirements(branch), key=_score, default=None) for branch in av[1]]
+            if all(literals is not None for literals in best):
+                found.append(frozenset().union(*best))
+
+    close_run()
+    return found
+
+
+def required_literals(pattern: str, flags: int = 0) -> tuple[frozenset[str], ...]:
+    """Get the literal requirements every match of a regex satisfies.
+
+    Args:
+        pattern: Regex source
+        flags: Flags the regex is compiled with (for inline-flag parsing)
+
+    Returns:
+        Any-of sets of lowercase literals, most selective first; a match
+        contains at least one literal of every set. Empty if nothing is
+        required (or the regex does not parse).
+    """
+    try:
+        tree = sre_parse.parse(pattern, flags)
+    except re.error:
+        return ()
+    requirements = set(_requirements(list(tree)))
+    return tuple(sorted(requirements, key=lambda lits: (_score(lits), sorted(lits)), reverse=True))
+
+
+def may_match(requirements: tuple[frozenset[str], ...], lowered: str) -> bool:
+    """Prefilter check: can a regex with these requirements match this path?
+
+    Args:
+        requirements: Result of required_literals()
+        lowered: The path, lowercased (non-ASCII paths always pass)
+    """
+    if not requirements or not lowered.isascii():
+        return True
+    return all(
+        any(literal in lowered for literal in literals)
+        for literals in requirements
+    )
@@ -1,23 +1,39 @@
 """NAS Scanner service for NAMS."""
 import os
 import re
+from collections import Counter, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from datetime import datetime
-from enum import Enum
+from datetime import datetime, timedelta
+from enum import StrEnum
+from itertools import islice
 from pathlib import Path
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from ..database import ExclusionRule, NasFile, get_db_context
-
-
-class ScanMode(str, Enum):
+from ..database import (
+    BULK_CHUNK_SIZE,
+    AssetGroup,
+    BulkInserter,
+    BulkUpdater,
+    NasFile,
+    ScanDirectory,
+    get_db_context,
+)
+from .content_hash import HASH_WORKERS, run_content_hash
+from .exclusion_rules import ExclusionRuleSet
+from .grouping import update_group_stats
+from .media_probe import PROBE_WORKERS, run_media_probe
+
+
+class ScanMode(StrEnum):
     """Scan mode."""
     INCREMENTAL = "incremental"  # 추가분만
     FULL = "full"  # 전체 재스캔
 
 
-class FolderType(str, Enum):
+class FolderType(StrEnum):
     """NAS folder type."""
     ORIGIN = "origin"
     ARCHIVE = "archive"
@@ -26,6 +42,25 @@ class FolderType(str, Enum):
     ALL = "all"  # Origin + Archive + PokerGO
 
 
+class FileState(StrEnum):
+    """Incremental scan classification of a file."""
+    NEW = "new"
+    CHANGED = "changed"  # mtime or size differs from the stored fingerprint
+    UNCHANGED = "unchanged"
+    DELETED = "deleted"  # stored under a scanned root, not found on disk
+
+
+# Concurrent directory listings: in total / per share (drive)
+SCAN_WORKERS = 16
+SHARE_WORKERS = 8
+
+# Paths per IN (...) lookup (below SQLite's bound-parameter limit)
+PATH_LOOKUP_CHUNK = 500
+
+# Unchanged directories are listed again at least this often (deep verify)
+DIR_VERIFY_DAYS = 7
+
+
 @dataclass
 class ScanConfig:
     """Scan configuration."""
@@ -34,105 +69,51 @@ class ScanConfig:
     pokergo_path: str = "X:/GGP Footage/POKERGO"  # PokerGO source
     mode: ScanMode = ScanMode.INCREMENTAL
     folder_type: FolderType = FolderType.BOTH
+    workers: int = SCAN_WORKERS
+    share_workers: int = SHARE_WORKERS
+    chunk_size: int = BULK_CHUNK_SIZE  # rows per insert/commit
+    prune_dirs: bool = False  # skip listing directories unchanged since the last scan
+    verify_days: int | None = DIR_VERIFY_DAYS  # re-list older cache entries (None = never)
+    collect_seen: bool = False  # return seen_paths / new_paths (see run_scan)
+    probe_media: bool = False  # read duration/resolution/codec of new and changed files
+    probe_workers: int = PROBE_WORKERS
+    hash_content: bool = False  # partial-content hash of new and changed files
+    hash_workers: int = HASH_WORKERS
 
 
 # Video extensions
 VIDEO_EXTENSIONS = {'.mp4', '.mkv', '.mov', '.avi', '.wmv', '.m4v', '.mxf'}
 
 
-@dataclass
-class ExclusionCheckResult:
-    """Result of exclusion check."""
-    excluded: bool
-    reason: str | None = None
-    rule_id: int | None = None
-
+def scan_fingerprint(mtime: float, size: int) -> str:
+    """File fingerprint "mtime:size" (same format as scripts/scan_state)."""
+    return f"{mtime}:{size}"
 
-def get_active_exclusion_rules(db: Session) -> list[ExclusionRule]:
-    """Get all active exclusion rules from database."""
-    return db.query(ExclusionRule).filter(ExclusionRule.is_active).all()
 
-
-def check_exclusion_rules(
-    rules: list[ExclusionRule],
-    filename: str,
-    size_bytes: int,
-    full_path: str,
-    duration_sec: int | None = None
-) -> ExclusionCheckResult:
-    """Check if a file should be excluded based on active rules.
+def parse_filename(filepath: Path, stat_result: os.stat_result | None = None) -> dict:
+    """Extract metadata from filename.
 
     Args:
-        rules: List of active exclusion rules
-        filename: File name
-        size_bytes: File size in bytes
-        full_path: Full path for keyword matching
-        duration_sec: Optional duration in seconds (if available)
-
-    Returns:
-        ExclusionCheckResult with excluded status and reason
+        filepath: File path
+        stat_result: The file's stat (e.g. DirEntry.stat()), saves stat round trips
     """
-    filename_lower = filename.lower()
-    full_path_lower = full_path.lower()
-
-    for rule in rules:
-        # Size rules
-        if rule.rule_type == "size":
-            threshold = int(rule.value)
-            if rule.operator == "lt" and size_bytes < threshold:
-                return ExclusionCheckResult(
-                    excluded=True,
-                    reason=f"Size {size_bytes:,} bytes < {threshold:,} bytes",
-                    rule_id=rule.id
-                )
-            elif rule.operator == "gt" and size_bytes > threshold:
-                return ExclusionCheckResult(
-                    excluded=True,
-                    reason=f"Size {size_bytes:,} bytes > {threshold:,} bytes",
-                    rule_id=rule.id
-                )
-
-        # Duration rules (only if duration is available)
-        elif rule.rule_type == "duration" and duration_sec is not None:
-            threshold = int(rule.value)
-            if rule.operator == "lt" and duration_sec < threshold:
-                return ExclusionCheckResult(
-                    excluded=True,
-                    reason=f"Duration {duration_sec}s < {threshold}s",
-                    rule_id=rule.id
-                )
-            elif rule.operator == "gt" and duration_sec > threshold:
-                return ExclusionCheckResult(
-                    excluded=True,
-                    reason=f"Duration {duration_sec}s > {threshold}s",
-                    rule_id=rule.id
-                )
-
-        # Keyword rules (check both filename and full path)
-        elif rule.rule_type == "keyword":
-            keyword_lower = rule.value.lower()
-            if rule.operator == "contains":
-                if keyword_lower in filename_lower or keyword_lower in full_path_lower:
-                    return ExclusionCheckResult(
-                        excluded=True,
-                        reason=f"Contains keyword '{rule.value}'",
-                        rule_id=rule.id
-                    )
-
-    return ExclusionCheckResult(excluded=False)
-
-
-def parse_filename(filepath: Path) -> dict:
-    """Extract metadata from filename."""
     filename = filepath.stem
 
+    if stat_result is None and filepath.exists():
+        stat_result = filepath.stat()
+
     metadata = {
         "filename": filepath.name,
         "extension": filepath.suffix.lower(),
-        "size_bytes": filepath.stat().st_size if filepath.exists() else 0,
+        "size_bytes": stat_result.st_size if stat_result else 0,
         "modified_at": (
-            datetime.fromtimestamp(filepath.stat().st_mtime).isoformat()
-            if filepath.exists()
+            datetime.fromtimestamp(stat_result.st_mtime).isoformat()
+            if stat_result
+            else None
+        ),
+        "fingerprint": (
+            scan_fingerprint(stat_result.st_mtime, stat_result.st_size)
+            if stat_result
             else None
         ),
     }
@@ -163,46 +144,426 @@ def parse_filename(filepath: Path) -> dict:
     return metadata
 
 
-def scan_directory(root_path: Path, base_path: str = "") -> list[dict]:
-    """Recursively scan directory and collect file info."""
-    files = []
-
-    if not root_path.exists():
-        return files
-
+def _list_directory(path: str, base_path: str) -> list:
+    """List one directory: file records and (path, relative_path) subdirectories, in order."""
+    items = []
     try:
-        for entry in os.scandir(root_path):
+        for entry in os.scandir(path):
             if entry.name.startswith('.') or entry.name in ('Thumbs.db', 'desktop.ini'):
                 continue
 
             relative_path = os.path.join(base_path, entry.name) if base_path else entry.name
 
             if entry.is_dir():
-                files.extend(scan_directory(Path(entry.path), relative_path))
+                items.append((entry.path, relative_path))
             elif entry.is_file():
                 ext = os.path.splitext(entry.name)[1].lower()
                 if ext in VIDEO_EXTENSIONS:
                     filepath = Path(entry.path)
-                    file_info = parse_filename(filepath)
+                    try:
+                        stat_result = entry.stat()
+                    except FileNotFoundError:
+                        stat_result = None  # Removed since listing
+                    file_info = parse_filename(filepath, stat_result)
                     file_info["relative_path"] = relative_path
                     file_info["full_path"] = str(filepath)
                     file_info["directory"] = base_path
-                    files.append(file_info)
-    except PermissionError:
+                    items.append(file_info)
+    except (PermissionError, FileNotFoundError):
         pass
+    return items
+
 
-    return files
+class DirectoryCache:
+    """Directory mtimes and child counts from the previous scan (scan_directories).
 
+    A directory is unchanged when its mtime equals the cached one, it was
+    listed within ``verify_days``, and its cached child count still equals
+    the stored files directly in it (not flagged missing) plus its cached
+    subdirectories (so a cleared or edited nas_files table forces a listing). Adding, removing or
+    renaming an entry changes the mtime of the directory holding it; a file
+    rewritten in place does not, so it is only picked up by the deep verify.
+    """
 
-def get_existing_paths(db: Session) -> set[str]:
-    """Get all existing file paths from database."""
-    paths = db.query(NasFile.full_path).all()
-    return {p[0] for p in paths if p[0]}
+    def __init__(self, rows, file_counts: Counter, verify_before: datetime | None = None):
+        self.rows = {row.path: row for row in rows}
+        self.file_counts = file_counts
+        self.verify_before = verify_before
+        self.subdirs: dict[str, list[str]] = {}
+        for path in self.rows:
+            parent = os.path.dirname(path)
+            if parent != path:
+                self.subdirs.setdefault(parent, []).append(path)
+
+    @classmethod
+    def load(
+        cls, db: Session, root_paths: list[Path], verify_days: int | None = DIR_VERIFY_DAYS
+    ) -> 'DirectoryCache':
+        """Cached directories under ``root_paths`` and stored file counts per directory."""
+        roots = {os.path.normpath(str(root_path)) for root_path in root_paths}
+        prefixes = tuple(os.path.join(root, "") for root in roots)
+        rows = [
+            row for row in db.query(
+                ScanDirectory.id,
+                ScanDirectory.path,
+                ScanDirectory.mtime,
+                ScanDirectory.child_count,
+                ScanDirectory.verified_at,
+            )
+            if row.path in roots or row.path.startswith(prefixes)
+        ]
+        file_counts = Counter(
+            os.path.dirname(full_path)
+            for (full_path,) in db.query(NasFile.full_path).filter(
+                NasFile.full_path.isnot(None),
+                NasFile.last_seen_at.is_(None),  # not flagged missing
+            ).yield_per(BULK_CHUNK_SIZE)
+            if full_path.startswith(prefixes)
+        )
+        verify_before = None
+        if verify_days is not None:
+            verify_before = datetime.utcnow() - timedelta(days=verify_days)
+        return cls(rows, file_counts, verify_before)
+
+    def is_unchanged(self, path: str, mtime: float) -> bool:
+        """Whether the listing of ``path`` (normalized) can be skipped."""
+        row = self.rows.get(path)
+        if row is None or row.mtime != mtime:
+            return False
+        if self.verify_before is not None and (
+            row.verified_at is None or row.verified_at < self.verify_before
+        ):
+            return False
+        subdirs = self.subdirs.get(path, ())
+        return self.file_counts.get(path, 0) + len(subdirs) == row.child_count
+
+
+def share_of(path: Path | str) -> str:
+    """Share a path lives on ("Y:", "\\\\server\\share"); the path itself without a drive."""
+    drive = os.path.splitdrive(str(path))[0]
+    return drive.upper() if drive else str(path)
+
+
+class DirectoryWalker:
+    """Walk several directory trees concurrently.
+
+    Every directory listing is one task on a bounded thread pool; on SMB shares
+    each listing is a network round trip, so listings overlap instead of
+    queueing. At most ``share_workers`` listings run against one share (see
+    share_of) at a time and shares are served round-robin, so one slow drive
+    cannot take every thread.
+
+    Records come back in the same depth-first order a recursive walk produces.
+
+    With a DirectoryCache each directory is stat'ed first; unchanged ones are
+    not listed (one round trip instead of a listing plus a stat per file)
+    and only their cached subdirectories are visited. Their paths are
+    collected in ``pruned``, and the mtime and child count of every listed
+    directory in ``listed``.
+    """
+
+    def __init__(
+        self,
+        workers: int = SCAN_WORKERS,
+        share_workers: int = SHARE_WORKERS,
+        cache: DirectoryCache | None = None,
+    ):
+        self.workers = max(1, workers)
+        self.share_workers = max(1, share_workers)
+        self.cache = cache
+        self.directories = 0
+        self.listed: dict[str, tuple[float, int]] = {}
+        self.pruned: set[str] = set()
+
+    def _visit(self, path: str, base_path: str) -> tuple[str, float | None, bool, list]:
+        """List one directory, or reuse the cache; (normalized path, mtime, pruned, items)."""
+        if self.cache is None:
+            return path, None, False, _list_directory(path, base_path)
+
+        key = os.path.normpath(path)
+        try:
+            mtime = os.stat(path).st_mtime  # before listing: a change during it re-lists
+        except OSError:
+            return key, None, False, []
+        if self.cache.is_unchanged(key, mtime):
+            items = []
+            for subdir in self.cache.subdirs.get(key, ()):
+                name = os.path.basename(subdir)
+                items.append((subdir, os.path.join(base_path, name) if base_path else name))
+            return key, mtime, True, items
+        return key, mtime, False, _list_directory(path, base_path)
+
+    def iter_listings(self, roots: list[tuple[Path, str]]):
+        """Yield (root index, directory path, listing) as each listing completes."""
+        queues: dict[str, deque] = {}
+        running: dict[str, int] = {}
+        for n, (root_path, base_path) in enumerate(roots):
+            if root_path.exists():
+                share = share_of(root_path)
+                queues.setdefault(share, deque()).append((n, str(root_path), base_path))
+                running.setdefault(share, 0)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = {}
+            while queues or pending:
+                # Fill free slots round-robin over shares with queued directories
+                submitted = True
+                while submitted and len(pending) < self.workers:
+                    submitted = False
+                    for share in list(queues):
+                        if len(pending) >= self.workers:
+                            break
+                        if running[share] >= self.share_workers:
+                            continue
+                        n, path, base_path = queues[share].popleft()
+                        if not queues[share]:
+                            del queues[share]
+                        future = pool.submit(self._visit, path, base_path)
+                        pending[future] = (share, n, path)
+                        running[share] += 1
+                        submitted = True
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    share, n, path = pending.pop(future)
+                    running[share] -= 1
+                    key, mtime, pruned, items = future.result()
+                    self.directories += 1
+                    if pruned:
+                        self.pruned.add(key)
+                    elif mtime is not None:
+                        self.listed[key] = (mtime, len(items))
+                    for item in items:
+                        if isinstance(item, tuple):
+                            queues.setdefault(share, deque()).append((n, *item))
+                    yield n, path, items
+
+    def iter_files(self, roots: list[tuple[Path, str]]):
+        """Yield (root index, file record) as directories are listed (discovery order).
+
+        Nothing but the queue of unlisted directories is held, so memory does
+        not grow with the number of files.
+        """
+        for n, _, items in self.iter_listings(roots):
+            for item in items:
+                if not isinstance(item, tuple):
+                    yield n, item
+
+    def walk(self, roots: list[tuple[Path, str]]) -> list[list[dict]]:
+        """Scan (root_path, base_path) trees; returns one file list per root (depth-first)."""
+        # Listing of each directory, keyed by (root index, directory path)
+        listings: dict[tuple[int, str], list] = {}
+        for n, path, items in self.iter_listings(roots):
+            listings[(n, path)] = items
+
+        return [
+            self._flatten(listings, n, str(root_path)) if (n, str(root_path)) in listings else []
+            for n, (root_path, _) in enumerate(roots)
+        ]
+
+    @staticmethod
+    def _flatten(listings: dict, n: int, root: str) -> list[dict]:
+        """Depth-first file records of one tree."""
+        files = []
+        stack = [iter(listings[(n, root)])]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+            elif isinstance(item, tuple):
+                stack.append(iter(listings[(n, item[0])]))
+            else:
+                files.append(item)
+        return files
+
+
+def scan_directory(
+    root_path: Path,
+    base_path: str = "",
+    workers: int = SCAN_WORKERS,
+    share_workers: int = SHARE_WORKERS,
+) -> list[dict]:
+    """Recursively scan directory and collect file info (subdirectories in parallel)."""
+    return DirectoryWalker(workers, share_workers).walk([(root_path, base_path)])[0]
+
+
+def get_existing_paths(db: Session, paths: list[str] | None = None) -> set[str]:
+    """Get existing file paths from database (all of them, or those among ``paths``)."""
+    if paths is None:
+        rows = db.query(NasFile.full_path).all()
+        return {p[0] for p in rows if p[0]}
+
+    existing = set()
+    for start in range(0, len(paths), PATH_LOOKUP_CHUNK):
+        chunk = paths[start:start + PATH_LOOKUP_CHUNK]
+        rows = db.query(NasFile.full_path).filter(NasFile.full_path.in_(chunk))
+        existing.update(p[0] for p in rows)
+    return existing
+
+
+def get_file_fingerprints(db: Session, paths: list[str]) -> dict:
+    """Stored (id, fingerprint, size_bytes, asset_group_id) rows of ``paths``, by path."""
+    rows = {}
+    for start in range(0, len(paths), PATH_LOOKUP_CHUNK):
+        chunk = paths[start:start + PATH_LOOKUP_CHUNK]
+        for row in db.query(
+            NasFile.id,
+            NasFile.full_path,
+            NasFile.fingerprint,
+            NasFile.size_bytes,
+            NasFile.asset_group_id,
+        ).filter(NasFile.full_path.in_(chunk)):
+            rows[row.full_path] = row
+    return rows
+
+
+def classify_file(stored, fingerprint: str | None, size_bytes: int) -> FileState:
+    """Compare a scanned file with its stored row (None when not in the database).
+
+    Rows scanned before fingerprints were stored have none; they count as
+    unchanged when the size matches, and the caller stamps the fingerprint.
+    A file that vanished between listing and stat (no fingerprint) is left alone.
+    """
+    if stored is None:
+        return FileState.NEW
+    if fingerprint is None or stored.fingerprint == fingerprint:
+        return FileState.UNCHANGED
+    if stored.fingerprint is None and stored.size_bytes == size_bytes:
+        return FileState.UNCHANGED
+    return FileState.CHANGED
+
+
+def sweep_unseen_files(
+    db: Session,
+    root_paths: list[Path],
+    seen_ids: set[int],
+    last_id: int,
+    pruned: set[str] = frozenset(),
+) -> tuple[list, list]:
+    """Rows stored before the scan (id <= ``last_id``) under the scanned roots, not seen.
+
+    Rows in a directory the walker pruned (unchanged, see DirectoryCache) are
+    still on disk, unless they were flagged missing (last_seen_at); the
+    others are deleted.
+
+    Returns:
+        ([(root index, row)] reused from pruned directories, [row] deleted),
+        rows being (id, full_path, size_bytes, last_seen_at)
+    """
+    prefixes = [os.path.join(os.path.normpath(str(root_path)), "") for root_path in root_paths]
+    if not prefixes:
+        return [], []
+    rows = db.query(
+        NasFile.id, NasFile.full_path, NasFile.size_bytes, NasFile.last_seen_at
+    ).filter(
+        NasFile.id <= last_id,
+        NasFile.full_path.isnot(None),
+    )
+    reused, deleted = [], []
+    for row in rows.yield_per(BULK_CHUNK_SIZE):
+        if row.id in seen_ids:
+            continue
+        root_index = next(
+            (n for n, prefix in enumerate(prefixes) if row.full_path.startswith(prefix)), None
+        )
+        if root_index is None:
+            continue
+        if row.last_seen_at is None and os.path.dirname(row.full_path) in pruned:
+            reused.append((root_index, row))
+        else:
+            deleted.append(row)
+    return reused, deleted
+
+
+def save_directory_cache(db: Session, cache: DirectoryCache, walker: DirectoryWalker) -> dict:
+    """Store the directories the walker listed and drop cached ones that are gone.
+
+    Returns:
+        Counts of added/updated/removed cache rows
+    """
+    stats = {"added": 0, "updated": 0, "removed": 0}
+    now = datetime.utcnow()
+    with (
+        BulkInserter(db, ScanDirectory) as inserter,
+        BulkUpdater(db, ScanDirectory) as updater,
+    ):
+        for path, (mtime, child_count) in walker.listed.items():
+            values = {"mtime": mtime, "child_count": child_count, "verified_at": now}
+            row = cache.rows.get(path)
+            if row is None:
+                inserter.add({"path": path, **values})
+                stats["added"] += 1
+            else:
+                updater.add({"id": row.id, **values})
+                stats["updated"] += 1
+
+    gone = [
+        row.id for path, row in cache.rows.items()
+        if path not in walker.listed and path not in walker.pruned
+    ]
+    for start in range(0, len(gone), PATH_LOOKUP_CHUNK):
+        chunk = gone[start:start + PATH_LOOKUP_CHUNK]
+        db.query(ScanDirectory).filter(ScanDirectory.id.in_(chunk)).delete(
+            synchronize_session=False
+        )
+    db.commit()
+    stats["removed"] = len(gone)
+    return stats
+
+
+def _batched(iterable, size: int):
+    """Yield lists of up to ``size`` items."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _exclusion_columns(rules: ExclusionRuleSet, filename: str, size_bytes: int,
+                       full_path: str) -> dict:
+    """Exclusion flag columns of a file (stored, not skipped)."""
+    # Duration not available from file scan
+    result = rules.check(filename, size_bytes, full_path)
+    excluded = result.excluded
+    return {
+        "is_excluded": excluded,
+        "exclusion_reason": result.reason if excluded else None,
+        "exclusion_rule_id": result.rule_id if excluded else None,
+    }
 
 
 def run_scan(config: ScanConfig) -> dict:
     """Run NAS scan with given configuration.
 
+    File records are streamed from the walker into the database and committed
+    every ``config.chunk_size`` rows, so memory stays flat and the first rows
+    are visible while a long scan is still running. Full mode clears
+    nas_files before the walk starts.
+
+    Incremental mode compares each file's "mtime:size" fingerprint with the
+    stored one (see classify_file). New files are inserted; changed files get
+    the new size and fingerprint, re-checked exclusion flags and a cleared
+    extraction_version, so only they are re-extracted by reprocess_incremental
+    (their groups' stats are refreshed). Unchanged files are not written.
+    Stored files under a scanned root that were not found are counted as
+    deleted (not removed).
+
+    With ``config.prune_dirs`` directories unchanged since the last scan are
+    not listed (see DirectoryCache); their stored files count as unchanged.
+
+    With ``config.hash_content`` files not hashed since their last change get
+    a partial-content hash (see content_hash), used for move detection and
+    to group copies across drives.
+
+    With ``config.probe_media`` files not probed since their last change get
+    duration, resolution and codec from their headers (see media_probe), and
+    exclusion rules are re-applied with the durations.
+
+    With ``config.collect_seen`` the stats also hold ``seen_paths`` (every
+    file on disk under the scanned roots, pruned directories included) and
+    ``new_paths`` ({full_path: directory} of inserted files), so missing-file
+    and move detection can reuse this walk instead of scanning again. Both
+    are left out otherwise (they are not JSON serializable / can be large).
+
     Args:
         config: Scan configuration
 
@@ -216,64 +577,46 @@ def run_scan(config: ScanConfig) -> dict:
         "archive_files": 0,
         "pokergo_files": 0,
         "new_files": 0,
+        "changed_files": 0,
+        "unchanged_files": 0,
+        "deleted_files": 0,
+        "pruned_directories": 0,
+        "updated_files": 0,
         "skipped_files": 0,
         "excluded_files": 0,
         "total_size_bytes": 0,
         "errors": [],
         "exclusion_reasons": [],
+        "changed": [],
+        "deleted": [],
     }
 
-    all_files = []
-
-    # Scan origin folder
+    # (source folder, path) of the selected roots
+    roots = []
     if config.folder_type in (FolderType.ORIGIN, FolderType.BOTH, FolderType.ALL):
-        origin_path = Path(config.origin_path)
-        if origin_path.exists():
-            print(f"[Scan] Scanning origin: {origin_path}")
-            origin_files = scan_directory(origin_path, "origin")
-            for f in origin_files:
-                f["source_folder"] = "origin"
-            all_files.extend(origin_files)
-            stats["origin_files"] = len(origin_files)
-            print(f"  Found {len(origin_files)} files")
-        else:
-            stats["errors"].append(f"Origin path not found: {origin_path}")
-
-    # Scan archive folder
+        roots.append(("origin", Path(config.origin_path)))
     if config.folder_type in (FolderType.ARCHIVE, FolderType.BOTH, FolderType.ALL):
-        archive_path = Path(config.archive_path)
-        if archive_path.exists():
-            print(f"[Scan] Scanning archive: {archive_path}")
-            archive_files = scan_directory(archive_path, "archive")
-            for f in archive_files:
-                f["source_folder"] = "archive"
-            all_files.extend(archive_files)
-            stats["archive_files"] = len(archive_files)
-            print(f"  Found {len(archive_files)} files")
-        else:
-            stats["errors"].append(f"Archive path not found: {archive_path}")
-
-    # Scan PokerGO source folder
+        roots.append(("archive", Path(config.archive_path)))
     if config.folder_type in (FolderType.POKERGO, FolderType.ALL):
-        pokergo_path = Path(config.pokergo_path)
-        if pokergo_path.exists():
-            print(f"[Scan] Scanning PokerGO source: {pokergo_path}")
-            pokergo_files = scan_directory(pokergo_path, "pokergo")
-            for f in pokergo_files:
-                f["source_folder"] = "pokergo"
-            all_files.extend(pokergo_files)
-            stats["pokergo_files"] = len(pokergo_files)
-            print(f"  Found {len(pokergo_files)} files")
+        roots.append(("pokergo", Path(config.pokergo_path)))
+
+    labels = {"origin": "Origin", "archive": "Archive", "pokergo": "PokerGO"}
+    found = []
+    for source_folder, root_path in roots:
+        if root_path.exists():
+            print(f"[Scan] Scanning {source_folder}: {root_path}")
+            found.append((source_folder, root_path))
         else:
-            stats["errors"].append(f"PokerGO path not found: {pokergo_path}")
+            stats["errors"].append(f"{labels[source_folder]} path not found: {root_path}")
 
-    # Save to database
-    with get_db_context() as db:
-        existing_paths = set()
+    incremental = config.mode == ScanMode.INCREMENTAL
 
-        if config.mode == ScanMode.INCREMENTAL:
-            existing_paths = get_existing_paths(db)
-            print(f"[Scan] Incremental mode: {len(existing_paths)} existing files")
+    with get_db_context() as db:
+        if incremental:
+            existing_count, last_id = db.query(
+                func.count(NasFile.id), func.coalesce(func.max(NasFile.id), 0)
+            ).one()
+            print(f"[Scan] Incremental mode: {existing_count} existing files")
         elif config.mode == ScanMode.FULL:
             # Clear existing files for full rescan
             print("[Scan] Full mode: clearing existing files...")
@@ -281,65 +624,156 @@ def run_scan(config: ScanConfig) -> dict:
             db.commit()
 
         # Get active exclusion rules
-        exclusion_rules = get_active_exclusion_rules(db)
+        exclusion_rules = ExclusionRuleSet.load(db)
         print(f"[Scan] Active exclusion rules: {len(exclusion_rules)}")
 
-        for file_data in all_files:
-            full_path = file_data.get("full_path")
-            filename = file_data["filename"]
-            size_bytes = file_data["size_bytes"]
-
-            # Skip existing files in incremental mode
-            if config.mode == ScanMode.INCREMENTAL and full_path in existing_paths:
-                stats["skipped_files"] += 1
-                continue
-
-            # Check exclusion rules (for flagging, not skipping)
-            exclusion_result = check_exclusion_rules(
-                rules=exclusion_rules,
-                filename=filename,
-                size_bytes=size_bytes,
-                full_path=full_path,
-                duration_sec=None  # Duration not available from file scan
+        cache = None
+        if config.prune_dirs:
+            cache = DirectoryCache.load(
+                db, [root_path for _, root_path in found], config.verify_days
             )
-
-            # Determine role based on source folder
-            source_folder = file_data["source_folder"]
-            if source_folder == "origin":
-                role = "primary"
-            elif source_folder == "pokergo":
-                role = "pokergo_source"
-            else:
-                role = "backup"
-
-            # Create new file record (ALL files are stored, excluded ones are flagged)
-            nas_file = NasFile(
-                filename=file_data["filename"],
-                extension=file_data["extension"],
-                size_bytes=file_data["size_bytes"],
-                directory=file_data["directory"],
-                full_path=full_path,
-                year=file_data.get("year"),
-                role=role,
-                # Exclusion flags (checkbox display)
-                is_excluded=exclusion_result.excluded,
-                exclusion_reason=exclusion_result.reason if exclusion_result.excluded else None,
-                exclusion_rule_id=exclusion_result.rule_id if exclusion_result.excluded else None,
-            )
-            db.add(nas_file)
-            stats["new_files"] += 1
-            stats["total_size_bytes"] += file_data["size_bytes"]
-
-            if exclusion_result.excluded:
-                stats["excluded_files"] += 1
-                if len(stats["exclusion_reasons"]) < 10:
-                    stats["exclusion_reasons"].append({
-                        "file": filename,
-                        "reason": exclusion_result.reason
+            print(f"[Scan] Directory cache: {len(cache.rows)} directories")
+
+        # Records stream from all roots (walked concurrently, per-share limits in
+        # DirectoryWalker) straight into chunked inserts; nothing is collected first
+        walker = DirectoryWalker(config.workers, config.share_workers, cache)
+        records = walker.iter_files([(root_path, folder) for folder, root_path in found])
+
+        seen_ids: set[int] = set()
+        changed_groups: set[int] = set()
+        seen_paths: set[str] = set()
+        new_paths: dict[str, str] = {}
+
+        # Every chunk_size new rows are inserted and committed (visible to the API)
+        with (
+            BulkInserter(db, NasFile, config.chunk_size) as writer,
+            BulkUpdater(db, NasFile, config.chunk_size) as updater,
+        ):
+            for batch in _batched(records, config.chunk_size):
+                stored_rows = {}
+                if incremental:
+                    stored_rows = get_file_fingerprints(db, [f["full_path"] for _, f in batch])
+
+                for root_index, file_data in batch:
+                    source_folder = found[root_index][0]
+                    stats[f"{source_folder}_files"] += 1
+
+                    full_path = file_data["full_path"]
+                    filename = file_data["filename"]
+                    size_bytes = file_data["size_bytes"]
+                    fingerprint = file_data["fingerprint"]
+                    if config.collect_seen:
+                        seen_paths.add(full_path)
+
+                    stored = stored_rows.get(full_path)
+                    state = classify_file(stored, fingerprint, size_bytes)
+
+                    if state == FileState.UNCHANGED:
+                        seen_ids.add(stored.id)
+                        stats["unchanged_files"] += 1
+                        stats["skipped_files"] += 1
+                        if stored.fingerprint is None and fingerprint is not None:
+                            updater.add({"id": stored.id, "fingerprint": fingerprint})
+                        continue
+
+                    exclusion = _exclusion_columns(
+                        exclusion_rules, filename, size_bytes, full_path
+                    )
+                    if exclusion["is_excluded"]:
+                        stats["excluded_files"] += 1
+                        if len(stats["exclusion_reasons"]) < 10:
+                            stats["exclusion_reasons"].append({
+                                "file": filename,
+                                "reason": exclusion["exclusion_reason"]
+                            })
+
+                    if state == FileState.CHANGED:
+                        seen_ids.add(stored.id)
+                        updater.add({
+                            "id": stored.id,
+                            "size_bytes": size_bytes,
+                            "fingerprint": fingerprint,
+                            # Re-extracted by the next incremental extraction
+                            "extraction_version": None,
+                            **exclusion,
+                        })
+                        if stored.asset_group_id is not None:
+                            changed_groups.add(stored.asset_group_id)
+                        stats["changed_files"] += 1
+                        stats["skipped_files"] += 1
+                        if len(stats["changed"]) < 10:
+                            stats["changed"].append({
+                                "path": full_path,
+                                "old_size": stored.size_bytes,
+                                "new_size": size_bytes,
+                            })
+                        continue
+
+                    # Determine role based on source folder
+                    if source_folder == "origin":
+                        role = "primary"
+                    elif source_folder == "pokergo":
+                        role = "pokergo_source"
+                    else:
+                        role = "backup"
+
+                    # New file record (ALL files are stored, excluded ones are flagged)
+                    writer.add({
+                        "filename": filename,
+                        "extension": file_data["extension"],
+                        "size_bytes": size_bytes,
+                        "directory": file_data["directory"],
+                        "full_path": full_path,
+                        "fingerprint": fingerprint,
+                        "year": file_data.get("year"),
+                        "role": role,
+                        # Exclusion flags (checkbox display)
+                        **exclusion,
                     })
-
-        db.commit()
-
+                    stats["new_files"] += 1
+                    stats["total_size_bytes"] += size_bytes
+                    if config.collect_seen:
+                        new_paths[full_path] = file_data["directory"]
+
+        if incremental:
+            reused, deleted = sweep_unseen_files(
+                db, [root_path for _, root_path in found], seen_ids, last_id, walker.pruned
+            )
+            # Files in pruned (unchanged) directories were not listed
+            for root_index, row in reused:
+                stats[f"{found[root_index][0]}_files"] += 1
+                stats["unchanged_files"] += 1
+                stats["skipped_files"] += 1
+                if config.collect_seen:
+                    seen_paths.add(row.full_path)
+            stats["deleted_files"] = len(deleted)
+            stats["deleted"] = [row.full_path for row in deleted[:10]]
+
+            # Changed sizes change group totals
+            for group in db.query(AssetGroup).filter(AssetGroup.id.in_(changed_groups)):
+                update_group_stats(db, group)
+
+        if cache is not None:
+            save_directory_cache(db, cache, walker)
+
+        if config.hash_content:
+            stats["hash"] = run_content_hash(db, config.hash_workers, config.chunk_size)
+        if config.probe_media:
+            stats["probe"] = run_media_probe(db, config.probe_workers, config.chunk_size)
+
+    stats["pruned_directories"] = len(walker.pruned)
+    if config.collect_seen:
+        stats["seen_paths"] = seen_paths
+        stats["new_paths"] = new_paths
+    stats["updated_files"] = stats["changed_files"]
+
+    for source_folder, _ in found:
+        print(f"  {source_folder}: found {stats[f'{source_folder}_files']} files")
+    listed = walker.directories - len(walker.pruned)
+    print(f"[Scan] Listed {listed} directories, skipped {len(walker.pruned)} unchanged")
+    if incremental:
+        print(f"[Scan] New {stats['new_files']}, changed {stats['changed_files']}, "
+              f"unchanged {stats['unchanged_files']}, deleted {stats['deleted_files']}")
     excluded_count = stats['excluded_files']
     print(f"[Scan] Flagged {excluded_count} files as excluded (stored with is_excluded=True)")
     return stats
@@ -0,0 +1,115 @@
+"""Title similarity: token-set and character-trigram overlap, batched.
+
+Replaces ``difflib.SequenceMatcher.ratio()`` (pure Python, roughly quadratic
+in title length) in the PokerGO matching loop. A normalized title is turned
+once into a TitleProfile: its word tokens and its character trigrams (of the
+space-padded title), each interned to small ints. Similarity is the mean of
+the Dice overlaps of the two sets, so comparing two profiles is two C-level
+set intersections. Profiles and their vocabulary live in a TitleProfiles
+built per matching run (EpisodeIndex holds one), whose ``similarities()``
+scores one title against a whole candidate block at once.
+
+The raw overlap runs lower than SequenceMatcher on the same pair (shared
+"wsop 2011 main event" boilerplate counts for less), so it is mapped through
+CALIBRATION onto the SequenceMatcher scale: thresholds and score weights
+tuned on the old ratio (``min_score``, the 0.2 title bonus) keep their
+meaning. The table is equipercentile-linked on group titles vs the PokerGO
+WSOP catalog; ``python scripts/test_similarity.py --calibrate`` rebuilds it.
+"""
+from bisect import bisect_right
+from collections.abc import Sequence
+from typing import NamedTuple
+
+NGRAM = 3
+
+# (raw overlap, SequenceMatcher-equivalent ratio), increasing; linear in between
+CALIBRATION = (
+    (0.0, 0.0),
+    (0.203, 0.348),
+    (0.227, 0.383),
+    (0.246, 0.413),
+    (0.268, 0.436),
+    (0.297, 0.465),
+    (0.34, 0.508),
+    (0.373, 0.56),
+    (0.5, 0.646),
+    (0.536, 0.714),
+    (0.564, 0.75),
+    (0.58, 0.764),
+    (0.64, 0.792),
+    (1.0, 1.0),
+)
+_KNOTS = [raw for raw, _ in CALIBRATION]
+
+
+class TitleProfile(NamedTuple):
+    """Interned word tokens and character trigrams of a normalized title."""
+    tokens: frozenset[int]
+    grams: frozenset[int]
+
+
+class TitleProfiles:
+    """Memoized profiles of one matching run's titles, with their vocabulary.
+
+    Token / trigram ids are only comparable between profiles of the same
+    TitleProfiles, so build one per run; the memo is freed with it. Not
+    thread-safe: a run uses it from one thread.
+    """
+
+    def __init__(self):
+        # Token / trigram -> int; titles share a small vocabulary
+        self._interned: dict[str, int] = {}
+        self._profiles: dict[str, TitleProfile] = {}
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def profile(self, normalized: str) -> TitleProfile:
+        """Profile of a normalized title (see matching.normalize_title), memoized."""
+        profile = self._profiles.get(normalized)
+        if profile is None:
+            interned = self._interned
+            intern = interned.setdefault
+            padded = f' {normalized} '
+            profile = TitleProfile(
+                tokens=frozenset(intern(token, len(interned)) for token in normalized.split()),
+                grams=frozenset(
+                    intern(padded[i:i + NGRAM], len(interned))
+                    for i in range(len(padded) - NGRAM + 1)
+                ),
+            )
+            self._profiles[normalized] = profile
+        return profile
+
+    def similarities(self, query: str, candidates: Sequence[TitleProfile]) -> list[float]:
+        """Calibrated similarity of one normalized title to every candidate profile."""
+        tokens, grams = self.profile(query)
+        return [
+            calibrate((_dice(tokens, other.tokens) + _dice(grams, other.grams)) / 2)
+            for other in candidates
+        ]
+
+
+def _dice(a: frozenset[int], b: frozenset[int]) -> float:
+    total = len(a) + len(b)
+    return 2 * len(a & b) / total if total else 1.0
+
+
+def raw_similarity(a: TitleProfile, b: TitleProfile) -> float:
+    """Uncalibrated overlap in [0, 1]: mean of token and trigram Dice."""
+    return (_dice(a.tokens, b.tokens) + _dice(a.grams, b.grams)) / 2
+
+
+def calibrate(raw: float) -> float:
+    """Map a raw overlap onto the SequenceMatcher ratio scale."""
+    i = bisect_right(_KNOTS, raw)
+    if i >= len(CALIBRATION):
+        return 1.0
+    (x0, y0), (x1, y1) = CALIBRATION[i - 1], CALIBRATION[i]
+    return y0 + (y1 - y0) * (raw - x0) / (x1 - x0)
+
+
+def similarity(a: str, b: str) -> float:
+    """Calibrated similarity of two normalized titles."""
+    profiles = TitleProfiles()
+    return calibrate(raw_similarity(profiles.profile(a), profiles.profile(b)))